@@ -9,6 +9,7 @@ from injector import inject
 
 from atcoder_helper._version import __version__
 from atcoder_helper.application.usecases import errors as usecase_errors
+from atcoder_helper.application.usecases.archive import ArchiveUsecase
 from atcoder_helper.application.usecases.atcoder_helper_config import (
     AtCoderHelperConfigUsecase,
 )
@@ -16,6 +17,9 @@ from atcoder_helper.application.usecases.auth import AuthUsecase
 from atcoder_helper.application.usecases.execute_test import ExecuteTestUsecase
 from atcoder_helper.application.usecases.fetch_task import FetchTaskUsecase
 from atcoder_helper.application.usecases.init_task import InitTaskDirUsecase
+from atcoder_helper.application.usecases.pipeline import PipelineUsecase
+from atcoder_helper.application.usecases.scaling_test import ScalingTestUsecase
+from atcoder_helper.application.usecases.stress_test import StressTestUsecase
 
 
 class Controller:
@@ -26,6 +30,10 @@ class Controller:
     _execute_test_usecase: ExecuteTestUsecase
     _fetch_task_usecase: FetchTaskUsecase
     _init_task_dir_usecase: InitTaskDirUsecase
+    _stress_test_usecase: StressTestUsecase
+    _scaling_test_usecase: ScalingTestUsecase
+    _pipeline_usecase: PipelineUsecase
+    _archive_usecase: ArchiveUsecase
 
     @inject
     def __init__(
@@ -35,6 +43,10 @@ class Controller:
         execute_test_usecase: ExecuteTestUsecase,
         fetch_task_usecase: FetchTaskUsecase,
         init_task_dir_usecase: InitTaskDirUsecase,
+        stress_test_usecase: StressTestUsecase,
+        scaling_test_usecase: ScalingTestUsecase,
+        pipeline_usecase: PipelineUsecase,
+        archive_usecase: ArchiveUsecase,
     ) -> None:
         """__init__.
 
@@ -44,12 +56,20 @@ class Controller:
             execute_test_usecase (ExecuteTestUsecase, optional): _
             fetch_task_usecase (FetchTaskUsecase, optional): _
             init_task_dir_usecase (InitTaskDirUsecase, optional): _
+            stress_test_usecase (StressTestUsecase, optional): _
+            scaling_test_usecase (ScalingTestUsecase, optional): _
+            pipeline_usecase (PipelineUsecase, optional): _
+            archive_usecase (ArchiveUsecase, optional): _
         """
         self._auth_usecase = auth_usecase
         self._atcoder_helper_config_usecase = atcoder_helper_config_usecase
         self._execute_test_usecase = execute_test_usecase
         self._fetch_task_usecase = fetch_task_usecase
         self._init_task_dir_usecase = init_task_dir_usecase
+        self._stress_test_usecase = stress_test_usecase
+        self._scaling_test_usecase = scaling_test_usecase
+        self._pipeline_usecase = pipeline_usecase
+        self._archive_usecase = archive_usecase
 
     def auth_login_handler(self, args: argparse.Namespace) -> None:
         """ログインする."""
@@ -156,12 +176,202 @@ class Controller:
             args (argparse.Namespace): コマンドライン引数
         """
         try:
-            self._execute_test_usecase.execute_test()
+            if args.bench:
+                self._execute_test_usecase.benchmark_test(
+                    warmup=args.warmup,
+                    repeat=args.repeat,
+                    precision=args.precision,
+                    cpu=args.cpu,
+                    json_file=args.bench_json,
+                    time_limit=args.time_limit,
+                    memory_limit=args.memory_limit,
+                    output_limit=args.output_limit,
+                )
+            else:
+                self._run_test_suite(args)
         except usecase_errors.ConfigAccessError:
             print("設定ファイルの読み書きに失敗しました")
             if args.verbose:
                 print(traceback.format_exc())
             sys.exit(1)
+        except usecase_errors.BuildFailure:
+            print("ビルドに失敗しました")
+            if args.verbose:
+                print(traceback.format_exc())
+            sys.exit(1)
+        except usecase_errors.ResultWriteError:
+            print("結果ファイルの書き込みに失敗しました")
+            if args.verbose:
+                print(traceback.format_exc())
+            sys.exit(1)
+
+    def _run_test_suite(self, args: argparse.Namespace) -> None:
+        if args.watch:
+            self._watch_test(args)
+        elif args.languages:
+            self._race_languages(args)
+        elif args.profile is not None:
+            self._profile_test(args)
+        else:
+            self._execute_test_usecase.execute_test(
+                jobs=args.jobs,
+                time_limit=args.time_limit,
+                memory_limit=args.memory_limit,
+                output_limit=args.output_limit,
+                changed_only=args.changed_only,
+                failed_only=args.failed_only,
+                output_format=args.format,
+                output_file=args.output,
+            )
+
+    def _watch_test(self, args: argparse.Namespace) -> None:
+        try:
+            self._execute_test_usecase.watch_test(
+                jobs=args.jobs,
+                time_limit=args.time_limit,
+                memory_limit=args.memory_limit,
+                output_limit=args.output_limit,
+                debounce=args.debounce,
+            )
+        except KeyboardInterrupt:
+            pass  # Ctrl+C で止めるのが正常な終わり方
+
+    def _race_languages(self, args: argparse.Namespace) -> None:
+        try:
+            self._execute_test_usecase.race_languages(
+                args.languages,
+                jobs=args.jobs,
+                time_limit=args.time_limit,
+                memory_limit=args.memory_limit,
+                output_limit=args.output_limit,
+            )
+        except usecase_errors.UndefinedLanguage as e:
+            print(f"{e} 設定ファイルを変更し、言語設定を追加してください。")
+            if args.verbose:
+                print(traceback.format_exc())
+            sys.exit(1)
+
+    def _profile_test(self, args: argparse.Namespace) -> None:
+        try:
+            self._execute_test_usecase.profile_test(
+                args.profile,
+                profiler=args.profiler,
+                top=args.profile_top,
+                output_file=args.profile_output,
+                time_limit=args.time_limit,
+                memory_limit=args.memory_limit,
+                output_limit=args.output_limit,
+            )
+        except (
+            usecase_errors.UndefinedTestCase,
+            usecase_errors.ProfilerUnavailable,
+            usecase_errors.HelperProgramFailure,
+        ) as e:
+            print(e)
+            if args.verbose:
+                print(traceback.format_exc())
+            sys.exit(1)
+
+    def stress_test_handler(self, args: argparse.Namespace) -> None:
+        """ランダムな入力で、解答を愚直解と突き合わせる.
+
+        Args:
+            args (argparse.Namespace): コマンドライン引数
+        """
+        try:
+            passed = self._stress_test_usecase.stress_test(
+                generator=args.generator,
+                reference=args.reference,
+                seeds=args.seeds,
+                start_seed=args.start_seed,
+                jobs=args.jobs,
+                time_limit=args.time_limit,
+                memory_limit=args.memory_limit,
+                output_limit=args.output_limit,
+                minimize_time=args.minimize_time,
+                format_hint=args.format_hint,
+            )
+        except usecase_errors.ConfigAccessError:
+            print("設定ファイルの読み書きに失敗しました")
+            if args.verbose:
+                print(traceback.format_exc())
+            sys.exit(1)
+        except usecase_errors.BuildFailure:
+            print("ビルドに失敗しました")
+            if args.verbose:
+                print(traceback.format_exc())
+            sys.exit(1)
+        except usecase_errors.HelperProgramFailure as e:
+            print(e)
+            if args.verbose:
+                print(traceback.format_exc())
+            sys.exit(1)
+
+        if not passed:
+            sys.exit(1)
+
+    def scaling_test_handler(self, args: argparse.Namespace) -> None:
+        """入力サイズを変えながら解答を実行し、計算量を推定する.
+
+        Args:
+            args (argparse.Namespace): コマンドライン引数
+        """
+        try:
+            within_limit = self._scaling_test_usecase.scaling_test(
+                generator=args.generator,
+                max_n=args.max_n,
+                min_n=args.min_n,
+                up_to=args.up_to,
+                steps=args.steps,
+                repeat=args.repeat,
+                time_limit=args.time_limit,
+                memory_limit=args.memory_limit,
+                output_limit=args.output_limit,
+            )
+        except usecase_errors.ConfigAccessError:
+            print("設定ファイルの読み書きに失敗しました")
+            if args.verbose:
+                print(traceback.format_exc())
+            sys.exit(1)
+        except usecase_errors.BuildFailure:
+            print("ビルドに失敗しました")
+            if args.verbose:
+                print(traceback.format_exc())
+            sys.exit(1)
+        except (
+            usecase_errors.HelperProgramFailure,
+            usecase_errors.MissingDependency,
+        ) as e:
+            print(e)
+            if args.verbose:
+                print(traceback.format_exc())
+            sys.exit(1)
+
+        if not within_limit:
+            sys.exit(1)
+
+    def run_tasks_handler(self, args: argparse.Namespace) -> None:
+        """複数のタスクディレクトリで、取得・ビルド・実行を並行して進める.
+
+        Args:
+            args (argparse.Namespace): コマンドライン引数
+        """
+        try:
+            passed = self._pipeline_usecase.run_tasks(
+                task_dirs=args.task_dirs,
+                fetch=args.fetch,
+                fetch_jobs=args.fetch_jobs,
+                build_jobs=args.build_jobs,
+                run_jobs=args.run_jobs,
+            )
+        except usecase_errors.ConfigAccessError as e:
+            print(e)
+            if args.verbose:
+                print(traceback.format_exc())
+            sys.exit(1)
+
+        if not passed:
+            sys.exit(1)
 
     def fetch_task_handler(self, args: argparse.Namespace) -> None:
         """テストケースをフェッチする.
@@ -170,13 +380,77 @@ class Controller:
             args (argparse.Namespace): コマンドライン引数
         """
         try:
-            self._fetch_task_usecase.fetch_task(args.contest, args.task)
+            if args.all:
+                self._fetch_task_usecase.fetch_contest(args.contest, jobs=args.jobs)
+            else:
+                self._fetch_task_usecase.fetch_task(args.contest, args.task)
         except usecase_errors.AtcoderAccessError:
             print("AtCoderサイトからデータを取得する過程でエラーが発生しました")
             if args.verbose:
                 print(traceback.format_exc())
 
             sys.exit(1)
+        except usecase_errors.ConfigAccessError:
+            print("設定ファイルの読み書きに失敗しました")
+            if args.verbose:
+                print(traceback.format_exc())
+
+            sys.exit(1)
+
+    def contest_prepare_handler(self, args: argparse.Namespace) -> None:
+        """開始前のコンテストを用意し、開始と同時にテストケースをフェッチする.
+
+        Args:
+            args (argparse.Namespace): コマンドライン引数
+        """
+        try:
+            self._fetch_task_usecase.prepare_contest(
+                args.contest,
+                tasks=args.tasks,
+                jobs=args.jobs,
+                warm_up=args.warm_up,
+            )
+        except KeyboardInterrupt:
+            pass  # 開始を待つのをやめた
+        except usecase_errors.AtcoderAccessError:
+            print("AtCoderサイトからデータを取得する過程でエラーが発生しました")
+            if args.verbose:
+                print(traceback.format_exc())
+
+            sys.exit(1)
+        except usecase_errors.ConfigAccessError as e:
+            print(e)
+            if args.verbose:
+                print(traceback.format_exc())
+
+            sys.exit(1)
+
+    def archive_sync_handler(self, args: argparse.Namespace) -> None:
+        """過去のコンテストの問題を取得し、手元のアーカイブに保存する.
+
+        Args:
+            args (argparse.Namespace): コマンドライン引数
+        """
+        try:
+            self._archive_usecase.sync(
+                [contest for contests in args.contests for contest in contests],
+                jobs=args.jobs,
+            )
+        except KeyboardInterrupt:
+            print("中断しました. 次回は続きから取得します")
+            sys.exit(1)
+        except usecase_errors.AtcoderAccessError as e:
+            print(e)
+            if args.verbose:
+                print(traceback.format_exc())
+
+            sys.exit(1)
+        except usecase_errors.ConfigAccessError as e:
+            print(e)
+            if args.verbose:
+                print(traceback.format_exc())
+
+            sys.exit(1)
 
     def config_init_handler(self, args: argparse.Namespace) -> None:
         """atcoder_helper全体設定ファイルを初期化する.
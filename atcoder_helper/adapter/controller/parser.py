@@ -1,8 +1,15 @@
 """parser."""
 
 import argparse
+import re
+import shlex
+from typing import Callable
+from typing import Dict
+from typing import Final
+from typing import Tuple
 
 from atcoder_helper.adapter.controller.controller import Controller
+from atcoder_helper.application.usecases.stress_test import FORMAT_HINTS
 
 
 def get_root_parser() -> argparse.ArgumentParser:
@@ -19,6 +26,8 @@ def get_root_parser() -> argparse.ArgumentParser:
     _set_auth_parser(root_subparsers.add_parser("auth"))
     _set_exec_parser(root_subparsers.add_parser("exec"))
     _set_fetch_parser(root_subparsers.add_parser("fetch"))
+    _set_contest_parser(root_subparsers.add_parser("contest"))
+    _set_archive_parser(root_subparsers.add_parser("archive"))
     _set_task_pasrer(root_subparsers.add_parser("task"))
     _set_config_parser(root_subparsers.add_parser("config"))
     _set_version_parser(root_subparsers.add_parser("version"))
@@ -51,7 +60,262 @@ def _set_auth_parser(parser_auth: argparse.ArgumentParser) -> None:
 
 def _set_exec_parser(parser_exec: argparse.ArgumentParser) -> None:
     parser_exec.set_defaults(
-        handler=Controller.execute_test_handler, parser=parser_exec
+        handler=_checked(Controller.execute_test_handler, _check_exec_args),
+        parser=parser_exec,
+    )
+    # --watch, --languages, --profile, --bench は、どれか1つのモードを選ぶ
+    parser_exec_modes = parser_exec.add_mutually_exclusive_group()
+    parser_exec.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="同時に実行するテストケース数 (デフォルト: 使用可能なCPU数)",
+    )
+    parser_exec.add_argument(
+        "--time-limit",
+        type=float,
+        help="実行時間制限[秒] (デフォルト: タスク設定のtime_limit)",
+    )
+    parser_exec.add_argument(
+        "--memory-limit",
+        type=int,
+        help="メモリ制限[MiB] (デフォルト: タスク設定のmemory_limit)",
+    )
+    parser_exec.add_argument(
+        "--output-limit",
+        type=int,
+        help="出力サイズ制限[MiB] (デフォルト: タスク設定のoutput_limit)",
+    )
+    parser_exec.add_argument(
+        "--changed-only",
+        action="store_true",
+        help="前回の結果を再利用できない(解答・入力・期待する出力などが変わった)ケースだけを実行する",
+    )
+    parser_exec.add_argument(
+        "--failed-only",
+        action="store_true",
+        help="前回失敗したケースだけを実行する",
+    )
+    parser_exec.add_argument(
+        "--format",
+        choices=["text", "json", "junit"],
+        default="text",
+        help="結果の形式. json は JSON Lines、junit は JUnit XML で、"
+        "ケースが終わるたびに書き出す (デフォルト: text)",
+    )
+    parser_exec.add_argument(
+        "--output",
+        metavar="FILE",
+        help="--format json, junit の書き出し先 (デフォルト: 標準出力)",
+    )
+    parser_exec_modes.add_argument(
+        "--watch",
+        action="store_true",
+        help="ファイルが変わるたびに、ビルドしてテストを実行し直す. Ctrl+C で止める",
+    )
+    parser_exec.add_argument(
+        "--debounce",
+        type=float,
+        default=0.2,
+        help="--watch で、変更が落ち着いたとみなすまでの時間[秒] (デフォルト: 0.2)",
+    )
+    parser_exec_modes.add_argument(
+        "--languages",
+        type=_comma_separated,
+        metavar="LANGUAGE[,LANGUAGE...]",
+        help="カンマ区切りの言語設定それぞれでビルド・実行し、判定と時間を並べて比べる",
+    )
+    parser_exec_modes.add_argument(
+        "--profile",
+        metavar="CASE",
+        help="テストケース CASE をプロファイラの下で実行し、時間のかかっている関数を表示する",
+    )
+    parser_exec.add_argument(
+        "--profiler",
+        choices=["cprofile", "sampling", "perf"],
+        help="--profile で使うプロファイラ (デフォルト: タスク設定の profiler."
+        " なければ Python なら cprofile、それ以外は perf)",
+    )
+    parser_exec.add_argument(
+        "--profile-top",
+        type=int,
+        default=20,
+        help="--profile で表示する関数の数 (デフォルト: 20)",
+    )
+    parser_exec.add_argument(
+        "--profile-output",
+        metavar="FILE",
+        help="--profile で折りたたんだスタックを書き出すファイル"
+        " (デフォルト: .atcoder_helper_profiles/<CASE>.folded)",
+    )
+    parser_exec_modes.add_argument(
+        "--bench",
+        action="store_true",
+        help="各ケースを繰り返し実行し、実行時間の統計を表示する",
+    )
+    parser_exec.add_argument(
+        "--warmup",
+        type=int,
+        default=1,
+        help="--bench で計測前に捨てる実行の回数 (デフォルト: 1)",
+    )
+    parser_exec.add_argument(
+        "--repeat",
+        type=int,
+        default=10,
+        help="--bench で計測する実行の回数. --precision を指定した場合は上限 (デフォルト: 10)",
+    )
+    parser_exec.add_argument(
+        "--precision",
+        type=float,
+        help="--bench で、平均の95%%信頼区間の半幅が平均のこの割合以下になったら計測を打ち切る",
+    )
+    parser_exec.add_argument(
+        "--cpu",
+        type=int,
+        help="--bench で固定するCPU (デフォルト: 使用可能なCPUのうち番号が最大のもの)",
+    )
+    parser_exec.add_argument(
+        "--bench-json",
+        metavar="FILE",
+        help="--bench の結果をJSONで書き出すファイル",
+    )
+
+    parser_exec_subparsers = parser_exec.add_subparsers()
+    _set_exec_stress_parser(parser_exec_subparsers.add_parser("stress"))
+    _set_exec_scaling_parser(parser_exec_subparsers.add_parser("scaling"))
+    _set_exec_tasks_parser(parser_exec_subparsers.add_parser("tasks"))
+
+
+def _set_exec_stress_parser(parser_stress: argparse.ArgumentParser) -> None:
+    parser_stress.set_defaults(
+        handler=Controller.stress_test_handler, parser=parser_stress
+    )
+    parser_stress.add_argument(
+        "--generator",
+        type=shlex.split,
+        required=True,
+        help="入力生成器の実行コマンド. 末尾にシードが付け足される (例: 'python3 gen.py')",
+    )
+    parser_stress.add_argument(
+        "--reference",
+        type=shlex.split,
+        required=True,
+        help="愚直解の実行コマンド (例: './brute')",
+    )
+    parser_stress.add_argument(
+        "--seeds", type=int, default=1000, help="試すシードの数 (デフォルト: 1000)"
+    )
+    parser_stress.add_argument(
+        "--start-seed", type=int, default=0, help="最初のシード (デフォルト: 0)"
+    )
+    parser_stress.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="同時に試すシード数 (デフォルト: 使用可能なCPU数)",
+    )
+    parser_stress.add_argument(
+        "--time-limit",
+        type=float,
+        help="解答の実行時間制限[秒] (デフォルト: タスク設定のtime_limit)",
+    )
+    parser_stress.add_argument(
+        "--memory-limit",
+        type=int,
+        help="解答のメモリ制限[MiB] (デフォルト: タスク設定のmemory_limit)",
+    )
+    parser_stress.add_argument(
+        "--output-limit",
+        type=int,
+        help="解答の出力サイズ制限[MiB] (デフォルト: タスク設定のoutput_limit)",
+    )
+    parser_stress.add_argument(
+        "--minimize-time",
+        type=float,
+        default=10.0,
+        help="食い違った入力の縮小にかける時間[秒]. 0なら縮小しない (デフォルト: 10)",
+    )
+    parser_stress.add_argument(
+        "--format-hint",
+        choices=FORMAT_HINTS,
+        help="縮小に使う入力形式のヒント. n-list: 先頭の整数Nのあとに N 個の数が続く",
+    )
+
+
+def _set_exec_scaling_parser(parser_scaling: argparse.ArgumentParser) -> None:
+    parser_scaling.set_defaults(
+        handler=Controller.scaling_test_handler, parser=parser_scaling
+    )
+    parser_scaling.add_argument(
+        "--generator",
+        type=shlex.split,
+        required=True,
+        help="入力生成器の実行コマンド. 末尾に入力サイズNが付け足される (例: 'python3 gen.py')",
+    )
+    parser_scaling.add_argument(
+        "--max-n", type=int, required=True, help="入力サイズNの最大制約"
+    )
+    parser_scaling.add_argument(
+        "--min-n", type=int, help="最小の入力サイズ (デフォルト: --up-to の1/1000)"
+    )
+    parser_scaling.add_argument(
+        "--up-to", type=int, help="実際に試す最大の入力サイズ (デフォルト: --max-n)"
+    )
+    parser_scaling.add_argument(
+        "--steps", type=int, default=8, help="試す入力サイズの数 (デフォルト: 8)"
+    )
+    parser_scaling.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="入力サイズごとの実行回数. 最小のCPU時間を使う (デフォルト: 3)",
+    )
+    parser_scaling.add_argument(
+        "--time-limit",
+        type=float,
+        help="解答の実行時間制限[秒] (デフォルト: タスク設定のtime_limit)",
+    )
+    parser_scaling.add_argument(
+        "--memory-limit",
+        type=int,
+        help="解答のメモリ制限[MiB] (デフォルト: タスク設定のmemory_limit)",
+    )
+    parser_scaling.add_argument(
+        "--output-limit",
+        type=int,
+        help="解答の出力サイズ制限[MiB] (デフォルト: タスク設定のoutput_limit)",
+    )
+
+
+def _set_exec_tasks_parser(parser_tasks: argparse.ArgumentParser) -> None:
+    parser_tasks.set_defaults(handler=Controller.run_tasks_handler, parser=parser_tasks)
+    parser_tasks.add_argument(
+        "task_dirs",
+        nargs="*",
+        metavar="TASK_DIR",
+        help="タスクディレクトリ (デフォルト: カレントディレクトリ直下のすべてのタスクディレクトリ)",
+    )
+    parser_tasks.add_argument(
+        "--fetch",
+        action="store_true",
+        help="ビルドと並行して、AtCoderからテストケースを取得する",
+    )
+    parser_tasks.add_argument(
+        "--fetch-jobs",
+        type=int,
+        default=2,
+        help="同時にテストケースを取得するタスク数 (デフォルト: 2)",
+    )
+    parser_tasks.add_argument(
+        "--build-jobs",
+        type=int,
+        help="同時にビルドするタスク数 (デフォルト: 使用可能なCPU数)",
+    )
+    parser_tasks.add_argument(
+        "--run-jobs",
+        type=int,
+        help="すべてのタスクを通して、同時に実行するテストケース数 (デフォルト: 使用可能なCPU数)",
     )
 
 
@@ -61,6 +325,71 @@ def _set_fetch_parser(parser_fetch: argparse.ArgumentParser) -> None:
     )
     parser_fetch.add_argument("--contest")
     parser_fetch.add_argument("--task")
+    parser_fetch.add_argument(
+        "--all",
+        action="store_true",
+        help="コンテストのすべてのタスクを並行して取得し、<contest>/<task> に書き込む",
+    )
+    parser_fetch.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="--all で同時に取得するタスク数 (デフォルト: タスク数. 最大8)",
+    )
+
+
+def _set_contest_parser(parser_contest: argparse.ArgumentParser) -> None:
+    parser_contest.set_defaults(parser=parser_contest)
+
+    parser_contest_subparsers = parser_contest.add_subparsers()
+
+    parser_contest_prepare = parser_contest_subparsers.add_parser("prepare")
+    parser_contest_prepare.set_defaults(
+        handler=Controller.contest_prepare_handler, parser=parser_contest_prepare
+    )
+    parser_contest_prepare.add_argument("contest")
+    parser_contest_prepare.add_argument(
+        "--tasks",
+        type=_comma_separated,
+        metavar="TASK[,TASK...]",
+        help="開始前に用意するタスク (デフォルト: abc なら a-g、arc, agc なら a-f)",
+    )
+    parser_contest_prepare.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="同時に取得するタスク数・開いておく接続の数 (デフォルト: タスク数. 最大8)",
+    )
+    parser_contest_prepare.add_argument(
+        "--warm-up",
+        type=float,
+        default=10.0,
+        help="開始の何秒前に接続を開いておくか (デフォルト: 10)",
+    )
+
+
+def _set_archive_parser(parser_archive: argparse.ArgumentParser) -> None:
+    parser_archive.set_defaults(parser=parser_archive)
+
+    parser_archive_subparsers = parser_archive.add_subparsers()
+
+    parser_archive_sync = parser_archive_subparsers.add_parser("sync")
+    parser_archive_sync.set_defaults(
+        handler=Controller.archive_sync_handler, parser=parser_archive_sync
+    )
+    parser_archive_sync.add_argument(
+        "contests",
+        nargs="+",
+        type=_contest_range,
+        metavar="CONTEST[-CONTEST]",
+        help="保存するコンテスト. abc001-abc300 や arc100-150 のように範囲でも指定できる",
+    )
+    parser_archive_sync.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="同時に取得する問題数 (デフォルト: 4)",
+    )
 
 
 def _set_task_pasrer(parser_task: argparse.ArgumentParser) -> None:
@@ -113,3 +442,79 @@ def _set_version_parser(parser_version: argparse.ArgumentParser) -> None:
     parser_version.set_defaults(
         handler=Controller.version_handler, parser=parser_version
     )
+
+
+def _comma_separated(value: str) -> list[str]:
+    """カンマ区切りの引数を、空の要素を除いたリストにする."""
+    return [item for item in value.split(",") if item]
+
+
+def _contest_range(value: str) -> list[str]:
+    """abc001-abc010 や abc001-010 のような範囲を、コンテスト名のリストにする."""
+    match = re.fullmatch(r"([a-z]+)([0-9]+)(?:-(?:\1)?([0-9]+))?", value)
+    if match is None:
+        raise argparse.ArgumentTypeError(f"invalid contest range: {value}")
+    prefix, first, last = match.groups()
+    start, stop = int(first), int(last or first)
+    if stop < start:
+        raise argparse.ArgumentTypeError(f"empty contest range: {value}")
+    return [f"{prefix}{number:0{len(first)}d}" for number in range(start, stop + 1)]
+
+
+# exec のモードごとに、そのモードが使う引数の dest. "" はモードを選ばない通常の実行.
+# 時間などの制限は、どのモードでも使う
+_EXEC_MODE_OPTIONS: Final[Dict[str, Tuple[str, ...]]] = {
+    "": ("jobs", "changed_only", "failed_only", "format", "output"),
+    "watch": ("jobs", "debounce"),
+    "languages": ("jobs",),
+    "profile": ("profiler", "profile_top", "profile_output"),
+    "bench": ("warmup", "repeat", "precision", "cpu", "bench_json"),
+}
+
+
+def _check_exec_args(args: argparse.Namespace) -> None:
+    """選んだモードが使わない exec の引数があれば、使い方を表示して終了する.
+
+    黙って無視すると、たとえば --watch に --format junit を付けても何も書き出されない.
+    """
+    parser: argparse.ArgumentParser = args.parser
+    mode = _exec_mode(args)
+    options = {dest for dests in _EXEC_MODE_OPTIONS.values() for dest in dests}
+    for dest in sorted(options - set(_EXEC_MODE_OPTIONS[mode])):
+        if getattr(args, dest) == parser.get_default(dest):
+            continue
+        option = "--" + dest.replace("_", "-")
+        if mode:
+            parser.error(f"{option} は --{mode} と一緒には使えません")
+        owners = [
+            f"--{owner}"
+            for owner, dests in _EXEC_MODE_OPTIONS.items()
+            if owner and dest in dests
+        ]
+        parser.error(f"{option} は {' か '.join(owners)} と一緒に使ってください")
+
+
+def _exec_mode(args: argparse.Namespace) -> str:
+    """Controller.execute_test_handler と同じ規則で、exec のモードを決める."""
+    if args.bench:
+        return "bench"
+    if args.watch:
+        return "watch"
+    if args.languages:
+        return "languages"
+    if args.profile is not None:
+        return "profile"
+    return ""
+
+
+def _checked(
+    handler: Callable[[Controller, argparse.Namespace], None],
+    check: Callable[[argparse.Namespace], None],
+) -> Callable[[Controller, argparse.Namespace], None]:
+    """引数の組み合わせを check で確かめてから、handler を呼ぶようにする."""
+
+    def checked_handler(self: Controller, args: argparse.Namespace) -> None:
+        check(args)
+        handler(self, args)
+
+    return checked_handler
@@ -0,0 +1,174 @@
+"""アーカイブにある問題は手元から、ない問題はAtCoderから取得するリポジトリ."""
+
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Union
+
+import requests
+
+from atcoder_helper.application.repositories.atcoder_test_case_repo import (
+    AtCoderTestCaseRepository,
+)
+from atcoder_helper.application.repositories.errors import ReadError
+from atcoder_helper.application.repositories.problem_archive_repo import (
+    ProblemArchiveRepository,
+)
+from atcoder_helper.entities.atcoder_problem import AtCoderProblem
+from atcoder_helper.entities.atcoder_test_case import AtcoderTestCase
+
+
+class ArchivedAtCoderTestCaseRepositoryImpl:
+    """アーカイブにある問題は手元から、ない問題はAtCoderから取得するリポジトリ.
+
+    アーカイブを読めなければ、アーカイブにないものとして AtCoder から取得する.
+    AtCoder から取得したものをアーカイブには書き込まない. アーカイブに入れるのは
+    archive sync だけ.
+    """
+
+    _archive: ProblemArchiveRepository
+    _remote: AtCoderTestCaseRepository
+
+    def __init__(
+        self, archive: ProblemArchiveRepository, remote: AtCoderTestCaseRepository
+    ):
+        """__init__.
+
+        Args:
+            archive (ProblemArchiveRepository): 過去の問題のアーカイブ
+            remote (AtCoderTestCaseRepository): アーカイブにないときに使うリポジトリ
+        """
+        self._archive = archive
+        self._remote = remote
+
+    def fetch_test_cases(
+        self, session: requests.Session, contest: str, task: str
+    ) -> List[AtcoderTestCase]:
+        """テストケーススイートを取得する.
+
+        Args:
+            session (requests.Session): セッション
+            contest (str): コンテスト名
+            task (str): タスク名
+
+        Raises:
+            ConnectionError: GETに失敗
+            ParseError: Parseに失敗
+
+        Returns:
+            List[TestCase]: テストケーススイート
+        """
+        problem = self._read_problem(contest, task)
+        if problem is not None:
+            return problem.test_cases
+        return self._remote.fetch_test_cases(session, contest, task)
+
+    def fetch_problem(
+        self, session: requests.Session, contest: str, task: str
+    ) -> AtCoderProblem:
+        """問題名・制限・問題文・テストケーススイートを取得する.
+
+        Args:
+            session (requests.Session): セッション
+            contest (str): コンテスト名
+            task (str): タスク名
+
+        Raises:
+            ConnectionError: GETに失敗
+            ParseError: Parseに失敗
+
+        Returns:
+            AtCoderProblem: 問題
+        """
+        problem = self._read_problem(contest, task)
+        if problem is not None:
+            return problem
+        return self._remote.fetch_problem(session, contest, task)
+
+    def cached_test_cases(
+        self, contest: str, task: str
+    ) -> Optional[List[AtcoderTestCase]]:
+        """通信せずに、アーカイブかキャッシュにあるテストケーススイートを返す.
+
+        Args:
+            contest (str): コンテスト名
+            task (str): タスク名
+
+        Returns:
+            Optional[List[AtcoderTestCase]]: テストケーススイート. どちらにもなければ None
+        """
+        problem = self._read_problem(contest, task)
+        if problem is not None:
+            return problem.test_cases
+        return self._remote.cached_test_cases(contest, task)
+
+    def fetch_tasks(
+        self, session: requests.Session, contest: str, use_cache: bool = True
+    ) -> List[str]:
+        """コンテストの問題一覧から、タスク名を一覧の順に取得する.
+
+        Args:
+            session (requests.Session): セッション
+            contest (str): コンテスト名
+            use_cache (bool): False なら、キャッシュやアーカイブを使わずに必ず問い合わせる.
+                Defaults to True
+
+        Raises:
+            ConnectionError: GETに失敗
+            ParseError: 問題が1つも見つからない
+
+        Returns:
+            List[str]: タスク名
+        """
+        if use_cache:
+            try:
+                tasks = self._archive.read_tasks(contest)
+            except ReadError:
+                tasks = None
+            if tasks:
+                return tasks
+        return self._remote.fetch_tasks(session, contest, use_cache=use_cache)
+
+    def fetch_contest_test_cases(
+        self,
+        session: requests.Session,
+        contest: str,
+        tasks: List[str],
+        jobs: int,
+    ) -> Dict[str, Union[List[AtcoderTestCase], Exception]]:
+        """複数のタスクのテストケーススイートを取得する. アーカイブにないものは並行して取得する.
+
+        Args:
+            session (requests.Session): セッション
+            contest (str): コンテスト名
+            tasks (List[str]): タスク名
+            jobs (int): 同時に取得するタスク数
+
+        Returns:
+            Dict[str, Union[List[AtcoderTestCase], Exception]]: タスク名ごとの
+                テストケーススイート. 取得かパースに失敗したタスクは、その
+                ConnectionError か ParseError
+        """
+        archived: Dict[str, List[AtcoderTestCase]] = {}
+        for task in tasks:
+            problem = self._read_problem(contest, task)
+            if problem is not None:
+                archived[task] = problem.test_cases
+
+        missing = [task for task in tasks if task not in archived]
+        fetched = (
+            self._remote.fetch_contest_test_cases(session, contest, missing, jobs)
+            if missing
+            else {}
+        )
+        return {
+            task: archived[task] if task in archived else fetched[task]
+            for task in tasks
+            if task in archived or task in fetched
+        }
+
+    def _read_problem(self, contest: str, task: str) -> Optional[AtCoderProblem]:
+        try:
+            return self._archive.read_problem(contest, task)
+        except ReadError:
+            return None
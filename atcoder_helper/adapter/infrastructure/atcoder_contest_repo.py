@@ -0,0 +1,93 @@
+"""AtCoderからコンテストの情報を取得するリポジトリ."""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Final
+from typing import Optional
+
+import requests
+from bs4 import BeautifulSoup
+from bs4 import SoupStrainer  # type: ignore[attr-defined]
+
+from atcoder_helper.adapter.infrastructure.http_transport import HttpTransport
+from atcoder_helper.adapter.infrastructure.utils import AtCoderURLProvider
+from atcoder_helper.adapter.infrastructure.utils import mount_connection_pool
+from atcoder_helper.application.repositories.errors import ConnectionError
+from atcoder_helper.application.repositories.errors import ParseError
+
+# コンテストのページに、開始時刻・終了時刻の順に "2023-04-29 21:00:00+0900" の形で載る
+_TIME_FORMAT: Final[str] = "%Y-%m-%d %H:%M:%S%z"
+
+
+class AtCoderContestRepositoryImpl:
+    """AtCoderからコンテストの情報を取得するリポジトリ."""
+
+    _url_provider = AtCoderURLProvider
+
+    _transport: HttpTransport
+
+    def __init__(self, transport: Optional[HttpTransport] = None):
+        """__init__.
+
+        Args:
+            transport (Optional[HttpTransport]): 通信に使う.
+                Defaults to None (既定の設定で作る)
+        """
+        self._transport = transport if transport is not None else HttpTransport()
+
+    def fetch_start_time(self, session: requests.Session, contest: str) -> datetime:
+        """コンテストの開始時刻を取得する.
+
+        Args:
+            session (requests.Session): セッション
+            contest (str): コンテスト名
+
+        Raises:
+            ConnectionError: GETに失敗
+            ParseError: 開始時刻が見つからない
+
+        Returns:
+            datetime: 開始時刻. タイムゾーン付き
+        """
+        url = self._url_provider.contest_url(contest)
+        try:
+            page = self._transport.get(session, url)
+        except Exception as e:
+            raise ConnectionError(f"cannot GET {url}") from e
+        if page.status_code >= 500:
+            raise ConnectionError(f"cannot GET {url}: {page.status_code}")
+
+        html = BeautifulSoup(page.text, "html.parser", parse_only=SoupStrainer("time"))
+        start = html.find("time", attrs={"class": "fixtime-full"})
+        if start is None:
+            raise ParseError(f"no start time found in {contest}")
+        try:
+            return datetime.strptime(start.text.strip(), _TIME_FORMAT)
+        except ValueError as e:
+            raise ParseError(f"cannot parse start time of {contest}") from e
+
+    def warm_up(self, session: requests.Session, contest: str, connections: int) -> int:
+        """コンテストのページへの接続を、名前解決と TLS ハンドシェイクまで済ませておく.
+
+        同時に connections 回コンテストのページを取得して、その数だけ接続を開かせる.
+
+        Args:
+            session (requests.Session): セッション
+            contest (str): コンテスト名
+            connections (int): 開いておく接続の数
+
+        Returns:
+            int: 開けた接続の数
+        """
+        connections = max(1, connections)
+        url = self._url_provider.contest_url(contest)
+        mount_connection_pool(session, url, connections)
+
+        def connect(_: int) -> bool:
+            try:
+                return self._transport.get(session, url).ok
+            except Exception:
+                return False
+
+        with ThreadPoolExecutor(max_workers=connections) as pool:
+            return sum(pool.map(connect, range(connections)))
@@ -1,9 +1,12 @@
 """atcoderからlogin済みのセッションを取得するrepository."""
 
 
+from typing import Optional
+
 import requests
 from bs4 import BeautifulSoup
 
+from atcoder_helper.adapter.infrastructure.http_transport import HttpTransport
 from atcoder_helper.adapter.infrastructure.utils import AtCoderURLProvider
 from atcoder_helper.application.repositories.errors import ConnectionError
 from atcoder_helper.application.repositories.errors import LoginFailure
@@ -15,6 +18,17 @@ class AtCoderLoggedInSessionRepositoryImpl:
 
     _url_provider = AtCoderURLProvider
 
+    _transport: HttpTransport
+
+    def __init__(self, transport: Optional[HttpTransport] = None):
+        """__init__.
+
+        Args:
+            transport (Optional[HttpTransport]): 通信に使う.
+                Defaults to None (既定の設定で作る)
+        """
+        self._transport = transport if transport is not None else HttpTransport()
+
     def _get_csrf_token(self, session: requests.Session) -> str:
         """_.
 
@@ -29,7 +43,7 @@ class AtCoderLoggedInSessionRepositoryImpl:
             str: _description_
         """
         try:
-            login_page = session.get(self._url_provider.login_url)
+            login_page = self._transport.get(session, self._url_provider.login_url)
         except Exception as e:
             raise ConnectionError("fail to get url") from e
 
@@ -62,7 +76,8 @@ class AtCoderLoggedInSessionRepositoryImpl:
         csrf_token = self._get_csrf_token(session)
 
         try:
-            res = session.post(
+            res = self._transport.post(
+                session,
                 self._url_provider.login_url,
                 params={
                     "username": username,
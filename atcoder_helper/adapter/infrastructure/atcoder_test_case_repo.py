@@ -1,21 +1,65 @@
 """AtCoderからテストケースを取得するリポジトリ."""
 
-
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Final
 from typing import List
+from typing import Optional
+from typing import Union
 
 import requests
 from bs4 import BeautifulSoup
+from bs4 import SoupStrainer  # type: ignore[attr-defined]
 
+from atcoder_helper.adapter.infrastructure.http_cache import HttpCache
+from atcoder_helper.adapter.infrastructure.http_transport import HttpTransport
 from atcoder_helper.adapter.infrastructure.utils import AtCoderURLProvider
+from atcoder_helper.adapter.infrastructure.utils import mount_connection_pool
+from atcoder_helper.application.repositories import errors as repository_error
 from atcoder_helper.application.repositories.errors import ParseError
+from atcoder_helper.entities.atcoder_problem import AtCoderProblem
 from atcoder_helper.entities.atcoder_test_case import AtcoderTestCase
 
+# 問題文以外(ヘッダ・ナビゲーション・スクリプト)の木を作らない
+_TASK_STATEMENT: Final[SoupStrainer] = SoupStrainer("div", id="task-statement")
+# 問題名・制限・問題文を含む部分
+_MAIN_CONTAINER: Final[SoupStrainer] = SoupStrainer("div", id="main-container")
+
+_TIME_LIMIT: Final[re.Pattern[str]] = re.compile(
+    r"(?:実行時間制限|Time Limit)\s*:\s*([0-9.]+)\s*sec"
+)
+_MEMORY_LIMIT: Final[re.Pattern[str]] = re.compile(
+    r"(?:メモリ制限|Memory Limit)\s*:\s*([0-9]+)\s*(KB|KiB|MB|MiB)"
+)
+
 
 class AtCoderTestCaseRepositoryImpl:
     """AtCoderからテストケースを取得するリポジトリ."""
 
     _url_provider = AtCoderURLProvider
 
+    _cache: Optional[HttpCache]
+    _transport: HttpTransport
+
+    def __init__(
+        self,
+        cache: Optional[HttpCache] = None,
+        transport: Optional[HttpTransport] = None,
+    ):
+        """__init__.
+
+        Args:
+            cache (Optional[HttpCache]): 取り出したテストケースやタスク名のキャッシュ.
+                Defaults to None (キャッシュしない)
+            transport (Optional[HttpTransport]): キャッシュを通さずに取得するときに使う.
+                Defaults to None (既定の設定で作る)
+        """
+        self._cache = cache
+        self._transport = transport if transport is not None else HttpTransport()
+
     def fetch_test_cases(
         self, session: requests.Session, contest: str, task: str
     ) -> List[AtcoderTestCase]:
@@ -32,47 +76,251 @@ class AtCoderTestCaseRepositoryImpl:
         Returns:
             List[TestCase]: テストケーススイート
         """
+        url = self._url_provider.task_url(contest, task)
+        objects = self._get(session, url, _extract_test_cases)
+        try:
+            return [AtcoderTestCase.parse_obj(object) for object in objects]
+        except ValueError as e:
+            raise ParseError(f"invalid test cases for {url}") from e
+
+    def fetch_problem(
+        self, session: requests.Session, contest: str, task: str
+    ) -> AtCoderProblem:
+        """問題名・制限・問題文・テストケーススイートを取得する.
+
+        キャッシュは通さない.
+
+        Args:
+            session (requests.Session): セッション
+            contest (str): コンテスト名
+            task (str): タスク名
 
-        def normalize_newline(text: str) -> str:
-            return "\n".join(text.splitlines())
+        Raises:
+            ConnectionError: GETに失敗
+            ParseError: Parseに失敗
 
+        Returns:
+            AtCoderProblem: 問題
+        """
+        url = self._url_provider.task_url(contest, task)
         try:
-            task_page = session.get(self._url_provider.task_url(contest, task))
+            page = self._transport.get(session, url)
         except Exception as e:
-            raise ConnectionError(
-                f"cannot GET {self._url_provider.task_url(contest, task)}"
-            ) from e
+            raise repository_error.ConnectionError(f"cannot GET {url}") from e
+        if page.status_code >= 500:
+            raise repository_error.ConnectionError(
+                f"cannot GET {url}: {page.status_code}"
+            )
+        return _extract_problem(page.text, contest, task)
+
+    def cached_test_cases(
+        self, contest: str, task: str
+    ) -> Optional[List[AtcoderTestCase]]:
+        """通信せずに、以前に取得したテストケーススイートを返す.
+
+        Args:
+            contest (str): コンテスト名
+            task (str): タスク名
 
+        Returns:
+            Optional[List[AtcoderTestCase]]: テストケーススイート. 取得したことがなければ None
+        """
+        if self._cache is None:
+            return None
+        objects = self._cache.peek(self._url_provider.task_url(contest, task))
+        if objects is None:
+            return None
         try:
-            html = BeautifulSoup(task_page.text, "html.parser")
+            return [AtcoderTestCase.parse_obj(object) for object in objects]
+        except Exception:
+            return None
+
+    def fetch_tasks(
+        self, session: requests.Session, contest: str, use_cache: bool = True
+    ) -> List[str]:
+        """コンテストの問題一覧から、タスク名を一覧の順に取得する.
 
-            sections = (
-                html.find("div", id="task-statement")
-                .find("span", attrs={"class": "lang-ja"})
-                .find_all("section")
+        Args:
+            session (requests.Session): セッション
+            contest (str): コンテスト名
+            use_cache (bool): False なら、キャッシュやアーカイブを使わずに必ず問い合わせる.
+                Defaults to True
+
+        Raises:
+            ConnectionError: GETに失敗
+            ParseError: 問題が1つも見つからない
+
+        Returns:
+            List[str]: タスク名
+        """
+        task_link = re.compile(rf"^/contests/{re.escape(contest)}/tasks/([^/?#]+)$")
+
+        def extract(text: str) -> List[str]:
+            html = BeautifulSoup(
+                text, "html.parser", parse_only=SoupStrainer("a", href=True)
             )
+            tasks: Dict[str, None] = {}  # 一覧の順を保って重複を除く
+            for link in html.find_all("a"):
+                match = task_link.match(str(link.get("href")))
+                if match is not None:
+                    tasks[self._url_provider.task_name(contest, match.group(1))] = None
+            if not tasks:
+                raise ParseError(f"no tasks found in {contest}")
+            return list(tasks)
+
+        url = self._url_provider.tasks_url(contest)
+        return list(self._get(session, url, extract, use_cache))
 
-            input_sections = {
-                section.find("h3").text.split()[1]: normalize_newline(
-                    section.find("pre").text
-                )
-                for section in sections
-                if "入力例" in section.find("h3").text
-            }
-
-            output_sections = {
-                section.find("h3").text.split()[1]: normalize_newline(
-                    section.find("pre").text
-                )
-                for section in sections
-                if "出力例" in section.find("h3").text
-            }
+    def fetch_contest_test_cases(
+        self,
+        session: requests.Session,
+        contest: str,
+        tasks: List[str],
+        jobs: int,
+    ) -> Dict[str, Union[List[AtcoderTestCase], Exception]]:
+        """複数のタスクのテストケーススイートを、並行して取得する.
+
+        jobs 本までの接続を同じセッションの接続プールに保って使い回す. 問題文は
+        届いたものから順に、まだ届いていない問題の通信と並行してパースする.
+        送る速さは、共有している HttpTransport のレート制限に従う.
+
+        Args:
+            session (requests.Session): セッション
+            contest (str): コンテスト名
+            tasks (List[str]): タスク名
+            jobs (int): 同時に取得するタスク数
+
+        Returns:
+            Dict[str, Union[List[AtcoderTestCase], Exception]]: タスク名ごとの
+                テストケーススイート. 取得かパースに失敗したタスクは、その
+                ConnectionError か ParseError
+        """
+        jobs = max(1, jobs)
+        mount_connection_pool(session, self._url_provider.contest_url(contest), jobs)
+
+        def fetch(task: str) -> Union[List[AtcoderTestCase], Exception]:
+            try:
+                return self.fetch_test_cases(session, contest, task)
+            except (repository_error.ConnectionError, ParseError) as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            return dict(zip(tasks, pool.map(fetch, tasks)))
+
+    def _get(
+        self,
+        session: requests.Session,
+        url: str,
+        extract: Callable[[str], Any],
+        use_cache: bool = True,
+    ) -> Any:
+        """ページを取得してデータを取り出す. キャッシュがあり use_cache なら、キャッシュを通す.
+
+        Raises:
+            ConnectionError: GETに失敗
+            ParseError: Parseに失敗
+        """
+        if self._cache is not None and use_cache:
+            return self._cache.get(session, url, extract)
+
+        try:
+            page = self._transport.get(session, url)
         except Exception as e:
-            raise ParseError() from e
+            raise repository_error.ConnectionError(f"cannot GET {url}") from e
+        if page.status_code >= 500:
+            raise repository_error.ConnectionError(
+                f"cannot GET {url}: {page.status_code}"
+            )
+        return extract(page.text)
+
+
+def _extract_test_cases(text: str) -> List[Dict[str, Any]]:
+    """問題文のページから、入力例と出力例の組を取り出す.
 
+    Raises:
+        ParseError: Parseに失敗
+    """
+    return _samples(BeautifulSoup(text, "html.parser", parse_only=_TASK_STATEMENT))
+
+
+def _samples(html: Any) -> List[Dict[str, Any]]:
+    """パースした問題文のページから、入力例と出力例の組を取り出す.
+
+    Raises:
+        ParseError: Parseに失敗
+    """
+
+    def normalize_newline(text: str) -> str:
+        return "\n".join(text.splitlines())
+
+    try:
+        sections = _statement(html).find_all("section")
+
+        input_sections = {
+            section.find("h3").text.split()[1]: normalize_newline(
+                section.find("pre").text
+            )
+            for section in sections
+            if "入力例" in section.find("h3").text
+        }
+
+        output_sections = {
+            section.find("h3").text.split()[1]: normalize_newline(
+                section.find("pre").text
+            )
+            for section in sections
+            if "出力例" in section.find("h3").text
+        }
+    except Exception as e:
+        raise ParseError() from e
+
+    try:
         return [
             AtcoderTestCase(
                 name=f"case-{name}", given=given, expected=output_sections[name]
-            )
+            ).dict()
             for (name, given) in input_sections.items()
         ]
+    except KeyError as e:
+        raise ParseError(f"no output for sample {e}") from e
+
+
+def _statement(html: Any) -> Any:
+    """問題文の要素を返す. 日本語版があれば日本語版.
+
+    古いコンテストの問題文は、言語ごとに分かれていない.
+    """
+    statement = html.find("div", id="task-statement")
+    return statement.find("span", attrs={"class": "lang-ja"}) or statement
+
+
+def _extract_problem(text: str, contest: str, task: str) -> AtCoderProblem:
+    """問題のページから、問題名・制限・問題文・入力例と出力例の組を取り出す.
+
+    Raises:
+        ParseError: Parseに失敗
+    """
+    html = BeautifulSoup(text, "html.parser", parse_only=_MAIN_CONTAINER)
+    title = html.find("span", attrs={"class": "h2"})
+    if title is None or html.find("div", id="task-statement") is None:
+        raise ParseError(f"no task statement found in {contest} {task}")
+
+    limits = title.find_next("p")
+    limits_text = "" if limits is None else limits.get_text(" ")
+    time_limit = _TIME_LIMIT.search(limits_text)
+    memory_limit = _MEMORY_LIMIT.search(limits_text)
+    memory_limit_mib = None
+    if memory_limit is not None:
+        memory_limit_mib = int(memory_limit.group(1))
+        if memory_limit.group(2) in ("KB", "KiB"):
+            memory_limit_mib //= 1024
+
+    return AtCoderProblem(
+        contest=contest,
+        task=task,
+        title=next(title.stripped_strings, ""),
+        time_limit=None if time_limit is None else float(time_limit.group(1)),
+        memory_limit=memory_limit_mib,
+        statement=_statement(html).get_text().strip(),
+        test_cases=[AtcoderTestCase.parse_obj(object) for object in _samples(html)],
+    )
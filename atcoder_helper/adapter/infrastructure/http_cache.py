@@ -0,0 +1,185 @@
+"""AtCoderのページから取り出したデータを、URLごとにディスクにキャッシュする."""
+
+import contextlib
+import email.utils
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import asdict
+from dataclasses import dataclass
+from typing import Any
+from typing import Callable
+from typing import Final
+from typing import Optional
+
+import requests
+
+from atcoder_helper.adapter.infrastructure.http_transport import HttpTransport
+from atcoder_helper.application.repositories.errors import ConnectionError
+
+_NOT_MODIFIED: Final[int] = 304
+
+
+@dataclass
+class CacheEntry:
+    """キャッシュした1つのページ."""
+
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    expires: float  # この時刻[UNIX時間]までは、問い合わせずに使う
+    payload: Any  # ページから取り出したデータ. JSON にできる値
+
+
+class HttpCache:
+    """ページから取り出したデータを、検証子(ETag / Last-Modified)とともに保存する.
+
+    新しいうちは問い合わせずに返し、古くなったら条件付きリクエストで変わっていないか
+    確かめる. 通信できなければ、古くてもキャッシュを返す.
+
+    保存するのはページそのものではなく取り出したデータなので、動的ページに付く
+    Cache-Control には従わず、新しさは RFC 9111 のヒューリスティック(最終更新からの
+    経過時間の1割)で決める. AtCoder の問題ページのように Last-Modified のない動的ページは、
+    一定時間だけ新しいとみなす(始まったタスクの入出力例は変わらない).
+    """
+
+    _heuristic_fraction: Final[float] = 0.1
+    _max_freshness: Final[float] = 24 * 60 * 60  # [秒]
+    _default_freshness: Final[float] = 60 * 60  # Last-Modified がないページ[秒]
+
+    _cache_dir: str
+    _transport: HttpTransport
+    _clock: Callable[[], float]
+
+    def __init__(
+        self,
+        cache_dir: str,
+        transport: Optional[HttpTransport] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """__init__.
+
+        Args:
+            cache_dir (str): キャッシュを置くディレクトリ
+            transport (Optional[HttpTransport]): 問い合わせに使う.
+                Defaults to None (既定の設定で作る)
+            clock (Callable[[], float]): 現在時刻[UNIX時間]を返す. Defaults to time.time
+        """
+        self._cache_dir = cache_dir
+        self._transport = transport if transport is not None else HttpTransport()
+        self._clock = clock
+
+    def get(
+        self, session: requests.Session, url: str, extract: Callable[[str], Any]
+    ) -> Any:
+        """URL のページから取り出したデータを返す.
+
+        Args:
+            session (requests.Session): セッション
+            url (str): URL
+            extract (Callable[[str], Any]): ページの本文からデータを取り出す.
+                JSON にできる値を返す
+
+        Raises:
+            ConnectionError: 通信できず、キャッシュもない
+            ParseError: extract が投げたもの. キャッシュは更新しない
+
+        Returns:
+            Any: extract が返したデータ
+        """
+        entry = self._read(url)
+        if entry is not None and self._clock() < entry.expires:
+            return entry.payload
+
+        headers = {}
+        if entry is not None and entry.etag is not None:
+            headers["If-None-Match"] = entry.etag
+        if entry is not None and entry.last_modified is not None:
+            headers["If-Modified-Since"] = entry.last_modified
+
+        try:
+            response = self._transport.get(session, url, headers=headers)
+        except Exception as e:
+            if entry is not None:
+                return entry.payload  # 再試行しても通信できない. 古くても使う
+            raise ConnectionError(f"cannot GET {url}") from e
+
+        if entry is not None and response.status_code == _NOT_MODIFIED:
+            entry.expires = self._expires(entry.last_modified)
+            self._write(entry)
+            return entry.payload
+        if entry is not None and response.status_code >= 500:
+            return entry.payload  # 再試行してもサーバーが落ちている. 古くても使う
+
+        payload = extract(response.text)
+        if response.ok:
+            last_modified = response.headers.get("Last-Modified")
+            self._write(
+                CacheEntry(
+                    url=url,
+                    etag=response.headers.get("ETag"),
+                    last_modified=last_modified,
+                    expires=self._expires(last_modified),
+                    payload=payload,
+                )
+            )
+        return payload
+
+    def peek(self, url: str) -> Any:
+        """通信せずに、新しさによらずキャッシュしたデータを返す.
+
+        Args:
+            url (str): URL
+
+        Returns:
+            Any: キャッシュしたデータ. なければ None
+        """
+        entry = self._read(url)
+        return None if entry is None else entry.payload
+
+    def _expires(self, last_modified: Optional[str]) -> float:
+        now = self._clock()
+        freshness = self._default_freshness
+        if last_modified is not None:
+            try:
+                modified = email.utils.parsedate_to_datetime(last_modified)
+                age = max(0.0, now - modified.timestamp())
+                freshness = min(age * self._heuristic_fraction, self._max_freshness)
+            except (TypeError, ValueError):
+                pass
+        return now + freshness
+
+    def _path(self, url: str) -> str:
+        return os.path.join(
+            self._cache_dir, hashlib.sha256(url.encode()).hexdigest() + ".json"
+        )
+
+    def _read(self, url: str) -> Optional[CacheEntry]:
+        """壊れたキャッシュは、ないものとして扱う."""
+        try:
+            with open(self._path(url), "rt") as file:
+                entry = CacheEntry(**json.load(file))
+        except (OSError, ValueError, TypeError):
+            return None
+        return entry if entry.url == url else None
+
+    def _write(self, entry: CacheEntry) -> None:
+        """書き込めなくても、キャッシュしないだけで続ける.
+
+        同じページを並行して書いても壊れないよう、一時ファイルから置き換える.
+        """
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self._cache_dir, suffix=".tmp")
+        except OSError:
+            return
+
+        try:
+            with os.fdopen(fd, "wt") as file:
+                json.dump(asdict(entry), file, ensure_ascii=False)
+            os.replace(temp_path, self._path(entry.url))
+        except OSError:
+            with contextlib.suppress(OSError):
+                os.remove(temp_path)
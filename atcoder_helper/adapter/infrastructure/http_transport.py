@@ -0,0 +1,367 @@
+"""AtCoder へのリクエストを、レート制限・タイムアウト・再試行を付けて送る.
+
+すべてのリポジトリがこの HttpTransport を共有して AtCoder と通信する.
+
+    レート制限: トークンバケット. 一括取得でも rate [回/秒] を超えて送らない.
+        burst 回までは待たずに送れるので、コンテスト開始時の数問の取得は遅れない.
+    タイムアウト: 接続と読み込みにそれぞれ上限を付ける. 既定の requests には上限がない.
+    再試行: 5xx・429・タイムアウト・接続エラーのとき、ジッター付きの指数バックオフで
+        送り直す. POST は、サーバーが処理していないと分かるとき(接続できなかった,
+        503, 429)だけ送り直す.
+    再試行予算: 再試行は、送ったリクエストの数の一定割合までしかしない. AtCoder が
+        落ちているときに、再試行でさらに負荷をかけないため.
+
+環境変数 ATCODER_HELPER_HTTP_STATS を設定すると、終了時に再試行の回数や
+レイテンシの分布を標準エラー出力に書き出す. パラメータの調整に使う.
+"""
+
+import atexit
+import email.utils
+import os
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from typing import IO
+from typing import Any
+from typing import Callable
+from typing import Final
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import requests
+
+HTTP_STATS_ENV: Final[str] = "ATCODER_HELPER_HTTP_STATS"
+
+_TOO_MANY_REQUESTS: Final[int] = 429
+_SERVICE_UNAVAILABLE: Final[int] = 503
+
+
+class TokenBucket:
+    """トークンバケットによるレート制限. 複数のスレッドから使ってよい."""
+
+    _rate: float
+    _burst: float
+    _clock: Callable[[], float]
+    _sleep: Callable[[float], None]
+    _lock: threading.Lock
+    _tokens: float
+    _updated: float
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """__init__.
+
+        Args:
+            rate (float): トークンが溜まる速さ[個/秒]
+            burst (int): 溜められるトークンの数
+            clock (Callable[[], float]): 単調増加する時刻[秒]. Defaults to time.monotonic
+            sleep (Callable[[float], None]): 待つ. Defaults to time.sleep
+        """
+        self._rate = rate
+        self._burst = float(burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = clock()
+
+    def acquire(self) -> float:
+        """トークンを1つ取り出す. なければ溜まるまで待つ.
+
+        待つ間はロックを持たないよう、先にトークンを借りて(残りを負にして)から待つ.
+
+        Returns:
+            float: 待った時間[秒]
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self._burst, self._tokens + (now - self._updated) * self._rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+@dataclass
+class TransportStats:
+    """HttpTransport の統計."""
+
+    requests: int = 0  # 送ろうとしたリクエストの数. 再試行は数えない
+    attempts: int = 0  # 実際に送った回数. 再試行を含む
+    retries: int = 0
+    failures: int = 0  # 再試行しても、例外か 5xx で終わったリクエストの数
+    budget_exhausted: int = 0  # 再試行予算が尽きて、再試行できなかった回数
+    throttled: float = 0.0  # レート制限で待った時間の合計[秒]
+    latencies: List[float] = field(default_factory=list)  # 1回ごとの応答時間[秒]
+
+    def percentile(self, p: float) -> Optional[float]:
+        """応答時間の p パーセンタイル[秒]. 1回も送っていなければ None."""
+        if not self.latencies:
+            return None
+        latencies = sorted(self.latencies)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))]
+
+    def format(self) -> str:
+        """人が読むための1行の要約."""
+        text = (
+            f"http: {self.requests} requests, {self.attempts} attempts,"
+            f" {self.retries} retries, {self.failures} failures,"
+            f" {self.budget_exhausted} budget exhausted,"
+            f" throttled {self.throttled:.3f}s"
+        )
+        if self.latencies:
+            text += (
+                f", latency p50 {self.percentile(50):.3f}s"
+                f" p95 {self.percentile(95):.3f}s max {max(self.latencies):.3f}s"
+            )
+        return text
+
+
+class HttpTransport:
+    """AtCoder へのリクエストを、レート制限・タイムアウト・再試行を付けて送る.
+
+    複数のスレッドから同時に使ってよい.
+    """
+
+    _bucket: TokenBucket
+    _timeout: Tuple[float, float]
+    _max_attempts: int
+    _backoff_base: float
+    _backoff_max: float
+    _retry_ratio: float
+    _min_retry_budget: float
+    _clock: Callable[[], float]
+    _sleep: Callable[[float], None]
+    _jitter: Callable[[], float]
+    _lock: threading.Lock
+    _retry_budget: float
+    _stats: TransportStats
+
+    def __init__(
+        self,
+        rate: float = 2.0,
+        burst: int = 10,
+        timeout: Tuple[float, float] = (5.0, 15.0),
+        max_attempts: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        retry_ratio: float = 0.2,
+        min_retry_budget: int = 10,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        jitter: Callable[[], float] = random.random,
+    ):
+        """__init__.
+
+        Args:
+            rate (float): 送る速さの上限[回/秒]. Defaults to 2.0
+            burst (int): 待たずに続けて送れる回数. Defaults to 10
+            timeout (Tuple[float, float]): 接続と読み込みのタイムアウト[秒].
+                Defaults to (5.0, 15.0)
+            max_attempts (int): 1つのリクエストを送る回数の上限. Defaults to 4
+            backoff_base (float): 1回目の再試行までの待ち時間の上限[秒].
+                Defaults to 0.5
+            backoff_max (float): 再試行までの待ち時間の上限[秒]. Defaults to 8.0
+            retry_ratio (float): リクエスト1つごとに再試行予算に足す量. Defaults to 0.2
+            min_retry_budget (int): 再試行予算の初期値かつ上限. Defaults to 10
+            clock (Callable[[], float]): 単調増加する時刻[秒]. Defaults to time.monotonic
+            sleep (Callable[[float], None]): 待つ. Defaults to time.sleep
+            jitter (Callable[[], float]): [0, 1) の乱数. Defaults to random.random
+        """
+        self._bucket = TokenBucket(rate, burst, clock=clock, sleep=sleep)
+        self._timeout = timeout
+        self._max_attempts = max(1, max_attempts)
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._retry_ratio = retry_ratio
+        self._min_retry_budget = float(min_retry_budget)
+        self._clock = clock
+        self._sleep = sleep
+        self._jitter = jitter
+        self._lock = threading.Lock()
+        self._retry_budget = float(min_retry_budget)
+        self._stats = TransportStats()
+
+    def get(
+        self, session: requests.Session, url: str, **kwargs: Any
+    ) -> requests.Response:
+        """GET を送る.
+
+        Args:
+            session (requests.Session): セッション
+            url (str): URL
+            **kwargs: session.get にそのまま渡す. timeout を渡せば既定のものを上書きする
+
+        Raises:
+            Exception: 再試行しても送れなかったときの、最後の例外
+
+        Returns:
+            requests.Response: 最後に受け取った応答. 再試行しても 5xx なら、その応答
+        """
+        return self._request(session.get, url, idempotent=True, **kwargs)
+
+    def post(
+        self, session: requests.Session, url: str, **kwargs: Any
+    ) -> requests.Response:
+        """POST を送る.
+
+        Args:
+            session (requests.Session): セッション
+            url (str): URL
+            **kwargs: session.post にそのまま渡す. timeout を渡せば既定のものを上書きする
+
+        Raises:
+            Exception: 再試行しても送れなかったときの、最後の例外
+
+        Returns:
+            requests.Response: 最後に受け取った応答. 再試行しても 5xx なら、その応答
+        """
+        return self._request(session.post, url, idempotent=False, **kwargs)
+
+    def stats(self) -> TransportStats:
+        """これまでの統計の写しを返す."""
+        with self._lock:
+            return TransportStats(
+                requests=self._stats.requests,
+                attempts=self._stats.attempts,
+                retries=self._stats.retries,
+                failures=self._stats.failures,
+                budget_exhausted=self._stats.budget_exhausted,
+                throttled=self._stats.throttled,
+                latencies=list(self._stats.latencies),
+            )
+
+    def _request(
+        self,
+        send: Callable[..., Any],
+        url: str,
+        idempotent: bool,
+        **kwargs: Any,
+    ) -> requests.Response:
+        kwargs.setdefault("timeout", self._timeout)
+        with self._lock:
+            self._stats.requests += 1
+            self._retry_budget = min(
+                self._min_retry_budget, self._retry_budget + self._retry_ratio
+            )
+
+        attempt = 0
+        while True:
+            attempt += 1
+            waited = self._bucket.acquire()
+            start = self._clock()
+            try:
+                response: requests.Response = send(url, **kwargs)
+            except Exception as e:
+                self._record_attempt(waited, self._clock() - start)
+                if not self._should_retry_error(e, idempotent, attempt):
+                    self._record_failure(e)
+                    raise
+                self._backoff(attempt, None)
+                continue
+
+            self._record_attempt(waited, self._clock() - start)
+            if not self._should_retry_status(response, idempotent, attempt):
+                if response.status_code >= 500:
+                    self._record_failure(None)
+                return response
+            self._backoff(attempt, response)
+
+    def _should_retry_error(
+        self, error: Exception, idempotent: bool, attempt: int
+    ) -> bool:
+        """Requests 以外の例外(呼び出し側の誤りなど)は、送り直しても直らない."""
+        if isinstance(error, requests.ConnectTimeout):
+            retriable = True  # 接続できていないので、POST でも届いていない
+        elif isinstance(error, (requests.Timeout, requests.ConnectionError)):
+            retriable = idempotent
+        else:
+            retriable = False
+        return retriable and self._take_retry(attempt)
+
+    def _should_retry_status(
+        self, response: requests.Response, idempotent: bool, attempt: int
+    ) -> bool:
+        status = response.status_code
+        if status in (_TOO_MANY_REQUESTS, _SERVICE_UNAVAILABLE):
+            retriable = True  # サーバーが処理せずに断った
+        else:
+            retriable = idempotent and status >= 500
+        return retriable and self._take_retry(attempt)
+
+    def _take_retry(self, attempt: int) -> bool:
+        if attempt >= self._max_attempts:
+            return False
+        with self._lock:
+            if self._retry_budget < 1:
+                self._stats.budget_exhausted += 1
+                return False
+            self._retry_budget -= 1
+            self._stats.retries += 1
+        return True
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response]) -> None:
+        """Full jitter の指数バックオフ. Retry-After があれば、それより早くは送らない."""
+        ceiling = min(self._backoff_max, self._backoff_base * 2 ** (attempt - 1))
+        delay = self._jitter() * ceiling
+        if response is not None:
+            retry_after = _retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                delay = max(delay, min(retry_after, self._backoff_max))
+        self._sleep(delay)
+
+    def _record_attempt(self, waited: float, latency: float) -> None:
+        with self._lock:
+            self._stats.attempts += 1
+            self._stats.throttled += waited
+            self._stats.latencies.append(latency)
+
+    def _record_failure(self, error: Optional[Exception]) -> None:
+        if error is not None and not isinstance(error, requests.RequestException):
+            return
+        with self._lock:
+            self._stats.failures += 1
+
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After (秒数か HTTP-date) を、待つ秒数にする."""
+    if value is None:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, date.timestamp() - time.time())
+
+
+def report_stats_at_exit(transport: HttpTransport, file: IO[str] = sys.stderr) -> None:
+    """環境変数 ATCODER_HELPER_HTTP_STATS が設定されていれば、終了時に統計を書き出す.
+
+    Args:
+        transport (HttpTransport): 統計を取る HttpTransport
+        file (IO[str]): 書き出し先. Defaults to sys.stderr
+    """
+    if not os.environ.get(HTTP_STATS_ENV):
+        return
+
+    def report() -> None:
+        stats = transport.stats()
+        if stats.requests > 0:
+            print(stats.format(), file=file)
+
+    atexit.register(report)
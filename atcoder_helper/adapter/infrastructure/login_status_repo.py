@@ -1,8 +1,11 @@
 """loginしているかどうかを取得するrepository."""
 
 
+from typing import Optional
+
 import requests
 
+from atcoder_helper.adapter.infrastructure.http_transport import HttpTransport
 from atcoder_helper.adapter.infrastructure.utils import AtCoderURLProvider
 from atcoder_helper.application.repositories.errors import ReadError
 
@@ -12,6 +15,17 @@ class LoginStatusRepoImpl:
 
     _url_provider = AtCoderURLProvider
 
+    _transport: HttpTransport
+
+    def __init__(self, transport: Optional[HttpTransport] = None):
+        """__init__.
+
+        Args:
+            transport (Optional[HttpTransport]): 通信に使う.
+                Defaults to None (既定の設定で作る)
+        """
+        self._transport = transport if transport is not None else HttpTransport()
+
     def is_logged_in(self, session: requests.Session) -> bool:
         """loginしているかどうかを判定する.
 
@@ -25,7 +39,8 @@ class LoginStatusRepoImpl:
         #  https://github.com/Tatamo/atcoder-cli/blob/0ca0d088f28783a4804ad90d89fc56eb7ddd6ef4/src/atcoder.ts#L46
 
         try:
-            res = session.get(
+            res = self._transport.get(
+                session,
                 self._url_provider.submit_url("abc001"),
                 allow_redirects=False,
             )
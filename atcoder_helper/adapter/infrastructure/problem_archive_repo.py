@@ -0,0 +1,293 @@
+"""過去の問題を SQLite のデータベースに保存しておくアーカイブ."""
+
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Final
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Set
+
+from atcoder_helper.application.repositories.errors import ReadError
+from atcoder_helper.application.repositories.errors import WriteError
+from atcoder_helper.entities.atcoder_problem import AtCoderProblem
+from atcoder_helper.entities.atcoder_test_case import AtcoderTestCase
+
+_SCHEMA: Final[str] = """
+CREATE TABLE IF NOT EXISTS contests (
+    contest TEXT PRIMARY KEY,
+    tasks TEXT NOT NULL,  -- タスク名の JSON 配列. 問題一覧の順
+    synced_at REAL  -- すべての問題を保存し終えた時刻[UNIX時間]. 途中なら NULL
+);
+CREATE TABLE IF NOT EXISTS problems (
+    contest TEXT NOT NULL,
+    task TEXT NOT NULL,
+    title TEXT NOT NULL,
+    time_limit REAL,
+    memory_limit INTEGER,
+    statement TEXT NOT NULL,
+    archived_at REAL NOT NULL,
+    PRIMARY KEY (contest, task)
+);
+CREATE TABLE IF NOT EXISTS samples (
+    contest TEXT NOT NULL,
+    task TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    given TEXT NOT NULL,
+    expected TEXT,
+    PRIMARY KEY (contest, task, position)
+);
+"""
+
+
+class SqliteProblemArchiveRepositoryImpl:
+    """過去の問題を SQLite のデータベースに保存しておくアーカイブ.
+
+    問題は1つずつ、サンプルとともに1つのトランザクションで書き込むので、クロールを
+    途中で止めても、保存し終えた問題は次回そのまま使える.
+    """
+
+    _busy_timeout: Final[float] = 30.0  # 他の書き込みが終わるのを待つ時間[秒]
+
+    _filename: str
+    _lock: threading.Lock
+    _initialized: bool
+
+    def __init__(self, filename: str):
+        """__init__.
+
+        Args:
+            filename (str): データベースのファイル名. なければ、最初に書き込むときに作る
+        """
+        self._filename = filename
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def read_problem(self, contest: str, task: str) -> Optional[AtCoderProblem]:
+        """保存した問題を読み込む.
+
+        Args:
+            contest (str): コンテスト名
+            task (str): タスク名
+
+        Raises:
+            ReadError: アーカイブを読み込めない
+
+        Returns:
+            Optional[AtCoderProblem]: 問題. 保存していなければ None
+        """
+        with self._reading() as connection:
+            if connection is None:
+                return None
+            row = connection.execute(
+                "SELECT title, time_limit, memory_limit, statement FROM problems"
+                " WHERE contest = ? AND task = ?",
+                (contest, task),
+            ).fetchone()
+            if row is None:
+                return None
+            samples = connection.execute(
+                "SELECT name, given, expected FROM samples"
+                " WHERE contest = ? AND task = ? ORDER BY position",
+                (contest, task),
+            ).fetchall()
+
+        title, time_limit, memory_limit, statement = row
+        return AtCoderProblem(
+            contest=contest,
+            task=task,
+            title=title,
+            time_limit=time_limit,
+            memory_limit=memory_limit,
+            statement=statement,
+            test_cases=[
+                AtcoderTestCase(name=name, given=given, expected=expected)
+                for name, given, expected in samples
+            ],
+        )
+
+    def write_problem(self, problem: AtCoderProblem) -> None:
+        """問題を保存する. 既に保存していれば置き換える.
+
+        Args:
+            problem (AtCoderProblem): 問題
+
+        Raises:
+            WriteError: アーカイブに書き込めない
+        """
+        key = (problem.contest, problem.task)
+        with self._writing() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO problems (contest, task, title, time_limit,"
+                " memory_limit, statement, archived_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    *key,
+                    problem.title,
+                    problem.time_limit,
+                    problem.memory_limit,
+                    problem.statement,
+                    time.time(),
+                ),
+            )
+            connection.execute(
+                "DELETE FROM samples WHERE contest = ? AND task = ?", key
+            )
+            connection.executemany(
+                "INSERT INTO samples (contest, task, position, name, given, expected)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (*key, position, case.name, case.given, case.expected)
+                    for position, case in enumerate(problem.test_cases)
+                ],
+            )
+
+    def read_tasks(self, contest: str) -> Optional[List[str]]:
+        """保存したコンテストの問題一覧を読み込む.
+
+        Args:
+            contest (str): コンテスト名
+
+        Raises:
+            ReadError: アーカイブを読み込めない
+
+        Returns:
+            Optional[List[str]]: タスク名. 問題一覧の順. 保存していなければ None
+        """
+        with self._reading() as connection:
+            if connection is None:
+                return None
+            row = connection.execute(
+                "SELECT tasks FROM contests WHERE contest = ?", (contest,)
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            tasks = json.loads(row[0])
+        except ValueError as e:
+            raise ReadError(f"broken task list of {contest}") from e
+        return [str(task) for task in tasks]
+
+    def write_tasks(self, contest: str, tasks: List[str]) -> None:
+        """コンテストの問題一覧を保存する.
+
+        問題一覧が変わっていれば、保存し終えた印も消す.
+
+        Args:
+            contest (str): コンテスト名
+            tasks (List[str]): タスク名. 問題一覧の順
+
+        Raises:
+            WriteError: アーカイブに書き込めない
+        """
+        with self._writing() as connection:
+            connection.execute(
+                "INSERT INTO contests (contest, tasks) VALUES (?, ?)"
+                " ON CONFLICT (contest) DO UPDATE SET tasks = excluded.tasks,"
+                " synced_at = CASE WHEN tasks = excluded.tasks THEN synced_at END",
+                (contest, json.dumps(tasks)),
+            )
+
+    def archived_tasks(self, contest: str) -> Set[str]:
+        """コンテストの問題のうち、保存してあるもののタスク名を返す.
+
+        Args:
+            contest (str): コンテスト名
+
+        Raises:
+            ReadError: アーカイブを読み込めない
+
+        Returns:
+            Set[str]: タスク名
+        """
+        with self._reading() as connection:
+            if connection is None:
+                return set()
+            rows = connection.execute(
+                "SELECT task FROM problems WHERE contest = ?", (contest,)
+            ).fetchall()
+        return {task for (task,) in rows}
+
+    def is_synced(self, contest: str) -> bool:
+        """コンテストのすべての問題を保存し終えたか.
+
+        Args:
+            contest (str): コンテスト名
+
+        Raises:
+            ReadError: アーカイブを読み込めない
+
+        Returns:
+            bool: 保存し終えたか
+        """
+        with self._reading() as connection:
+            if connection is None:
+                return False
+            row = connection.execute(
+                "SELECT synced_at FROM contests WHERE contest = ?", (contest,)
+            ).fetchone()
+        return row is not None and row[0] is not None
+
+    def mark_synced(self, contest: str) -> None:
+        """コンテストのすべての問題を保存し終えたことを記録する.
+
+        Args:
+            contest (str): コンテスト名
+
+        Raises:
+            WriteError: アーカイブに書き込めない
+        """
+        with self._writing() as connection:
+            connection.execute(
+                "UPDATE contests SET synced_at = ? WHERE contest = ?",
+                (time.time(), contest),
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self._filename, timeout=self._busy_timeout)
+        with self._lock:
+            if not self._initialized:
+                # WAL なら、クロールの書き込み中も fetch などから読める
+                connection.execute("PRAGMA journal_mode = WAL")
+                connection.executescript(_SCHEMA)
+                self._initialized = True
+        return connection
+
+    @contextlib.contextmanager
+    def _reading(self) -> Iterator[Optional[sqlite3.Connection]]:
+        """読み込み用の接続. データベースがなければ作らずに None を渡す."""
+        if not os.path.exists(self._filename):
+            yield None
+            return
+        try:
+            connection = self._connect()
+        except sqlite3.Error as e:
+            raise ReadError(f"cannot open {self._filename}") from e
+        try:
+            yield connection
+        except sqlite3.Error as e:
+            raise ReadError(f"cannot read {self._filename}") from e
+        finally:
+            connection.close()
+
+    @contextlib.contextmanager
+    def _writing(self) -> Iterator[sqlite3.Connection]:
+        """書き込み用の接続. ブロックを抜けるとコミットし、例外ならロールバックする."""
+        try:
+            directory = os.path.dirname(self._filename)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = self._connect()
+        except (OSError, sqlite3.Error) as e:
+            raise WriteError(f"cannot open {self._filename}") from e
+        try:
+            with connection:
+                yield connection
+        except sqlite3.Error as e:
+            raise WriteError(f"cannot write {self._filename}") from e
+        finally:
+            connection.close()
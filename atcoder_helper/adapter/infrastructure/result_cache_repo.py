@@ -0,0 +1,81 @@
+"""テスト結果のキャッシュの永続化を行う."""
+import json
+from dataclasses import asdict
+from typing import List
+
+from atcoder_helper.application.repositories.errors import ParseError
+from atcoder_helper.application.repositories.errors import ReadError
+from atcoder_helper.application.repositories.errors import WriteError
+from atcoder_helper.entities.atcoder_test_case import AtCoderTestResult
+from atcoder_helper.entities.atcoder_test_case import AtCoderTestStatus
+from atcoder_helper.entities.atcoder_test_case import CachedTestResult
+
+
+class ResultCacheRepositoryImpl:
+    """テスト結果のキャッシュを JSON ファイルに永続化する."""
+
+    def __init__(self, filename: str):
+        """__init__.
+
+        Args:
+            filename (str): 永続化先のファイル名
+        """
+        self._filename = filename
+
+    def write(self, results: List[CachedTestResult]) -> None:
+        """書き込みを行う.
+
+        Args:
+            results (List[CachedTestResult]): テストケースごとの直近の実行結果
+
+        Raises:
+            WriteError: 書き込み失敗
+        """
+        objects = []
+        for cached in results:
+            result = asdict(cached.result)
+            result["status"] = cached.result.status.name
+            result.pop("cached")
+            objects.append({"key": cached.key, "result": result})
+
+        try:
+            with open(self._filename, "wt") as file:
+                json.dump(objects, file)
+        except OSError as e:
+            raise WriteError(f"cannot open {self._filename}") from e
+
+    def read(self) -> List[CachedTestResult]:
+        """読み込みを行う.
+
+        Returns:
+            List[CachedTestResult]: テストケースごとの直近の実行結果
+
+        Raises:
+            ReadError: データの読み込みに失敗した
+            ParseError: パースに失敗した
+        """
+        try:
+            with open(self._filename, "rt") as file:
+                objects = json.load(file)
+        except OSError as e:
+            raise ReadError(f"cannot open {self._filename}") from e
+        except ValueError as e:
+            raise ParseError(f"failed to parse {self._filename} as JSON") from e
+
+        try:
+            return [
+                CachedTestResult(
+                    key=object["key"],
+                    result=AtCoderTestResult(
+                        **{
+                            **object["result"],
+                            "status": AtCoderTestStatus[object["result"]["status"]],
+                        }
+                    ),
+                )
+                for object in objects
+            ]
+        except Exception as e:
+            raise ParseError(
+                f"failed to parse {self._filename} as CachedTestResult"
+            ) from e
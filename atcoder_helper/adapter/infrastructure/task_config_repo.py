@@ -88,7 +88,8 @@ class TaskConfigRepositoryImpl:
                 raise CopyError("テンプレートディレクトリのコピー中にエラーが発生しました") from e
 
         try:
-            with open(os.path.join(task_dir, self._filename), "wt") as file:
+            filename = os.path.join(task_dir, os.path.basename(self._filename))
+            with open(filename, "wt") as file:
                 yaml.dump(
                     task_config.dict(exclude_none=True),
                     file,
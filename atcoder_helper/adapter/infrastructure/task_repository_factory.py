@@ -0,0 +1,72 @@
+"""タスクディレクトリごとのリポジトリを作る."""
+import os
+from typing import List
+
+from atcoder_helper.adapter.infrastructure.local_test_case_repo import (
+    LocalTestCaseRepositoryImpl,
+)
+from atcoder_helper.adapter.infrastructure.task_config_repo import (
+    TaskConfigRepositoryImpl,
+)
+
+
+class TaskRepositoryFactoryImpl:
+    """タスクディレクトリごとのリポジトリを作る."""
+
+    _task_config_filename: str
+    _testcase_filename: str
+
+    def __init__(self, task_config_filename: str, testcase_filename: str):
+        """__init__.
+
+        Args:
+            task_config_filename (str): タスクディレクトリでの TaskConfig のファイル名
+            testcase_filename (str): タスクディレクトリでのテストケースのファイル名
+        """
+        self._task_config_filename = task_config_filename
+        self._testcase_filename = testcase_filename
+
+    def find_task_dirs(self, parent: str) -> List[str]:
+        """指定したディレクトリの直下にあるタスクディレクトリを、名前順に返す.
+
+        Args:
+            parent (str): 探すディレクトリ
+
+        Returns:
+            List[str]: タスクディレクトリのパス
+        """
+        try:
+            names = sorted(os.listdir(parent))
+        except OSError:
+            return []
+        return [
+            os.path.normpath(os.path.join(parent, name))
+            for name in names
+            if os.path.isfile(os.path.join(parent, name, self._task_config_filename))
+        ]
+
+    def task_config_repo(self, task_dir: str) -> TaskConfigRepositoryImpl:
+        """タスクディレクトリの TaskConfigRepository を返す.
+
+        Args:
+            task_dir (str): タスクディレクトリ
+
+        Returns:
+            TaskConfigRepositoryImpl: _
+        """
+        return TaskConfigRepositoryImpl(
+            os.path.join(task_dir, self._task_config_filename)
+        )
+
+    def test_case_repo(self, task_dir: str) -> LocalTestCaseRepositoryImpl:
+        """タスクディレクトリの LocalTestCaseRepository を返す.
+
+        Args:
+            task_dir (str): タスクディレクトリ
+
+        Returns:
+            LocalTestCaseRepositoryImpl: _
+        """
+        return LocalTestCaseRepositoryImpl(
+            os.path.join(task_dir, self._testcase_filename)
+        )
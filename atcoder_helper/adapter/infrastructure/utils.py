@@ -3,6 +3,9 @@
 
 from typing import Final
 
+import requests
+from requests.adapters import HTTPAdapter
+
 
 class AtCoderURLProvider:
     """URL情報を保持するクラス."""
@@ -22,10 +25,24 @@ class AtCoderURLProvider:
         """
         return f"{AtCoderURLProvider._atcoder_url}/contests/{contest}"
 
+    @staticmethod
+    def tasks_url(contest: str) -> str:
+        """contestの問題一覧のURLを返す.
+
+        Args:
+            contest (str):
+
+        Returns:
+            str:
+        """
+        return f"{AtCoderURLProvider.contest_url(contest)}/tasks"
+
     @staticmethod
     def task_url(contest: str, task: str) -> str:
         """taskのURLを返す.
 
+        task に "_" を含む場合は、"コンテスト名_" を除いていないタスクIDとして扱う.
+
         Args:
             contest (str):
             task (str):
@@ -33,7 +50,23 @@ class AtCoderURLProvider:
         Returns:
             str:
         """
-        return f"{AtCoderURLProvider.contest_url(contest)}/tasks/{contest}_{task}"
+        task_id = task if "_" in task else f"{contest}_{task}"
+        return f"{AtCoderURLProvider.tasks_url(contest)}/{task_id}"
+
+    @staticmethod
+    def task_name(contest: str, task_id: str) -> str:
+        """タスクIDから "コンテスト名_" の部分を除いたタスク名を返す.
+
+        別のコンテストと共有している問題 (abc042 の arc058_a など) は、タスクIDのまま返す.
+
+        Args:
+            contest (str):
+            task_id (str):
+
+        Returns:
+            str:
+        """
+        return task_id.removeprefix(f"{contest}_")
 
     @staticmethod
     def submit_url(contest: str) -> str:
@@ -46,3 +79,22 @@ class AtCoderURLProvider:
             str:
         """
         return f"{AtCoderURLProvider.contest_url(contest)}/submit"
+
+
+def mount_connection_pool(session: requests.Session, url: str, size: int) -> None:
+    """URL が url で始まるページへの接続を、size 本まで session の接続プールに保つ.
+
+    既定のプールに収まらない接続は使い終わると閉じられ、次のリクエストでまた
+    TLS ハンドシェイクからやり直すことになる. 既に十分な大きさのプールがあれば、
+    開いている接続を捨てないようそのまま使う.
+
+    Args:
+        session (requests.Session): セッション
+        url (str): URL の接頭辞
+        size (int): プールに保つ接続の数
+    """
+    adapter = session.adapters.get(url)
+    pool_size = getattr(adapter, "_pool_maxsize", 0)
+    if isinstance(adapter, HTTPAdapter) and pool_size >= size:
+        return
+    session.mount(url, HTTPAdapter(pool_connections=1, pool_maxsize=size))
@@ -0,0 +1,167 @@
+"""過去の問題を手元のアーカイブに保存するサービス."""
+
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+from typing import Dict
+from typing import Final
+from typing import List
+from typing import Optional
+
+import requests
+from injector import inject
+
+from atcoder_helper.application.repositories import errors as repository_error
+from atcoder_helper.application.repositories.atcoder_test_case_repo import (
+    AtCoderTestCaseRepository,
+)
+from atcoder_helper.application.repositories.logged_in_session_repo import (
+    LoggedInSessionRepository,
+)
+from atcoder_helper.application.repositories.problem_archive_repo import (
+    ProblemArchiveRepository,
+)
+from atcoder_helper.application.usecases.errors import AtcoderAccessError
+from atcoder_helper.application.usecases.errors import ConfigAccessError
+from atcoder_helper.entities.atcoder_problem import AtCoderProblem
+
+
+class ArchiveInteractor:
+    """過去の問題を手元のアーカイブに保存するサービス.
+
+    問題ページの取得は jobs 本のスレッドで並行して行い、アーカイブへの書き込みは
+    取得できたものから順に呼び出し元のスレッドで行う. 送る速さは、共有している
+    通信層のレート制限に従う.
+    """
+
+    _default_jobs: Final[int] = 4
+
+    _session_repo: LoggedInSessionRepository
+    _atcoder_testcase_repo: AtCoderTestCaseRepository
+    _archive_repo: ProblemArchiveRepository
+
+    @inject
+    def __init__(
+        self,
+        session_repo: LoggedInSessionRepository,
+        atcoder_testcase_repo: AtCoderTestCaseRepository,
+        archive_repo: ProblemArchiveRepository,
+    ) -> None:
+        """__init__."""
+        self._session_repo = session_repo
+        self._atcoder_testcase_repo = atcoder_testcase_repo
+        self._archive_repo = archive_repo
+
+    def sync(self, contests: List[str], jobs: Optional[int] = None) -> None:
+        """コンテストの問題をまだ保存していなければ、取得してアーカイブに保存する.
+
+        問題は1つずつ保存するので、途中で止めても次回は続きから取得する.
+        すべての問題を保存し終えたコンテストは、問題一覧も取得し直さない.
+
+        Args:
+            contests (List[str]): コンテスト名
+            jobs (Optional[int]): 同時に取得する問題数. Defaults to None (4)
+
+        Raises:
+            AtcoderAccessError: 取得に失敗したコンテストがある
+            ConfigAccessError: セッション・アーカイブの読み書きのエラー
+        """
+        try:
+            session = self._session_repo.read()
+        except repository_error.ReadError as e:
+            raise ConfigAccessError("セッションの読み込みに失敗") from e
+
+        failed = []
+        skipped = 0
+        pool = ThreadPoolExecutor(max_workers=max(1, jobs or self._default_jobs))
+        try:
+            for contest in contests:
+                if self._is_synced(contest):
+                    skipped += 1
+                elif not self._sync_contest(session, contest, pool):
+                    failed.append(contest)
+        finally:
+            # Ctrl+C で止めたときに、まだ始めていない取得を待たない
+            pool.shutdown(wait=True, cancel_futures=True)
+
+        print(
+            f"{len(contests) - skipped - len(failed)} contests synced,"
+            f" {skipped} already synced, {len(failed)} failed"
+        )
+        if failed:
+            raise AtcoderAccessError(f"{', '.join(failed)} の取得に失敗しました")
+
+    def _sync_contest(
+        self, session: requests.Session, contest: str, pool: ThreadPoolExecutor
+    ) -> bool:
+        """コンテストのまだ保存していない問題を取得して保存し、すべて保存できたかを返す.
+
+        Raises:
+            ConfigAccessError: アーカイブの読み書きのエラー
+        """
+        try:
+            tasks = self._atcoder_testcase_repo.fetch_tasks(session, contest)
+        except (repository_error.ConnectionError, repository_error.ParseError):
+            print(f"{contest}: 問題一覧の取得に失敗しました")
+            return False
+
+        try:
+            self._archive_repo.write_tasks(contest, tasks)
+            archived = self._archive_repo.archived_tasks(contest)
+        except (repository_error.ReadError, repository_error.WriteError) as e:
+            raise ConfigAccessError("アーカイブの読み書きに失敗しました") from e
+
+        missing = [task for task in tasks if task not in archived]
+        failed = self._archive_problems(session, contest, missing, pool)
+        if failed:
+            print(f"{contest}: {', '.join(sorted(failed))} の取得に失敗しました")
+            return False
+
+        try:
+            self._archive_repo.mark_synced(contest)
+        except repository_error.WriteError as e:
+            raise ConfigAccessError("アーカイブの書き込みに失敗しました") from e
+        print(f"{contest}: {len(tasks)} tasks ({len(missing)} fetched)")
+        return True
+
+    def _archive_problems(
+        self,
+        session: requests.Session,
+        contest: str,
+        tasks: List[str],
+        pool: ThreadPoolExecutor,
+    ) -> List[str]:
+        """問題を並行して取得し、取得できたものから保存して、取得に失敗したタスクを返す.
+
+        Raises:
+            ConfigAccessError: アーカイブの書き込みのエラー
+        """
+        futures: Dict[Future[AtCoderProblem], str] = {
+            pool.submit(
+                self._atcoder_testcase_repo.fetch_problem, session, contest, task
+            ): task
+            for task in tasks
+        }
+        failed = []
+        for future in as_completed(futures):
+            try:
+                problem = future.result()
+            except (repository_error.ConnectionError, repository_error.ParseError):
+                failed.append(futures[future])
+                continue
+            try:
+                self._archive_repo.write_problem(problem)
+            except repository_error.WriteError as e:
+                raise ConfigAccessError("アーカイブの書き込みに失敗しました") from e
+        return failed
+
+    def _is_synced(self, contest: str) -> bool:
+        """すべての問題を保存し終えたコンテストか.
+
+        Raises:
+            ConfigAccessError: アーカイブを読み込めない
+        """
+        try:
+            return self._archive_repo.is_synced(contest)
+        except repository_error.ReadError as e:
+            raise ConfigAccessError("アーカイブの読み込みに失敗しました") from e
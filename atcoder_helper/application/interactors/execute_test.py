@@ -1,30 +1,91 @@
 """テストケース実行のためのメソッド."""
 
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+from contextlib import redirect_stdout
+from dataclasses import replace
 from textwrap import indent
+from typing import Callable
+from typing import Dict
 from typing import List
+from typing import Optional
 from typing import Protocol
+from typing import Set
+from typing import Tuple
 
 from injector import inject
 
+from atcoder_helper import profiler as profilers
 from atcoder_helper.application.repositories import errors as repository_error
+from atcoder_helper.application.repositories.atcoder_helper_config_repo import (
+    ConfigRepository,
+)
 from atcoder_helper.application.repositories.local_test_case_repo import (
     LocalTestCaseRepository,
 )
+from atcoder_helper.application.repositories.result_cache_repo import (
+    ResultCacheRepository,
+)
 from atcoder_helper.application.repositories.task_config_repo import (
     TaskConfigRepository,
 )
+from atcoder_helper.application.interactors.util import get_usable_cpu_count
+from atcoder_helper.application.interactors.util import pinned_to_cpu
+from atcoder_helper.application.interactors.util import resolve_limits
+from atcoder_helper.application.usecases.errors import BuildFailure
 from atcoder_helper.application.usecases.errors import ConfigAccessError
+from atcoder_helper.application.usecases.errors import HelperProgramFailure
+from atcoder_helper.application.usecases.errors import ProfilerUnavailable
+from atcoder_helper.application.usecases.errors import ResultWriteError
+from atcoder_helper.application.usecases.errors import UndefinedLanguage
+from atcoder_helper.application.usecases.errors import UndefinedTestCase
+from atcoder_helper.entities.atcoder_benchmark import AtCoderBenchmarkResult
+from atcoder_helper.entities.atcoder_benchmark import TimingStats
+from atcoder_helper.entities.atcoder_benchmark import count_outliers
+from atcoder_helper.entities.atcoder_benchmark import relative_confidence_interval
+from atcoder_helper.entities.atcoder_helper_config import LanguageConfig
+from atcoder_helper.entities.atcoder_profile import ProfileResult
+from atcoder_helper.entities.atcoder_profile import find_hotspots
+from atcoder_helper.entities.atcoder_profile import format_collapsed
+from atcoder_helper.entities.atcoder_task_config import CheckerConfig
+from atcoder_helper.entities.atcoder_task_config import TaskConfig
+from atcoder_helper.entities.atcoder_test_case import AtcoderTestCase
 from atcoder_helper.entities.atcoder_test_case import AtCoderTestResult
 from atcoder_helper.entities.atcoder_test_case import AtCoderTestStatus
+from atcoder_helper.entities.atcoder_test_case import CachedTestResult
+from atcoder_helper.file_watcher import FileWatcher
+from atcoder_helper.file_watcher import create_file_watcher
+from atcoder_helper.program_executor import ForkServerProgramExecutorRepoImpl
 from atcoder_helper.program_executor import ProgramExecutor
+from atcoder_helper.program_executor import ProfilingProgramExecutor
+from atcoder_helper.program_executor import ProfilingProgramExecutorRepoImpl
 from atcoder_helper.program_executor import ProgramExecutorRepoImpl
+from atcoder_helper.result_reporter import ResultReporter
+from atcoder_helper.result_reporter import create_result_reporter
+from atcoder_helper.workspace import prepare_language_workspace
 
 
 class ControllerBuilder(Protocol):
     """ControllerBuilder."""
 
     @staticmethod
-    def build(build_command: List[str], run_command: List[str]) -> ProgramExecutor:
+    def build(
+        build_command: List[str],
+        run_command: List[str],
+        time_limit: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+        output_limit: Optional[int] = None,
+        fork_server: bool = False,
+        preload_modules: Optional[List[str]] = None,
+        checker: Optional[CheckerConfig] = None,
+        limit_address_space: bool = True,
+        task_dir: Optional[str] = None,
+    ) -> ProgramExecutor:
         """build."""
         pass
 
@@ -33,73 +94,777 @@ class ControllerBuilderImpl:
     """ControllerBuilderの実装."""
 
     @staticmethod
-    def build(build_command: List[str], run_command: List[str]) -> ProgramExecutor:
+    def build(
+        build_command: List[str],
+        run_command: List[str],
+        time_limit: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+        output_limit: Optional[int] = None,
+        fork_server: bool = False,
+        preload_modules: Optional[List[str]] = None,
+        checker: Optional[CheckerConfig] = None,
+        limit_address_space: bool = True,
+        task_dir: Optional[str] = None,
+    ) -> ProgramExecutor:
         """ProgramExecutorRepoの標準実装を返す."""
-        return ProgramExecutorRepoImpl(build_command, run_command)
+        if fork_server:
+            return ForkServerProgramExecutorRepoImpl(
+                build_command,
+                run_command,
+                time_limit=time_limit,
+                memory_limit=memory_limit,
+                output_limit=output_limit,
+                checker=checker,
+                preload_modules=preload_modules,
+                limit_address_space=limit_address_space,
+                task_dir=task_dir,
+            )
+        return ProgramExecutorRepoImpl(
+            build_command,
+            run_command,
+            time_limit=time_limit,
+            memory_limit=memory_limit,
+            output_limit=output_limit,
+            checker=checker,
+            limit_address_space=limit_address_space,
+            task_dir=task_dir,
+        )
+
+
+class ProfilerBuilder(Protocol):
+    """ProfilerBuilder."""
+
+    @staticmethod
+    def build(
+        build_command: List[str],
+        run_command: List[str],
+        profiler: Optional[str] = None,
+        time_limit: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+        output_limit: Optional[int] = None,
+        checker: Optional[CheckerConfig] = None,
+        limit_address_space: bool = True,
+    ) -> ProfilingProgramExecutor:
+        """build."""
+        pass
+
+
+class ProfilerBuilderImpl:
+    """ProfilerBuilderの実装."""
+
+    @staticmethod
+    def build(
+        build_command: List[str],
+        run_command: List[str],
+        profiler: Optional[str] = None,
+        time_limit: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+        output_limit: Optional[int] = None,
+        checker: Optional[CheckerConfig] = None,
+        limit_address_space: bool = True,
+    ) -> ProfilingProgramExecutor:
+        """プロファイラの下で解答を実行する ProgramExecutor を返す.
+
+        Raises:
+            profilers.ProfilerUnavailable: この解答には、指定したプロファイラを使えない
+        """
+        return ProfilingProgramExecutorRepoImpl(
+            build_command,
+            run_command,
+            profilers.create_profiler(profiler, run_command),
+            time_limit=time_limit,
+            memory_limit=memory_limit,
+            output_limit=output_limit,
+            checker=checker,
+            limit_address_space=limit_address_space,
+        )
+
+
+class ResultReporterBuilder(Protocol):
+    """ResultReporterBuilder."""
+
+    @staticmethod
+    def build(
+        output_format: str, output_file: Optional[str], suite: str
+    ) -> ResultReporter:
+        """build."""
+        pass
+
+
+class ResultReporterBuilderImpl:
+    """ResultReporterBuilderの実装."""
+
+    @staticmethod
+    def build(
+        output_format: str, output_file: Optional[str], suite: str
+    ) -> ResultReporter:
+        """形式に合った ResultReporter を返す.
+
+        Raises:
+            OSError: 書き出し先のファイルを開けなかった
+        """
+        return create_result_reporter(output_format, output_file, suite)
+
+
+class FileWatcherBuilder(Protocol):
+    """FileWatcherBuilder."""
+
+    @staticmethod
+    def build(directory: str) -> FileWatcher:
+        """build."""
+        pass
+
+
+class FileWatcherBuilderImpl:
+    """FileWatcherBuilderの実装."""
+
+    @staticmethod
+    def build(directory: str) -> FileWatcher:
+        """その環境で使えるFileWatcherを返す."""
+        return create_file_watcher(directory)
+
+
+@dataclass
+class _WatchState:
+    """watch_test で、変更をまたいで持ち越す状態."""
+
+    task_config: Optional[TaskConfig] = None
+    # 設定が変わらない限り使い回し、フォークサーバなどを起動し直さずに済ませる
+    controller: Optional[ProgramExecutor] = None
+    failing: Set[str] = field(default_factory=set)  # 前回失敗したケースの名前
 
 
 class ExecuteTestInteractor:
     """テストを実行するサービス."""
 
+    # precision を指定したときに、信頼区間を見始めるまでの最低実行回数
+    _min_runs_for_precision = 5
+    # プロファイラの下では遅くなるので、時間制限を指定されなければタスク設定の何倍まで待つか
+    _profile_time_factor = 10
+    _profile_dir = ".atcoder_helper_profiles"
+
     _task_config_repo: TaskConfigRepository
     _test_case_repo: LocalTestCaseRepository
+    _result_cache_repo: ResultCacheRepository
+    _config_repo: ConfigRepository
 
     # 本当は ControllerBuilder型なんだがmypyのバグにより型付けに失敗するので Any
     # see also https://github.com/python/mypy/issues/5485
     _controller_builder: ControllerBuilder
+    _file_watcher_builder: FileWatcherBuilder
+    _profiler_builder: ProfilerBuilder
+    _result_reporter_builder: ResultReporterBuilder
 
     @inject
     def __init__(
         self,
         task_config_repo: TaskConfigRepository,
         test_case_repo: LocalTestCaseRepository,
+        result_cache_repo: ResultCacheRepository,
+        config_repo: ConfigRepository,
         controller_builder: ControllerBuilder,
+        file_watcher_builder: FileWatcherBuilder,
+        profiler_builder: ProfilerBuilder,
+        result_reporter_builder: ResultReporterBuilder,
     ):
         """__init__.
 
         Args:
             task_config_repo (TaskConfigRepository, optional): _
             test_case_repo (TestCaseRepository, optional): _
+            result_cache_repo (ResultCacheRepository): _
+            config_repo (ConfigRepository): _
             controller_builder (Callable[[List[str], List[str]], ProgramExecutor]): _
+            file_watcher_builder (FileWatcherBuilder): _
+            profiler_builder (ProfilerBuilder): _
+            result_reporter_builder (ResultReporterBuilder): _
         """
         self._task_config_repo = task_config_repo
         self._test_case_repo = test_case_repo
+        self._result_cache_repo = result_cache_repo
+        self._config_repo = config_repo
         self._controller_builder = controller_builder
+        self._file_watcher_builder = file_watcher_builder
+        self._profiler_builder = profiler_builder
+        self._result_reporter_builder = result_reporter_builder
 
-    def execute_test(self) -> None:
+    def execute_test(
+        self,
+        jobs: Optional[int] = None,
+        time_limit: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+        output_limit: Optional[int] = None,
+        changed_only: bool = False,
+        failed_only: bool = False,
+        output_format: str = "text",
+        output_file: Optional[str] = None,
+    ) -> None:
         """testcaseに基づき、テストを実行する関数.
 
+        テストケースは最大jobs個まで並列に実行されるが、結果の表示は元のケース順を保つ.
+        プログラム・入力・期待する出力・判定方法が前回と同じケースは実行せず、前回の結果を
+        再利用する. changed_only と failed_only を両方指定した場合は、どちらかに
+        当てはまるケースを対象にする.
+
+        output_format に "json" か "junit" を指定すると、結果をケースが終わった順に
+        その形式でも書き出す. 書き出し先が標準出力の場合は、色付きの表示はせず、
+        ビルドのメッセージは標準エラー出力に回す.
+
+        Args:
+            jobs (Optional[int]): 同時に実行するケース数. Defaults to None (使えるCPU数)
+            time_limit (Optional[float]): 実行時間制限[秒]. Defaults to None (タスク設定の値)
+            memory_limit (Optional[int]): メモリ制限[MiB]. Defaults to None (タスク設定の値)
+            output_limit (Optional[int]): 出力サイズ制限[MiB]. Defaults to None (タスク設定の値)
+            changed_only (bool): 前回の結果を再利用できないケースだけを対象にする.
+                Defaults to False
+            failed_only (bool): 前回失敗したケースだけを対象にする. Defaults to False
+            output_format (str): "text", "json", "junit" のいずれか. Defaults to "text"
+            output_file (Optional[str]): json, junit の書き出し先.
+                Defaults to None (標準出力)
+
+        Raises:
+            ConfigAccessError: 設定ファイル読み書きのエラー
+            BuildFailure: ビルドに失敗した
+            ResultWriteError: 書き出し先のファイルを開けなかった
+        """
+        # 標準出力に書き出す場合は、機械可読な出力だけにする
+        reports_to_stdout = output_format != "text" and output_file is None
+        if reports_to_stdout:
+            with redirect_stdout(sys.stderr):
+                task_config, controller, test_cases = self._prepare(
+                    time_limit, memory_limit, output_limit
+                )
+        else:
+            task_config, controller, test_cases = self._prepare(
+                time_limit, memory_limit, output_limit
+            )
+
+        if jobs is None:
+            jobs = get_usable_cpu_count()
+
+        if output_format == "text":
+            self._run_all(controller, test_cases, jobs, changed_only, failed_only)
+            return
+
+        suite = "_".join(
+            name for name in (task_config.contest, task_config.task) if name
+        ) or os.path.basename(os.getcwd())
+        try:
+            reporter = self._result_reporter_builder.build(
+                output_format, output_file, suite
+            )
+        except OSError as e:
+            raise ResultWriteError(f"{output_file} に書き込めませんでした") from e
+        try:
+            self._run_all(
+                controller,
+                test_cases,
+                jobs,
+                changed_only,
+                failed_only,
+                reporter=reporter,
+                shows_text=not reports_to_stdout,
+            )
+        finally:
+            reporter.close()
+
+    def watch_test(
+        self,
+        jobs: Optional[int] = None,
+        time_limit: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+        output_limit: Optional[int] = None,
+        debounce: float = 0.2,
+    ) -> None:
+        """タスクディレクトリのファイルが変わるたびに、ビルドしてテストを実行し直す.
+
+        KeyboardInterrupt で止めるまで戻らない. ビルドは前回から変わっていなければ省略され、
+        テストケースは前回失敗したものから実行する. 設定ファイルが読めない場合や
+        ビルドに失敗した場合は、エラーを表示して次の変更を待つ.
+
+        Args:
+            jobs (Optional[int]): 同時に実行するケース数. Defaults to None (使えるCPU数)
+            time_limit (Optional[float]): 実行時間制限[秒]. Defaults to None (タスク設定の値)
+            memory_limit (Optional[int]): メモリ制限[MiB]. Defaults to None (タスク設定の値)
+            output_limit (Optional[int]): 出力サイズ制限[MiB]. Defaults to None (タスク設定の値)
+            debounce (float): 変更が落ち着いたとみなすまでの時間[秒]. Defaults to 0.2
+        """
+        if jobs is None:
+            jobs = get_usable_cpu_count()
+
+        watcher = self._file_watcher_builder.build(".")
+        state = _WatchState()
+        try:
+            while True:
+                self._watch_iteration(
+                    watcher, state, jobs, time_limit, memory_limit, output_limit
+                )
+                print(f"watching {os.getcwd()} for changes. press Ctrl+C to stop.")
+                changed = watcher.wait(debounce)
+                print(f"changed: {', '.join(sorted(changed))}")
+        finally:
+            watcher.close()
+
+    def _watch_iteration(
+        self,
+        watcher: FileWatcher,
+        state: _WatchState,
+        jobs: int,
+        time_limit: Optional[float],
+        memory_limit: Optional[int],
+        output_limit: Optional[int],
+    ) -> None:
+        """watch_test の1回分. 設定を読み直し、ビルドしてテストを実行する."""
+        try:
+            task_config = self._read_task_config()
+            test_cases = self._read_test_cases()
+        except ConfigAccessError as e:
+            print(e)
+            return
+
+        if state.controller is None or state.task_config != task_config:
+            state.task_config = task_config
+            state.controller = self._build_controller(
+                task_config, time_limit, memory_limit, output_limit
+            )
+
+        built = state.controller.build()
+        # ビルドが書き出した成果物の変更で、もう一度実行し直さないようにする
+        watcher.discard()
+        if not built:
+            print("ビルドに失敗しました")
+            return
+
+        # sorted は安定なので、失敗したケース同士・それ以外同士は元の順のまま
+        ordered = sorted(test_cases, key=lambda case: case.name not in state.failing)
+        results = self._run_all(state.controller, ordered, jobs)
+        state.failing = {result.name for result in results if not _is_passed(result)}
+
+    def _run_all(
+        self,
+        controller: ProgramExecutor,
+        test_cases: List[AtcoderTestCase],
+        jobs: int,
+        changed_only: bool = False,
+        failed_only: bool = False,
+        reporter: Optional[ResultReporter] = None,
+        shows_text: bool = True,
+    ) -> List[AtCoderTestResult]:
+        """テストケースを並列に実行し、結果を表示する.
+
+        前回の結果を再利用できるケースは実行しない. reporter には、ケースが終わった順に
+        結果を渡す.
+        """
+        previous = self._read_result_cache()
+        keys = {case.name: controller.cache_key(case) for case in test_cases}
+
+        def is_reusable(case: AtcoderTestCase) -> bool:
+            cached = previous.get(case.name)
+            key = keys[case.name]
+            return key is not None and cached is not None and cached.key == key
+
+        selected = _select_cases(
+            test_cases, previous, is_reusable, changed_only, failed_only
+        )
+        if not selected:
+            if shows_text:
+                print("no test cases to run.")
+            return []
+
+        def run(case: AtcoderTestCase) -> AtCoderTestResult:
+            if is_reusable(case):
+                result = replace(previous[case.name].result, cached=True)
+            else:
+                result = controller.execute(case)
+            if reporter is not None:
+                reporter.report(result)
+            return result
+
+        results = []
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            # map は投入順に結果を返すので、表示順は元のケース順のまま
+            for result in pool.map(run, selected):
+                results.append(result)
+                if shows_text:
+                    self._show_result(result)
+        if shows_text:
+            self._show_summary(results)
+
+        self._write_result_cache(test_cases, keys, previous, results)
+        return results
+
+    def _read_result_cache(self) -> Dict[str, CachedTestResult]:
+        """ケース名ごとの、前回の実行結果を読む. 読めなければ空として扱う."""
+        try:
+            return {
+                cached.result.name: cached
+                for cached in self._result_cache_repo.read()
+            }
+        except (repository_error.ReadError, repository_error.ParseError):
+            return {}
+
+    def _write_result_cache(
+        self,
+        test_cases: List[AtcoderTestCase],
+        keys: Dict[str, Optional[str]],
+        previous: Dict[str, CachedTestResult],
+        results: List[AtCoderTestResult],
+    ) -> None:
+        """今回実行したケースの結果を記録する. 実行しなかったケースは前回の記録を残す."""
+        executed = {result.name: result for result in results if not result.cached}
+        cache = []
+        for case in test_cases:
+            if case.name in executed:
+                result = executed[case.name]
+                # TLE は実行ごとにぶれうるので、失敗したことだけ記録して再利用はしない
+                reusable = result.status != AtCoderTestStatus.TLE
+                cache.append(
+                    CachedTestResult(keys[case.name] if reusable else None, result)
+                )
+            elif case.name in previous:
+                cache.append(previous[case.name])
+
+        try:
+            self._result_cache_repo.write(cache)
+        except repository_error.WriteError:
+            pass  # キャッシュが書けなくても、次回実行し直すだけ
+
+    def race_languages(
+        self,
+        languages: List[str],
+        jobs: Optional[int] = None,
+        time_limit: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+        output_limit: Optional[int] = None,
+    ) -> None:
+        """同じテストケースを複数の言語設定でビルド・実行し、判定と時間を並べて表示する.
+
+        言語ごとにタスクディレクトリを写した作業ディレクトリを用意し、その中で並列に
+        ビルドするので、成果物がぶつからない. 同じソースを別の処理系で動かすことも、
+        言語ごとに別のソースを置いておくこともできる. ビルドに失敗した言語は表で CE と
+        表示し、ほかの言語は続けて実行する. 前回の結果は再利用しない.
+
+        Args:
+            languages (List[str]): 言語設定の名前
+            jobs (Optional[int]): 同時に実行するケース数. Defaults to None (使えるCPU数)
+            time_limit (Optional[float]): 実行時間制限[秒]. Defaults to None (タスク設定の値)
+            memory_limit (Optional[int]): メモリ制限[MiB]. Defaults to None (タスク設定の値)
+            output_limit (Optional[int]): 出力サイズ制限[MiB]. Defaults to None (タスク設定の値)
+
+        Raises:
+            ConfigAccessError: 設定ファイル読み書きのエラー
+            UndefinedLanguage: 設定にない言語を指定した
+        """
+        language_configs = self._read_language_configs(languages)
+        task_config = self._read_task_config()
+        test_cases = self._read_test_cases()
+
+        controllers: Dict[str, ProgramExecutor] = {}
+        for language in language_configs:
+            try:
+                workspace = prepare_language_workspace(".", language.name)
+            except OSError as e:
+                raise ConfigAccessError(
+                    f"{language.name} の作業ディレクトリを用意できませんでした"
+                ) from e
+            controllers[language.name] = self._controller_builder.build(
+                language.build,
+                language.run,
+                **asdict(
+                    resolve_limits(task_config, time_limit, memory_limit, output_limit)
+                ),
+                fork_server=bool(language.fork_server),
+                preload_modules=language.preload_modules or [],
+                checker=task_config.checker,
+                limit_address_space=language.limit_address_space is not False,
+                task_dir=workspace,
+            )
+
+        names = list(controllers)
+        with ThreadPoolExecutor(max_workers=len(names)) as pool:
+            built = dict(
+                zip(names, pool.map(lambda name: controllers[name].build(), names))
+            )
+        for name in names:
+            if not built[name]:
+                print(f"{name}: ビルドに失敗しました")
+
+        if jobs is None:
+            jobs = get_usable_cpu_count()
+        runs = [
+            (name, case) for case in test_cases for name in names if built[name]
+        ]
+
+        def run(target: Tuple[str, AtcoderTestCase]) -> AtCoderTestResult:
+            name, case = target
+            return controllers[name].execute(case)
+
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            results = {
+                (name, case.name): result
+                for (name, case), result in zip(runs, pool.map(run, runs))
+            }
+
+        self._show_race(names, built, test_cases, results)
+
+    def _read_language_configs(self, languages: List[str]) -> List[LanguageConfig]:
+        """指定された名前の言語設定を、重複を除いて指定順に返す."""
+        try:
+            config = self._config_repo.read()
+        except (repository_error.ReadError, repository_error.ParseError) as e:
+            raise ConfigAccessError("設定ファイルの読み込みに失敗しました") from e
+
+        language_configs: List[LanguageConfig] = []
+        for language in dict.fromkeys(languages):
+            if language not in config.languages:
+                raise UndefinedLanguage(f"言語{language}は設定の中に存在しません。")
+            language_configs.append(config.languages[language])
+        return language_configs
+
+    def profile_test(
+        self,
+        case: str,
+        profiler: Optional[str] = None,
+        top: int = 20,
+        output_file: Optional[str] = None,
+        time_limit: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+        output_limit: Optional[int] = None,
+    ) -> None:
+        """1つのテストケースをプロファイラの下で実行し、時間のかかっている関数を表示する.
+
+        折りたたんだスタック(flamegraph.pl などにそのまま渡せる形式)をファイルに書き出す.
+        プロファイラは、指定がなければタスク設定の profiler を、それもなければ実行コマンド
+        から選ぶ(Python のスクリプトなら cprofile、それ以外は perf).
+
+        Args:
+            case (str): テストケースの名前
+            profiler (Optional[str]): "cprofile", "sampling", "perf" のいずれか.
+                Defaults to None (タスク設定の値)
+            top (int): 表示する関数の数. Defaults to 20
+            output_file (Optional[str]): 折りたたんだスタックを書き出すファイル.
+                Defaults to None (.atcoder_helper_profiles/<case>.folded)
+            time_limit (Optional[float]): 実行時間制限[秒].
+                Defaults to None (タスク設定の値の10倍)
+            memory_limit (Optional[int]): メモリ制限[MiB]. Defaults to None (タスク設定の値)
+            output_limit (Optional[int]): 出力サイズ制限[MiB]. Defaults to None (タスク設定の値)
+
         Raises:
             ConfigAccessError: 設定ファイル読み書きのエラー
+            UndefinedTestCase: 指定したテストケースがない
+            ProfilerUnavailable: この解答には、指定したプロファイラを使えない
+            BuildFailure: ビルドに失敗した
+            HelperProgramFailure: プロファイラが計測結果を残さなかった
+            ResultWriteError: 折りたたんだスタックの書き出しに失敗した
         """
+        task_config = self._read_task_config()
+        matched = [
+            test_case for test_case in self._read_test_cases() if test_case.name == case
+        ]
+        if not matched:
+            raise UndefinedTestCase(f"テストケース{case}は testcases.yaml に存在しません。")
+
+        try:
+            executor = self._profiler_builder.build(
+                task_config.build,
+                task_config.run,
+                profiler=profiler if profiler is not None else task_config.profiler,
+                **asdict(
+                    resolve_limits(
+                        task_config,
+                        time_limit,
+                        memory_limit,
+                        output_limit,
+                        time_factor=self._profile_time_factor,
+                    )
+                ),
+                checker=task_config.checker,
+                limit_address_space=task_config.limit_address_space,
+            )
+        except profilers.ProfilerUnavailable as e:
+            raise ProfilerUnavailable(str(e)) from e
+        if not executor.build():
+            raise BuildFailure("ビルドに失敗しました")
+
+        try:
+            result, profile = executor.profile(matched[0])
+        except profilers.ProfilerFailure as e:
+            raise HelperProgramFailure(str(e)) from e
+        self._show_result(result)
+
+        if output_file is None:
+            output_file = os.path.join(self._profile_dir, f"{case}.folded")
         try:
-            task_config = self._task_config_repo.read()
-            test_cases = self._test_case_repo.read()
+            os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+            with open(output_file, "wt") as file:
+                file.write(format_collapsed(profile.stacks))
+        except OSError:
+            raise ResultWriteError(f"{output_file} に書き込めませんでした")
+
+        self._show_profile(case, profile, top)
+        print(f"collapsed stacks: {output_file}")
+
+    def benchmark_test(
+        self,
+        warmup: int = 1,
+        repeat: int = 10,
+        precision: Optional[float] = None,
+        cpu: Optional[int] = None,
+        json_file: Optional[str] = None,
+        time_limit: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+        output_limit: Optional[int] = None,
+    ) -> None:
+        """testcaseごとに解答を繰り返し実行し、実行時間の統計を表示する.
+
+        計測のぶれを抑えるため、ケースは1つずつ、1つのCPUに固定して実行する.
+
+        Args:
+            warmup (int): 計測前に捨てる実行の回数. Defaults to 1
+            repeat (int): 計測する実行の回数 (precision を指定した場合は上限). Defaults to 10
+            precision (Optional[float]): 平均の95%信頼区間の半幅が平均のこの割合以下に
+                なったら計測を打ち切る. Defaults to None (常に repeat 回実行する)
+            cpu (Optional[int]): 固定するCPU. Defaults to None (自動で選ぶ)
+            json_file (Optional[str]): 結果をJSONで書き出すファイル. Defaults to None
+            time_limit (Optional[float]): 実行時間制限[秒]. Defaults to None (タスク設定の値)
+            memory_limit (Optional[int]): メモリ制限[MiB]. Defaults to None (タスク設定の値)
+            output_limit (Optional[int]): 出力サイズ制限[MiB]. Defaults to None (タスク設定の値)
+
+        Raises:
+            ConfigAccessError: 設定ファイル読み書きのエラー
+            BuildFailure: ビルドに失敗した
+            ResultWriteError: JSONの書き出しに失敗した
+        """
+        _, controller, test_cases = self._prepare(
+            time_limit, memory_limit, output_limit
+        )
+
+        with pinned_to_cpu(cpu) as pinned:
+            if pinned is None:
+                print("could not pin to a cpu. timings may be noisy.")
+            else:
+                print(f"pinned to cpu {pinned}.")
+
+            results = [
+                self._benchmark_case(controller, test_case, warmup, repeat, precision)
+                for test_case in test_cases
+            ]
+
+        self._show_benchmark(results)
+
+        if json_file is not None:
+            try:
+                with open(json_file, "wt") as file:
+                    json.dump([result.to_dict() for result in results], file, indent=2)
+            except OSError:
+                raise ResultWriteError(f"{json_file} に書き込めませんでした")
+
+    def _prepare(
+        self,
+        time_limit: Optional[float],
+        memory_limit: Optional[int],
+        output_limit: Optional[int],
+    ) -> Tuple[TaskConfig, ProgramExecutor, List[AtcoderTestCase]]:
+        """設定を読み込んでプログラムをビルドし、実行の準備をする."""
+        task_config = self._read_task_config()
+        test_cases = self._read_test_cases()
+        controller = self._build_controller(
+            task_config, time_limit, memory_limit, output_limit
+        )
+
+        if not controller.build():
+            raise BuildFailure("ビルドに失敗しました")
+
+        return task_config, controller, test_cases
+
+    def _read_task_config(self) -> TaskConfig:
+        try:
+            return self._task_config_repo.read()
         except (repository_error.ReadError, repository_error.ParseError):
             raise ConfigAccessError("設定ファイルの読み込みに失敗しました")
 
-        controller = self._controller_builder.build(task_config.build, task_config.run)
+    def _read_test_cases(self) -> List[AtcoderTestCase]:
+        try:
+            return self._test_case_repo.read()
+        except (repository_error.ReadError, repository_error.ParseError):
+            raise ConfigAccessError("設定ファイルの読み込みに失敗しました")
 
-        controller.build()  # TODO(ビルド失敗で止まるようにする)
+    def _build_controller(
+        self,
+        task_config: TaskConfig,
+        time_limit: Optional[float],
+        memory_limit: Optional[int],
+        output_limit: Optional[int],
+    ) -> ProgramExecutor:
+        """タスク設定とコマンドラインでの上書きから、実行に使うエグゼキューターを作る."""
+        return self._controller_builder.build(
+            task_config.build,
+            task_config.run,
+            **asdict(
+                resolve_limits(task_config, time_limit, memory_limit, output_limit)
+            ),
+            fork_server=task_config.fork_server,
+            preload_modules=task_config.preload_modules,
+            checker=task_config.checker,
+            limit_address_space=task_config.limit_address_space,
+        )
 
-        results = []
-        for test_case in test_cases:
-            print("-----------------------------------")
-            print(f"executing {test_case.name}...")
+    def _benchmark_case(
+        self,
+        controller: ProgramExecutor,
+        test_case: AtcoderTestCase,
+        warmup: int,
+        repeat: int,
+        precision: Optional[float],
+    ) -> AtCoderBenchmarkResult:
+        passing = (AtCoderTestStatus.AC, AtCoderTestStatus.JUSTSHOW)
+        status = AtCoderTestStatus.JUSTSHOW
+        wall_times: List[float] = []
+        cpu_times: List[float] = []
+
+        for run in range(warmup + repeat):
             result = controller.execute(test_case)
-            results.append(result)
-            self._show_result(result)
-        self._show_summary(results)
+            status = result.status
+            if status not in passing:
+                break  # 正しく動かない解答を計測しても意味がない
+            if run < warmup:
+                continue
+
+            wall_times.append(result.wall_time or 0.0)
+            cpu_times.append(result.cpu_time or 0.0)
+            if precision is None or len(wall_times) < self._min_runs_for_precision:
+                continue
+            if relative_confidence_interval(wall_times) <= precision:
+                break
+
+        return AtCoderBenchmarkResult(
+            name=test_case.name,
+            status=status,
+            runs=len(wall_times),
+            outliers=count_outliers(wall_times),
+            wall=TimingStats.of(wall_times) if wall_times else None,
+            cpu=TimingStats.of(cpu_times) if cpu_times else None,
+        )
 
     def _show_result(self, result: AtCoderTestResult) -> None:
         print("-----------------------------------")
-        print(f"{result.name:<15}: {result.status.dyed}")
+        usage = self._format_usage(result)
+        print(f"{result.name:<15}: {result.status.dyed}{usage}")
 
         if result.status == AtCoderTestStatus.JUSTSHOW:
             print("    output:")
             print(indent(result.actual, "       >"))
         if result.status == AtCoderTestStatus.ERROR:
             print(result.error)
+        if result.status == AtCoderTestStatus.TLE:
+            print("    killed by time limit. output so far:")
+            print(indent(result.actual, "       >"))
+        if result.status == AtCoderTestStatus.MLE:
+            print("    exceeded memory limit.")
+            print(result.error)
+        if result.status == AtCoderTestStatus.OLE:
+            print("    killed by output limit.")
+            print(result.error)
         if result.status == AtCoderTestStatus.WA:
             if result.expected is None:
                 raise Exception("internal error")
@@ -108,9 +873,145 @@ class ExecuteTestInteractor:
             print(indent(result.expected, "       >"))
             print("    but got:")
             print(indent(result.actual, "       >"))
+            if result.error:
+                print("    checker:")
+                print(indent(result.error, "       >"))
 
     def _show_summary(self, results: List[AtCoderTestResult]) -> None:
         print("========================================")
         print("SUMMARY:")
         for result in results:
-            print(f"{result.name:<15}: {result.status.dyed}")
+            usage = self._format_usage(result)
+            print(f"{result.name:<15}: {result.status.dyed}{usage}")
+
+    def _show_race(
+        self,
+        names: List[str],
+        built: Dict[str, bool],
+        test_cases: List[AtcoderTestCase],
+        results: Dict[Tuple[str, str], AtCoderTestResult],
+    ) -> None:
+        """ケースを行、言語を列にして、判定と時間[秒]を並べる.
+
+        時間はCPU時間を、計れなかった場合は経過時間を表示する.
+        """
+        width = max([18, *(len(name) + 2 for name in names)])
+
+        def seconds(result: AtCoderTestResult) -> float:
+            if result.cpu_time is not None:
+                return result.cpu_time
+            return result.wall_time or 0.0
+
+        def format_cell(result: Optional[AtCoderTestResult]) -> str:
+            if result is None:
+                return "CE".ljust(width)
+            text = f"{result.status.name:<8} {seconds(result):>7.3f}".ljust(width)
+            # 色付けの制御文字は幅を取らないので、揃えてから染める
+            return result.status.dyed + text.removeprefix(result.status.name)
+
+        print("========================================")
+        print("RACE: [s]")
+        print(f"{'name':<15} " + "".join(name.ljust(width) for name in names))
+        for case in test_cases:
+            cells = [format_cell(results.get((name, case.name))) for name in names]
+            print(f"{case.name:<15} " + "".join(cells))
+
+        passed = []
+        total = []
+        for name in names:
+            if not built[name]:
+                passed.append("CE".ljust(width))
+                total.append("-".ljust(width))
+                continue
+            own = [results[(name, case.name)] for case in test_cases]
+            count = sum(1 for result in own if _is_passed(result))
+            passed.append(f"{count}/{len(own)}".ljust(width))
+            total.append(f"{sum(seconds(result) for result in own):.3f}".ljust(width))
+        print(f"{'passed':<15} " + "".join(passed))
+        print(f"{'total':<15} " + "".join(total))
+
+    def _show_profile(self, case: str, profile: ProfileResult, top: int) -> None:
+        total = sum(profile.stacks.values())
+        print("========================================")
+        print(f"PROFILE: {case} ({profile.profiler}, {total} {profile.unit})")
+        if total == 0:
+            print("no samples were collected. the run may be too short to profile.")
+            return
+
+        print(f"{'self%':>6} {'total%':>6}  function")
+        for hotspot in find_hotspots(profile.stacks, top):
+            print(
+                f"{hotspot.self_weight / total * 100:>6.1f}"
+                f" {hotspot.total_weight / total * 100:>6.1f}  {hotspot.name}"
+            )
+
+    def _show_benchmark(self, results: List[AtCoderBenchmarkResult]) -> None:
+        def format_stats(stats: Optional[TimingStats]) -> str:
+            if stats is None:
+                return f"{'-':>26}"
+            return (
+                f"{stats.min * 1000:>8.1f}"
+                f" {stats.median * 1000:>8.1f}"
+                f" {stats.p95 * 1000:>8.1f}"
+            )
+
+        print("========================================")
+        print("BENCHMARK: [ms]")
+        print(
+            f"{'name':<15} {'runs':>4} {'out':>3}"
+            f" {'wall min':>8} {'median':>8} {'p95':>8}"
+            f" {'cpu min':>8} {'median':>8} {'p95':>8}  status"
+        )
+        for result in results:
+            print(
+                f"{result.name:<15} {result.runs:>4} {result.outliers:>3}"
+                f" {format_stats(result.wall)} {format_stats(result.cpu)}"
+                f"  {result.status.dyed}"
+            )
+
+    @staticmethod
+    def _format_usage(result: AtCoderTestResult) -> str:
+        usages = []
+        if result.cached:
+            usages.append("cached")
+        if result.wall_time is not None:
+            usages.append(f"wall {result.wall_time:.3f}s")
+        if result.cpu_time is not None:
+            usages.append(f"cpu {result.cpu_time:.3f}s")
+        if result.max_rss is not None:
+            usages.append(f"{result.max_rss / 1024:.1f}MiB")
+
+        if not usages:
+            return ""
+        return f" ({', '.join(usages)})"
+
+
+def _is_passed(result: AtCoderTestResult) -> bool:
+    """テストケースを通ったか. 期待する出力がないケースは、実行できれば通ったとみなす."""
+    return result.status in (AtCoderTestStatus.AC, AtCoderTestStatus.JUSTSHOW)
+
+
+def _select_cases(
+    test_cases: List[AtcoderTestCase],
+    previous: Dict[str, CachedTestResult],
+    is_reusable: Callable[[AtcoderTestCase], bool],
+    changed_only: bool,
+    failed_only: bool,
+) -> List[AtcoderTestCase]:
+    """changed_only, failed_only のどちらかに当てはまるケースを選ぶ.
+
+    どちらも指定しなければ、すべてのケースを返す.
+    """
+    if not (changed_only or failed_only):
+        return test_cases
+
+    def has_failed(case: AtcoderTestCase) -> bool:
+        cached = previous.get(case.name)
+        return cached is not None and not _is_passed(cached.result)
+
+    def is_selected(case: AtcoderTestCase) -> bool:
+        if changed_only and not is_reusable(case):
+            return True
+        return failed_only and has_failed(case)
+
+    return [case for case in test_cases if is_selected(case)]
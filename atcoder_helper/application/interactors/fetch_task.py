@@ -1,10 +1,30 @@
 """testcasesを取得し、指定したtestcasesファイルに書き込むサービス."""
+import os
+import string
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from typing import Dict
+from typing import Final
+from typing import List
 from typing import Optional
 from typing import Tuple
+from typing import Union
 
+import requests
 from injector import inject
 
+from atcoder_helper.application.interactors.execute_test import ControllerBuilder
+from atcoder_helper.application.interactors.init_task import task_config_for_language
+from atcoder_helper.application.interactors.util import get_usable_cpu_count
+from atcoder_helper.application.interactors.util import resolve_limits
 from atcoder_helper.application.repositories import errors as repository_error
+from atcoder_helper.application.repositories.atcoder_contest_repo import (
+    AtCoderContestRepository,
+)
+from atcoder_helper.application.repositories.atcoder_helper_config_repo import (
+    ConfigRepository,
+)
 from atcoder_helper.application.repositories.atcoder_test_case_repo import (
     AtCoderTestCaseRepository,
 )
@@ -17,17 +37,35 @@ from atcoder_helper.application.repositories.logged_in_session_repo import (
 from atcoder_helper.application.repositories.task_config_repo import (
     TaskConfigRepository,
 )
+from atcoder_helper.application.repositories.task_repository_factory import (
+    TaskRepositoryFactory,
+)
 from atcoder_helper.application.usecases.errors import AtcoderAccessError
 from atcoder_helper.application.usecases.errors import ConfigAccessError
+from atcoder_helper.entities.atcoder_test_case import AtcoderTestCase
 
 
 class FetchTaskInteractor:
     """atcoderサイトからテストケースを取得するサービス."""
 
+    _max_contest_jobs: Final[int] = 8  # コンテスト全体の取得で、同時に取得するタスク数の既定の上限
+    # contest prepare で、タスクを指定しなかったときに用意するタスク
+    _default_tasks: Final[Dict[str, str]] = {
+        "abc": string.ascii_lowercase[:7],
+        "arc": string.ascii_lowercase[:6],
+        "agc": string.ascii_lowercase[:6],
+    }
+    _start_timeout: Final[float] = 60.0  # 開始後、問題一覧が見えるまで待つ時間[秒]
+    _poll_interval: Final[float] = 1.0  # 問題一覧が見えるまで問い合わせる間隔[秒]
+
     _task_config_repo: TaskConfigRepository
     _test_case_repo: LocalTestCaseRepository
     _session_repo: LoggedInSessionRepository
     _atcoder_testcase_repo: AtCoderTestCaseRepository
+    _repo_factory: TaskRepositoryFactory
+    _config_repo: ConfigRepository
+    _contest_repo: AtCoderContestRepository
+    _controller_builder: ControllerBuilder
 
     @inject
     def __init__(
@@ -36,12 +74,20 @@ class FetchTaskInteractor:
         test_case_repo: LocalTestCaseRepository,
         session_repo: LoggedInSessionRepository,
         atcoder_testcase_repo: AtCoderTestCaseRepository,
+        repo_factory: TaskRepositoryFactory,
+        config_repo: ConfigRepository,
+        contest_repo: AtCoderContestRepository,
+        controller_builder: ControllerBuilder,
     ) -> None:
         """__init__."""
         self._task_config_repo = task_config_repo
         self._test_case_repo = test_case_repo
         self._session_repo = session_repo
         self._atcoder_testcase_repo = atcoder_testcase_repo
+        self._repo_factory = repo_factory
+        self._config_repo = config_repo
+        self._contest_repo = contest_repo
+        self._controller_builder = controller_builder
 
     def fetch_task(
         self,
@@ -77,6 +123,279 @@ class FetchTaskInteractor:
         except repository_error.WriteError as e:
             raise ConfigAccessError("テストケースの書き込みに失敗しました") from e
 
+    def fetch_contest(self, contest: Optional[str], jobs: Optional[int] = None) -> None:
+        """コンテストのすべてのタスクのtestcasesを並行して取得し、タスクごとに書き込む.
+
+        タスクは問題一覧から見つけ、<contest>/<task> ディレクトリの testcases ファイルに
+        書き込む. タスクディレクトリがなければ、task create と同じように初期化する.
+        取得に失敗したタスクがあっても、取得できたタスクは書き込む.
+
+        Args:
+            contest (Optional[str]): コンテスト名. Defaults to None (タスク設定の値)
+            jobs (Optional[int]): 同時に取得するタスク数. Defaults to None (タスク数. 最大8)
+
+        Raises:
+            AtcoderAccessError: 問題一覧を取得できなかった・取得に失敗したタスクがある
+            ConfigAccessError: 設定ファイルの読み書きのエラー
+        """
+        if contest is None:
+            contest = self._get_contest()
+
+        session = self._read_session()
+
+        try:
+            tasks = self._atcoder_testcase_repo.fetch_tasks(session, contest)
+        except (repository_error.ConnectionError, repository_error.ParseError) as e:
+            raise AtcoderAccessError("問題一覧の取得に失敗しました") from e
+
+        self._fetch_contest_tasks(session, contest, tasks, jobs)
+
+    def prepare_contest(
+        self,
+        contest: str,
+        tasks: Optional[List[str]] = None,
+        jobs: Optional[int] = None,
+        warm_up: float = 10.0,
+    ) -> None:
+        """開始前のコンテストを用意して開始を待ち、開始と同時にすべてのタスクを取得する.
+
+        開始時刻をコンテストのページから読み、開始までに次のことを済ませる.
+            - <contest>/<task> ディレクトリを task create と同じように作る
+            - 作ったディレクトリでテンプレートをビルドする
+            - 開始の warm_up 秒前に、名前解決・TLS ハンドシェイクを済ませた接続を
+              jobs 本開いておく
+        開始したら問題一覧が見えるまで問い合わせ、fetch_contest と同じように取得する.
+        既に始まっていれば、すぐに fetch_contest と同じように取得する.
+
+        Args:
+            contest (str): コンテスト名
+            tasks (Optional[List[str]]): 用意するタスク名.
+                Defaults to None (abc なら a-g、arc, agc なら a-f)
+            jobs (Optional[int]): 同時に取得するタスク数.
+                Defaults to None (用意するタスク数. 最大8)
+            warm_up (float): 開始の何秒前に接続を開くか. Defaults to 10.0
+
+        Raises:
+            AtcoderAccessError: 開始時刻・問題一覧を取得できなかった・
+                取得に失敗したタスクがある
+            ConfigAccessError: 設定ファイルの読み書きのエラー・用意するタスクが分からない
+        """
+        session = self._read_session()
+
+        try:
+            start = self._contest_repo.fetch_start_time(session, contest)
+        except (repository_error.ConnectionError, repository_error.ParseError) as e:
+            raise AtcoderAccessError("開始時刻の取得に失敗しました") from e
+
+        if start.timestamp() <= time.time():
+            print(f"{contest} は既に始まっています")
+            self.fetch_contest(contest, jobs=jobs)
+            return
+
+        if tasks is None:
+            tasks = self._guess_tasks(contest)
+        if jobs is None:
+            jobs = min(len(tasks), self._max_contest_jobs)
+        print(f"{contest} は {start.astimezone():%Y-%m-%d %H:%M:%S} に始まります")
+
+        task_dirs = self._prepare_task_dirs(contest, tasks)
+        self._build_task_dirs(task_dirs)
+
+        _sleep_until(start.timestamp() - warm_up)
+        connections = self._contest_repo.warm_up(session, contest, jobs)
+        print(f"{connections}/{jobs} 本の接続を開きました")
+
+        _sleep_until(start.timestamp())
+        fetched_tasks = self._wait_for_tasks(session, contest)
+        unused = [task for task in tasks if task not in fetched_tasks]
+        if unused:
+            print(f"{', '.join(unused)} はこのコンテストにありません")
+        self._fetch_contest_tasks(session, contest, fetched_tasks, jobs)
+
+    def _read_session(self) -> requests.Session:
+        """ログイン済みのセッションを読み込む.
+
+        Raises:
+            ConfigAccessError: セッションを読み込めない
+        """
+        try:
+            return self._session_repo.read()
+        except repository_error.ReadError as e:
+            raise ConfigAccessError("セッションの読み込みに失敗") from e
+
+    def _fetch_contest_tasks(
+        self,
+        session: requests.Session,
+        contest: str,
+        tasks: List[str],
+        jobs: Optional[int],
+    ) -> None:
+        """タスクのtestcasesを並行して取得し、タスクごとに書き込む.
+
+        Raises:
+            AtcoderAccessError: 取得に失敗したタスクがある
+            ConfigAccessError: 設定ファイルの読み書きのエラー
+        """
+        if jobs is None:
+            jobs = min(len(tasks), self._max_contest_jobs)
+        test_cases = self._atcoder_testcase_repo.fetch_contest_test_cases(
+            session, contest, tasks, jobs
+        )
+
+        failed = self._write_contest(contest, tasks, test_cases)
+        if failed:
+            raise AtcoderAccessError(
+                f"{', '.join(failed)} のテストケースの取得に失敗しました"
+            )
+
+    def _guess_tasks(self, contest: str) -> List[str]:
+        """コンテストの種類から、用意するタスクを決める.
+
+        Raises:
+            ConfigAccessError: 知らない種類のコンテスト
+        """
+        for prefix, tasks in self._default_tasks.items():
+            if contest.startswith(prefix):
+                return list(tasks)
+        raise ConfigAccessError(f"{contest} のタスクを指定してください")
+
+    def _prepare_task_dirs(self, contest: str, tasks: List[str]) -> List[str]:
+        """まだないタスクディレクトリを作り、作ったディレクトリを返す.
+
+        Raises:
+            ConfigAccessError: 設定ファイルの読み書きのエラー
+        """
+        existing_dirs = self._repo_factory.find_task_dirs(contest)
+        task_dirs = []
+        for task in tasks:
+            task_dir = os.path.join(contest, task)
+            if task_dir not in existing_dirs:
+                self._init_task_dir(task_dir, contest, task)
+                task_dirs.append(task_dir)
+        return task_dirs
+
+    def _build_task_dirs(self, task_dirs: List[str]) -> None:
+        """タスクディレクトリのテンプレートを並行してビルドする.
+
+        ビルドの結果は次の exec で再利用され、コンパイラなどもディスクキャッシュに載る.
+        失敗しても、表示するだけで続ける.
+        """
+
+        def build(task_dir: str) -> bool:
+            try:
+                task_config = self._repo_factory.task_config_repo(task_dir).read()
+            except (repository_error.ReadError, repository_error.ParseError):
+                return False
+            controller = self._controller_builder.build(
+                task_config.build,
+                task_config.run,
+                **asdict(resolve_limits(task_config)),
+                fork_server=task_config.fork_server,
+                preload_modules=task_config.preload_modules,
+                checker=task_config.checker,
+                limit_address_space=task_config.limit_address_space,
+                task_dir=task_dir,
+            )
+            return controller.build()
+
+        with ThreadPoolExecutor(max_workers=get_usable_cpu_count()) as pool:
+            for task_dir, built in zip(task_dirs, pool.map(build, task_dirs)):
+                print(f"{task_dir}: {'built' if built else 'ビルドに失敗しました'}")
+
+    def _wait_for_tasks(self, session: requests.Session, contest: str) -> List[str]:
+        """問題一覧が見えるようになるまで問い合わせる.
+
+        開始前に取得した問題一覧が残っていても使わないよう、キャッシュは通さない.
+
+        Raises:
+            AtcoderAccessError: 開始から _start_timeout 秒たっても見えない
+        """
+        deadline = time.time() + self._start_timeout
+        while True:
+            try:
+                return self._atcoder_testcase_repo.fetch_tasks(
+                    session, contest, use_cache=False
+                )
+            except (
+                repository_error.ConnectionError,
+                repository_error.ParseError,
+            ) as e:
+                if time.time() >= deadline:
+                    raise AtcoderAccessError("問題一覧の取得に失敗しました") from e
+            time.sleep(self._poll_interval)
+
+    def _write_contest(
+        self,
+        contest: str,
+        tasks: List[str],
+        test_cases: Dict[str, Union[List[AtcoderTestCase], Exception]],
+    ) -> List[str]:
+        """取得できたタスクのtestcasesを書き込み、取得に失敗したタスクを返す.
+
+        取得に失敗したタスクは、理由とともに表示する.
+
+        Raises:
+            ConfigAccessError: 設定ファイルの読み書きのエラー
+        """
+        existing_dirs = self._repo_factory.find_task_dirs(contest)
+        failed = []
+        for task in tasks:
+            task_dir = os.path.join(contest, task)
+            fetched = test_cases.get(task)
+            if not isinstance(fetched, list):
+                reason = "" if fetched is None else f": {_describe_error(fetched)}"
+                print(f"{task}: テストケースの取得に失敗しました{reason}")
+                failed.append(task)
+                continue
+            if task_dir not in existing_dirs:
+                self._init_task_dir(task_dir, contest, task)
+            try:
+                self._repo_factory.test_case_repo(task_dir).write(fetched)
+            except repository_error.WriteError as e:
+                raise ConfigAccessError("テストケースの書き込みに失敗しました") from e
+            print(f"{task}: {len(fetched)} cases -> {task_dir}")
+        return failed
+
+    def _init_task_dir(self, task_dir: str, contest: str, task: str) -> None:
+        """新しいタスクディレクトリを、task create と同じように初期化する.
+
+        Raises:
+            ConfigAccessError: 設定ファイルの読み書きのエラー
+        """
+        try:
+            language_config = self._config_repo.read().default_language_config
+        except (repository_error.ReadError, repository_error.ParseError) as e:
+            raise ConfigAccessError("全体設定ファイルの読み込みに失敗しました") from e
+
+        try:
+            self._repo_factory.task_config_repo(task_dir).write(
+                task_config_for_language(language_config, contest, task),
+                template_dir=language_config.resolved_template_dir,
+                target_dir=task_dir,
+            )
+        except repository_error.DirectoryNotEmpty:
+            pass  # 手で作ったディレクトリ. testcases だけ書き込む
+        except (repository_error.WriteError, repository_error.CopyError) as e:
+            raise ConfigAccessError(f"{task_dir} を初期化できませんでした") from e
+
+    def _get_contest(self) -> str:
+        """タスク設定からcontestを得る.
+
+        Raises:
+            ConfigAccessError: 設定に問題がある
+
+        Returns:
+            str: contest
+        """
+        try:
+            contest = self._task_config_repo.read().contest
+        except (repository_error.ReadError, repository_error.ParseError) as e:
+            raise ConfigAccessError("設定ファイルの読み込みに失敗しました") from e
+
+        if contest is None:
+            raise ConfigAccessError("contest is not set.")
+        return contest
+
     def _get_task_info(
         self, given_contest: Optional[str], given_task: Optional[str]
     ) -> Tuple[str, str]:
@@ -103,3 +422,24 @@ class FetchTaskInteractor:
             raise ConfigAccessError("task is not set.")
 
         return (contest, task)
+
+
+def _sleep_until(deadline: float) -> None:
+    """UNIX時間 deadline まで待つ.
+
+    スリープ中に時計が合わせられても遅れないよう、少しずつ区切って待つ.
+    """
+    while True:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return
+        time.sleep(min(remaining, 30.0))
+
+
+def _describe_error(error: Exception) -> str:
+    """エラーを1行で説明する. 元になったエラーがあれば添える."""
+    description = str(error) or type(error).__name__
+    cause = error.__cause__
+    if cause is not None and str(cause):
+        description += f" ({type(cause).__name__}: {cause})"
+    return description
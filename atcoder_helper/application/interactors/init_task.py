@@ -7,35 +7,75 @@ import atcoder_helper.application.repositories.errors as repo_errors
 from atcoder_helper.application.repositories.atcoder_helper_config_repo import (
     ConfigRepository,
 )
+from atcoder_helper.application.repositories.atcoder_test_case_repo import (
+    AtCoderTestCaseRepository,
+)
 from atcoder_helper.application.repositories.errors import ParseError
 from atcoder_helper.application.repositories.errors import ReadError
 from atcoder_helper.application.repositories.task_config_repo import (
     TaskConfigRepository,
 )
+from atcoder_helper.application.repositories.task_repository_factory import (
+    TaskRepositoryFactory,
+)
 from atcoder_helper.application.usecases.errors import ConfigAccessError
+from atcoder_helper.entities.atcoder_helper_config import LanguageConfig
 from atcoder_helper.entities.atcoder_task_config import TaskConfig
 
 
+def task_config_for_language(
+    language_config: LanguageConfig, contest: Optional[str], task: Optional[str]
+) -> TaskConfig:
+    """言語設定を引き継いだ、新しいタスクディレクトリの設定を作る.
+
+    Args:
+        language_config (LanguageConfig): 言語設定
+        contest (Optional[str]): コンテスト名
+        task (Optional[str]): タスク名
+
+    Returns:
+        TaskConfig: タスク設定
+    """
+    return TaskConfig(
+        build=language_config.build,
+        run=language_config.run,
+        contest=contest,
+        task=task,
+        fork_server=bool(language_config.fork_server),
+        preload_modules=language_config.preload_modules or [],
+        limit_address_space=language_config.limit_address_space is not False,
+        profiler=language_config.profiler,
+    )
+
+
 class InitTaskDirInteractor:
     """TaskDirectoryを初期化するサービス."""
 
     _atcoder_helper_config_repo: ConfigRepository
     _task_config_repo: TaskConfigRepository
+    _atcoder_testcase_repo: AtCoderTestCaseRepository
+    _repo_factory: TaskRepositoryFactory
 
     @inject
     def __init__(
         self,
         atcoder_helper_config_repo: ConfigRepository,
         task_config_repo: TaskConfigRepository,
+        atcoder_testcase_repo: AtCoderTestCaseRepository,
+        repo_factory: TaskRepositoryFactory,
     ):
         """__init.
 
         Args:
             atcoder_helper_config_repo (ConfigRepository): _
             task_config_repo (TaskConfigRepository): _
+            atcoder_testcase_repo (AtCoderTestCaseRepository): _
+            repo_factory (TaskRepositoryFactory): _
         """
         self._atcoder_helper_config_repo = atcoder_helper_config_repo
         self._task_config_repo = task_config_repo
+        self._atcoder_testcase_repo = atcoder_testcase_repo
+        self._repo_factory = repo_factory
 
     def init_task(
         self,
@@ -45,6 +85,8 @@ class InitTaskDirInteractor:
     ) -> None:
         """taskディレクトリを初期化します.
 
+        以前に取得したことのある問題なら、通信せずにキャッシュからテストケースも書き込む.
+
         Raises:
             DirectoryNotEmpty: 作成しようとしているディレクトリが空でない
             ConfigAccessError: 設定ファイルの読み書きに失敗
@@ -56,12 +98,7 @@ class InitTaskDirInteractor:
         except (ReadError, ParseError) as e:
             raise ConfigAccessError("全体設定ファイルの読み込みに失敗しました") from e
 
-        task_config = TaskConfig(
-            build=language_config.build,
-            run=language_config.run,
-            contest=contest,
-            task=task,
-        )
+        task_config = task_config_for_language(language_config, contest, task)
 
         try:
             self._task_config_repo.write(
@@ -75,3 +112,20 @@ class InitTaskDirInteractor:
             raise ConfigAccessError("タスク設定ファイルの書き込みに失敗しました") from e
         except repo_errors.CopyError as e:
             raise ConfigAccessError("テンプレートによる初期化に失敗しました") from e
+
+        if contest is not None and task is not None:
+            self._write_cached_test_cases(dir or ".", contest, task)
+
+    def _write_cached_test_cases(self, dir: str, contest: str, task: str) -> None:
+        """以前に取得したテストケースがあれば書き込む.
+
+        Raises:
+            ConfigAccessError: テストケースの書き込みに失敗
+        """
+        test_cases = self._atcoder_testcase_repo.cached_test_cases(contest, task)
+        if test_cases is None:
+            return
+        try:
+            self._repo_factory.test_case_repo(dir).write(test_cases)
+        except repo_errors.WriteError as e:
+            raise ConfigAccessError("テストケースの書き込みに失敗しました") from e
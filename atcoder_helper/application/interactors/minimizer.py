@@ -0,0 +1,153 @@
+"""解答が誤る入力を、誤ったまま小さくする.
+
+delta debugging の要領で、大きな塊を取り除く候補から順に試し、誤りが再現する候補が
+見つかったらそれを新しい入力にして最初からやり直す. 候補は jobs 個ずつまとめて並列に
+評価し、その中で最も先に並んでいるものを採用するので、結果は並列度によらない.
+
+入力の形式を知らなくても使えるよう、行の削除と整数の縮小だけを行う.
+形式のヒントが与えられた場合は、それに沿った候補も試す.
+"""
+
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Callable
+from typing import Final
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import TypeVar
+
+from atcoder_helper.application.usecases.stress_test import COUNTED_LIST
+
+T = TypeVar("T")
+
+_TOKEN: Final[re.Pattern[str]] = re.compile(r"\S+")
+_INTEGER: Final[re.Pattern[str]] = re.compile(r"-?\d+")
+
+
+def minimize(
+    given: str,
+    is_failing: Callable[[str], bool],
+    jobs: int,
+    time_budget: float,
+    format_hint: Optional[str] = None,
+) -> str:
+    """誤りが再現する範囲で、入力をできるだけ小さくする.
+
+    Args:
+        given (str): 誤りが再現する入力
+        is_failing (Callable[[str], bool]): 入力に対して誤りが再現するかを返す.
+            複数のスレッドから同時に呼ばれる
+        jobs (int): 同時に評価する候補の数
+        time_budget (float): 縮小にかける時間[秒]. 超えたらその時点の入力を返す
+        format_hint (Optional[str]): 入力形式のヒント (FORMAT_HINTS のいずれか). Defaults to None
+
+    Returns:
+        str: 誤りが再現する、最も小さい入力
+    """
+    deadline = time.monotonic() + time_budget
+    jobs = max(1, jobs)
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        improved = True
+        while improved and time.monotonic() < deadline:
+            improved = False
+            candidates = _candidates(given, format_hint)
+            while time.monotonic() < deadline:
+                batch = list(islice(candidates, jobs))
+                if not batch:
+                    break
+                failing = [
+                    candidate
+                    for candidate, fails in zip(batch, pool.map(is_failing, batch))
+                    if fails
+                ]
+                if failing:
+                    given = failing[0]
+                    improved = True
+                    break
+
+    return given
+
+
+def _candidates(given: str, format_hint: Optional[str]) -> Iterator[str]:
+    """小さくした入力の候補を、効果の大きいものから順に返す."""
+    if format_hint == COUNTED_LIST and _parse_counted_list(given) is not None:
+        yield from _counted_list_candidates(given)
+        yield from _integer_candidates(given, skip=1)  # 先頭の N は要素数と連動する
+    else:
+        yield from _line_candidates(given)
+        yield from _integer_candidates(given, skip=0)
+
+
+def _remove_chunks(items: Sequence[T]) -> Iterator[List[T]]:
+    """連続する塊を1つ取り除いたものを、塊の大きいものから順に返す."""
+    if not items:
+        return
+
+    granularity = 2
+    while True:
+        size = -(-len(items) // granularity)  # 切り上げ
+        for start in range(0, len(items), size):
+            end = start + size
+            yield [*items[:start], *items[end:]]
+        if size <= 1:
+            return
+        granularity *= 2
+
+
+def _line_candidates(given: str) -> Iterator[str]:
+    lines = given.splitlines()
+    if len(lines) <= 1:
+        return
+    for remaining in _remove_chunks(lines):
+        yield _join_lines(remaining)
+
+
+def _parse_counted_list(given: str) -> Optional[List[str]]:
+    """N に続いて N 個の数が並んでいれば、その数の列を返す."""
+    tokens = given.split()
+    if not tokens or not _INTEGER.fullmatch(tokens[0]):
+        return None
+    if int(tokens[0]) != len(tokens) - 1:
+        return None
+    return tokens[1:]
+
+
+def _counted_list_candidates(given: str) -> Iterator[str]:
+    elements = _parse_counted_list(given)
+    if not elements:
+        return
+    # 要素が1行に並んでいたか、1行に1つずつだったかを保つ
+    one_line = len(given.splitlines()) <= 2
+    for remaining in _remove_chunks(elements):
+        if one_line:
+            yield _join_lines([str(len(remaining)), " ".join(remaining)])
+        else:
+            yield _join_lines([str(len(remaining)), *remaining])
+
+
+def _integer_candidates(given: str, skip: int) -> Iterator[str]:
+    """整数のトークンを、1つずつ絶対値の小さい値に置き換えたものを返す."""
+    for index, match in enumerate(_TOKEN.finditer(given)):
+        if index < skip or not _INTEGER.fullmatch(match.group()):
+            continue
+        start, end = match.span()
+        head, tail = given[:start], given[end:]
+        for smaller in _smaller_integers(int(match.group())):
+            yield head + str(smaller) + tail
+
+
+def _smaller_integers(value: int) -> List[int]:
+    candidates = [0, 1, value // 2 if value > 0 else -(-value // 2)]
+    return sorted(
+        {candidate for candidate in candidates if abs(candidate) < abs(value)},
+        key=abs,
+    )
+
+
+def _join_lines(lines: Sequence[str]) -> str:
+    return "".join(line + "\n" for line in lines)
@@ -0,0 +1,298 @@
+"""複数のタスクディレクトリで、取得・ビルド・実行を並行して進めるサービス."""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+from typing import List
+from typing import Optional
+
+import requests
+from injector import inject
+
+from atcoder_helper.application.interactors.execute_test import ControllerBuilder
+from atcoder_helper.application.interactors.util import get_usable_cpu_count
+from atcoder_helper.application.interactors.util import resolve_limits
+from atcoder_helper.application.repositories import errors as repository_error
+from atcoder_helper.application.repositories.atcoder_test_case_repo import (
+    AtCoderTestCaseRepository,
+)
+from atcoder_helper.application.repositories.logged_in_session_repo import (
+    LoggedInSessionRepository,
+)
+from atcoder_helper.application.repositories.task_repository_factory import (
+    TaskRepositoryFactory,
+)
+from atcoder_helper.application.usecases.errors import ConfigAccessError
+from atcoder_helper.entities.atcoder_task_config import TaskConfig
+from atcoder_helper.entities.atcoder_test_case import AtcoderTestCase
+from atcoder_helper.entities.atcoder_test_case import AtCoderTestResult
+from atcoder_helper.entities.atcoder_test_case import AtCoderTestStatus
+from atcoder_helper.program_executor import ProgramExecutor
+
+
+@dataclass
+class _StageLimits:
+    """段階ごとに、同時に進める数の上限."""
+
+    fetch: asyncio.Semaphore
+    build: asyncio.Semaphore
+    run: asyncio.Semaphore
+
+
+@dataclass
+class _TaskOutcome:
+    """1つのタスクディレクトリを処理した結果."""
+
+    task_dir: str
+    fetched: Optional[bool] = None  # 取得しなかった場合は None
+    built: Optional[bool] = None  # ビルドまで進まなかった場合は None
+    results: List[AtCoderTestResult] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    elapsed: float = 0.0  # [秒]
+
+    @property
+    def passed(self) -> bool:
+        """エラーなく、すべてのケースを通ったか."""
+        return not self.errors and all(
+            result.status in (AtCoderTestStatus.AC, AtCoderTestStatus.JUSTSHOW)
+            for result in self.results
+        )
+
+
+class PipelineInteractor:
+    """複数のタスクディレクトリで、取得・ビルド・実行を並行して進めるサービス.
+
+    リポジトリとエグゼキューターはブロッキングな API なので、asyncio のイベントループから
+    スレッドに逃がして呼び出し、段階ごとの上限はセマフォで守る. 実行そのものは
+    子プロセスで行われるので、スレッドで並べてもCPUを使い切れる.
+    """
+
+    _repo_factory: TaskRepositoryFactory
+    _session_repo: LoggedInSessionRepository
+    _atcoder_testcase_repo: AtCoderTestCaseRepository
+    _controller_builder: ControllerBuilder
+
+    @inject
+    def __init__(
+        self,
+        repo_factory: TaskRepositoryFactory,
+        session_repo: LoggedInSessionRepository,
+        atcoder_testcase_repo: AtCoderTestCaseRepository,
+        controller_builder: ControllerBuilder,
+    ):
+        """__init__.
+
+        Args:
+            repo_factory (TaskRepositoryFactory): _
+            session_repo (LoggedInSessionRepository): _
+            atcoder_testcase_repo (AtCoderTestCaseRepository): _
+            controller_builder (ControllerBuilder): _
+        """
+        self._repo_factory = repo_factory
+        self._session_repo = session_repo
+        self._atcoder_testcase_repo = atcoder_testcase_repo
+        self._controller_builder = controller_builder
+
+    def run_tasks(
+        self,
+        task_dirs: Optional[List[str]] = None,
+        fetch: bool = False,
+        fetch_jobs: int = 2,
+        build_jobs: Optional[int] = None,
+        run_jobs: Optional[int] = None,
+    ) -> bool:
+        """タスクディレクトリごとにテストケースを取得し、ビルドしてテストを実行する.
+
+        Args:
+            task_dirs (Optional[List[str]]): タスクディレクトリ.
+                Defaults to None (カレントディレクトリ直下のすべてのタスクディレクトリ)
+            fetch (bool): 実行の前に AtCoder からテストケースを取得するか. Defaults to False
+            fetch_jobs (int): 同時に取得するタスク数. Defaults to 2
+            build_jobs (Optional[int]): 同時にビルドするタスク数. Defaults to None (使えるCPU数)
+            run_jobs (Optional[int]): 同時に実行するケース数. Defaults to None (使えるCPU数)
+
+        Raises:
+            ConfigAccessError: タスクディレクトリやセッションが見つからない
+
+        Returns:
+            bool: すべてのタスクで、すべてのケースを通ったか
+        """
+        if not task_dirs:
+            task_dirs = self._repo_factory.find_task_dirs(".")
+        if not task_dirs:
+            raise ConfigAccessError("タスクディレクトリが見つかりません")
+
+        session = None
+        if fetch:
+            try:
+                session = self._session_repo.read()
+            except repository_error.ReadError as e:
+                raise ConfigAccessError("セッションの読み込みに失敗") from e
+
+        usable_cpus = get_usable_cpu_count()
+        outcomes = asyncio.run(
+            self._run_all(
+                task_dirs,
+                session,
+                max(1, fetch_jobs),
+                max(1, build_jobs or usable_cpus),
+                max(1, run_jobs or usable_cpus),
+            )
+        )
+        self._show_summary(outcomes)
+        return all(outcome.passed for outcome in outcomes)
+
+    async def _run_all(
+        self,
+        task_dirs: List[str],
+        session: Optional[requests.Session],
+        fetch_jobs: int,
+        build_jobs: int,
+        run_jobs: int,
+    ) -> List[_TaskOutcome]:
+        # 既定のエグゼキューターのスレッド数では、上限まで並べられないことがある
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(
+            ThreadPoolExecutor(max_workers=fetch_jobs + build_jobs + run_jobs)
+        )
+        limits = _StageLimits(
+            fetch=asyncio.Semaphore(fetch_jobs),
+            build=asyncio.Semaphore(build_jobs),
+            run=asyncio.Semaphore(run_jobs),
+        )
+        return list(
+            await asyncio.gather(
+                *(self._process(task_dir, session, limits) for task_dir in task_dirs)
+            )
+        )
+
+    async def _process(
+        self,
+        task_dir: str,
+        session: Optional[requests.Session],
+        limits: _StageLimits,
+    ) -> _TaskOutcome:
+        """1つのタスクディレクトリで、取得とビルドを同時に進めてからテストを実行する."""
+        outcome = _TaskOutcome(task_dir)
+        start = time.perf_counter()
+        try:
+            try:
+                task_config = self._repo_factory.task_config_repo(task_dir).read()
+            except (repository_error.ReadError, repository_error.ParseError):
+                outcome.errors.append("設定ファイルの読み込みに失敗しました")
+                return outcome
+
+            fetching = None
+            if session is not None:
+                fetching = asyncio.create_task(
+                    self._fetch(task_dir, task_config, session, limits.fetch, outcome)
+                )
+
+            controller = self._controller_builder.build(
+                task_config.build,
+                task_config.run,
+                **asdict(resolve_limits(task_config)),
+                fork_server=task_config.fork_server,
+                preload_modules=task_config.preload_modules,
+                checker=task_config.checker,
+                limit_address_space=task_config.limit_address_space,
+                task_dir=task_dir,
+            )
+            async with limits.build:
+                outcome.built = await asyncio.to_thread(controller.build)
+
+            if fetching is not None:
+                await fetching
+            if not outcome.built:
+                outcome.errors.append("ビルドに失敗しました")
+                return outcome
+
+            try:
+                test_cases = self._repo_factory.test_case_repo(task_dir).read()
+            except (repository_error.ReadError, repository_error.ParseError):
+                outcome.errors.append("テストケースの読み込みに失敗しました")
+                return outcome
+
+            outcome.results = list(
+                await asyncio.gather(
+                    *(
+                        self._run_case(task_dir, controller, case, limits.run)
+                        for case in test_cases
+                    )
+                )
+            )
+            return outcome
+        finally:
+            outcome.elapsed = time.perf_counter() - start
+
+    async def _fetch(
+        self,
+        task_dir: str,
+        task_config: TaskConfig,
+        session: requests.Session,
+        limit: asyncio.Semaphore,
+        outcome: _TaskOutcome,
+    ) -> None:
+        """テストケースを取得して書き込む. 失敗しても、手元のテストケースで実行は続ける."""
+        outcome.fetched = False
+        if task_config.contest is None or task_config.task is None:
+            outcome.errors.append("contest と task が設定されていません")
+            return
+
+        async with limit:
+            try:
+                test_cases = await asyncio.to_thread(
+                    self._atcoder_testcase_repo.fetch_test_cases,
+                    session=session,
+                    contest=task_config.contest,
+                    task=task_config.task,
+                )
+            except (repository_error.ConnectionError, repository_error.ParseError):
+                outcome.errors.append("テストケースの取得に失敗しました")
+                return
+
+        try:
+            self._repo_factory.test_case_repo(task_dir).write(test_cases)
+        except repository_error.WriteError:
+            outcome.errors.append("テストケースの書き込みに失敗しました")
+            return
+
+        outcome.fetched = True
+        print(f"{task_dir}: fetched {len(test_cases)} test cases.")
+
+    async def _run_case(
+        self,
+        task_dir: str,
+        controller: ProgramExecutor,
+        test_case: AtcoderTestCase,
+        limit: asyncio.Semaphore,
+    ) -> AtCoderTestResult:
+        async with limit:
+            result = await asyncio.to_thread(controller.execute, test_case)
+        wall = "" if result.wall_time is None else f" ({result.wall_time:.3f}s)"
+        print(f"{task_dir}/{result.name}: {result.status.dyed}{wall}")
+        return result
+
+    def _show_summary(self, outcomes: List[_TaskOutcome]) -> None:
+        def mark(done: Optional[bool]) -> str:
+            return "-" if done is None else ("ok" if done else "NG")
+
+        print("========================================")
+        print("SUMMARY:")
+        print(f"{'task':<15} {'fetch':>5} {'build':>5} {'passed':>8} {'time':>8}")
+        for outcome in outcomes:
+            passed = sum(
+                result.status in (AtCoderTestStatus.AC, AtCoderTestStatus.JUSTSHOW)
+                for result in outcome.results
+            )
+            print(
+                f"{outcome.task_dir:<15} {mark(outcome.fetched):>5}"
+                f" {mark(outcome.built):>5}"
+                f" {f'{passed}/{len(outcome.results)}':>8}"
+                f" {outcome.elapsed:>7.2f}s"
+            )
+            for error in outcome.errors:
+                print(f"    {error}")
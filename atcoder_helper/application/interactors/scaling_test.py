@@ -0,0 +1,243 @@
+"""入力サイズを変えながら解答を実行し、計算量を推定するサービス."""
+
+import os
+import tempfile
+from dataclasses import asdict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from injector import inject
+
+from atcoder_helper.application.interactors.execute_test import ControllerBuilder
+from atcoder_helper.application.interactors.util import pinned_to_cpu
+from atcoder_helper.application.interactors.util import resolve_limits
+from atcoder_helper.application.repositories import errors as repository_error
+from atcoder_helper.application.repositories.task_config_repo import (
+    TaskConfigRepository,
+)
+from atcoder_helper.application.usecases.errors import BuildFailure
+from atcoder_helper.application.usecases.errors import ConfigAccessError
+from atcoder_helper.application.usecases.errors import HelperProgramFailure
+from atcoder_helper.application.usecases.errors import MissingDependency
+from atcoder_helper.entities.atcoder_complexity import ComplexityFit
+from atcoder_helper.entities.atcoder_complexity import can_fit_complexity
+from atcoder_helper.entities.atcoder_complexity import choose_best_fit
+from atcoder_helper.entities.atcoder_complexity import fit_complexity
+from atcoder_helper.entities.atcoder_test_case import AtcoderTestCase
+from atcoder_helper.entities.atcoder_test_case import AtCoderTestStatus
+from atcoder_helper.program_executor import ProgramExecutor
+
+
+class ScalingTestInteractor:
+    """入力サイズを変えながら解答を実行し、計算量を推定するサービス."""
+
+    # 曲線を当てはめるのに必要な計測点の数
+    _min_points = 3
+    # 計測できるCPU時間の下限[秒]. 相対誤差で当てはめるので 0 は扱えない
+    _min_time = 1e-4
+    # 結果に表示する当てはめの数
+    _shown_fits = 5
+
+    _task_config_repo: TaskConfigRepository
+    _controller_builder: ControllerBuilder
+
+    @inject
+    def __init__(
+        self,
+        task_config_repo: TaskConfigRepository,
+        controller_builder: ControllerBuilder,
+    ):
+        """__init__.
+
+        Args:
+            task_config_repo (TaskConfigRepository): _
+            controller_builder (ControllerBuilder): _
+        """
+        self._task_config_repo = task_config_repo
+        self._controller_builder = controller_builder
+
+    def scaling_test(
+        self,
+        generator: List[str],
+        max_n: int,
+        min_n: Optional[int] = None,
+        up_to: Optional[int] = None,
+        steps: int = 8,
+        repeat: int = 3,
+        time_limit: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+        output_limit: Optional[int] = None,
+    ) -> bool:
+        """等比数列の入力サイズで解答のCPU時間を計り、計算量の曲線を当てはめる.
+
+        当てはめた曲線で最大制約での実行時間を見積もり、実行時間制限と比べる.
+        実行時間制限を超えた入力サイズがあれば、それより大きいサイズは試さない.
+
+        Args:
+            generator (List[str]): 入力生成器の実行コマンド. 末尾に入力サイズが付け足される
+            max_n (int): 入力サイズの最大制約
+            min_n (Optional[int]): 最小の入力サイズ. Defaults to None (up_to の 1/1000)
+            up_to (Optional[int]): 実際に試す最大の入力サイズ. Defaults to None (max_n)
+            steps (int): 試す入力サイズの数. Defaults to 8
+            repeat (int): 入力サイズごとの実行回数. 最小のCPU時間を使う. Defaults to 3
+            time_limit (Optional[float]): 解答の実行時間制限[秒]. Defaults to None (タスク設定の値)
+            memory_limit (Optional[int]): 解答のメモリ制限[MiB]. Defaults to None (タスク設定の値)
+            output_limit (Optional[int]): 解答の出力サイズ制限[MiB]. Defaults to None (タスク設定の値)
+
+        Raises:
+            ConfigAccessError: 設定ファイル読み書きのエラー
+            BuildFailure: ビルドに失敗した
+            HelperProgramFailure: 入力生成器の実行に失敗した
+            MissingDependency: numpy がインストールされていない
+
+        Returns:
+            bool: 最大制約での実行時間の見積もりが、実行時間制限に収まったか
+        """
+        if not can_fit_complexity():
+            raise MissingDependency(
+                "計算量の推定には numpy が必要です"
+                " (pip install 'atcoder_helper[scaling]')"
+            )
+
+        try:
+            task_config = self._task_config_repo.read()
+        except (repository_error.ReadError, repository_error.ParseError):
+            raise ConfigAccessError("設定ファイルの読み込みに失敗しました")
+
+        limits = resolve_limits(task_config, time_limit, memory_limit, output_limit)
+        time_limit = limits.time_limit
+        solution = self._controller_builder.build(
+            task_config.build,
+            task_config.run,
+            **asdict(limits),
+            fork_server=task_config.fork_server,
+            preload_modules=task_config.preload_modules,
+            checker=task_config.checker,
+            limit_address_space=task_config.limit_address_space,
+        )
+        if not solution.build():
+            raise BuildFailure("ビルドに失敗しました")
+
+        if up_to is None:
+            up_to = max_n
+        if min_n is None:
+            min_n = max(1, up_to // 1000)
+
+        print(f"{'N':>10} {'cpu [ms]':>10}")
+        # 計測のぶれを抑えるため、1つのCPUに固定して1つずつ実行する
+        with pinned_to_cpu():
+            sizes, times, finished = self._measure(
+                _geometric_sizes(min_n, up_to, steps),
+                generator,
+                solution,
+                repeat,
+                time_limit,
+            )
+
+        if len(sizes) < self._min_points:
+            print(
+                f"need at least {self._min_points} sizes to estimate complexity,"
+                f" but measured {len(sizes)}."
+            )
+            return False
+
+        fits = fit_complexity(sizes, times)
+        best = choose_best_fit(fits)
+        self._show_fits(fits, best)
+
+        projected = best.predict(max_n)
+        print(
+            f"projected at N={max_n}: {projected:.3f}s"
+            f" (time limit {time_limit:.3f}s)"
+        )
+        if projected > time_limit:
+            print(f"WARNING: projected time at N={max_n} exceeds the time limit.")
+            return False
+        return finished
+
+    def _measure(
+        self,
+        sizes: List[int],
+        generator: List[str],
+        solution: ProgramExecutor,
+        repeat: int,
+        time_limit: float,
+    ) -> Tuple[List[int], List[float], bool]:
+        """入力サイズごとにCPU時間を計る.
+
+        Returns:
+            Tuple[List[int], List[float], bool]: 計れた入力サイズとCPU時間[秒]、
+                すべての入力サイズを制限内で実行できたか
+        """
+        measured_sizes: List[int] = []
+        measured_times: List[float] = []
+
+        for n in sizes:
+            with tempfile.TemporaryDirectory(prefix="atcoder_helper_scaling_") as spool:
+                test_case = self._generate(generator, n, spool)
+
+                cpu_times = []
+                for _ in range(max(1, repeat)):
+                    result = solution.execute(test_case)
+                    if result.status not in (
+                        AtCoderTestStatus.AC,
+                        AtCoderTestStatus.JUSTSHOW,
+                    ):
+                        print(f"{n:>10} {result.status.dyed}")
+                        return measured_sizes, measured_times, False
+                    cpu_times.append(
+                        result.wall_time if result.cpu_time is None else result.cpu_time
+                    )
+
+            cpu_time = max(min(time or 0.0 for time in cpu_times), self._min_time)
+            print(f"{n:>10} {cpu_time * 1000:>10.1f}")
+            measured_sizes.append(n)
+            measured_times.append(cpu_time)
+            if cpu_time > time_limit:
+                # これより大きい入力は、試すまでもなく制限を超える
+                return measured_sizes, measured_times, False
+
+        return measured_sizes, measured_times, True
+
+    def _generate(
+        self, generator: List[str], n: int, spool_dir: str
+    ) -> AtcoderTestCase:
+        """入力を生成して spool_dir に書き出し、それを入力ファイルにするケースを返す.
+
+        生成した入力は巨大になりうるので、文字列として持ち回らない.
+        """
+        name = f"scaling_{n}"
+        input_path = os.path.join(spool_dir, "input")
+        generated = self._controller_builder.build([], [*generator, str(n)]).execute(
+            AtcoderTestCase(name=name, expected=None), output_path=input_path
+        )
+        if generated.status != AtCoderTestStatus.JUSTSHOW:
+            raise HelperProgramFailure(
+                f"入力生成器が N={n} で {generated.status.name} になりました"
+                f"\n{generated.error}"
+            )
+        return AtcoderTestCase(name=name, given_file=input_path, expected=None)
+
+    def _show_fits(self, fits: List[ComplexityFit], best: ComplexityFit) -> None:
+        print("========================================")
+        print("COMPLEXITY: (relative error of fit)")
+        shown = self._shown_fits
+        for fit in fits[:shown]:
+            mark = "  <- best" if fit is best else ""
+            print(f"  {fit.complexity.name:<14} {fit.error * 100:>6.1f}%{mark}")
+
+        growth = best.complexity.name[2:-1]  # "O(N log N)" -> "N log N"
+        terms = [f"{best.constant:.3g}s"]
+        if best.complexity.growth is not None:
+            terms.append(f"{best.coefficient:.3g}s * {growth}")
+        print(f"best fit: {best.complexity.name}  t = {' + '.join(terms)}")
+
+
+def _geometric_sizes(min_n: int, max_n: int, steps: int) -> List[int]:
+    """min_n から max_n までの、およそ等比数列になる入力サイズを返す."""
+    if steps <= 1 or max_n <= min_n:
+        return [max_n]
+    ratio = (max_n / min_n) ** (1 / (steps - 1))
+    sizes = [round(min_n * ratio**step) for step in range(steps - 1)] + [max_n]
+    return sorted(set(sizes))
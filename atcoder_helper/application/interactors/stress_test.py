@@ -0,0 +1,293 @@
+"""ランダムな入力で、解答を愚直解と突き合わせるサービス."""
+
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from dataclasses import dataclass
+from textwrap import indent
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from injector import inject
+
+from atcoder_helper.application.interactors.execute_test import ControllerBuilder
+from atcoder_helper.application.interactors.minimizer import minimize
+from atcoder_helper.application.interactors.util import get_usable_cpu_count
+from atcoder_helper.application.interactors.util import resolve_limits
+from atcoder_helper.application.repositories import errors as repository_error
+from atcoder_helper.application.repositories.local_test_case_repo import (
+    LocalTestCaseRepository,
+)
+from atcoder_helper.application.repositories.task_config_repo import (
+    TaskConfigRepository,
+)
+from atcoder_helper.application.usecases.errors import BuildFailure
+from atcoder_helper.application.usecases.errors import ConfigAccessError
+from atcoder_helper.application.usecases.errors import HelperProgramFailure
+from atcoder_helper.entities.atcoder_test_case import AtcoderTestCase
+from atcoder_helper.entities.atcoder_test_case import AtCoderTestResult
+from atcoder_helper.entities.atcoder_test_case import AtCoderTestStatus
+from atcoder_helper.program_executor import ProgramExecutor
+from atcoder_helper.program_executor import read_output
+
+
+@dataclass
+class _SeedOutcome:
+    """1つのシードを試した結果."""
+
+    test_case: AtcoderTestCase  # 生成した入力と、愚直解の出力
+    result: AtCoderTestResult  # 解答の実行結果
+
+
+class StressTestInteractor:
+    """ランダムな入力で、解答を愚直解と突き合わせるサービス."""
+
+    _task_config_repo: TaskConfigRepository
+    _test_case_repo: LocalTestCaseRepository
+    _controller_builder: ControllerBuilder
+
+    @inject
+    def __init__(
+        self,
+        task_config_repo: TaskConfigRepository,
+        test_case_repo: LocalTestCaseRepository,
+        controller_builder: ControllerBuilder,
+    ):
+        """__init__.
+
+        Args:
+            task_config_repo (TaskConfigRepository): _
+            test_case_repo (LocalTestCaseRepository): _
+            controller_builder (ControllerBuilder): _
+        """
+        self._task_config_repo = task_config_repo
+        self._test_case_repo = test_case_repo
+        self._controller_builder = controller_builder
+
+    def stress_test(
+        self,
+        generator: List[str],
+        reference: List[str],
+        seeds: int = 1000,
+        start_seed: int = 0,
+        jobs: Optional[int] = None,
+        time_limit: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+        output_limit: Optional[int] = None,
+        minimize_time: float = 10.0,
+        format_hint: Optional[str] = None,
+    ) -> bool:
+        """シードごとに入力を生成し、解答の出力を愚直解の出力と突き合わせる.
+
+        最初に食い違ったシードで打ち切り、食い違いが再現する範囲で入力を小さくしてから
+        testcases.yaml に追加する.
+
+        Args:
+            generator (List[str]): 入力生成器の実行コマンド. 末尾にシードが付け足される
+            reference (List[str]): 愚直解の実行コマンド
+            seeds (int): 試すシードの数. Defaults to 1000
+            start_seed (int): 最初のシード. Defaults to 0
+            jobs (Optional[int]): 同時に試すシード数. Defaults to None (使えるCPU数)
+            time_limit (Optional[float]): 解答の実行時間制限[秒]. Defaults to None (タスク設定の値)
+            memory_limit (Optional[int]): 解答のメモリ制限[MiB]. Defaults to None (タスク設定の値)
+            output_limit (Optional[int]): 解答の出力サイズ制限[MiB]. Defaults to None (タスク設定の値)
+            minimize_time (float): 入力の縮小にかける時間[秒]. 0 なら縮小しない. Defaults to 10.0
+            format_hint (Optional[str]): 縮小に使う入力形式のヒント. Defaults to None
+
+        Raises:
+            ConfigAccessError: 設定ファイル読み書きのエラー
+            BuildFailure: ビルドに失敗した
+            HelperProgramFailure: 入力生成器か愚直解の実行に失敗した
+
+        Returns:
+            bool: すべてのシードで出力が一致したか
+        """
+        try:
+            task_config = self._task_config_repo.read()
+        except (repository_error.ReadError, repository_error.ParseError):
+            raise ConfigAccessError("設定ファイルの読み込みに失敗しました")
+
+        solution = self._controller_builder.build(
+            task_config.build,
+            task_config.run,
+            **asdict(
+                resolve_limits(task_config, time_limit, memory_limit, output_limit)
+            ),
+            fork_server=task_config.fork_server,
+            preload_modules=task_config.preload_modules,
+            checker=task_config.checker,
+            limit_address_space=task_config.limit_address_space,
+        )
+        if not solution.build():
+            raise BuildFailure("ビルドに失敗しました")
+
+        reference_executor = self._controller_builder.build([], reference)
+
+        if jobs is None:
+            jobs = get_usable_cpu_count()
+
+        failure = self._find_failure(
+            range(start_seed, start_seed + seeds),
+            generator,
+            reference_executor,
+            solution,
+            jobs,
+        )
+        if failure is None:
+            return True
+
+        if minimize_time > 0:
+            failure = self._minimize(
+                failure, reference_executor, solution, jobs, minimize_time, format_hint
+            )
+        self._report_disagreement(failure)
+        self._save(failure.test_case)
+        return False
+
+    def _find_failure(
+        self,
+        seeds: range,
+        generator: List[str],
+        reference: ProgramExecutor,
+        solution: ProgramExecutor,
+        jobs: int,
+    ) -> Optional[_SeedOutcome]:
+        """シードを並列に試し、最初に食い違ったシードの結果を返す. なければ None を返す."""
+
+        def try_seed(seed: int) -> _SeedOutcome:
+            return self._try_seed(seed, generator, reference, solution)
+
+        start = time.perf_counter()
+        # 実行の大半は子プロセスの中なので、スレッドで並べれば十分にCPUを使い切れる
+        pool = ThreadPoolExecutor(max_workers=max(1, jobs))
+        try:
+            # map は投入順に結果を返すので、最初に見つかった食い違いが最小のシードになる
+            for outcome in pool.map(try_seed, seeds):
+                if outcome.result.status != AtCoderTestStatus.AC:
+                    return outcome
+        finally:
+            # 食い違いが見つかったら、まだ始まっていないシードは試さない
+            pool.shutdown(cancel_futures=True)
+
+        elapsed = time.perf_counter() - start
+        rate = len(seeds) / elapsed * 60 if elapsed > 0 else 0.0
+        print(f"all {len(seeds)} seeds passed in {elapsed:.1f}s", end="")
+        print(f" ({rate:.0f} seeds/min).")
+        return None
+
+    def _try_seed(
+        self,
+        seed: int,
+        generator: List[str],
+        reference: ProgramExecutor,
+        solution: ProgramExecutor,
+    ) -> _SeedOutcome:
+        name = f"stress_{seed}"
+
+        generated, given = _execute_for_output(
+            self._controller_builder.build([], [*generator, str(seed)]),
+            AtcoderTestCase(name=name, expected=None),
+        )
+        if generated.status != AtCoderTestStatus.JUSTSHOW:
+            raise HelperProgramFailure(
+                f"入力生成器が seed {seed} で {generated.status.name} になりました"
+                f"\n{generated.error}"
+            )
+
+        answer, expected = _execute_for_output(
+            reference, AtcoderTestCase(name=name, given=given, expected=None)
+        )
+        if answer.status != AtCoderTestStatus.JUSTSHOW:
+            raise HelperProgramFailure(
+                f"愚直解が seed {seed} で {answer.status.name} になりました"
+                f"\n{answer.error}"
+            )
+
+        test_case = AtcoderTestCase(name=name, given=given, expected=expected)
+        return _SeedOutcome(test_case, solution.execute(test_case))
+
+    def _minimize(
+        self,
+        outcome: _SeedOutcome,
+        reference: ProgramExecutor,
+        solution: ProgramExecutor,
+        jobs: int,
+        time_budget: float,
+        format_hint: Optional[str],
+    ) -> _SeedOutcome:
+        """食い違いが再現する範囲で、入力を小さくする."""
+        name = outcome.test_case.name
+
+        def judge(given: str) -> Optional[_SeedOutcome]:
+            answer, expected = _execute_for_output(
+                reference, AtcoderTestCase(name=name, given=given, expected=None)
+            )
+            # 縮小の途中で入力が壊れた場合は、愚直解も正しく動かないので候補にしない
+            if answer.status != AtCoderTestStatus.JUSTSHOW:
+                return None
+            test_case = AtcoderTestCase(name=name, given=given, expected=expected)
+            return _SeedOutcome(test_case, solution.execute(test_case))
+
+        def is_failing(given: str) -> bool:
+            judged = judge(given)
+            return judged is not None and judged.result.status != AtCoderTestStatus.AC
+
+        original_size = len(outcome.test_case.given)
+        print(f"minimizing {name} ({original_size} bytes)...")
+        given = minimize(
+            outcome.test_case.given, is_failing, jobs, time_budget, format_hint
+        )
+        print(f"minimized {name} to {len(given)} bytes.")
+
+        # 縮小の結果を表示・保存するために、もう一度実行し直す
+        return judge(given) or outcome
+
+    def _report_disagreement(self, outcome: _SeedOutcome) -> None:
+        result = outcome.result
+        print(f"{result.name}: {result.status.dyed}")
+        print("    input:")
+        print(indent(outcome.test_case.given, "       >"))
+        print("    expected (reference):")
+        print(indent(outcome.test_case.expected or "", "       >"))
+        print("    but got:")
+        print(indent(result.actual, "       >"))
+        if result.error:
+            print(result.error)
+
+    def _save(self, test_case: AtcoderTestCase) -> None:
+        """食い違ったケースを testcases.yaml に追加する. 同名のケースは置き換える."""
+        try:
+            test_cases = self._test_case_repo.read()
+        except repository_error.ReadError:
+            test_cases = []  # testcases.yaml がまだない
+        except repository_error.ParseError as e:
+            raise ConfigAccessError("テストケースの読み込みに失敗しました") from e
+
+        test_cases = [case for case in test_cases if case.name != test_case.name]
+        test_cases.append(test_case)
+
+        try:
+            self._test_case_repo.write(test_cases)
+        except repository_error.WriteError as e:
+            raise ConfigAccessError("テストケースの書き込みに失敗しました") from e
+
+        print(f"saved {test_case.name} to testcases.yaml.")
+
+
+def _execute_for_output(
+    executor: ProgramExecutor, test_case: AtcoderTestCase
+) -> Tuple[AtCoderTestResult, str]:
+    """実行して、テスト結果と標準出力の全体を返す.
+
+    テスト結果の actual は表示用に切り詰められているので、入力や正解には使えない.
+    """
+    with tempfile.TemporaryDirectory(prefix="atcoder_helper_stress_") as spool_dir:
+        output_path = os.path.join(spool_dir, "output")
+        result = executor.execute(test_case, output_path=output_path)
+        try:
+            return result, read_output(output_path)
+        except OSError:
+            return result, ""  # 実行できなかったので、出力もない
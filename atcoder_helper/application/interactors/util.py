@@ -1,12 +1,23 @@
 """Usecases共通のutil."""
 
+import math
 import os
+from contextlib import contextmanager
+from dataclasses import dataclass
 from typing import Final
+from typing import Iterator
+from typing import Optional
+
+from atcoder_helper.entities.atcoder_task_config import TaskConfig
 
 default_atcoder_helper_config_file: Final[str] = os.path.join(
     os.path.expanduser("~"), ".atcoder_helper", "config.yaml"
 )
 
+_cgroup_v2_cpu_max_file: Final[str] = "/sys/fs/cgroup/cpu.max"
+_cgroup_v1_cfs_quota_file: Final[str] = "/sys/fs/cgroup/cpu/cpu.cfs_quota_us"
+_cgroup_v1_cfs_period_file: Final[str] = "/sys/fs/cgroup/cpu/cpu.cfs_period_us"
+
 
 def get_atcoder_helper_config_filepath() -> str:
     """atcoder_helper_configのパスを決定する."""
@@ -15,3 +26,117 @@ def get_atcoder_helper_config_filepath() -> str:
         return filepath
     else:
         return default_atcoder_helper_config_file
+
+
+@dataclass(frozen=True)
+class Limits:
+    """解答の実行に使う制限. ControllerBuilder.build に asdict して渡す."""
+
+    time_limit: float  # 実行時間制限[秒]
+    memory_limit: int  # メモリ制限[MiB]
+    output_limit: int  # 出力サイズ制限[MiB]
+
+
+def resolve_limits(
+    task_config: TaskConfig,
+    time_limit: Optional[float] = None,
+    memory_limit: Optional[int] = None,
+    output_limit: Optional[int] = None,
+    time_factor: float = 1.0,
+) -> Limits:
+    """タスク設定の制限を、コマンドラインで指定された制限で上書きする.
+
+    Args:
+        task_config (TaskConfig): タスク設定
+        time_limit (Optional[float]): 実行時間制限[秒]. Defaults to None (タスク設定の値)
+        memory_limit (Optional[int]): メモリ制限[MiB]. Defaults to None (タスク設定の値)
+        output_limit (Optional[int]): 出力サイズ制限[MiB]. Defaults to None (タスク設定の値)
+        time_factor (float): タスク設定の実行時間制限を使うときにかける倍率.
+            Defaults to 1.0
+
+    Returns:
+        Limits: 実行に使う制限
+    """
+    return Limits(
+        time_limit=(
+            task_config.time_limit * time_factor if time_limit is None else time_limit
+        ),
+        memory_limit=task_config.memory_limit if memory_limit is None else memory_limit,
+        output_limit=task_config.output_limit if output_limit is None else output_limit,
+    )
+
+
+def get_usable_cpu_count() -> int:
+    """このプロセスが実際に使えるCPU数を返す.
+
+    CPU affinity と cgroup の CPU クォータの両方を考慮する.
+
+    Returns:
+        int: 使えるCPU数. 少なくとも1.
+    """
+    try:
+        count = len(os.sched_getaffinity(0))
+    except AttributeError:  # sched_getaffinity がないプラットフォーム
+        count = os.cpu_count() or 1
+
+    quota = _read_cgroup_cpu_quota()
+    if quota is not None:
+        count = min(count, math.ceil(quota))
+
+    return max(1, count)
+
+
+def _read_cgroup_cpu_quota() -> Optional[float]:
+    """Cgroupで制限されているCPU数を読む. 制限がなければNoneを返す."""
+    try:
+        with open(_cgroup_v2_cpu_max_file, "rt") as file:
+            quota, period = file.read().split()
+        if quota == "max":
+            return None
+        return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+
+    try:
+        with open(_cgroup_v1_cfs_quota_file, "rt") as file:
+            quota_us = int(file.read())
+        with open(_cgroup_v1_cfs_period_file, "rt") as file:
+            period_us = int(file.read())
+    except (OSError, ValueError):
+        return None
+
+    if quota_us <= 0 or period_us <= 0:
+        return None
+    return quota_us / period_us
+
+
+@contextmanager
+def pinned_to_cpu(cpu: Optional[int] = None) -> Iterator[Optional[int]]:
+    """呼び出したスレッドと、そこから起動する子プロセスを1つのCPUに固定する.
+
+    ProgramExecutor はフォークサーバから解答を起動するときも、起動を頼んだスレッドの
+    CPU affinity を解答に引き継がせるので、この中で実行した解答も同じCPUに固定される.
+
+    Args:
+        cpu (Optional[int]): 固定するCPU. Defaults to None (使えるCPUのうち番号が最大のもの)
+
+    Yields:
+        Optional[int]: 固定したCPU. 固定できなかった場合は None
+    """
+    try:
+        original = os.sched_getaffinity(0)
+    except AttributeError:  # sched_getaffinity がないプラットフォーム
+        yield None
+        return
+
+    target = max(original) if cpu is None else cpu
+    try:
+        os.sched_setaffinity(0, {target})
+    except OSError:
+        yield None
+        return
+
+    try:
+        yield target
+    finally:
+        os.sched_setaffinity(0, original)
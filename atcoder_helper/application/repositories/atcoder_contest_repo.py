@@ -0,0 +1,40 @@
+"""AtCoderからコンテストの情報を取得するリポジトリ."""
+
+from datetime import datetime
+from typing import Protocol
+
+import requests
+
+
+class AtCoderContestRepository(Protocol):
+    """AtCoderからコンテストの情報を取得するリポジトリのプロトコル."""
+
+    def fetch_start_time(self, session: requests.Session, contest: str) -> datetime:
+        """コンテストの開始時刻を取得する.
+
+        Args:
+            session (requests.Session): セッション
+            contest (str): コンテスト名
+
+        Raises:
+            ConnectionError: GETに失敗
+            ParseError: 開始時刻が見つからない
+
+        Returns:
+            datetime: 開始時刻. タイムゾーン付き
+        """
+
+    def warm_up(self, session: requests.Session, contest: str, connections: int) -> int:
+        """コンテストのページへの接続を、名前解決と TLS ハンドシェイクまで済ませておく.
+
+        開いた接続はセッションの接続プールに残り、同じコンテストのページの取得に
+        使い回される.
+
+        Args:
+            session (requests.Session): セッション
+            contest (str): コンテスト名
+            connections (int): 開いておく接続の数
+
+        Returns:
+            int: 開けた接続の数
+        """
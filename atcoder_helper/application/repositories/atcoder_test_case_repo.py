@@ -1,11 +1,15 @@
 """AtCoderからテストケースを取得するリポジトリ."""
 
 
+from typing import Dict
 from typing import List
+from typing import Optional
 from typing import Protocol
+from typing import Union
 
 import requests
 
+from atcoder_helper.entities.atcoder_problem import AtCoderProblem
 from atcoder_helper.entities.atcoder_test_case import AtcoderTestCase
 
 
@@ -28,3 +32,74 @@ class AtCoderTestCaseRepository(Protocol):
         Returns:
             List[TestCase]: テストケーススイート
         """
+
+    def fetch_problem(
+        self, session: requests.Session, contest: str, task: str
+    ) -> AtCoderProblem:
+        """問題名・制限・問題文・テストケーススイートを取得する.
+
+        Args:
+            session (requests.Session): セッション
+            contest (str): コンテスト名
+            task (str): タスク名
+
+        Raises:
+            ConnectionError: GETに失敗
+            ParseError: Parseに失敗
+
+        Returns:
+            AtCoderProblem: 問題
+        """
+
+    def cached_test_cases(
+        self, contest: str, task: str
+    ) -> Optional[List[AtcoderTestCase]]:
+        """通信せずに、以前に取得したテストケーススイートを返す.
+
+        Args:
+            contest (str): コンテスト名
+            task (str): タスク名
+
+        Returns:
+            Optional[List[AtcoderTestCase]]: テストケーススイート. 取得したことがなければ None
+        """
+
+    def fetch_tasks(
+        self, session: requests.Session, contest: str, use_cache: bool = True
+    ) -> List[str]:
+        """コンテストの問題一覧から、タスク名を一覧の順に取得する.
+
+        Args:
+            session (requests.Session): セッション
+            contest (str): コンテスト名
+            use_cache (bool): False なら、キャッシュやアーカイブを使わずに必ず問い合わせる.
+                Defaults to True
+
+        Raises:
+            ConnectionError: GETに失敗
+            ParseError: 問題が1つも見つからない
+
+        Returns:
+            List[str]: タスク名
+        """
+
+    def fetch_contest_test_cases(
+        self,
+        session: requests.Session,
+        contest: str,
+        tasks: List[str],
+        jobs: int,
+    ) -> Dict[str, Union[List[AtcoderTestCase], Exception]]:
+        """複数のタスクのテストケーススイートを、並行して取得する.
+
+        Args:
+            session (requests.Session): セッション
+            contest (str): コンテスト名
+            tasks (List[str]): タスク名
+            jobs (int): 同時に取得するタスク数
+
+        Returns:
+            Dict[str, Union[List[AtcoderTestCase], Exception]]: タスク名ごとの
+                テストケーススイート. 取得かパースに失敗したタスクは、その
+                ConnectionError か ParseError
+        """
@@ -0,0 +1,99 @@
+"""過去の問題を手元に保存しておくアーカイブ."""
+
+from typing import List
+from typing import Optional
+from typing import Protocol
+from typing import Set
+
+from atcoder_helper.entities.atcoder_problem import AtCoderProblem
+
+
+class ProblemArchiveRepository(Protocol):
+    """過去の問題を手元に保存しておくアーカイブのプロトコル.
+
+    複数のスレッドから同時に呼ばれても安全でなければならない.
+    """
+
+    def read_problem(self, contest: str, task: str) -> Optional[AtCoderProblem]:
+        """保存した問題を読み込む.
+
+        Args:
+            contest (str): コンテスト名
+            task (str): タスク名
+
+        Raises:
+            ReadError: アーカイブを読み込めない
+
+        Returns:
+            Optional[AtCoderProblem]: 問題. 保存していなければ None
+        """
+
+    def write_problem(self, problem: AtCoderProblem) -> None:
+        """問題を保存する. 既に保存していれば置き換える.
+
+        Args:
+            problem (AtCoderProblem): 問題
+
+        Raises:
+            WriteError: アーカイブに書き込めない
+        """
+
+    def read_tasks(self, contest: str) -> Optional[List[str]]:
+        """保存したコンテストの問題一覧を読み込む.
+
+        Args:
+            contest (str): コンテスト名
+
+        Raises:
+            ReadError: アーカイブを読み込めない
+
+        Returns:
+            Optional[List[str]]: タスク名. 問題一覧の順. 保存していなければ None
+        """
+
+    def write_tasks(self, contest: str, tasks: List[str]) -> None:
+        """コンテストの問題一覧を保存する.
+
+        Args:
+            contest (str): コンテスト名
+            tasks (List[str]): タスク名. 問題一覧の順
+
+        Raises:
+            WriteError: アーカイブに書き込めない
+        """
+
+    def archived_tasks(self, contest: str) -> Set[str]:
+        """コンテストの問題のうち、保存してあるもののタスク名を返す.
+
+        Args:
+            contest (str): コンテスト名
+
+        Raises:
+            ReadError: アーカイブを読み込めない
+
+        Returns:
+            Set[str]: タスク名
+        """
+
+    def is_synced(self, contest: str) -> bool:
+        """コンテストのすべての問題を保存し終えたか.
+
+        Args:
+            contest (str): コンテスト名
+
+        Raises:
+            ReadError: アーカイブを読み込めない
+
+        Returns:
+            bool: 保存し終えたか
+        """
+
+    def mark_synced(self, contest: str) -> None:
+        """コンテストのすべての問題を保存し終えたことを記録する.
+
+        Args:
+            contest (str): コンテスト名
+
+        Raises:
+            WriteError: アーカイブに書き込めない
+        """
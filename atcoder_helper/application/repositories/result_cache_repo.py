@@ -0,0 +1,30 @@
+"""テスト結果のキャッシュの永続化を行う."""
+from typing import List
+from typing import Protocol
+
+from atcoder_helper.entities.atcoder_test_case import CachedTestResult
+
+
+class ResultCacheRepository(Protocol):
+    """テスト結果のキャッシュの永続化を行うプロトコル."""
+
+    def write(self, results: List[CachedTestResult]) -> None:
+        """書き込みを行う.
+
+        Args:
+            results (List[CachedTestResult]): テストケースごとの直近の実行結果
+
+        Raises:
+            WriteError: 書き込み失敗
+        """
+
+    def read(self) -> List[CachedTestResult]:
+        """読み込みを行う.
+
+        Returns:
+            List[CachedTestResult]: テストケースごとの直近の実行結果
+
+        Raises:
+            ReadError: データの読み込みに失敗した
+            ParseError: パースに失敗した
+        """
@@ -0,0 +1,47 @@
+"""タスクディレクトリごとのリポジトリを作る."""
+from typing import List
+from typing import Protocol
+
+from atcoder_helper.application.repositories.local_test_case_repo import (
+    LocalTestCaseRepository,
+)
+from atcoder_helper.application.repositories.task_config_repo import (
+    TaskConfigRepository,
+)
+
+
+class TaskRepositoryFactory(Protocol):
+    """タスクディレクトリごとのリポジトリを作るプロトコル.
+
+    カレントディレクトリ以外のタスクディレクトリを扱うときに使う.
+    """
+
+    def find_task_dirs(self, parent: str) -> List[str]:
+        """指定したディレクトリの直下にあるタスクディレクトリを、名前順に返す.
+
+        Args:
+            parent (str): 探すディレクトリ
+
+        Returns:
+            List[str]: タスクディレクトリのパス
+        """
+
+    def task_config_repo(self, task_dir: str) -> TaskConfigRepository:
+        """タスクディレクトリの TaskConfigRepository を返す.
+
+        Args:
+            task_dir (str): タスクディレクトリ
+
+        Returns:
+            TaskConfigRepository: _
+        """
+
+    def test_case_repo(self, task_dir: str) -> LocalTestCaseRepository:
+        """タスクディレクトリの LocalTestCaseRepository を返す.
+
+        Args:
+            task_dir (str): タスクディレクトリ
+
+        Returns:
+            LocalTestCaseRepository: _
+        """
@@ -0,0 +1,24 @@
+"""過去の問題を手元のアーカイブに保存するサービス."""
+
+from typing import List
+from typing import Optional
+from typing import Protocol
+
+
+class ArchiveUsecase(Protocol):
+    """過去の問題を手元のアーカイブに保存するサービスのプロトコル."""
+
+    def sync(self, contests: List[str], jobs: Optional[int] = None) -> None:
+        """コンテストの問題をまだ保存していなければ、取得してアーカイブに保存する.
+
+        問題は1つずつ保存するので、途中で止めても次回は続きから取得する.
+        すべての問題を保存し終えたコンテストは、問題一覧も取得し直さない.
+
+        Args:
+            contests (List[str]): コンテスト名
+            jobs (Optional[int]): 同時に取得する問題数. Defaults to None (4)
+
+        Raises:
+            AtcoderAccessError: 取得に失敗したコンテストがある
+            ConfigAccessError: セッション・アーカイブの読み書きのエラー
+        """
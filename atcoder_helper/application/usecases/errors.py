@@ -19,3 +19,27 @@ class UndefinedLanguage(Exception):
 
 class DirectoryNotEmpty(Exception):
     """Directoryが空でないエラー."""
+
+
+class BuildFailure(Exception):
+    """ビルドに失敗した."""
+
+
+class ResultWriteError(Exception):
+    """結果ファイルの書き込みに失敗した."""
+
+
+class HelperProgramFailure(Exception):
+    """入力生成器や愚直解など、解答以外のプログラムの実行に失敗した."""
+
+
+class MissingDependency(Exception):
+    """機能に必要な任意の依存パッケージがインストールされていない."""
+
+
+class UndefinedTestCase(Exception):
+    """未定義のテストケース."""
+
+
+class ProfilerUnavailable(Exception):
+    """指定したプロファイラを、この解答には使えない."""
@@ -1,8 +1,11 @@
 """テストケース実行のためのメソッド."""
 
 from typing import List
+from typing import Optional
 from typing import Protocol
 
+from atcoder_helper.entities.atcoder_task_config import CheckerConfig
+from atcoder_helper.program_executor import ForkServerProgramExecutorRepoImpl
 from atcoder_helper.program_executor import ProgramExecutor
 from atcoder_helper.program_executor import ProgramExecutorRepoImpl
 
@@ -11,7 +14,18 @@ class ControllerBuilder(Protocol):
     """ControllerBuilder."""
 
     @staticmethod
-    def build(build_command: List[str], run_command: List[str]) -> ProgramExecutor:
+    def build(
+        build_command: List[str],
+        run_command: List[str],
+        time_limit: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+        output_limit: Optional[int] = None,
+        fork_server: bool = False,
+        preload_modules: Optional[List[str]] = None,
+        checker: Optional[CheckerConfig] = None,
+        limit_address_space: bool = True,
+        task_dir: Optional[str] = None,
+    ) -> ProgramExecutor:
         """build."""
         pass
 
@@ -20,17 +34,193 @@ class ControllerBuilderImpl:
     """ControllerBuilderの実装."""
 
     @staticmethod
-    def build(build_command: List[str], run_command: List[str]) -> ProgramExecutor:
+    def build(
+        build_command: List[str],
+        run_command: List[str],
+        time_limit: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+        output_limit: Optional[int] = None,
+        fork_server: bool = False,
+        preload_modules: Optional[List[str]] = None,
+        checker: Optional[CheckerConfig] = None,
+        limit_address_space: bool = True,
+        task_dir: Optional[str] = None,
+    ) -> ProgramExecutor:
         """ProgramExecutorRepoの標準実装を返す."""
-        return ProgramExecutorRepoImpl(build_command, run_command)
+        if fork_server:
+            return ForkServerProgramExecutorRepoImpl(
+                build_command,
+                run_command,
+                time_limit=time_limit,
+                memory_limit=memory_limit,
+                output_limit=output_limit,
+                checker=checker,
+                preload_modules=preload_modules,
+                limit_address_space=limit_address_space,
+                task_dir=task_dir,
+            )
+        return ProgramExecutorRepoImpl(
+            build_command,
+            run_command,
+            time_limit=time_limit,
+            memory_limit=memory_limit,
+            output_limit=output_limit,
+            checker=checker,
+            limit_address_space=limit_address_space,
+            task_dir=task_dir,
+        )
 
 
 class ExecuteTestUsecase(Protocol):
     """テストを実行するサービス."""
 
-    def execute_test(self) -> None:
+    def execute_test(
+        self,
+        jobs: Optional[int] = None,
+        time_limit: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+        output_limit: Optional[int] = None,
+        changed_only: bool = False,
+        failed_only: bool = False,
+        output_format: str = "text",
+        output_file: Optional[str] = None,
+    ) -> None:
         """testcaseに基づき、テストを実行する関数.
 
+        テストケースは最大jobs個まで並列に実行されるが、結果の表示は元のケース順を保つ.
+        プログラム・入力・期待する出力・判定方法が前回と同じケースは実行せず、前回の結果を
+        再利用する. changed_only と failed_only を両方指定した場合は、どちらかに
+        当てはまるケースを対象にする.
+
+        output_format に "json" か "junit" を指定すると、結果をケースが終わった順に
+        その形式でも書き出す. 書き出し先が標準出力の場合は、色付きの表示はしない.
+
+        Args:
+            jobs (Optional[int]): 同時に実行するケース数. Defaults to None (使えるCPU数)
+            time_limit (Optional[float]): 実行時間制限[秒]. Defaults to None (タスク設定の値)
+            memory_limit (Optional[int]): メモリ制限[MiB]. Defaults to None (タスク設定の値)
+            output_limit (Optional[int]): 出力サイズ制限[MiB]. Defaults to None (タスク設定の値)
+            changed_only (bool): 前回の結果を再利用できないケースだけを対象にする.
+                Defaults to False
+            failed_only (bool): 前回失敗したケースだけを対象にする. Defaults to False
+            output_format (str): "text", "json", "junit" のいずれか. Defaults to "text"
+            output_file (Optional[str]): json, junit の書き出し先.
+                Defaults to None (標準出力)
+
+        Raises:
+            ConfigAccessError: 設定ファイル読み書きのエラー
+            BuildFailure: ビルドに失敗した
+            ResultWriteError: 書き出し先のファイルを開けなかった
+        """
+
+    def watch_test(
+        self,
+        jobs: Optional[int] = None,
+        time_limit: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+        output_limit: Optional[int] = None,
+        debounce: float = 0.2,
+    ) -> None:
+        """タスクディレクトリのファイルが変わるたびに、ビルドしてテストを実行し直す.
+
+        KeyboardInterrupt で止めるまで戻らない. 前回失敗したケースから実行する.
+        設定ファイルの読み込みやビルドに失敗しても止まらず、次の変更を待つ.
+
+        Args:
+            jobs (Optional[int]): 同時に実行するケース数. Defaults to None (使えるCPU数)
+            time_limit (Optional[float]): 実行時間制限[秒]. Defaults to None (タスク設定の値)
+            memory_limit (Optional[int]): メモリ制限[MiB]. Defaults to None (タスク設定の値)
+            output_limit (Optional[int]): 出力サイズ制限[MiB]. Defaults to None (タスク設定の値)
+            debounce (float): 変更が落ち着いたとみなすまでの時間[秒]. Defaults to 0.2
+        """
+
+    def race_languages(
+        self,
+        languages: List[str],
+        jobs: Optional[int] = None,
+        time_limit: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+        output_limit: Optional[int] = None,
+    ) -> None:
+        """同じテストケースを複数の言語設定でビルド・実行し、判定と時間を並べて表示する.
+
+        言語ごとの作業ディレクトリで並列にビルドする. ビルドに失敗した言語は CE と表示する.
+
+        Args:
+            languages (List[str]): 言語設定の名前
+            jobs (Optional[int]): 同時に実行するケース数. Defaults to None (使えるCPU数)
+            time_limit (Optional[float]): 実行時間制限[秒]. Defaults to None (タスク設定の値)
+            memory_limit (Optional[int]): メモリ制限[MiB]. Defaults to None (タスク設定の値)
+            output_limit (Optional[int]): 出力サイズ制限[MiB]. Defaults to None (タスク設定の値)
+
+        Raises:
+            ConfigAccessError: 設定ファイル読み書きのエラー
+            UndefinedLanguage: 設定にない言語を指定した
+        """
+
+    def profile_test(
+        self,
+        case: str,
+        profiler: Optional[str] = None,
+        top: int = 20,
+        output_file: Optional[str] = None,
+        time_limit: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+        output_limit: Optional[int] = None,
+    ) -> None:
+        """1つのテストケースをプロファイラの下で実行し、時間のかかっている関数を表示する.
+
+        折りたたんだスタック(flamegraph.pl などにそのまま渡せる形式)をファイルに書き出す.
+
+        Args:
+            case (str): テストケースの名前
+            profiler (Optional[str]): "cprofile", "sampling", "perf" のいずれか.
+                Defaults to None (タスク設定の値)
+            top (int): 表示する関数の数. Defaults to 20
+            output_file (Optional[str]): 折りたたんだスタックを書き出すファイル.
+                Defaults to None (.atcoder_helper_profiles/<case>.folded)
+            time_limit (Optional[float]): 実行時間制限[秒].
+                Defaults to None (タスク設定の値の10倍)
+            memory_limit (Optional[int]): メモリ制限[MiB]. Defaults to None (タスク設定の値)
+            output_limit (Optional[int]): 出力サイズ制限[MiB]. Defaults to None (タスク設定の値)
+
+        Raises:
+            ConfigAccessError: 設定ファイル読み書きのエラー
+            UndefinedTestCase: 指定したテストケースがない
+            ProfilerUnavailable: この解答には、指定したプロファイラを使えない
+            BuildFailure: ビルドに失敗した
+            HelperProgramFailure: プロファイラが計測結果を残さなかった
+            ResultWriteError: 折りたたんだスタックの書き出しに失敗した
+        """
+
+    def benchmark_test(
+        self,
+        warmup: int = 1,
+        repeat: int = 10,
+        precision: Optional[float] = None,
+        cpu: Optional[int] = None,
+        json_file: Optional[str] = None,
+        time_limit: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+        output_limit: Optional[int] = None,
+    ) -> None:
+        """testcaseごとに解答を繰り返し実行し、実行時間の統計を表示する.
+
+        計測のぶれを抑えるため、ケースは1つずつ、1つのCPUに固定して実行する.
+
+        Args:
+            warmup (int): 計測前に捨てる実行の回数. Defaults to 1
+            repeat (int): 計測する実行の回数 (precision を指定した場合は上限). Defaults to 10
+            precision (Optional[float]): 平均の95%信頼区間の半幅が平均のこの割合以下に
+                なったら計測を打ち切る. Defaults to None (常に repeat 回実行する)
+            cpu (Optional[int]): 固定するCPU. Defaults to None (自動で選ぶ)
+            json_file (Optional[str]): 結果をJSONで書き出すファイル. Defaults to None
+            time_limit (Optional[float]): 実行時間制限[秒]. Defaults to None (タスク設定の値)
+            memory_limit (Optional[int]): メモリ制限[MiB]. Defaults to None (タスク設定の値)
+            output_limit (Optional[int]): 出力サイズ制限[MiB]. Defaults to None (タスク設定の値)
+
         Raises:
             ConfigAccessError: 設定ファイル読み書きのエラー
+            BuildFailure: ビルドに失敗した
+            ResultWriteError: JSONの書き出しに失敗した
         """
@@ -1,4 +1,5 @@
 """testcasesを取得し、指定したtestcasesファイルに書き込むサービス."""
+from typing import List
 from typing import Optional
 from typing import Protocol
 
@@ -21,3 +22,50 @@ class FetchTaskUsecase(Protocol):
             contest (str): コンテスト名。AtCoderのコンテストページのURLに現れる形式で渡す
             task (str): タスク名。AtCoderのコンテストページのURLに現れる形から、"コンテスト名_"の部分を除いたもの
         """
+
+    def fetch_contest(self, contest: Optional[str], jobs: Optional[int] = None) -> None:
+        """コンテストのすべてのタスクのtestcasesを並行して取得し、タスクごとに書き込む.
+
+        タスクは問題一覧から見つけ、<contest>/<task> ディレクトリの testcases ファイルに
+        書き込む. タスクディレクトリがなければ、task create と同じように初期化する.
+        取得に失敗したタスクがあっても、取得できたタスクは書き込む.
+
+        Args:
+            contest (Optional[str]): コンテスト名. Defaults to None (タスク設定の値)
+            jobs (Optional[int]): 同時に取得するタスク数. Defaults to None (タスク数. 最大8)
+
+        Raises:
+            AtcoderAccessError: 問題一覧を取得できなかった・取得に失敗したタスクがある
+            ConfigAccessError: 設定ファイルの読み書きのエラー
+        """
+
+    def prepare_contest(
+        self,
+        contest: str,
+        tasks: Optional[List[str]] = None,
+        jobs: Optional[int] = None,
+        warm_up: float = 10.0,
+    ) -> None:
+        """開始前のコンテストを用意して開始を待ち、開始と同時にすべてのタスクを取得する.
+
+        開始時刻をコンテストのページから読み、開始までに次のことを済ませる.
+            - <contest>/<task> ディレクトリを task create と同じように作る
+            - 作ったディレクトリでテンプレートをビルドする
+            - 開始の warm_up 秒前に、名前解決・TLS ハンドシェイクを済ませた接続を
+              jobs 本開いておく
+        開始したら問題一覧が見えるまで問い合わせ、fetch_contest と同じように取得する.
+        既に始まっていれば、すぐに fetch_contest と同じように取得する.
+
+        Args:
+            contest (str): コンテスト名
+            tasks (Optional[List[str]]): 用意するタスク名.
+                Defaults to None (abc なら a-g、arc, agc なら a-f)
+            jobs (Optional[int]): 同時に取得するタスク数.
+                Defaults to None (用意するタスク数. 最大8)
+            warm_up (float): 開始の何秒前に接続を開くか. Defaults to 10.0
+
+        Raises:
+            AtcoderAccessError: 開始時刻・問題一覧を取得できなかった・
+                取得に失敗したタスクがある
+            ConfigAccessError: 設定ファイルの読み書きのエラー・用意するタスクが分からない
+        """
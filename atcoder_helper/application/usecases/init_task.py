@@ -14,6 +14,8 @@ class InitTaskDirUsecase(Protocol):
     ) -> None:
         """taskディレクトリを初期化します.
 
+        以前に取得したことのある問題なら、通信せずにキャッシュからテストケースも書き込む.
+
         Raises:
             DirectoryNotEmpty: 作成しようとしているディレクトリが空でない
             ConfigAccessError: 設定ファイルの読み書きに失敗
@@ -0,0 +1,37 @@
+"""複数のタスクディレクトリで、取得・ビルド・実行を並行して進めるサービス."""
+
+from typing import List
+from typing import Optional
+from typing import Protocol
+
+
+class PipelineUsecase(Protocol):
+    """複数のタスクディレクトリで、取得・ビルド・実行を並行して進めるサービス."""
+
+    def run_tasks(
+        self,
+        task_dirs: Optional[List[str]] = None,
+        fetch: bool = False,
+        fetch_jobs: int = 2,
+        build_jobs: Optional[int] = None,
+        run_jobs: Optional[int] = None,
+    ) -> bool:
+        """タスクディレクトリごとにテストケースを取得し、ビルドしてテストを実行する.
+
+        テストケースの取得とビルドは同時に進め、両方が終わったタスクから順に
+        テストケースを実行する. 段階ごとに、同時に進める数の上限を決められる.
+
+        Args:
+            task_dirs (Optional[List[str]]): タスクディレクトリ.
+                Defaults to None (カレントディレクトリ直下のすべてのタスクディレクトリ)
+            fetch (bool): 実行の前に AtCoder からテストケースを取得するか. Defaults to False
+            fetch_jobs (int): 同時に取得するタスク数. Defaults to 2
+            build_jobs (Optional[int]): 同時にビルドするタスク数. Defaults to None (使えるCPU数)
+            run_jobs (Optional[int]): 同時に実行するケース数. Defaults to None (使えるCPU数)
+
+        Raises:
+            ConfigAccessError: タスクディレクトリやセッションが見つからない
+
+        Returns:
+            bool: すべてのタスクで、すべてのケースを通ったか
+        """
@@ -0,0 +1,46 @@
+"""入力サイズを変えながら解答を実行し、計算量を推定するサービス."""
+
+from typing import List
+from typing import Optional
+from typing import Protocol
+
+
+class ScalingTestUsecase(Protocol):
+    """入力サイズを変えながら解答を実行し、計算量を推定するサービス."""
+
+    def scaling_test(
+        self,
+        generator: List[str],
+        max_n: int,
+        min_n: Optional[int] = None,
+        up_to: Optional[int] = None,
+        steps: int = 8,
+        repeat: int = 3,
+        time_limit: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+        output_limit: Optional[int] = None,
+    ) -> bool:
+        """等比数列の入力サイズで解答のCPU時間を計り、計算量の曲線を当てはめる.
+
+        当てはめた曲線で最大制約での実行時間を見積もり、実行時間制限と比べる.
+
+        Args:
+            generator (List[str]): 入力生成器の実行コマンド. 末尾に入力サイズが付け足される
+            max_n (int): 入力サイズの最大制約
+            min_n (Optional[int]): 最小の入力サイズ. Defaults to None (up_to の 1/1000)
+            up_to (Optional[int]): 実際に試す最大の入力サイズ. Defaults to None (max_n)
+            steps (int): 試す入力サイズの数. Defaults to 8
+            repeat (int): 入力サイズごとの実行回数. 最小のCPU時間を使う. Defaults to 3
+            time_limit (Optional[float]): 解答の実行時間制限[秒]. Defaults to None (タスク設定の値)
+            memory_limit (Optional[int]): 解答のメモリ制限[MiB]. Defaults to None (タスク設定の値)
+            output_limit (Optional[int]): 解答の出力サイズ制限[MiB]. Defaults to None (タスク設定の値)
+
+        Raises:
+            ConfigAccessError: 設定ファイル読み書きのエラー
+            BuildFailure: ビルドに失敗した
+            HelperProgramFailure: 入力生成器の実行に失敗した
+            MissingDependency: numpy がインストールされていない
+
+        Returns:
+            bool: 最大制約での実行時間の見積もりが、実行時間制限に収まったか
+        """
@@ -0,0 +1,54 @@
+"""ランダムな入力で、解答を愚直解と突き合わせるサービス."""
+
+from typing import Final
+from typing import List
+from typing import Optional
+from typing import Protocol
+from typing import Tuple
+
+# 入力を縮小するときに使える、入力形式のヒント
+COUNTED_LIST: Final[str] = "n-list"  # 先頭の整数 N のあとに N 個の数が続く
+FORMAT_HINTS: Final[Tuple[str, ...]] = (COUNTED_LIST,)
+
+
+class StressTestUsecase(Protocol):
+    """ランダムな入力で、解答を愚直解と突き合わせるサービス."""
+
+    def stress_test(
+        self,
+        generator: List[str],
+        reference: List[str],
+        seeds: int = 1000,
+        start_seed: int = 0,
+        jobs: Optional[int] = None,
+        time_limit: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+        output_limit: Optional[int] = None,
+        minimize_time: float = 10.0,
+        format_hint: Optional[str] = None,
+    ) -> bool:
+        """シードごとに入力を生成し、解答の出力を愚直解の出力と突き合わせる.
+
+        最初に食い違ったシードで打ち切り、食い違いが再現する範囲で入力を小さくしてから
+        testcases.yaml に追加する.
+
+        Args:
+            generator (List[str]): 入力生成器の実行コマンド. 末尾にシードが付け足される
+            reference (List[str]): 愚直解の実行コマンド
+            seeds (int): 試すシードの数. Defaults to 1000
+            start_seed (int): 最初のシード. Defaults to 0
+            jobs (Optional[int]): 同時に試すシード数. Defaults to None (使えるCPU数)
+            time_limit (Optional[float]): 解答の実行時間制限[秒]. Defaults to None (タスク設定の値)
+            memory_limit (Optional[int]): 解答のメモリ制限[MiB]. Defaults to None (タスク設定の値)
+            output_limit (Optional[int]): 解答の出力サイズ制限[MiB]. Defaults to None (タスク設定の値)
+            minimize_time (float): 入力の縮小にかける時間[秒]. 0 なら縮小しない. Defaults to 10.0
+            format_hint (Optional[str]): 縮小に使う入力形式のヒント. Defaults to None
+
+        Raises:
+            ConfigAccessError: 設定ファイル読み書きのエラー
+            BuildFailure: ビルドに失敗した
+            HelperProgramFailure: 入力生成器か愚直解の実行に失敗した
+
+        Returns:
+            bool: すべてのシードで出力が一致したか
+        """
@@ -9,15 +9,24 @@ from injector import Binder
 from injector import Injector
 
 import atcoder_helper
+from atcoder_helper.adapter.infrastructure.atcoder_contest_repo import (
+    AtCoderContestRepositoryImpl,
+)
 from atcoder_helper.adapter.infrastructure.atcoder_helper_config_repo import (
     ConfigRepositoryImpl,
 )
 from atcoder_helper.adapter.infrastructure.atcoder_logged_in_session_repo import (
     AtCoderLoggedInSessionRepositoryImpl,
 )
+from atcoder_helper.adapter.infrastructure.archived_test_case_repo import (
+    ArchivedAtCoderTestCaseRepositoryImpl,
+)
 from atcoder_helper.adapter.infrastructure.atcoder_test_case_repo import (
     AtCoderTestCaseRepositoryImpl,
 )
+from atcoder_helper.adapter.infrastructure.http_cache import HttpCache
+from atcoder_helper.adapter.infrastructure.http_transport import HttpTransport
+from atcoder_helper.adapter.infrastructure.http_transport import report_stats_at_exit
 from atcoder_helper.adapter.infrastructure.local_test_case_repo import (
     LocalTestCaseRepositoryImpl,
 )
@@ -25,9 +34,19 @@ from atcoder_helper.adapter.infrastructure.logged_in_session_repo import (
     LoggedInSessionRepositoryImpl,
 )
 from atcoder_helper.adapter.infrastructure.login_status_repo import LoginStatusRepoImpl
+from atcoder_helper.adapter.infrastructure.problem_archive_repo import (
+    SqliteProblemArchiveRepositoryImpl,
+)
+from atcoder_helper.adapter.infrastructure.result_cache_repo import (
+    ResultCacheRepositoryImpl,
+)
 from atcoder_helper.adapter.infrastructure.task_config_repo import (
     TaskConfigRepositoryImpl,
 )
+from atcoder_helper.adapter.infrastructure.task_repository_factory import (
+    TaskRepositoryFactoryImpl,
+)
+from atcoder_helper.application.interactors.archive import ArchiveInteractor
 from atcoder_helper.application.interactors.atcoder_helper_config import (
     AtCoderHelperConfigInteractor,
 )
@@ -35,11 +54,29 @@ from atcoder_helper.application.interactors.auth import AuthInteractor
 from atcoder_helper.application.interactors.execute_test import ControllerBuilder
 from atcoder_helper.application.interactors.execute_test import ControllerBuilderImpl
 from atcoder_helper.application.interactors.execute_test import ExecuteTestInteractor
+from atcoder_helper.application.interactors.execute_test import FileWatcherBuilder
+from atcoder_helper.application.interactors.execute_test import (
+    FileWatcherBuilderImpl,
+)
+from atcoder_helper.application.interactors.execute_test import ProfilerBuilder
+from atcoder_helper.application.interactors.execute_test import ProfilerBuilderImpl
+from atcoder_helper.application.interactors.execute_test import (
+    ResultReporterBuilder,
+)
+from atcoder_helper.application.interactors.execute_test import (
+    ResultReporterBuilderImpl,
+)
 from atcoder_helper.application.interactors.fetch_task import FetchTaskInteractor
 from atcoder_helper.application.interactors.init_task import InitTaskDirInteractor
+from atcoder_helper.application.interactors.pipeline import PipelineInteractor
+from atcoder_helper.application.interactors.scaling_test import ScalingTestInteractor
+from atcoder_helper.application.interactors.stress_test import StressTestInteractor
 from atcoder_helper.application.interactors.util import (
     get_atcoder_helper_config_filepath,
 )
+from atcoder_helper.application.repositories.atcoder_contest_repo import (
+    AtCoderContestRepository,
+)
 from atcoder_helper.application.repositories.atcoder_helper_config_repo import (
     ConfigRepository,
 )
@@ -56,9 +93,19 @@ from atcoder_helper.application.repositories.logged_in_session_repo import (
     LoggedInSessionRepository,
 )
 from atcoder_helper.application.repositories.login_status_repo import LoginStatusRepo
+from atcoder_helper.application.repositories.problem_archive_repo import (
+    ProblemArchiveRepository,
+)
+from atcoder_helper.application.repositories.result_cache_repo import (
+    ResultCacheRepository,
+)
 from atcoder_helper.application.repositories.task_config_repo import (
     TaskConfigRepository,
 )
+from atcoder_helper.application.repositories.task_repository_factory import (
+    TaskRepositoryFactory,
+)
+from atcoder_helper.application.usecases.archive import ArchiveUsecase
 from atcoder_helper.application.usecases.atcoder_helper_config import (
     AtCoderHelperConfigUsecase,
 )
@@ -66,14 +113,24 @@ from atcoder_helper.application.usecases.auth import AuthUsecase
 from atcoder_helper.application.usecases.execute_test import ExecuteTestUsecase
 from atcoder_helper.application.usecases.fetch_task import FetchTaskUsecase
 from atcoder_helper.application.usecases.init_task import InitTaskDirUsecase
+from atcoder_helper.application.usecases.pipeline import PipelineUsecase
+from atcoder_helper.application.usecases.scaling_test import ScalingTestUsecase
+from atcoder_helper.application.usecases.stress_test import StressTestUsecase
 
 T = TypeVar("T")
 
 
 testcase_filename = "testcases.yaml"
+result_cache_filename = ".atcoder_helper_result_cache.json"
 default_session_file: Final[str] = os.path.join(
     os.path.expanduser("~"), ".atcoder_helper", "session", "session_dump.pkl"
 )
+default_http_cache_dir: Final[str] = os.path.join(
+    os.path.expanduser("~"), ".atcoder_helper", "http_cache"
+)
+default_archive_file: Final[str] = os.path.join(
+    os.path.expanduser("~"), ".atcoder_helper", "archive.sqlite3"
+)
 default_task_config_filename = ".atcoder_helper_task_config.yaml"
 default_config_filename = os.path.join(
     atcoder_helper.__path__[0],
@@ -94,6 +151,11 @@ class Dependency:
     @staticmethod
     def config(binder: Binder) -> None:
         """依存性の注入を行う."""
+        # AtCoder と通信するリポジトリは、レート制限と再試行予算を共有する
+        transport = HttpTransport()
+        report_stats_at_exit(transport)
+        archive = SqliteProblemArchiveRepositoryImpl(default_archive_file)
+
         binder.bind(AuthUsecase, AuthInteractor)  # type: ignore[type-abstract]
 
         binder.bind(
@@ -115,10 +177,36 @@ class Dependency:
             InitTaskDirUsecase,  # type: ignore[type-abstract]
             InitTaskDirInteractor,
         )
+        binder.bind(
+            StressTestUsecase,  # type: ignore[type-abstract]
+            StressTestInteractor,
+        )
+        binder.bind(
+            ScalingTestUsecase,  # type: ignore[type-abstract]
+            ScalingTestInteractor,
+        )
+        binder.bind(
+            PipelineUsecase,  # type: ignore[type-abstract]
+            PipelineInteractor,
+        )
+        binder.bind(
+            ArchiveUsecase,  # type: ignore[type-abstract]
+            ArchiveInteractor,
+        )
 
         binder.bind(
             ControllerBuilder, ControllerBuilderImpl  # type: ignore[type-abstract]
         )
+        binder.bind(
+            FileWatcherBuilder, FileWatcherBuilderImpl  # type: ignore[type-abstract]
+        )
+        binder.bind(
+            ProfilerBuilder, ProfilerBuilderImpl  # type: ignore[type-abstract]
+        )
+        binder.bind(
+            ResultReporterBuilder,  # type: ignore[type-abstract]
+            ResultReporterBuilderImpl,
+        )
 
         binder.bind(
             ConfigRepository,  # type: ignore[type-abstract]
@@ -126,27 +214,53 @@ class Dependency:
         )
         binder.bind(
             AtCoderLoggedInSessionRepository,  # type: ignore[type-abstract]
-            AtCoderLoggedInSessionRepositoryImpl,
+            lambda: AtCoderLoggedInSessionRepositoryImpl(transport),
         )
         binder.bind(
             AtCoderTestCaseRepository,  # type: ignore[type-abstract]
-            AtCoderTestCaseRepositoryImpl,
+            lambda: ArchivedAtCoderTestCaseRepositoryImpl(
+                archive,
+                AtCoderTestCaseRepositoryImpl(
+                    HttpCache(default_http_cache_dir, transport), transport
+                ),
+            ),
+        )
+        binder.bind(
+            AtCoderContestRepository,  # type: ignore[type-abstract]
+            lambda: AtCoderContestRepositoryImpl(transport),
+        )
+        binder.bind(
+            ProblemArchiveRepository,  # type: ignore[type-abstract]
+            lambda: archive,
         )
         binder.bind(
             LocalTestCaseRepository,  # type: ignore[type-abstract]
             lambda: LocalTestCaseRepositoryImpl(testcase_filename),
         )
+        binder.bind(
+            ResultCacheRepository,  # type: ignore[type-abstract]
+            lambda: ResultCacheRepositoryImpl(result_cache_filename),
+        )
 
         binder.bind(
             LoggedInSessionRepository,  # type: ignore[type-abstract]
             lambda: LoggedInSessionRepositoryImpl(default_session_file),
         )
-        binder.bind(LoginStatusRepo, LoginStatusRepoImpl)  # type: ignore[type-abstract]
+        binder.bind(
+            LoginStatusRepo,  # type: ignore[type-abstract]
+            lambda: LoginStatusRepoImpl(transport),
+        )
 
         binder.bind(
             TaskConfigRepository,  # type: ignore[type-abstract]
             lambda: TaskConfigRepositoryImpl(default_task_config_filename),
         )
+        binder.bind(
+            TaskRepositoryFactory,  # type: ignore[type-abstract]
+            lambda: TaskRepositoryFactoryImpl(
+                default_task_config_filename, testcase_filename
+            ),
+        )
 
     def resolve(self, cls: Type[T]) -> T:
         """Class のインスタンスを生成する."""
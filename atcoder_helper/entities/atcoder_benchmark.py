@@ -0,0 +1,152 @@
+"""ベンチマーク結果を定義する."""
+
+import math
+from dataclasses import asdict
+from dataclasses import dataclass
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from atcoder_helper.entities.atcoder_test_case import AtCoderTestStatus
+
+
+@dataclass
+class TimingStats:
+    """計測した時間の統計量[秒]."""
+
+    min: float
+    median: float
+    p95: float
+
+    @classmethod
+    def of(cls, samples: List[float]) -> "TimingStats":
+        """計測値から統計量を求める.
+
+        Args:
+            samples (List[float]): 計測値. 空であってはならない
+
+        Returns:
+            TimingStats: 統計量
+        """
+        ordered = sorted(samples)
+        return cls(
+            min=ordered[0],
+            median=percentile(ordered, 0.5),
+            p95=percentile(ordered, 0.95),
+        )
+
+
+@dataclass
+class AtCoderBenchmarkResult:
+    """1つのテストケースのベンチマーク結果.
+
+    途中の実行が AC / JUSTSHOW 以外になった場合は、status をその判定にして計測を打ち切る.
+    """
+
+    name: str
+    status: AtCoderTestStatus
+    runs: int  # 計測に使った実行回数 (ウォームアップを除く)
+    outliers: int  # wall time が外れ値だった実行の数
+    wall: Optional[TimingStats]
+    cpu: Optional[TimingStats]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSONにできる形に変換する."""
+        result = asdict(self)
+        result["status"] = self.status.name
+        return result
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """昇順に並んだ値の q 分位点を、線形補間で求める.
+
+    Args:
+        ordered (List[float]): 昇順に並んだ値. 空であってはならない
+        q (float): 0 以上 1 以下
+
+    Returns:
+        float: 分位点
+    """
+    position = (len(ordered) - 1) * q
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def count_outliers(samples: List[float]) -> int:
+    """Tukey の方法 (四分位範囲の1.5倍の外側) で外れ値の数を数える.
+
+    Args:
+        samples (List[float]): 計測値
+
+    Returns:
+        int: 外れ値の数
+    """
+    if len(samples) < 4:
+        return 0
+
+    ordered = sorted(samples)
+    q1 = percentile(ordered, 0.25)
+    q3 = percentile(ordered, 0.75)
+    fence = 1.5 * (q3 - q1)
+    return sum(1 for sample in ordered if sample < q1 - fence or q3 + fence < sample)
+
+
+# 両側95%の t 分布の臨界値. index が自由度. 30を超えたら正規分布で近似する
+_t_critical_values = [
+    math.inf,
+    12.706,
+    4.303,
+    3.182,
+    2.776,
+    2.571,
+    2.447,
+    2.365,
+    2.306,
+    2.262,
+    2.228,
+    2.201,
+    2.179,
+    2.160,
+    2.145,
+    2.131,
+    2.120,
+    2.110,
+    2.101,
+    2.093,
+    2.086,
+    2.080,
+    2.074,
+    2.069,
+    2.064,
+    2.060,
+    2.056,
+    2.052,
+    2.048,
+    2.045,
+    2.042,
+]
+
+
+def relative_confidence_interval(samples: List[float]) -> float:
+    """平均の95%信頼区間の半幅を、平均に対する比で返す.
+
+    Args:
+        samples (List[float]): 計測値
+
+    Returns:
+        float: 半幅 / 平均. 求められない場合は inf
+    """
+    n = len(samples)
+    if n < 2:
+        return math.inf
+
+    mean = sum(samples) / n
+    if mean <= 0:
+        return math.inf
+    variance = sum((sample - mean) ** 2 for sample in samples) / (n - 1)
+
+    degree = n - 1
+    t = _t_critical_values[degree] if degree < len(_t_critical_values) else 1.96
+    return t * math.sqrt(variance / n) / mean
@@ -0,0 +1,141 @@
+"""入力サイズと実行時間の関係から、計算量を推定する."""
+
+import math
+from dataclasses import dataclass
+from typing import Callable
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+try:
+    import numpy
+
+    _has_numpy = True
+except ImportError:  # numpy は任意の依存. なければ計算量の推定はできない
+    _has_numpy = False
+
+
+@dataclass(frozen=True)
+class ComplexityClass:
+    """計算量のクラス. growth が None なら入力サイズによらない."""
+
+    name: str
+    growth: Optional[Callable[[float], float]]
+
+
+COMPLEXITY_CLASSES: List[ComplexityClass] = [
+    ComplexityClass("O(1)", None),
+    ComplexityClass("O(log N)", lambda n: math.log(n)),
+    ComplexityClass("O(sqrt N)", lambda n: math.sqrt(n)),
+    ComplexityClass("O(N)", lambda n: n),
+    ComplexityClass("O(N log N)", lambda n: n * math.log(n)),
+    ComplexityClass("O(N sqrt N)", lambda n: n * math.sqrt(n)),
+    ComplexityClass("O(N^2)", lambda n: n**2),
+    ComplexityClass("O(N^2 log N)", lambda n: n**2 * math.log(n)),
+    ComplexityClass("O(N^3)", lambda n: n**3),
+]
+
+# 誤差の比がこれ以内なら、当てはまりの良さに差がないとみなす
+_indistinguishable_ratio = 1.2
+
+
+@dataclass
+class ComplexityFit:
+    """実行時間を constant + coefficient * growth(N) [秒] で近似した結果."""
+
+    complexity: ComplexityClass
+    constant: float
+    coefficient: float
+    error: float  # 計測値に対する相対誤差の二乗平均平方根
+
+    def predict(self, n: int) -> float:
+        """入力サイズ n での実行時間[秒]を見積もる.
+
+        Args:
+            n (int): 入力サイズ
+
+        Returns:
+            float: 実行時間[秒]
+        """
+        if self.complexity.growth is None:
+            return self.constant
+        return self.constant + self.coefficient * self.complexity.growth(n)
+
+
+def can_fit_complexity() -> bool:
+    """計算量の推定に必要な numpy が使えるか."""
+    return _has_numpy
+
+
+def fit_complexity(sizes: Sequence[int], times: Sequence[float]) -> List[ComplexityFit]:
+    """計測値に計算量のクラスごとの曲線を最小二乗法で当てはめる.
+
+    実行時間は入力サイズによって桁が変わるので、相対誤差が小さくなるように重みを付ける.
+    係数が負になるクラスは、実行時間の増え方を説明できていないとみなして除く.
+    numpy が必要.
+
+    Args:
+        sizes (Sequence[int]): 入力サイズ. 1以上
+        times (Sequence[float]): 各入力サイズでの実行時間[秒]. 正でなければならない
+
+    Returns:
+        List[ComplexityFit]: 当てはめた結果. よく当てはまったものから順に並ぶ
+    """
+    fits = []
+    for complexity in COMPLEXITY_CLASSES:
+        fit = _fit_one(complexity, sizes, times)
+        if fit is not None:
+            fits.append(fit)
+    return sorted(fits, key=lambda fit: fit.error)
+
+
+def choose_best_fit(fits: List[ComplexityFit]) -> ComplexityFit:
+    """当てはめた結果から、計測値を最もよく説明するものを選ぶ.
+
+    定数項があるので、成長の遅いクラスの計測値には成長の速いクラスもほぼ同じ誤差で
+    当てはまってしまう. 誤差が最小のものと区別がつかないもののうち、最も単純なものを選ぶ.
+
+    Args:
+        fits (List[ComplexityFit]): fit_complexity の結果. 空であってはならない
+
+    Returns:
+        ComplexityFit: 選んだ結果
+    """
+    tolerance = min(fit.error for fit in fits) * _indistinguishable_ratio
+    candidates = [fit for fit in fits if fit.error <= tolerance]
+    return min(candidates, key=lambda fit: COMPLEXITY_CLASSES.index(fit.complexity))
+
+
+def _fit_one(
+    complexity: ComplexityClass, sizes: Sequence[int], times: Sequence[float]
+) -> Optional[ComplexityFit]:
+    observed = numpy.array(times, dtype=numpy.float64)
+    ones = numpy.ones(len(sizes))
+
+    if complexity.growth is None:
+        (constant,) = _weighted_least_squares([ones], observed)
+        coefficient = 0.0
+        growth = numpy.zeros(len(sizes))
+    else:
+        growth = numpy.array([complexity.growth(n) for n in sizes], dtype=float)
+        constant, coefficient = _weighted_least_squares([ones, growth], observed)
+        if constant < 0:
+            # 起動時間などの定数項が負になるのは不自然なので、比例するとして当てはめ直す
+            constant = 0.0
+            (coefficient,) = _weighted_least_squares([growth], observed)
+        if coefficient <= 0:
+            return None
+
+    predicted = constant + coefficient * growth
+    error = float(numpy.sqrt(numpy.mean(((predicted - observed) / observed) ** 2)))
+    return ComplexityFit(complexity, constant, coefficient, error)
+
+
+def _weighted_least_squares(
+    columns: List["numpy.typing.NDArray[numpy.float64]"],
+    observed: "numpy.typing.NDArray[numpy.float64]",
+) -> List[float]:
+    """相対誤差の二乗和が最小になる、各列の係数を求める."""
+    design = numpy.stack(columns, axis=1) / observed[:, numpy.newaxis]
+    solution, *_ = numpy.linalg.lstsq(design, numpy.ones(len(observed)), rcond=None)
+    return [float(value) for value in solution]
@@ -4,6 +4,7 @@ import os
 from typing import Any
 from typing import Dict
 from typing import List
+from typing import Literal
 from typing import Optional
 
 from pydantic import BaseModel
@@ -19,6 +20,10 @@ class LanguageConfig(BaseModel):
     use_default_template: Optional[bool]
     build: List[str]
     run: List[str]
+    fork_server: Optional[bool] = None
+    preload_modules: Optional[List[str]] = None
+    limit_address_space: Optional[bool] = None
+    profiler: Optional[Literal["cprofile", "sampling", "perf"]] = None
 
     @property
     def resolved_template_dir(self) -> Optional[str]:
@@ -0,0 +1,19 @@
+"""AtCoderの問題を表すデータ構造を定義する."""
+from typing import List
+from typing import Optional
+
+from pydantic import BaseModel
+
+from atcoder_helper.entities.atcoder_test_case import AtcoderTestCase
+
+
+class AtCoderProblem(BaseModel):
+    """問題ページから取り出した、1つの問題."""
+
+    contest: str
+    task: str  # "コンテスト名_" を除いたタスク名
+    title: str
+    time_limit: Optional[float]  # 実行時間制限[秒]
+    memory_limit: Optional[int]  # メモリ制限[MiB]
+    statement: str  # 問題文のテキスト. 日本語版があれば日本語版
+    test_cases: List[AtcoderTestCase]
@@ -0,0 +1,86 @@
+"""プロファイラが集めたスタックから、時間のかかっている関数を見つける."""
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict
+from typing import List
+
+# 折りたたんだスタック (collapsed stacks). "root;caller;callee" -> 重み
+# 重みはプロファイラによってサンプル数かマイクロ秒. flamegraph.pl などにそのまま渡せる
+CollapsedStacks = Dict[str, int]
+
+
+@dataclass
+class ProfileResult:
+    """プロファイラの計測結果."""
+
+    profiler: str  # 使ったプロファイラ
+    unit: str  # 重みの単位
+    stacks: CollapsedStacks
+
+
+@dataclass
+class Hotspot:
+    """時間のかかっている関数."""
+
+    name: str
+    self_weight: int  # その関数自身の重み
+    total_weight: int  # その関数から呼んだ関数の分も含めた重み
+
+
+def find_hotspots(stacks: CollapsedStacks, limit: int) -> List[Hotspot]:
+    """関数自身の重みが大きい順に、上位 limit 個の関数を返す.
+
+    再帰している関数の total_weight は、同じスタックの中で一度だけ数える.
+
+    Args:
+        stacks (CollapsedStacks): 折りたたんだスタック
+        limit (int): 返す関数の数
+
+    Returns:
+        List[Hotspot]: 時間のかかっている関数
+    """
+    self_weights: Counter[str] = Counter()
+    total_weights: Counter[str] = Counter()
+    for stack, weight in stacks.items():
+        frames = stack.split(";")
+        self_weights[frames[-1]] += weight
+        for frame in set(frames):
+            total_weights[frame] += weight
+
+    names = sorted(
+        total_weights, key=lambda name: (-self_weights[name], -total_weights[name])
+    )
+    return [
+        Hotspot(name, self_weights[name], total_weights[name])
+        for name in names[:limit]
+    ]
+
+
+def parse_collapsed(text: str) -> CollapsedStacks:
+    """1行に1つ "root;caller;callee 重み" と書いたテキストを読む. 読めない行は無視する.
+
+    Args:
+        text (str): テキスト
+
+    Returns:
+        CollapsedStacks: 折りたたんだスタック
+    """
+    stacks: Counter[str] = Counter()
+    for line in text.splitlines():
+        stack, _, weight = line.rpartition(" ")
+        if stack and weight.isdigit():
+            stacks[stack] += int(weight)
+    return dict(stacks)
+
+
+def format_collapsed(stacks: CollapsedStacks) -> str:
+    """折りたたんだスタックを、flamegraph.pl などが読めるテキストにする.
+
+    Args:
+        stacks (CollapsedStacks): 折りたたんだスタック
+
+    Returns:
+        str: 1行に1つのスタックを書いたテキスト
+    """
+    return "".join(f"{stack} {weight}\n" for stack, weight in sorted(stacks.items()))
@@ -1,11 +1,29 @@
 """TaskConfigを定義する."""
 
 from typing import List
+from typing import Literal
 from typing import Optional
 
 from pydantic import BaseModel
 
 
+class CheckerConfig(BaseModel):
+    """出力の判定方法を保持する.
+
+    type は次のいずれか.
+        exact: 末尾の空白と改行コードの違いだけを無視して、出力全体を比較する
+        token: 空白で区切ったトークンの列として比較する
+        numeric: token と同様だが、数値のトークンは誤差を許して比較する
+        external: testlib 形式のチェッカを `<run...> input output answer` で呼び出す
+    """
+
+    type: Literal["exact", "token", "numeric", "external"] = "exact"
+    build: List[str] = []  # 外部チェッカのビルドコマンド
+    run: List[str] = []  # 外部チェッカの実行コマンド
+    absolute_error: float = 1e-6  # numeric で許容する絶対誤差
+    relative_error: float = 1e-6  # numeric で許容する相対誤差
+
+
 class TaskConfig(BaseModel):
     """タスクごとの設定を保持する."""
 
@@ -13,3 +31,14 @@ class TaskConfig(BaseModel):
     run: List[str]
     contest: Optional[str] = None
     task: Optional[str] = None
+    time_limit: float = 2.0  # 実行時間制限[秒]
+    memory_limit: int = 1024  # メモリ制限[MiB]
+    output_limit: int = 1024  # 出力サイズ制限[MiB]
+    fork_server: bool = False  # Python系の解答をフォークサーバ経由で実行するか
+    preload_modules: List[str] = []  # フォークサーバ起動時に import しておくモジュール
+    # メモリ制限に合わせて仮想メモリも制限するか. 大きな仮想アドレス空間を予約する処理系
+    # (JVM, .NET, Node.js など) では false にする
+    limit_address_space: bool = True
+    checker: CheckerConfig = CheckerConfig()  # 出力の判定方法
+    # exec --profile で使うプロファイラ. None なら実行コマンドから選ぶ
+    profiler: Optional[Literal["cprofile", "sampling", "perf"]] = None
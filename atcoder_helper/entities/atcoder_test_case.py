@@ -1,6 +1,8 @@
 """テストケースにまつわるデータ構造を定義する."""
 from dataclasses import dataclass
 from enum import Enum
+from typing import Any
+from typing import Dict
 from typing import Optional
 from typing import cast
 
@@ -16,6 +18,9 @@ class AtCoderTestStatus(Enum):
     WA = 2
     ERROR = 3
     JUSTSHOW = 4
+    TLE = 5
+    MLE = 6
+    OLE = 7
 
     def _dye(self, message: str, color: str) -> str:
         return cast(str, color + message + Style.RESET_ALL)
@@ -28,6 +33,9 @@ class AtCoderTestStatus(Enum):
             AtCoderTestStatus.WA: Fore.YELLOW,
             AtCoderTestStatus.ERROR: Fore.RED,
             AtCoderTestStatus.JUSTSHOW: Fore.BLUE,
+            AtCoderTestStatus.TLE: Fore.MAGENTA,
+            AtCoderTestStatus.MLE: Fore.MAGENTA,
+            AtCoderTestStatus.OLE: Fore.MAGENTA,
         }
 
         return self._dye(self.name, table[self])
@@ -42,11 +50,32 @@ class AtCoderTestResult:
     actual: str
     error: str
     expected: Optional[str] = None
+    wall_time: Optional[float] = None  # 実際に走っていた時間[秒]
+    cpu_time: Optional[float] = None  # user + sys [秒]
+    max_rss: Optional[int] = None  # ピークメモリ使用量[KiB]
+    cached: bool = False  # 実行せず、前回の結果を再利用したか
+
+
+@dataclass
+class CachedTestResult:
+    """再利用するために保存しておく、テストケースごとの直近の実行結果."""
+
+    key: Optional[str]  # ProgramExecutor.cache_key. None なら再利用しない
+    result: AtCoderTestResult
 
 
 class AtcoderTestCase(BaseModel):
     """テストケースを表す."""
 
     name: str
-    given: str
+    given: str = ""
     expected: Optional[str]
+    # 入力が書かれたファイルのタスクディレクトリからの相対パス. 指定されたときは given は使われない
+    given_file: Optional[str] = None
+
+    def dict(self, **kwargs: Any) -> Dict[str, Any]:
+        """辞書に変換. given_file が指定されていないときは含めない."""
+        result = super().dict(**kwargs)
+        if result.get("given_file") is None:
+            result.pop("given_file", None)
+        return result
@@ -0,0 +1,274 @@
+"""タスクディレクトリのファイルの変更を待つ."""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from typing import Dict
+from typing import Final
+from typing import List
+from typing import Optional
+from typing import Protocol
+from typing import Set
+from typing import Tuple
+
+
+class FileWatcher(Protocol):
+    """ディレクトリ以下のファイルの変更を待つ."""
+
+    def wait(self, debounce: float) -> Set[str]:
+        """どれかのファイルが変わるまで待つ.
+
+        保存のたびに複数回書き込むエディタやビルドツールのために、変更が始まってから
+        debounce 秒のあいだ新しい変更がなくなるまで待ってから返す.
+
+        Args:
+            debounce (float): 変更が落ち着いたとみなすまでの時間[秒]
+
+        Returns:
+            Set[str]: 変わったファイルの、ディレクトリからの相対パス
+        """
+
+    def discard(self) -> None:
+        """これまでに起きた変更を捨てる. ビルドで生成されたファイルの変更を無視するのに使う."""
+
+    def close(self) -> None:
+        """見張りをやめる."""
+
+
+def _is_ignored(name: str) -> bool:
+    """エディタの一時ファイルや隠しファイルかを返す."""
+    return name.startswith(".") or name.endswith("~") or name == "4913"
+
+
+class InotifyFileWatcher:
+    """inotify でファイルの変更を待つ. Linux でのみ使える."""
+
+    _IN_CLOSE_WRITE: Final[int] = 0x00000008
+    _IN_MOVED_FROM: Final[int] = 0x00000040
+    _IN_MOVED_TO: Final[int] = 0x00000080
+    _IN_CREATE: Final[int] = 0x00000100
+    _IN_DELETE: Final[int] = 0x00000200
+    _IN_Q_OVERFLOW: Final[int] = 0x00004000
+    _IN_ISDIR: Final[int] = 0x40000000
+    _IN_NONBLOCK: Final[int] = os.O_NONBLOCK
+    _IN_CLOEXEC: Final[int] = os.O_CLOEXEC
+
+    # 書き込みの途中 (IN_MODIFY) では起こさず、書き終わったときに起こす
+    _mask: Final[int] = (
+        _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+    )
+    _event_header: Final[struct.Struct] = struct.Struct("iIII")
+
+    _directory: str
+    _fd: int
+    _watches: Dict[int, str]  # watch descriptor -> ディレクトリからの相対パス
+    _libc: ctypes.CDLL
+
+    def __init__(self, directory: str):
+        """__init__.
+
+        Args:
+            directory (str): 見張るディレクトリ. 隠しディレクトリ以外のサブディレクトリも見張る
+
+        Raises:
+            OSError: inotify が使えない
+        """
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._directory = os.path.abspath(directory)
+        self._fd = self._libc.inotify_init1(self._IN_NONBLOCK | self._IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._watches = {}
+
+        try:
+            for dirpath, dirnames, _ in os.walk(self._directory):
+                dirnames[:] = [name for name in dirnames if not _is_ignored(name)]
+                self._add_watch(os.path.relpath(dirpath, self._directory))
+        except OSError:
+            self.close()
+            raise
+
+    def wait(self, debounce: float) -> Set[str]:
+        """どれかのファイルが変わるまで待つ.
+
+        Args:
+            debounce (float): 変更が落ち着いたとみなすまでの時間[秒]
+
+        Returns:
+            Set[str]: 変わったファイルの、ディレクトリからの相対パス
+        """
+        changed: Set[str] = set()
+        while not changed:
+            changed |= self._read_events(None)
+        while True:
+            more = self._read_events(debounce)
+            if not more:
+                return changed
+            changed |= more
+
+    def discard(self) -> None:
+        """これまでに起きた変更を捨てる."""
+        while self._read_events(0):
+            pass
+
+    def close(self) -> None:
+        """見張りをやめる."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _add_watch(self, relative_dir: str) -> None:
+        path = os.path.normpath(os.path.join(self._directory, relative_dir))
+        wd = self._libc.inotify_add_watch(self._fd, path.encode(), self._mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), path)
+        self._watches[wd] = os.path.normpath(relative_dir)
+
+    def _read_events(self, timeout: Optional[float]) -> Set[str]:
+        """イベントが届くまで最大 timeout 秒待って読み、変わったファイルを返す."""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        try:
+            buffer = os.read(self._fd, 1 << 16)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        for mask, relative_path in self._parse(buffer):
+            if mask & self._IN_Q_OVERFLOW:
+                changed.add(".")  # 取りこぼしたので、何かが変わったことだけ伝える
+                continue
+            if relative_path is None or _is_ignored(os.path.basename(relative_path)):
+                continue
+            if mask & self._IN_ISDIR:
+                self._on_directory_event(mask, relative_path)
+                continue
+            changed.add(relative_path)
+        return changed
+
+    def _on_directory_event(self, mask: int, relative_path: str) -> None:
+        """新しくできたサブディレクトリも見張る."""
+        if not mask & (self._IN_CREATE | self._IN_MOVED_TO):
+            return
+        try:
+            self._add_watch(relative_path)
+        except OSError:
+            pass  # すぐに消されたディレクトリ
+
+    def _parse(self, buffer: bytes) -> List[Tuple[int, Optional[str]]]:
+        events: List[Tuple[int, Optional[str]]] = []
+        offset = 0
+        while offset + self._event_header.size <= len(buffer):
+            wd, mask, _, length = self._event_header.unpack_from(buffer, offset)
+            offset += self._event_header.size
+            end = offset + length
+            name = buffer[offset:end].rstrip(b"\0").decode(errors="replace")
+            offset = end
+
+            directory = self._watches.get(wd)
+            if directory is None or not name:
+                events.append((mask, None))
+                continue
+            path = name if directory == "." else os.path.join(directory, name)
+            events.append((mask, path))
+        return events
+
+
+_FileSignature = Tuple[int, int]  # (mtime_ns, size)
+
+
+class PollingFileWatcher:
+    """一定間隔でファイルの更新時刻とサイズを調べて、変更を待つ. どの環境でも使える."""
+
+    _interval: Final[float] = 0.2  # 調べる間隔[秒]
+
+    _directory: str
+    _snapshot: Dict[str, _FileSignature]
+
+    def __init__(self, directory: str):
+        """__init__.
+
+        Args:
+            directory (str): 見張るディレクトリ. 隠しディレクトリ以外のサブディレクトリも見張る
+        """
+        self._directory = os.path.abspath(directory)
+        self._snapshot = self._take_snapshot()
+
+    def wait(self, debounce: float) -> Set[str]:
+        """どれかのファイルが変わるまで待つ.
+
+        Args:
+            debounce (float): 変更が落ち着いたとみなすまでの時間[秒]
+
+        Returns:
+            Set[str]: 変わったファイルの、ディレクトリからの相対パス
+        """
+        changed: Set[str] = set()
+        quiet_since = time.monotonic()
+        while True:
+            time.sleep(min(self._interval, debounce) if changed else self._interval)
+            more = self._poll()
+            if more:
+                changed |= more
+                quiet_since = time.monotonic()
+            elif changed and time.monotonic() - quiet_since >= debounce:
+                return changed
+
+    def discard(self) -> None:
+        """これまでに起きた変更を捨てる."""
+        self._snapshot = self._take_snapshot()
+
+    def close(self) -> None:
+        """見張りをやめる."""
+
+    def _poll(self) -> Set[str]:
+        snapshot = self._take_snapshot()
+        changed = {
+            path
+            for path in snapshot.keys() | self._snapshot.keys()
+            if snapshot.get(path) != self._snapshot.get(path)
+        }
+        self._snapshot = snapshot
+        return changed
+
+    def _take_snapshot(self) -> Dict[str, _FileSignature]:
+        snapshot = {}
+        for dirpath, dirnames, filenames in os.walk(self._directory):
+            dirnames[:] = [name for name in dirnames if not _is_ignored(name)]
+            for name in filenames:
+                if _is_ignored(name):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                relative_path = os.path.relpath(path, self._directory)
+                snapshot[relative_path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+
+def create_file_watcher(directory: str) -> FileWatcher:
+    """使える中で最も効率のよい FileWatcher を返す.
+
+    Args:
+        directory (str): 見張るディレクトリ
+
+    Returns:
+        FileWatcher: inotify が使えればそれを、使えなければポーリングで見張るもの
+    """
+    try:
+        return InotifyFileWatcher(directory)
+    except (OSError, AttributeError):  # AttributeError: libc に inotify がない
+        return PollingFileWatcher(directory)
@@ -0,0 +1,225 @@
+"""Python製の解答を、インタプリタを起動しなおさずに繰り返し実行するためのフォークサーバ.
+
+このファイルは atcoder_helper から import されるのではなく、解答を実行するインタプリタ
+(python, pypy3 等)によって単体のスクリプトとして実行される.
+そのため、標準ライブラリ以外に依存してはならない.
+
+使い方:
+    <interpreter> fork_server.py <socket path> [preload module...]
+
+起動するとモジュールを preload し、socket path で待ち受けを始めたことを標準出力に
+"ready" と1行書いて知らせる. 標準入力が閉じられると終了する.
+
+1つの接続が1つのテストケースに対応する. クライアントは
+{"workdir": ..., "script": ..., "rlimits": [[name, value], ...], "cgroup": ...} という
+JSON 1行を、解答の stdin / stdout / stderr になるファイルディスクリプタと一緒に送る.
+rlimits と cgroup は省略でき、指定されれば解答を実行する前にその制限をかける. サーバは fork したハンドラの中でさらに
+解答用のプロセスを fork し、そのpidを {"pid": ...} として返したのち、終了を待って
+{"status": ..., "utime": ..., "stime": ..., "maxrss": ...} を返す.
+
+"script" の代わりに "command": [...] を送ると、解答用のプロセスでそのコマンドを exec する.
+Python 以外の解答も、大きなプロセスからではなくこの小さなサーバから起動するために使う.
+
+"cpus": [...] を送ると、解答用のプロセスをその CPU の集合に固定する. サーバがいつ
+起動したかによらず、クライアントのスレッドの CPU affinity を解答に引き継ぐために使う.
+"""
+
+import array
+import importlib
+import json
+import os
+import resource
+import runpy
+import select
+import signal
+import socket
+import sys
+import traceback
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import NoReturn
+from typing import Tuple
+
+_FD_COUNT = 3
+_MAX_MESSAGE = 1 << 16
+
+
+def _recv_request(conn: socket.socket) -> Tuple[Dict[str, Any], List[int]]:
+    fds = array.array("i")
+    message, ancdata, _, _ = conn.recvmsg(
+        _MAX_MESSAGE, socket.CMSG_LEN(_FD_COUNT * fds.itemsize)
+    )
+    for level, type_, data in ancdata:
+        if level == socket.SOL_SOCKET and type_ == socket.SCM_RIGHTS:
+            fds.frombytes(data[: len(data) - (len(data) % fds.itemsize)])
+    request: Dict[str, Any] = json.loads(message.decode())
+    return request, list(fds)
+
+
+def _send(conn: socket.socket, obj: Dict[str, Any]) -> None:
+    conn.sendall((json.dumps(obj) + "\n").encode())
+
+
+def _run_script(script: str) -> int:
+    """解答スクリプトを __main__ として実行し、終了コードを返す."""
+    try:
+        runpy.run_path(script, run_name="__main__")
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        if isinstance(e.code, int):
+            return e.code
+        print(e.code, file=sys.stderr)
+        return 1
+    except BaseException:
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+def _limit_resources(request: Dict[str, Any]) -> None:
+    """解答を実行するプロセス自身に、要求された資源の制限をかける."""
+    for name, value in request.get("rlimits", []):
+        try:
+            resource.setrlimit(getattr(resource, name), (value, value))
+        except (AttributeError, ValueError, OSError):
+            pass
+
+    cgroup = request.get("cgroup")
+    if cgroup is not None:
+        try:
+            with open(os.path.join(cgroup, "cgroup.procs"), "wt") as file:
+                file.write("0")
+        except OSError:
+            pass
+
+
+def _set_affinity(request: Dict[str, Any]) -> None:
+    """解答を実行するプロセスを、要求された CPU の集合に固定する."""
+    cpus = request.get("cpus")
+    if cpus is None or not hasattr(os, "sched_setaffinity"):
+        return
+    try:
+        os.sched_setaffinity(0, cpus)
+    except OSError:
+        pass
+
+
+def _exec_command(command: List[str]) -> int:
+    """解答のコマンドを exec する. exec できなかったときだけ戻り、終了コードを返す."""
+    # Python が起動時に無視するようにしたシグナルを、通常のプロセスの既定の動作に戻す
+    for name in ("SIGPIPE", "SIGXFSZ"):
+        if hasattr(signal, name):
+            signal.signal(getattr(signal, name), signal.SIG_DFL)
+    try:
+        os.execvp(command[0], command)
+    except OSError as e:
+        print(f"{command[0]}: {e.strerror}", file=sys.stderr)
+    return 127
+
+
+def _run_solution(request: Dict[str, Any], fds: List[int]) -> NoReturn:
+    """解答用に fork されたプロセスの中で、解答スクリプトかコマンドを実行する. 戻らない."""
+    code = 1
+    try:
+        os.setsid()
+        for target, fd in enumerate(fds):
+            os.dup2(fd, target)
+        for fd in fds:
+            if fd >= _FD_COUNT:
+                os.close(fd)
+        os.chdir(request["workdir"])
+        _limit_resources(request)
+        _set_affinity(request)
+
+        if "command" in request:
+            code = _exec_command(request["command"])
+        else:
+            script = request["script"]
+            sys.argv = [script]
+            sys.path[0] = os.path.dirname(os.path.abspath(script))
+
+            # fork 元の乱数状態を全ケースで共有しないよう、通常の起動と同様に初期化する
+            if "random" in sys.modules:
+                sys.modules["random"].seed()
+
+            code = _run_script(script)
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+
+def _handle(conn: socket.socket) -> NoReturn:
+    """1つのテストケースを処理する. 接続ごとに fork されたプロセスの中で呼ばれる. 戻らない."""
+    try:
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        request, fds = _recv_request(conn)
+
+        pid = os.fork()
+        if pid == 0:
+            conn.close()
+            _run_solution(request, fds)
+
+        for fd in fds:
+            os.close(fd)
+        _send(conn, {"pid": pid})
+
+        _, status, rusage = os.wait4(pid, 0)
+        _send(
+            conn,
+            {
+                "status": status,
+                "utime": rusage.ru_utime,
+                "stime": rusage.ru_stime,
+                "maxrss": rusage.ru_maxrss,
+            },
+        )
+    finally:
+        os._exit(0)
+
+
+def _preload(modules: List[str]) -> None:
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except Exception:
+            print(f"failed to preload {module}", file=sys.stderr)
+
+
+def main() -> None:
+    """フォークサーバのエントリポイント."""
+    socket_path = sys.argv[1]
+
+    # sys.path[0] はこのファイルのあるディレクトリになっているが、解答から見えるべきなのは
+    # タスクディレクトリ(サーバの作業ディレクトリ)
+    sys.path[0] = os.getcwd()
+    _preload(sys.argv[2:])
+
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(socket_path)
+    listener.listen(64)
+
+    # ハンドラプロセスはカーネルに回収させる
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+
+    sys.stdout.write("ready\n")
+    sys.stdout.flush()
+
+    while True:
+        readable, _, _ = select.select([listener, sys.stdin], [], [])
+        if sys.stdin in readable and not os.read(sys.stdin.fileno(), 1024):
+            break  # クライアントがいなくなった
+        if listener in readable:
+            conn, _ = listener.accept()
+            if os.fork() == 0:
+                listener.close()
+                _handle(conn)
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
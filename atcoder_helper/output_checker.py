@@ -0,0 +1,487 @@
+"""解答の出力と期待する出力を比較する.
+
+出力は巨大になりうるので、文字列として読み込まずに、ファイルを mmap したものを
+一定の大きさごとに比較し、最初に食い違ったところで打ち切る.
+
+判定方法は TaskConfig の checker で選べる. どの判定方法も、入力・解答の出力・
+期待する出力をそれぞれファイルのパスで受け取る.
+"""
+
+import mmap
+import os
+import re
+import subprocess
+from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import zip_longest
+from typing import IO
+from typing import Final
+from typing import Iterator
+from typing import List
+from typing import Protocol
+from typing import Union
+
+from atcoder_helper.entities.atcoder_task_config import CheckerConfig
+
+try:
+    import numpy
+    import numpy.typing
+
+    _has_numpy = True
+except ImportError:  # numpy は任意の依存. なければ1トークンずつ比較する
+    _has_numpy = False
+
+Buffer = Union[bytes, mmap.mmap]
+
+_CHUNK_SIZE: Final[int] = 1 << 20
+
+_TOKEN: Final[re.Pattern[bytes]] = re.compile(rb"\S+")
+_SPACE: Final[re.Pattern[bytes]] = re.compile(rb"\s")
+
+if _has_numpy:
+    # bytes.split と同じく、ASCII の空白文字を区切りとみなす
+    _WHITESPACE_TABLE = numpy.zeros(256, dtype=bool)
+    _WHITESPACE_TABLE[list(b" \t\n\v\f\r")] = True
+
+
+class CheckerFailure(Exception):
+    """チェッカ自体が判定に失敗した."""
+
+
+@dataclass
+class CheckResult:
+    """出力の判定結果."""
+
+    accepted: bool
+    message: str = ""  # チェッカからのコメント
+
+
+class OutputChecker(Protocol):
+    """解答の出力を判定する."""
+
+    def check(self, input_path: str, output_path: str, answer_path: str) -> CheckResult:
+        """解答の出力を判定する.
+
+        複数のスレッドから同時に呼ばれても安全でなければならない.
+
+        Args:
+            input_path (str): 入力のファイル
+            output_path (str): 解答の出力のファイル
+            answer_path (str): 期待する出力のファイル
+
+        Raises:
+            CheckerFailure: チェッカ自体が判定に失敗した
+
+        Returns:
+            CheckResult: 判定結果
+        """
+
+
+class ExactChecker:
+    """末尾の空白と改行コードの違いだけを無視して、出力全体を比較する."""
+
+    def check(self, input_path: str, output_path: str, answer_path: str) -> CheckResult:
+        """解答の出力を判定する.
+
+        Args:
+            input_path (str): 入力のファイル
+            output_path (str): 解答の出力のファイル
+            answer_path (str): 期待する出力のファイル
+
+        Returns:
+            CheckResult: 判定結果
+        """
+        with _mapped_path(answer_path) as expected, _mapped_path(output_path) as actual:
+            return CheckResult(outputs_match(expected, actual))
+
+
+class TokenChecker:
+    """空白で区切ったトークンの列として比較する. 空白や改行の数・種類は問わない."""
+
+    def check(self, input_path: str, output_path: str, answer_path: str) -> CheckResult:
+        """解答の出力を判定する.
+
+        Args:
+            input_path (str): 入力のファイル
+            output_path (str): 解答の出力のファイル
+            answer_path (str): 期待する出力のファイル
+
+        Returns:
+            CheckResult: 判定結果
+        """
+        with _mapped_path(answer_path) as expected, _mapped_path(output_path) as actual:
+            # マッチオブジェクトが mmap を参照している間は mmap を閉じられないので、
+            # 比較は関数に切り出して、with を抜ける前に参照を手放す
+            return self._compare(expected, actual)
+
+    @staticmethod
+    def _compare(expected: Buffer, actual: Buffer) -> CheckResult:
+        tokens = zip_longest(_TOKEN.finditer(expected), _TOKEN.finditer(actual))
+        for index, (expected_token, actual_token) in enumerate(tokens, start=1):
+            if expected_token is None:
+                return CheckResult(False, f"token {index}: expected EOF")
+            if actual_token is None:
+                return CheckResult(False, f"token {index}: unexpected EOF")
+            if expected_token.group() != actual_token.group():
+                return CheckResult(
+                    False,
+                    f"token {index}: expected {_shorten(expected_token.group())}"
+                    f" but got {_shorten(actual_token.group())}",
+                )
+        return CheckResult(True)
+
+
+class NumericChecker:
+    """数値のトークンは誤差を許して、それ以外のトークンは完全一致で比較する.
+
+    数値は、絶対誤差か相対誤差のどちらかが許容範囲内なら一致とみなす.
+    numpy があれば、出力全体を C の実装でまとめて数値に変換し、ベクトル演算で比較する.
+    数値でないトークンが混ざっている場合や一致しなかった場合は、1トークンずつ比較する.
+    """
+
+    _absolute_error: float
+    _relative_error: float
+
+    def __init__(self, absolute_error: float, relative_error: float):
+        """__init__.
+
+        Args:
+            absolute_error (float): 許容する絶対誤差
+            relative_error (float): 許容する相対誤差
+        """
+        self._absolute_error = absolute_error
+        self._relative_error = relative_error
+
+    def check(self, input_path: str, output_path: str, answer_path: str) -> CheckResult:
+        """解答の出力を判定する.
+
+        Args:
+            input_path (str): 入力のファイル
+            output_path (str): 解答の出力のファイル
+            answer_path (str): 期待する出力のファイル
+
+        Returns:
+            CheckResult: 判定結果
+        """
+        with _mapped_path(answer_path) as expected, _mapped_path(output_path) as actual:
+            if _has_numpy:
+                try:
+                    if self._all_close_vectorized(expected, actual):
+                        return CheckResult(True)
+                except ValueError:
+                    pass  # 数値でないトークンが混ざっている
+
+            # 一致しなかった場合も、どこで食い違ったかを示すためにトークン単位で比較し直す
+            return self._check_tokens(expected, actual)
+
+    def _check_tokens(self, expected: Buffer, actual: Buffer) -> CheckResult:
+        """1トークンずつ比較し、最初に食い違ったトークンを示す.
+
+        トークンの列は作らず、両方の出力を同時にたどって食い違ったところで止める.
+        トークンの数が違う場合も、多いほうの残りは数えるだけにする.
+        """
+        expected_tokens = _TOKEN.finditer(expected)
+        actual_tokens = _TOKEN.finditer(actual)
+        count = 0
+        for expected_token, actual_token in zip_longest(expected_tokens, actual_tokens):
+            if expected_token is None or actual_token is None:
+                # 少ないほうが尽きた. 多いほうの残り(いま取り出した1つを含む)を数える
+                longer = actual_tokens if expected_token is None else expected_tokens
+                total = count + 1 + sum(1 for _ in longer)
+                if expected_token is None:
+                    expected_count, actual_count = count, total
+                else:
+                    expected_count, actual_count = total, count
+                return CheckResult(
+                    False, f"expected {expected_count} tokens but got {actual_count}"
+                )
+
+            count += 1
+            expected_bytes = expected_token.group()
+            actual_bytes = actual_token.group()
+            if expected_bytes != actual_bytes and not self._is_close(
+                expected_bytes, actual_bytes
+            ):
+                return CheckResult(
+                    False,
+                    f"token {count}: expected {_shorten(expected_bytes)}"
+                    f" but got {_shorten(actual_bytes)}",
+                )
+        return CheckResult(True)
+
+    def _all_close_vectorized(self, expected: Buffer, actual: Buffer) -> bool:
+        """すべてのトークンを数値として比較し、すべて許容範囲内かを返す.
+
+        出力全体をコピーしないよう、一定の大きさごとに数値に変換しながら比較する.
+
+        Raises:
+            ValueError: 数値でないトークンがあった
+        """
+        expected_chunks = _parse_float_chunks(expected)
+        actual_chunks = _parse_float_chunks(actual)
+        expected_values = actual_values = numpy.empty(0)
+        while True:
+            if len(expected_values) == 0:
+                expected_values = _next_floats(expected_chunks)
+            if len(actual_values) == 0:
+                actual_values = _next_floats(actual_chunks)
+            if len(expected_values) == 0 or len(actual_values) == 0:
+                # どちらかが尽きたら、もう一方も尽きていれば一致
+                return len(expected_values) == len(actual_values)
+
+            count = min(len(expected_values), len(actual_values))
+            if not self._all_close(expected_values[:count], actual_values[:count]):
+                return False
+            expected_values = expected_values[count:]
+            actual_values = actual_values[count:]
+
+    def _all_close(
+        self,
+        expected_values: "numpy.typing.NDArray[numpy.float64]",
+        actual_values: "numpy.typing.NDArray[numpy.float64]",
+    ) -> bool:
+        # inf 同士の差は nan になるので、等しいものは別に見る
+        with numpy.errstate(invalid="ignore"):
+            error = numpy.abs(actual_values - expected_values)
+        tolerance = numpy.maximum(
+            self._absolute_error, self._relative_error * numpy.abs(expected_values)
+        )
+        return bool(((actual_values == expected_values) | (error <= tolerance)).all())
+
+    def _is_close(self, expected: bytes, actual: bytes) -> bool:
+        try:
+            expected_value = float(expected)
+            actual_value = float(actual)
+        except ValueError:
+            return False
+
+        if expected_value == actual_value:
+            return True
+        tolerance = max(
+            self._absolute_error, self._relative_error * abs(expected_value)
+        )
+        return abs(actual_value - expected_value) <= tolerance
+
+
+def _parse_float_chunks(
+    buffer: Buffer,
+) -> Iterator["numpy.typing.NDArray[numpy.float64]"]:
+    """バッファを一定の大きさごとに、トークンの途中で切らずに数値の列に変換する.
+
+    Raises:
+        ValueError: 数値でないトークンがあった
+    """
+    start = 0
+    while start < len(buffer):
+        end = start + _CHUNK_SIZE
+        separator = _SPACE.search(buffer, end) if end < len(buffer) else None
+        end = len(buffer) if separator is None else separator.start()
+        yield _parse_floats(buffer[start:end])
+        start = end
+
+
+def _next_floats(
+    chunks: Iterator["numpy.typing.NDArray[numpy.float64]"],
+) -> "numpy.typing.NDArray[numpy.float64]":
+    """次の空でない数値の列を返す. 残っていなければ空の配列を返す."""
+    for values in chunks:
+        if len(values) > 0:
+            return values
+    return numpy.empty(0)
+
+
+def _parse_floats(text: bytes) -> "numpy.typing.NDArray[numpy.float64]":
+    """空白で区切られた数値の列を、Python のオブジェクトを作らずに配列に変換する.
+
+    Raises:
+        ValueError: 数値でないトークンがあった
+    """
+    token_count = _count_tokens(text)
+    # 空白だけの文字列を渡すと [-1.] が返ってくるので、別に扱う
+    if token_count == 0:
+        return numpy.empty(0)
+
+    values = numpy.fromstring(text, dtype=numpy.float64, sep=" ")
+    # 古い numpy は変換できないトークンがあっても例外を投げず、そこまでの結果を返す
+    if len(values) != token_count:
+        raise ValueError("not all tokens are numbers")
+    return values
+
+
+def _count_tokens(text: bytes) -> int:
+    """空白で区切られたトークンの数を、ベクトル演算で数える."""
+    if not text:
+        return 0
+    is_space = _WHITESPACE_TABLE[numpy.frombuffer(text, dtype=numpy.uint8)]
+    starts = numpy.count_nonzero(is_space[:-1] & ~is_space[1:])
+    return int(starts) + (0 if is_space[0] else 1)
+
+
+class ExternalChecker:
+    """testlib 形式のチェッカを呼び出して判定する.
+
+    チェッカは `<run...> input output answer` で呼び出され、終了コード 0 なら AC、
+    3 (testlib の _fail) やシグナルによる終了ならチェッカ自体の失敗、それ以外なら WA とみなす.
+    チェッカが標準エラー出力に書いたコメントを判定結果のメッセージにする.
+    """
+
+    _fail_returncode: Final[int] = 3
+    _timeout: Final[float] = 60  # チェッカの実行時間制限[秒]
+
+    _run_command: List[str]
+    _task_dir: str
+
+    def __init__(self, run_command: List[str], task_dir: str):
+        """__init__.
+
+        Args:
+            run_command (List[str]): チェッカの実行コマンド
+            task_dir (str): チェッカを実行するディレクトリ
+        """
+        self._run_command = run_command
+        self._task_dir = task_dir
+
+    def check(self, input_path: str, output_path: str, answer_path: str) -> CheckResult:
+        """解答の出力を判定する.
+
+        Args:
+            input_path (str): 入力のファイル
+            output_path (str): 解答の出力のファイル
+            answer_path (str): 期待する出力のファイル
+
+        Raises:
+            CheckerFailure: チェッカ自体が判定に失敗した
+
+        Returns:
+            CheckResult: 判定結果
+        """
+        try:
+            completed_process = subprocess.run(
+                [*self._run_command, input_path, output_path, answer_path],
+                cwd=self._task_dir,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                timeout=self._timeout,
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            raise CheckerFailure(str(e)) from e
+
+        message = completed_process.stderr.decode(errors="replace").strip()
+        returncode = completed_process.returncode
+        if returncode == 0:
+            return CheckResult(True, message)
+        if returncode < 0 or returncode == self._fail_returncode:
+            raise CheckerFailure(f"checker exited with {returncode}: {message}")
+        return CheckResult(False, message)
+
+
+def create_checker(config: CheckerConfig, task_dir: str) -> OutputChecker:
+    """設定に応じたチェッカを作る.
+
+    Args:
+        config (CheckerConfig): 判定方法の設定
+        task_dir (str): タスクディレクトリ
+
+    Returns:
+        OutputChecker: チェッカ
+    """
+    if config.type == "token":
+        return TokenChecker()
+    if config.type == "numeric":
+        return NumericChecker(config.absolute_error, config.relative_error)
+    if config.type == "external":
+        return ExternalChecker(config.run, task_dir)
+    return ExactChecker()
+
+
+@contextmanager
+def mapped(file: IO[bytes]) -> Iterator[Buffer]:
+    """ファイルの中身を読み込まずに、bytes のように扱えるようにする.
+
+    Args:
+        file (IO[bytes]): 読み込むファイル
+
+    Yields:
+        Buffer: ファイルの中身. 空ファイルは mmap できないので b"" になる.
+    """
+    if os.fstat(file.fileno()).st_size == 0:
+        yield b""
+        return
+
+    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        yield buffer
+
+
+@contextmanager
+def _mapped_path(path: str) -> Iterator[Buffer]:
+    with open(path, "rb") as file, mapped(file) as buffer:
+        yield buffer
+
+
+def _shorten(token: bytes, limit: int = 32) -> str:
+    text = token.decode(errors="replace")
+    return repr(text if len(text) <= limit else text[:limit] + "...")
+
+
+def outputs_match(expected: Buffer, actual: Buffer) -> bool:
+    """末尾の空白と改行コードの違いを無視して、2つの出力が一致するかを返す.
+
+    `expected.rstrip() == actual.rstrip()` と同じ判定を、出力全体をコピーせずに行う.
+
+    Args:
+        expected (Buffer): 期待する出力
+        actual (Buffer): 実際の出力
+
+    Returns:
+        bool: 一致するか
+    """
+    return _streams_equal(
+        _normalized_chunks(expected, _rstripped_length(expected)),
+        _normalized_chunks(actual, _rstripped_length(actual)),
+    )
+
+
+def _rstripped_length(buffer: Buffer) -> int:
+    """末尾の空白を取り除いたときの長さを返す."""
+    end = len(buffer)
+    while end > 0:
+        start = max(0, end - _CHUNK_SIZE)
+        stripped = buffer[start:end].rstrip()
+        if stripped:
+            return start + len(stripped)
+        end = start
+    return 0
+
+
+def _normalized_chunks(buffer: Buffer, end: int) -> Iterator[bytes]:
+    r"""buffer[:end] を、改行コードを \n にそろえながら少しずつ返す. 空の chunk は返さない."""
+    carry = b""
+    for start in range(0, end, _CHUNK_SIZE):
+        stop = min(end, start + _CHUNK_SIZE)
+        chunk = carry + buffer[start:stop]
+        # \r\n が chunk の境目で分かれている場合に備えて、末尾の \r は次に回す
+        carry = b"\r" if chunk.endswith(b"\r") else b""
+        chunk = chunk[: len(chunk) - len(carry)].replace(b"\r\n", b"\n")
+        if chunk:
+            yield chunk
+    if carry:
+        yield carry
+
+
+def _streams_equal(left: Iterator[bytes], right: Iterator[bytes]) -> bool:
+    """2つの chunk の列を、区切り方によらずバイト列として比較する."""
+    left_chunk = b""
+    right_chunk = b""
+    while True:
+        if not left_chunk:
+            left_chunk = next(left, b"")
+        if not right_chunk:
+            right_chunk = next(right, b"")
+        if not left_chunk or not right_chunk:
+            return not left_chunk and not right_chunk
+
+        length = min(len(left_chunk), len(right_chunk))
+        if left_chunk[:length] != right_chunk[:length]:
+            return False
+        left_chunk = left_chunk[length:]
+        right_chunk = right_chunk[length:]
@@ -0,0 +1,221 @@
+"""解答をプロファイラの下で実行し、折りたたんだスタック(collapsed stacks)を集める.
+
+プロファイラはタスク設定・言語設定の profiler で選べる.
+    - cprofile: Python製の解答を cProfile で計る. 関数ごとの時間は正確だが、呼び出し
+      経路ごとの時間は呼び出し元ごとの累積時間の比で按分した推定になる.
+    - sampling: Python製の解答を、CPU時間 1ms ごとにサンプリングする. 計測による
+      遅れが小さく、PyPy の JIT も止めない.
+    - perf: ネイティブの解答を perf record でサンプリングする. Linux の perf が必要.
+"""
+
+import os
+import re
+import shutil
+import subprocess
+from typing import Final
+from typing import List
+from typing import Optional
+from typing import Protocol
+
+from atcoder_helper import python_profiler
+from atcoder_helper.entities.atcoder_profile import CollapsedStacks
+from atcoder_helper.entities.atcoder_profile import parse_collapsed
+
+_PERF_FREQUENCY: Final[int] = 999  # [Hz] タイマー割り込みと同期しないよう半端にする
+_PERF_SCRIPT_TIMEOUT: Final[float] = 60.0  # [秒]
+
+# perf script のスタックの1段 "<address> <symbol>+0x<offset> (<dso>)"
+_PERF_FRAME: Final[re.Pattern[str]] = re.compile(
+    r"^\s*[0-9a-f]+\s+(?P<symbol>.*?)(?:\+0x[0-9a-f]+)?\s+\((?P<dso>.*)\)$"
+)
+
+
+class ProfilerUnavailable(Exception):
+    """この解答には、指定したプロファイラを使えない."""
+
+
+class ProfilerFailure(Exception):
+    """プロファイラが計測結果を残さなかった."""
+
+
+class Profiler(Protocol):
+    """解答の実行コマンドをプロファイラの下で走らせ、結果を集める."""
+
+    name: str
+    unit: str  # 重みの単位
+
+    def command(self, run_command: List[str], data_dir: str) -> List[str]:
+        """解答の実行コマンドを、プロファイラの下で実行するコマンドに書き換える.
+
+        Args:
+            run_command (List[str]): 解答の実行コマンド
+            data_dir (str): プロファイラが計測結果を書き出すディレクトリ
+
+        Returns:
+            List[str]: プロファイラの下で解答を実行するコマンド
+        """
+
+    def collect(self, data_dir: str) -> CollapsedStacks:
+        """実行後に、計測結果を折りたたんだスタックにする.
+
+        Args:
+            data_dir (str): command に渡したディレクトリ
+
+        Raises:
+            ProfilerFailure: 計測結果がない・読めない
+
+        Returns:
+            CollapsedStacks: 折りたたんだスタック
+        """
+
+
+class PythonProfiler:
+    """Python製の解答を、python_profiler.py を介して cProfile かサンプリングで計る.
+
+    実行コマンドは `<interpreter> [options...] <script>.py` の形をしていなければならない.
+    """
+
+    _stacks_filename: Final[str] = "stacks"
+
+    name: str
+    unit: str
+
+    def __init__(self, name: str):
+        """__init__.
+
+        Args:
+            name (str): "cprofile" か "sampling"
+        """
+        self.name = name
+        self.unit = "us" if name == "cprofile" else "samples"
+
+    def command(self, run_command: List[str], data_dir: str) -> List[str]:
+        """解答スクリプトを python_profiler.py から実行するコマンドにする."""
+        return [
+            *run_command[:-1],
+            python_profiler.__file__,
+            self.name,
+            os.path.join(data_dir, self._stacks_filename),
+            run_command[-1],
+        ]
+
+    def collect(self, data_dir: str) -> CollapsedStacks:
+        """python_profiler.py が書き出したスタックを読む."""
+        try:
+            with open(os.path.join(data_dir, self._stacks_filename), "rt") as file:
+                return parse_collapsed(file.read())
+        except OSError as e:
+            raise ProfilerFailure("プロファイラが結果を書き出しませんでした") from e
+
+
+class PerfProfiler:
+    """ネイティブの解答を perf record でサンプリングする."""
+
+    _data_filename: Final[str] = "perf.data"
+
+    name: str = "perf"
+    unit: str = "samples"
+
+    def command(self, run_command: List[str], data_dir: str) -> List[str]:
+        """解答を perf record の下で実行するコマンドにする."""
+        return [
+            "perf",
+            "record",
+            "--quiet",
+            # -O2 でフレームポインタが省かれていても辿れるよう、DWARF で巻き戻す
+            "--call-graph=dwarf",
+            f"--freq={_PERF_FREQUENCY}",
+            f"--output={os.path.join(data_dir, self._data_filename)}",
+            "--",
+            *run_command,
+        ]
+
+    def collect(self, data_dir: str) -> CollapsedStacks:
+        """記録を perf script で読み出して、折りたたむ."""
+        data_path = os.path.join(data_dir, self._data_filename)
+        if not os.path.exists(data_path):
+            raise ProfilerFailure("perf record が結果を書き出しませんでした")
+
+        try:
+            completed_process = subprocess.run(
+                ["perf", "script", f"--input={data_path}"],
+                capture_output=True,
+                timeout=_PERF_SCRIPT_TIMEOUT,
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            raise ProfilerFailure("perf script を実行できませんでした") from e
+        if completed_process.returncode != 0:
+            raise ProfilerFailure(
+                completed_process.stderr.decode(errors="replace").strip()
+            )
+        return collapse_perf_script(
+            completed_process.stdout.decode(errors="replace")
+        )
+
+
+def collapse_perf_script(text: str) -> CollapsedStacks:
+    """プロセス名を根にして、perf script の出力を折りたたんだスタックにする.
+
+    シンボルのない段は、その段のあるファイル名で表す.
+
+    Args:
+        text (str): perf script の出力
+
+    Returns:
+        CollapsedStacks: 折りたたんだスタック
+    """
+    stacks: CollapsedStacks = {}
+    for block in re.split(r"\n\s*\n", text):
+        lines = [line for line in block.splitlines() if line.strip()]
+        if not lines or lines[0].startswith("#"):
+            continue
+
+        frames = []
+        for line in lines[1:]:
+            match = _PERF_FRAME.match(line)
+            if match is None:
+                continue
+            symbol = match.group("symbol")
+            if not symbol or symbol == "[unknown]":
+                symbol = f"[{os.path.basename(match.group('dso'))}]"
+            frames.append(symbol.replace(";", ":"))
+
+        process = lines[0].split()[0]
+        stack = ";".join([process, *reversed(frames)])
+        stacks[stack] = stacks.get(stack, 0) + 1
+    return stacks
+
+
+def create_profiler(name: Optional[str], run_command: List[str]) -> Profiler:
+    """プロファイラを選ぶ.
+
+    Args:
+        name (Optional[str]): "cprofile", "sampling", "perf" のいずれか.
+            None なら、実行コマンドが Python のスクリプトを指していれば cprofile、
+            そうでなければ perf
+        run_command (List[str]): 解答の実行コマンド
+
+    Raises:
+        ProfilerUnavailable: この解答には使えない
+
+    Returns:
+        Profiler: プロファイラ
+    """
+    is_script = len(run_command) >= 2 and run_command[-1].endswith(".py")
+    if name is None:
+        name = "cprofile" if is_script else "perf"
+
+    if name in ("cprofile", "sampling"):
+        if not is_script:
+            raise ProfilerUnavailable(
+                f"{name} は `<interpreter> <script>.py` の形の実行コマンドにしか"
+                "使えません"
+            )
+        return PythonProfiler(name)
+    if name == "perf":
+        if shutil.which("perf") is None:
+            raise ProfilerUnavailable(
+                "perf が見つかりません (linux-tools をインストールしてください)"
+            )
+        return PerfProfiler()
+    raise ProfilerUnavailable(f"プロファイラ {name} はありません")
@@ -1,9 +1,38 @@
 """プログラムを実行して結果を取得する."""
 
+import hashlib
+import json
+import os
+import re
+import shutil
+import signal
+import socket
 import subprocess
+import sys
+import tempfile
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from dataclasses import asdict
+from dataclasses import dataclass
+from typing import IO
+from typing import Any
+from typing import Dict
+from typing import Final
+from typing import Iterator
 from typing import List
+from typing import Optional
 from typing import Protocol
+from typing import Set
+from typing import Tuple
 
+from atcoder_helper import fork_server
+from atcoder_helper import output_checker
+from atcoder_helper import profiler
+from atcoder_helper import resource_limits
+from atcoder_helper.entities.atcoder_profile import ProfileResult
+from atcoder_helper.entities.atcoder_task_config import CheckerConfig
 from atcoder_helper.entities.atcoder_test_case import AtcoderTestCase
 from atcoder_helper.entities.atcoder_test_case import AtCoderTestResult
 from atcoder_helper.entities.atcoder_test_case import AtCoderTestStatus
@@ -21,80 +50,1234 @@ class ProgramExecutor(Protocol):
             bool: ビルドが成功したか
         """
 
-    def execute(self, test_case: AtcoderTestCase) -> AtCoderTestResult:
+    def execute(
+        self, test_case: AtcoderTestCase, output_path: Optional[str] = None
+    ) -> AtCoderTestResult:
         """プログラムを実行し、テスト結果を得る.
 
+        複数のスレッドから同時に呼ばれても安全でなければならない.
+
         Args:
             test_case (AtcoderTestCase): テストケース
+            output_path (Optional[str]): 標準出力の全体を書き出すファイル.
+                テスト結果の actual は表示用に先頭だけになる. Defaults to None
 
         Returns:
             TestResult: テスト結果
         """
 
+    def cache_key(self, test_case: AtcoderTestCase) -> Optional[str]:
+        """ビルドしたプログラムでテストケースを実行した結果を、再利用するためのキーを返す.
+
+        プログラム・実行コマンド・制限・判定方法・入力・期待する出力のどれかが変われば
+        キーも変わる. build の後に呼ぶ.
+
+        Args:
+            test_case (AtcoderTestCase): テストケース
+
+        Returns:
+            Optional[str]: キー. 入力ファイルが読めないなどで決められなければ None
+        """
+
+
+@dataclass
+class _ProcessUsage:
+    """終了したプロセスの終了状態と資源使用量."""
+
+    returncode: int
+    timed_out: bool
+    output_exceeded: bool
+    memory_exceeded: bool  # cgroup の memory.max を超えて kill された
+    wall_time: float  # [秒]
+    cpu_time: float  # user + sys [秒]
+    max_rss: int  # [KiB]
+
+
+class _Watchdog(threading.Thread):
+    """実行中のプロセスを見張り、制限を超えたらプロセスグループごと kill するスレッド."""
+
+    _poll_interval: Final[float] = 0.05  # 出力サイズを確認する間隔[秒]
+
+    timed_out: bool
+    output_exceeded: bool
+
+    _pgid: int
+    _time_limit: Optional[float]
+    _stdout: IO[bytes]
+    _output_limit: Optional[int]
+    _finished: threading.Event
+
+    def __init__(
+        self,
+        pgid: int,
+        time_limit: Optional[float],
+        stdout: IO[bytes],
+        output_limit: Optional[int],
+    ):
+        """__init__.
+
+        Args:
+            pgid (int): 見張るプロセスグループ
+            time_limit (Optional[float]): 実行時間制限[秒]
+            stdout (IO[bytes]): 見張るプロセスの標準出力の書き出し先
+            output_limit (Optional[int]): 出力サイズ制限[bytes]
+        """
+        super().__init__(daemon=True)
+        self.timed_out = False
+        self.output_exceeded = False
+        self._pgid = pgid
+        self._time_limit = time_limit
+        self._stdout = stdout
+        self._output_limit = output_limit
+        self._finished = threading.Event()
+
+    def run(self) -> None:
+        """制限を超えるか、stop が呼ばれるまで見張る."""
+        deadline = (
+            None if self._time_limit is None else time.monotonic() + self._time_limit
+        )
+        while True:
+            timeout = None if deadline is None else max(0, deadline - time.monotonic())
+            if self._output_limit is not None:
+                timeout = (
+                    self._poll_interval
+                    if timeout is None
+                    else min(timeout, self._poll_interval)
+                )
+
+            if self._finished.wait(timeout):
+                return
+
+            if deadline is not None and time.monotonic() >= deadline:
+                self.timed_out = True
+                break
+            if self._output_limit is not None:
+                if os.fstat(self._stdout.fileno()).st_size > self._output_limit:
+                    self.output_exceeded = True
+                    break
+
+        ProgramExecutorRepoImpl._kill_process_group(self._pgid)
+
+    def stop(self) -> None:
+        """見張りをやめる. プロセスの終了後に呼ぶ."""
+        self._finished.set()
+        self.join()
+
 
 class ProgramExecutorRepoImpl:
     """プログラム実行のためのロジックを集約させるためのリポジトリ実装."""
 
+    _display_limit: Final[int] = 1 << 20  # 結果として保持する出力の大きさ[bytes]
+
     _build_command: List[str]
     _run_command: List[str]
+    _task_dir: str
+    _time_limit: Optional[float]
+    _memory_limit: Optional[int]
+    _output_limit: Optional[int]
+    _limits: resource_limits.ResourceLimits
+    _limits_in_cgroup: resource_limits.ResourceLimits
+    _checker_config: CheckerConfig
+    _checker: output_checker.OutputChecker
+    _fingerprint_lock: threading.Lock
+    _fingerprint: Optional[str]
+    _fingerprint_computed: bool
 
-    def __init__(self, build_command: List[str], run_command: List[str]):
-        """__init__."""
+    def __init__(
+        self,
+        build_command: List[str],
+        run_command: List[str],
+        task_dir: Optional[str] = None,
+        time_limit: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+        output_limit: Optional[int] = None,
+        checker: Optional[CheckerConfig] = None,
+        limit_address_space: bool = True,
+    ):
+        """__init__.
+
+        メモリ制限と出力サイズ制限は、実行後に判定するだけでなく、setrlimit と
+        (使えれば) cgroup v2 でカーネルにも強制させる.
+
+        Args:
+            build_command (List[str]): ビルドコマンド
+            run_command (List[str]): 実行コマンド
+            task_dir (Optional[str]): タスクディレクトリ. Defaults to None (current directory)
+            time_limit (Optional[float]): 実行時間制限[秒]. Defaults to None (無制限)
+            memory_limit (Optional[int]): メモリ制限[MiB]. Defaults to None (無制限)
+            output_limit (Optional[int]): 出力サイズ制限[MiB]. Defaults to None (無制限)
+            checker (Optional[CheckerConfig]): 出力の判定方法. Defaults to None (exact)
+            limit_address_space (bool): メモリ制限に合わせて仮想メモリも制限するか.
+                Defaults to True
+        """
         self._build_command = build_command
         self._run_command = run_command
+        self._task_dir = os.path.abspath(task_dir if task_dir is not None else ".")
+        self._time_limit = time_limit
+        self._memory_limit = memory_limit
+        self._output_limit = output_limit
+        self._limits = resource_limits.ResourceLimits.for_solution(
+            memory_limit, output_limit, limit_address_space
+        )
+        self._limits_in_cgroup = resource_limits.ResourceLimits.for_solution(
+            memory_limit, output_limit, limit_address_space, memory_cgroup=True
+        )
+        self._checker_config = checker if checker is not None else CheckerConfig()
+        self._checker = output_checker.create_checker(
+            self._checker_config, self._task_dir
+        )
+        self._fingerprint_lock = threading.Lock()
+        self._fingerprint = None
+        self._fingerprint_computed = False
 
     def build(self) -> bool:
         """プログラムをビルドする.
 
+        外部チェッカを使う場合は、チェッカも(解答より先に)ビルドする.
+        前回ビルドが成功したときからソース・ビルドコマンド・コンパイラが変わっていなければ、
+        ビルドを省略する.
+
         Args:
 
         Returns:
             bool: ビルドが成功したか
         """
-        completed_process = subprocess.run(self._build_command)
-        return completed_process.returncode == 0
+        # ビルドし直したら、結果を再利用するためのキーも計算し直す
+        with self._fingerprint_lock:
+            self._fingerprint_computed = False
+
+        checker_files: Set[str] = set()
+        checker_cache = self._checker_build_cache()
+        if checker_cache is not None:
+            if not self._build_with_cache(
+                self._checker_config.build, checker_cache, "checker sources"
+            ):
+                return False
+            checker_files = checker_cache.files()
+
+        if not self._build_command:
+            return True
+
+        cache = _BuildCache(self._task_dir, self._build_command, ignored=checker_files)
+        return self._build_with_cache(self._build_command, cache, "sources")
+
+    def _checker_build_cache(self) -> Optional["_BuildCache"]:
+        """外部チェッカをビルドする場合は、そのビルドキャッシュを返す."""
+        if self._checker_config.type != "external" or not self._checker_config.build:
+            return None
+        checker_build = self._checker_config.build
+        return _BuildCache(
+            self._task_dir,
+            checker_build,
+            cache_filename=".atcoder_helper_checker_build_cache.json",
+            # 解答のソースを変えるたびにチェッカをビルドし直さないよう、
+            # ビルドコマンドに現れるファイルだけをチェッカのソースとみなす
+            sources=[
+                arg
+                for arg in checker_build
+                if os.path.isfile(os.path.join(self._task_dir, arg))
+            ],
+        )
+
+    def _build_with_cache(
+        self, build_command: List[str], cache: "_BuildCache", target: str
+    ) -> bool:
+        """キャッシュが古ければビルドし直す. ビルドが成功したかを返す."""
+        if cache.is_fresh():
+            print(f"{target} are unchanged. skipping build.")
+            return True
+
+        before = cache.snapshot()
+        try:
+            completed_process = subprocess.run(
+                build_command, cwd=self._task_dir, stdout=_current_stdout()
+            )
+        except OSError:
+            cache.invalidate()
+            return False
+
+        if completed_process.returncode != 0:
+            cache.invalidate()
+            return False
+
+        cache.record(before)
+        return True
+
+    def cache_key(self, test_case: AtcoderTestCase) -> Optional[str]:
+        """ビルドしたプログラムでテストケースを実行した結果を、再利用するためのキーを返す.
+
+        Args:
+            test_case (AtcoderTestCase): テストケース
+
+        Returns:
+            Optional[str]: キー. 入力ファイルが読めないなどで決められなければ None
+        """
+        fingerprint = self._program_fingerprint()
+        if fingerprint is None:
+            return None
+
+        digest = hashlib.sha256(fingerprint.encode())
+        if test_case.given_file is not None:
+            given_path = os.path.join(self._task_dir, test_case.given_file)
+            try:
+                with open(given_path, "rb") as file:
+                    while chunk := file.read(1 << 20):
+                        digest.update(chunk)
+            except OSError:
+                return None
+        else:
+            digest.update(test_case.given.encode())
+        digest.update(b"\0" + json.dumps(test_case.expected).encode())
+        return digest.hexdigest()
 
-    def execute(self, test_case: AtcoderTestCase) -> AtCoderTestResult:
+    def _program_fingerprint(self) -> Optional[str]:
+        """テストケースによらない、実行結果を左右するものをまとめたハッシュを返す."""
+        with self._fingerprint_lock:
+            if not self._fingerprint_computed:
+                self._fingerprint = self._compute_fingerprint()
+                self._fingerprint_computed = True
+            return self._fingerprint
+
+    def _compute_fingerprint(self) -> Optional[str]:
+        checker_cache = self._checker_build_cache()
+        checker_key = None
+        checker_files: Set[str] = set()
+        if checker_cache is not None:
+            checker_key = checker_cache.recorded_key()
+            if checker_key is None:
+                return None
+            checker_files = checker_cache.files()
+
+        if self._build_command:
+            # ビルドのキーはソース・ビルドコマンド・コンパイラから決まる
+            program_key = _BuildCache(
+                self._task_dir, self._build_command, ignored=checker_files
+            ).recorded_key()
+            if program_key is None:
+                return None
+        else:
+            program_key = _BuildCache(
+                self._task_dir, self._run_command, ignored=checker_files
+            ).source_key()
+
+        return hashlib.sha256(
+            json.dumps(
+                {
+                    "program": program_key,
+                    "run": self._run_command,
+                    "time_limit": self._time_limit,
+                    "memory_limit": self._memory_limit,
+                    "output_limit": self._output_limit,
+                    "rlimits": asdict(self._limits),
+                    "checker": self._checker_config.dict(),
+                    "checker_build": checker_key,
+                },
+                sort_keys=True,
+            ).encode()
+        ).hexdigest()
+
+    def execute(
+        self, test_case: AtcoderTestCase, output_path: Optional[str] = None
+    ) -> AtCoderTestResult:
         """プログラムを実行し、テスト結果を得る.
 
         Args:
             test_case (AtcoderTestCase): テストケース
+            output_path (Optional[str]): 標準出力の全体を書き出すファイル.
+                テスト結果の actual は表示用に先頭だけになる. Defaults to None
 
         Returns:
             TestResult: テスト結果
         """
-        completed_process = subprocess.run(
-            self._run_command, input=test_case.given, text=True, capture_output=True
+        # 入出力はチェッカにパスで渡せるよう、解答からは見えない一時ディレクトリに置く
+        with tempfile.TemporaryDirectory(prefix="atcoder_helper_spool_") as spool_dir:
+            try:
+                input_path = self._prepare_input(test_case, spool_dir)
+                stdin_file = open(input_path, "rb")
+            except OSError as e:
+                return AtCoderTestResult(
+                    test_case.name, AtCoderTestStatus.ERROR, actual="", error=str(e)
+                )
+
+            if output_path is None:
+                output_path = os.path.join(spool_dir, "output")
+            with (
+                stdin_file,
+                self._isolated_workdir() as workdir,
+                open(output_path, "w+b") as stdout_file,
+                open(os.path.join(spool_dir, "error"), "w+b") as stderr_file,
+            ):
+                usage = self._run(workdir, stdin_file, stdout_file, stderr_file)
+                status, message = self._judge(
+                    test_case, usage, input_path, output_path, spool_dir
+                )
+
+                # 出力は巨大になりうるので、結果として持ち回るのは先頭だけにする
+                stdout = self._read_text(stdout_file)
+                stderr = self._read_text(stderr_file)
+
+        shows_error = status in (
+            AtCoderTestStatus.TLE,
+            AtCoderTestStatus.MLE,
+            AtCoderTestStatus.OLE,
+            AtCoderTestStatus.ERROR,
+        )
+        error = message
+        if shows_error and stderr:
+            error = f"{message}\n{stderr}" if message else stderr
+        return AtCoderTestResult(
+            test_case.name,
+            status,
+            actual=stdout,
+            error=error,
+            expected=test_case.expected if status == AtCoderTestStatus.WA else None,
+            wall_time=usage.wall_time,
+            cpu_time=usage.cpu_time,
+            max_rss=usage.max_rss,
         )
 
-        if completed_process.returncode != 0:
-            return AtCoderTestResult(
-                test_case.name,
+    def _prepare_input(self, test_case: AtcoderTestCase, spool_dir: str) -> str:
+        """解答の標準入力にするファイルのパスを返す.
+
+        入力がファイルで与えられている場合は、そのファイルをそのまま標準入力にするので、
+        巨大な入力でもこのプロセスが中身を読み込むことはない.
+        """
+        if test_case.given_file is not None:
+            return os.path.join(self._task_dir, test_case.given_file)
+
+        input_path = os.path.join(spool_dir, "input")
+        with open(input_path, "wb") as file:
+            file.write(test_case.given.encode())
+        return input_path
+
+    def _judge(
+        self,
+        test_case: AtcoderTestCase,
+        usage: _ProcessUsage,
+        input_path: str,
+        output_path: str,
+        spool_dir: str,
+    ) -> Tuple[AtCoderTestStatus, str]:
+        """実行結果から、テストケースの判定とチェッカからのメッセージを決める."""
+        if usage.output_exceeded:
+            return AtCoderTestStatus.OLE, ""
+
+        if usage.timed_out:
+            return AtCoderTestStatus.TLE, ""
+
+        # メモリ確保に失敗して落ちた場合もMLEとして扱いたいので、終了コードより先に見る
+        # cgroup が使えれば、超えた時点でカーネルに kill されている
+        if usage.memory_exceeded or self._exceeds_memory_limit(usage.max_rss):
+            return AtCoderTestStatus.MLE, ""
+
+        if usage.returncode != 0:
+            return self._judge_failure(usage, output_path, spool_dir)
+
+        if test_case.expected is None:
+            return AtCoderTestStatus.JUSTSHOW, ""
+
+        answer_path = os.path.join(spool_dir, "answer")
+        with open(answer_path, "wb") as file:
+            file.write(test_case.expected.encode())
+
+        try:
+            check = self._checker.check(input_path, output_path, answer_path)
+        except output_checker.CheckerFailure as e:
+            return AtCoderTestStatus.ERROR, f"checker failed: {e}"
+
+        if check.accepted:
+            return AtCoderTestStatus.AC, ""
+        return AtCoderTestStatus.WA, check.message
+
+    def _exceeds_memory_limit(self, max_rss: int) -> bool:
+        """ピークメモリ使用量[KiB]がメモリ制限を超えているかを返す."""
+        return self._memory_limit is not None and max_rss > self._memory_limit * 1024
+
+    def _judge_failure(
+        self, usage: _ProcessUsage, output_path: str, spool_dir: str
+    ) -> Tuple[AtCoderTestStatus, str]:
+        """異常終了した原因が、カーネルに強制させた制限かどうかを見分ける."""
+        # 書き込めるファイルサイズの制限に当たると、SIGXFSZ で kill されるか
+        # (シグナルを無視する処理系では) 書き込みが EFBIG で失敗する
+        if self._limits.file_size is not None:
+            if os.path.getsize(output_path) >= self._limits.file_size:
+                return AtCoderTestStatus.OLE, ""
+
+        if self._memory_limit is not None:
+            with open(os.path.join(spool_dir, "error"), "rb") as file:
+                stderr = file.read(self._display_limit)
+            if resource_limits.is_allocation_failure(stderr):
+                return AtCoderTestStatus.MLE, "failed to allocate memory."
+
+        if usage.returncode < 0:
+            return (
                 AtCoderTestStatus.ERROR,
-                actual=completed_process.stdout,
-                error=completed_process.stderr,
+                f"terminated by {signal.Signals(-usage.returncode).name}.",
             )
+        return AtCoderTestStatus.ERROR, ""
 
-        if test_case.expected is None:
-            return AtCoderTestResult(
-                test_case.name,
-                AtCoderTestStatus.JUSTSHOW,
-                actual=completed_process.stdout,
-                error="",
+    def _run(
+        self,
+        workdir: str,
+        stdin: IO[bytes],
+        stdout: IO[bytes],
+        stderr: IO[bytes],
+    ) -> _ProcessUsage:
+        """実行コマンドを走らせ、終了を待って資源使用量を測る.
+
+        解答はこのプロセスから直接ではなく、小さなフォークサーバから fork して起動する.
+        Linux の ru_maxrss は fork と exec をまたいで引き継がれるので、このプロセスから
+        起動すると、このプロセスのメモリ使用量まで解答のものとして数えてしまう.
+        制限も、exec する前にサーバの中でかける.
+        """
+        with self._memory_cgroup() as cgroup:
+            socket_path = _spawn_server.socket_path()
+            if socket_path is not None:
+                try:
+                    return self._run_on_server(
+                        socket_path,
+                        {"command": self._solution_command()},
+                        workdir,
+                        stdin,
+                        stdout,
+                        stderr,
+                        cgroup,
+                    )
+                except (OSError, ValueError, KeyError):
+                    # サーバが落ちたなどの場合は、やり直して直接起動する
+                    self._rewind(stdin, stdout, stderr)
+
+        return self._run_directly(workdir, stdin, stdout, stderr)
+
+    def _run_directly(
+        self,
+        workdir: str,
+        stdin: IO[bytes],
+        stdout: IO[bytes],
+        stderr: IO[bytes],
+    ) -> _ProcessUsage:
+        """フォークサーバが使えないときに、このプロセスから直接起動する.
+
+        setrlimit と cgroup の制限はかけられず、ピークメモリ使用量にはこのプロセスの
+        分も含まれる. 実行時間と出力サイズの制限はウォッチドッグが守る.
+        subprocess.run では子プロセスの rusage が取れないので、os.wait4 で自前で回収する.
+        """
+        start = time.perf_counter()
+        # 子孫プロセスもまとめて kill できるよう、新しいプロセスグループで起動する
+        process = subprocess.Popen(
+            self._solution_command(),
+            stdin=stdin,
+            stdout=stdout,
+            stderr=stderr,
+            cwd=workdir,
+            start_new_session=True,
+        )
+
+        watchdog = self._start_watchdog(process.pid, stdout)
+        try:
+            _, status, rusage = os.wait4(process.pid, 0)
+        finally:
+            wall_time = time.perf_counter() - start
+            watchdog.stop()
+            # 本体が終了しても孫プロセスが残っていることがあるので掃除する
+            self._kill_process_group(process.pid)
+
+        # 自前で回収したので、Popen にも終了済みであることを教えておく
+        process.returncode = os.waitstatus_to_exitcode(status)
+
+        return _ProcessUsage(
+            returncode=process.returncode,
+            timed_out=watchdog.timed_out,
+            output_exceeded=watchdog.output_exceeded,
+            memory_exceeded=False,
+            wall_time=wall_time,
+            cpu_time=rusage.ru_utime + rusage.ru_stime,
+            max_rss=self._normalize_max_rss(rusage.ru_maxrss),
+        )
+
+    def _run_on_server(
+        self,
+        socket_path: str,
+        target: Dict[str, Any],
+        workdir: str,
+        stdin: IO[bytes],
+        stdout: IO[bytes],
+        stderr: IO[bytes],
+        cgroup: Optional[resource_limits.MemoryCgroup],
+    ) -> _ProcessUsage:
+        """フォークサーバに解答を実行させ、終了を待って資源使用量を受け取る.
+
+        target は実行するもので、{"command": [...]} か {"script": ...}.
+        時間制限は、時間がきたらプロセスグループごと kill するウォッチドッグで実現する.
+        """
+        start = time.perf_counter()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.connect(socket_path)
+            request = {
+                **target,
+                "workdir": workdir,
+                "rlimits": (
+                    self._limits if cgroup is None else self._limits_in_cgroup
+                ).rlimits(),
+                "cgroup": None if cgroup is None else cgroup.path,
+                # サーバがいつ起動したかによらず、直接起動したときと同じく
+                # 呼び出したスレッドの CPU affinity を引き継がせる
+                "cpus": _thread_affinity(),
+            }
+            socket.send_fds(
+                conn,
+                [json.dumps(request).encode()],
+                [stdin.fileno(), stdout.fileno(), stderr.fileno()],
             )
 
-        if test_case.expected.rstrip() == completed_process.stdout.rstrip():
-            return AtCoderTestResult(
-                test_case.name,
-                AtCoderTestStatus.AC,
-                actual=completed_process.stdout,
-                error="",
+            with conn.makefile("rb") as responses:
+                pid = int(json.loads(responses.readline())["pid"])
+
+                watchdog = self._start_watchdog(pid, stdout)
+                try:
+                    response = json.loads(responses.readline())
+                finally:
+                    wall_time = time.perf_counter() - start
+                    watchdog.stop()
+                    # 本体が終了しても孫プロセスが残っていることがあるので掃除する
+                    self._kill_process_group(pid)
+
+        return _ProcessUsage(
+            returncode=os.waitstatus_to_exitcode(response["status"]),
+            timed_out=watchdog.timed_out,
+            output_exceeded=watchdog.output_exceeded,
+            memory_exceeded=cgroup is not None and cgroup.oom_killed(),
+            wall_time=wall_time,
+            cpu_time=response["utime"] + response["stime"],
+            max_rss=self._normalize_max_rss(response["maxrss"]),
+        )
+
+    @staticmethod
+    def _rewind(stdin: IO[bytes], stdout: IO[bytes], stderr: IO[bytes]) -> None:
+        """実行し直せるよう、途中まで書かれた出力を捨てて入力を先頭に戻す."""
+        for file in (stdout, stderr):
+            file.seek(0)
+            file.truncate()
+        stdin.seek(0)
+
+    def _solution_command(self) -> List[str]:
+        """解答を実行するコマンドを返す."""
+        return self._run_command
+
+    @contextmanager
+    def _memory_cgroup(self) -> Iterator[Optional[resource_limits.MemoryCgroup]]:
+        """実行1回分の cgroup を用意する. cgroup v2 が使えなければ None になる."""
+        if self._memory_limit is None:
+            yield None
+            return
+
+        cgroup = resource_limits.MemoryCgroup.create(self._memory_limit << 20)
+        try:
+            yield cgroup
+        finally:
+            if cgroup is not None:
+                cgroup.remove()
+
+    def _start_watchdog(self, pgid: int, stdout: IO[bytes]) -> _Watchdog:
+        """実行時間と出力サイズを見張るスレッドを起動する."""
+        watchdog = _Watchdog(
+            pgid,
+            self._time_limit,
+            stdout,
+            None if self._output_limit is None else self._output_limit << 20,
+        )
+        watchdog.start()
+        return watchdog
+
+    @staticmethod
+    def _normalize_max_rss(max_rss: int) -> int:
+        """ru_maxrss を KiB 単位にそろえる."""
+        if sys.platform == "darwin":  # macOS では bytes 単位
+            return max_rss // 1024
+        return max_rss
+
+    @classmethod
+    def _read_text(cls, file: IO[bytes]) -> str:
+        """一時ファイルに書き出された出力の先頭を、text=True 相当の文字列として読む."""
+        file.seek(0)
+        text = _decode_output(file.read(cls._display_limit))
+        if file.read(1):
+            text += "\n... (truncated)"
+        return text
+
+    @staticmethod
+    def _kill_process_group(pgid: int) -> None:
+        """プロセスグループごと SIGKILL する. 既に終了していれば何もしない."""
+        try:
+            os.killpg(pgid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    @contextmanager
+    def _isolated_workdir(self) -> Iterator[str]:
+        """テストケースごとに独立した作業ディレクトリを用意する.
+
+        タスクディレクトリ直下のエントリへのシンボリックリンクを張るので、
+        実行コマンドからは相対パスでビルド成果物やソースが見える一方、
+        プログラムが新しく作ったファイルは他のケースと干渉しない.
+        """
+        with tempfile.TemporaryDirectory(prefix="atcoder_helper_") as workdir:
+            for entry in os.listdir(self._task_dir):
+                os.symlink(
+                    os.path.join(self._task_dir, entry), os.path.join(workdir, entry)
+                )
+            yield workdir
+
+
+class ProfilingProgramExecutor(ProgramExecutor, Protocol):
+    """解答をプロファイラの下で実行できるエグゼキューター."""
+
+    def profile(
+        self, test_case: AtcoderTestCase
+    ) -> Tuple[AtCoderTestResult, ProfileResult]:
+        """プロファイラの下でプログラムを実行し、テスト結果と計測結果を得る.
+
+        Args:
+            test_case (AtcoderTestCase): テストケース
+
+        Raises:
+            ProfilerFailure: プロファイラが計測結果を残さなかった
+
+        Returns:
+            Tuple[AtCoderTestResult, ProfileResult]: テスト結果と計測結果
+        """
+
+
+class ProfilingProgramExecutorRepoImpl(ProgramExecutorRepoImpl):
+    """解答をプロファイラの下で実行するリポジトリ実装.
+
+    制限のかけ方と判定は通常の実行と同じで、実行コマンドだけをプロファイラで包む.
+    """
+
+    _profiler: profiler.Profiler
+    _profile_lock: threading.Lock
+    _data_dir: Optional[str]
+
+    def __init__(
+        self,
+        build_command: List[str],
+        run_command: List[str],
+        solution_profiler: profiler.Profiler,
+        task_dir: Optional[str] = None,
+        time_limit: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+        output_limit: Optional[int] = None,
+        checker: Optional[CheckerConfig] = None,
+        limit_address_space: bool = True,
+    ):
+        """__init__.
+
+        Args:
+            build_command (List[str]): ビルドコマンド
+            run_command (List[str]): 実行コマンド
+            solution_profiler (profiler.Profiler): 使うプロファイラ
+            task_dir (Optional[str]): タスクディレクトリ. Defaults to None (current directory)
+            time_limit (Optional[float]): 実行時間制限[秒]. Defaults to None (無制限)
+            memory_limit (Optional[int]): メモリ制限[MiB]. Defaults to None (無制限)
+            output_limit (Optional[int]): 出力サイズ制限[MiB]. Defaults to None (無制限)
+            checker (Optional[CheckerConfig]): 出力の判定方法. Defaults to None (exact)
+            limit_address_space (bool): メモリ制限に合わせて仮想メモリも制限するか.
+                Defaults to True
+        """
+        super().__init__(
+            build_command,
+            run_command,
+            task_dir=task_dir,
+            time_limit=time_limit,
+            memory_limit=memory_limit,
+            output_limit=output_limit,
+            checker=checker,
+            limit_address_space=limit_address_space,
+        )
+        self._profiler = solution_profiler
+        self._profile_lock = threading.Lock()
+        self._data_dir = None
+
+    def profile(
+        self, test_case: AtcoderTestCase
+    ) -> Tuple[AtCoderTestResult, ProfileResult]:
+        """プロファイラの下でプログラムを実行し、テスト結果と計測結果を得る.
+
+        Args:
+            test_case (AtcoderTestCase): テストケース
+
+        Raises:
+            ProfilerFailure: プロファイラが計測結果を残さなかった
+
+        Returns:
+            Tuple[AtCoderTestResult, ProfileResult]: テスト結果と計測結果
+        """
+        # 計測結果の置き場所を実行コマンドに埋め込むので、同時には1つしか計らない
+        with (
+            self._profile_lock,
+            tempfile.TemporaryDirectory(prefix="atcoder_helper_profile_") as data_dir,
+        ):
+            self._data_dir = data_dir
+            try:
+                result = self.execute(test_case)
+            finally:
+                self._data_dir = None
+
+            try:
+                stacks = self._profiler.collect(data_dir)
+            except profiler.ProfilerFailure as e:
+                raise profiler.ProfilerFailure(
+                    f"{test_case.name} は {result.status.name} でした: {e}"
+                    f"\n{result.error}".rstrip()
+                ) from e
+        return result, ProfileResult(self._profiler.name, self._profiler.unit, stacks)
+
+    def _solution_command(self) -> List[str]:
+        if self._data_dir is None:
+            return self._run_command
+        return self._profiler.command(self._run_command, self._data_dir)
+
+
+class ForkServerProgramExecutorRepoImpl(ProgramExecutorRepoImpl):
+    """Python製の解答を、フォークサーバ経由で実行するリポジトリ実装.
+
+    インタプリタの起動と preload_modules の import は最初の一度だけ行い、
+    テストケースごとにはサーバから fork したプロセスで解答を実行する.
+    実行コマンドが `<interpreter> [options...] <script>.py` の形をしていない場合や、
+    サーバが使えない場合は、通常どおりプロセスを起動して実行する.
+    """
+
+    _server: "_ForkServer"
+
+    def __init__(
+        self,
+        build_command: List[str],
+        run_command: List[str],
+        task_dir: Optional[str] = None,
+        time_limit: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+        output_limit: Optional[int] = None,
+        checker: Optional[CheckerConfig] = None,
+        preload_modules: Optional[List[str]] = None,
+        limit_address_space: bool = True,
+    ):
+        """__init__.
+
+        Args:
+            build_command (List[str]): ビルドコマンド
+            run_command (List[str]): 実行コマンド
+            task_dir (Optional[str]): タスクディレクトリ. Defaults to None (current directory)
+            time_limit (Optional[float]): 実行時間制限[秒]. Defaults to None (無制限)
+            memory_limit (Optional[int]): メモリ制限[MiB]. Defaults to None (無制限)
+            output_limit (Optional[int]): 出力サイズ制限[MiB]. Defaults to None (無制限)
+            checker (Optional[CheckerConfig]): 出力の判定方法. Defaults to None (exact)
+            preload_modules (Optional[List[str]]): サーバ起動時に import しておくモジュール
+            limit_address_space (bool): メモリ制限に合わせて仮想メモリも制限するか.
+                Defaults to True
+        """
+        super().__init__(
+            build_command,
+            run_command,
+            task_dir=task_dir,
+            time_limit=time_limit,
+            memory_limit=memory_limit,
+            output_limit=output_limit,
+            checker=checker,
+            limit_address_space=limit_address_space,
+        )
+        self._server = _ForkServer(
+            run_command[:-1],
+            list(preload_modules or []),
+            cwd=self._task_dir,
+            unavailable=not (len(run_command) >= 2 and run_command[-1].endswith(".py")),
+        )
+
+    def _run(
+        self,
+        workdir: str,
+        stdin: IO[bytes],
+        stdout: IO[bytes],
+        stderr: IO[bytes],
+    ) -> _ProcessUsage:
+        socket_path = self._server.socket_path()
+        if socket_path is not None:
+            try:
+                with self._memory_cgroup() as cgroup:
+                    return self._run_on_server(
+                        socket_path,
+                        {"script": self._run_command[-1]},
+                        workdir,
+                        stdin,
+                        stdout,
+                        stderr,
+                        cgroup,
+                    )
+            except (OSError, ValueError, KeyError):
+                # サーバが落ちたなどの場合は、やり直して通常どおり実行する
+                self._rewind(stdin, stdout, stderr)
+
+        return super()._run(workdir, stdin, stdout, stderr)
+
+
+class _ForkServer:
+    """フォークサーバのプロセス. 最初に使われたときに起動する."""
+
+    _interpreter: List[str]
+    _preload_modules: List[str]
+    _cwd: Optional[str]
+    _lock: threading.Lock
+    _socket_path: Optional[str]
+    _unavailable: bool
+
+    def __init__(
+        self,
+        interpreter: List[str],
+        preload_modules: List[str],
+        cwd: Optional[str] = None,
+        unavailable: bool = False,
+    ):
+        """__init__.
+
+        Args:
+            interpreter (List[str]): サーバを実行するインタプリタとそのオプション
+            preload_modules (List[str]): サーバ起動時に import しておくモジュール
+            cwd (Optional[str]): サーバの作業ディレクトリ. Defaults to None
+            unavailable (bool): 起動しようとせず、常に使えないものとして扱うか.
+                Defaults to False
+        """
+        self._interpreter = interpreter
+        self._preload_modules = preload_modules
+        self._cwd = cwd
+        self._lock = threading.Lock()
+        self._socket_path = None
+        self._unavailable = unavailable
+
+    def socket_path(self) -> Optional[str]:
+        """サーバを(まだなら)起動し、待ち受けているソケットのパスを返す.
+
+        起動できなかった場合は None を返す.
+        """
+        with self._lock:
+            if self._socket_path is not None or self._unavailable:
+                return self._socket_path
+
+            server_dir = tempfile.mkdtemp(prefix="atcoder_helper_fork_server_")
+            socket_path = os.path.join(server_dir, "server.sock")
+            try:
+                server = subprocess.Popen(
+                    [
+                        *self._interpreter,
+                        fork_server.__file__,
+                        socket_path,
+                        *self._preload_modules,
+                    ],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    cwd=self._cwd,
+                )
+            except OSError:
+                shutil.rmtree(server_dir, ignore_errors=True)
+                self._unavailable = True
+                return None
+
+            # 使われなくなるかインタプリタが終了したら、サーバも止める
+            weakref.finalize(self, _stop_fork_server, server, server_dir)
+
+            if server.stdout is None or server.stdout.readline() != b"ready\n":
+                self._unavailable = True
+                return None
+
+            self._socket_path = socket_path
+            return socket_path
+
+
+def read_output(path: str) -> str:
+    """ProgramExecutor.execute で書き出した出力の全体を、text=True 相当の文字列として読む.
+
+    Args:
+        path (str): 出力を書き出したファイル
+
+    Raises:
+        OSError: ファイルを読めなかった
+
+    Returns:
+        str: 出力
+    """
+    with open(path, "rb") as file:
+        return _decode_output(file.read())
+
+
+def _decode_output(data: bytes) -> str:
+    return data.decode(errors="replace").replace("\r\n", "\n")
+
+
+def _thread_affinity() -> Optional[List[int]]:
+    """呼び出したスレッドが使える CPU を返す. 取得できないプラットフォームでは None."""
+    try:
+        return sorted(os.sched_getaffinity(0))
+    except AttributeError:
+        return None
+
+
+def _current_stdout() -> Optional[int]:
+    """子プロセスの標準出力を、sys.stdout の差し替え先に合わせるための fd を返す.
+
+    ファイルに結び付いていない(テストで捕まえているなど)場合は None (そのまま引き継ぐ).
+    """
+    try:
+        sys.stdout.flush()
+        return sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def _stop_fork_server(server: "subprocess.Popen[bytes]", server_dir: str) -> None:
+    """フォークサーバを止め、ソケットを置いていたディレクトリを消す."""
+    if server.stdin is not None:
+        server.stdin.close()  # サーバは標準入力が閉じられると終了する
+    try:
+        server.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+    if server.stdout is not None:
+        server.stdout.close()
+    shutil.rmtree(server_dir, ignore_errors=True)
+
+
+# 解答を起動するためのフォークサーバ. preload せず site も読まないので、fork 元として小さい
+_spawn_server: Final[_ForkServer] = _ForkServer([sys.executable, "-E", "-S"], [])
+
+
+_FileSignature = Tuple[int, int]  # (mtime_ns, size)
+
+
+class _BuildCache:
+    """タスクディレクトリのソースのハッシュをキーにした、ビルド結果のキャッシュ.
+
+    どのファイルがビルド成果物なのかは言語によって異なるので、
+    ビルドの前後で新しくできた・変更されたファイルを成果物とみなして記録し、
+    キーの計算から除外する.
+    """
+
+    # ビルドに影響しないことがわかっているファイル
+    _ignored_files: Final[Tuple[str, ...]] = ("testcases.yaml",)
+    # --version でバージョンを聞いてよいとわかっているコンパイラ. make やビルドスクリプトを
+    # キーの計算のためだけに実行しないよう、それ以外はコマンドの実体からキーを決める
+    _known_compilers: Final[re.Pattern[str]] = re.compile(
+        r"(?:[\w.]+-)?(?:gcc|g\+\+|cc|c\+\+|clang|clang\+\+|gfortran|rustc|cargo"
+        r"|javac|kotlinc|scalac|ghc|nim|dmd|ldc2|gdc|swiftc|zig|crystal|fpc|dotnet)"
+        r"(?:-[0-9.]+)?"
+    )
+
+    _task_dir: str
+    _build_command: List[str]
+    _cache_filename: str
+    _sources: Optional[List[str]]
+    _ignored: Set[str]
+
+    def __init__(
+        self,
+        task_dir: str,
+        build_command: List[str],
+        cache_filename: str = ".atcoder_helper_build_cache.json",
+        sources: Optional[List[str]] = None,
+        ignored: Optional[Set[str]] = None,
+    ):
+        """__init__.
+
+        Args:
+            task_dir (str): タスクディレクトリ
+            build_command (List[str]): ビルドコマンド
+            cache_filename (str): キャッシュを書き込むファイル名
+            sources (Optional[List[str]]): キーの計算対象にするファイル.
+                Defaults to None (タスクディレクトリのビルド成果物以外の全ファイル)
+            ignored (Optional[Set[str]]): ビルドに影響しないファイル. Defaults to None
+        """
+        self._task_dir = task_dir
+        self._build_command = build_command
+        self._cache_filename = cache_filename
+        self._sources = sources
+        self._ignored = set(self._ignored_files) | (ignored or set())
+
+    @property
+    def _cache_filepath(self) -> str:
+        return os.path.join(self._task_dir, self._cache_filename)
+
+    def files(self) -> Set[str]:
+        """前回成功したビルドのソースと成果物を返す. 記録がなければ空集合を返す."""
+        try:
+            with open(self._cache_filepath, "rt") as file:
+                outputs = set(json.load(file)["outputs"])
+        except (OSError, ValueError, KeyError, TypeError):
+            outputs = set()
+        return outputs | set(self._sources or [])
+
+    def recorded_key(self) -> Optional[str]:
+        """前回成功したビルドのキーを返す. 記録がなければ None を返す."""
+        try:
+            with open(self._cache_filepath, "rt") as file:
+                key = json.load(file)["key"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return key if isinstance(key, str) else None
+
+    def source_key(self) -> str:
+        """コンパイラを呼び出さずに、ソースとコマンドだけからキーを計算する.
+
+        ビルドしない言語で、ソースが変わったかを調べるのに使う. コマンドの実体の
+        更新時刻も含めるので、処理系を更新すればキーも変わる.
+        """
+        digest = hashlib.sha256()
+        digest.update(json.dumps(self._build_command).encode())
+        command = shutil.which(self._build_command[0]) or self._build_command[0]
+        try:
+            stat = os.stat(command)
+            digest.update(f"{os.path.realpath(command)}:{stat.st_mtime_ns}".encode())
+        except OSError:
+            digest.update(command.encode())
+        self._hash_sources(digest, set())
+        return digest.hexdigest()
+
+    def is_fresh(self) -> bool:
+        """前回成功したビルドがそのまま使えるかを返す."""
+        try:
+            with open(self._cache_filepath, "rt") as file:
+                record = json.load(file)
+            key = record["key"]
+            outputs = set(record["outputs"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+
+        if not all(
+            os.path.lexists(os.path.join(self._task_dir, output)) for output in outputs
+        ):
+            return False
+
+        return bool(key == self._compute_key(outputs))
+
+    def snapshot(self) -> Dict[str, _FileSignature]:
+        """ビルド前のファイルの状態を記録する."""
+        return {
+            path: (stat.st_mtime_ns, stat.st_size) for path, stat in self._walk(set())
+        }
+
+    def record(self, before: Dict[str, _FileSignature]) -> None:
+        """ビルドの成功を記録する.
+
+        Args:
+            before (Dict[str, _FileSignature]): ビルド前に snapshot で取った状態
+        """
+        after = self.snapshot()
+        outputs = self._collapse_new_dirs(
+            {path for path, sig in after.items() if before.get(path) != sig}, before
+        )
+
+        try:
+            with open(self._cache_filepath, "wt") as file:
+                json.dump(
+                    {"key": self._compute_key(outputs), "outputs": sorted(outputs)},
+                    file,
+                )
+        except OSError:
+            pass  # キャッシュが書けなくても、次回ビルドし直すだけ
+
+    def invalidate(self) -> None:
+        """キャッシュを破棄する."""
+        try:
+            os.remove(self._cache_filepath)
+        except FileNotFoundError:
+            pass
+
+    def _collapse_new_dirs(
+        self, outputs: Set[str], before: Dict[str, _FileSignature]
+    ) -> Set[str]:
+        """ビルドで新しくできたディレクトリは、中身ではなくディレクトリごと成果物として扱う."""
+        existed_dirs = {
+            os.path.dirname(path).split(os.sep)[0] for path in before if os.sep in path
+        }
+        collapsed = set()
+        for output in outputs:
+            top = output.split(os.sep)[0]
+            if top != output and top not in existed_dirs:
+                collapsed.add(top)
+            else:
+                collapsed.add(output)
+        return collapsed
+
+    def _compute_key(self, outputs: Set[str]) -> str:
+        digest = hashlib.sha256()
+        digest.update(json.dumps(self._build_command).encode())
+        digest.update(self._compiler_version().encode())
+        self._hash_sources(digest, outputs)
+        return digest.hexdigest()
+
+    def _hash_sources(self, digest: "hashlib._Hash", outputs: Set[str]) -> None:
+        if self._sources is not None:
+            paths = sorted(
+                path
+                for path in self._sources
+                if os.path.isfile(os.path.join(self._task_dir, path))
             )
         else:
-            return AtCoderTestResult(
-                test_case.name,
-                AtCoderTestStatus.WA,
-                actual=completed_process.stdout,
-                expected=test_case.expected,
-                error="",
+            paths = sorted(path for path, _ in self._walk(outputs))
+
+        for path in paths:
+            digest.update(path.encode() + b"\0")
+            with open(os.path.join(self._task_dir, path), "rb") as file:
+                while chunk := file.read(1 << 20):
+                    digest.update(chunk)
+            digest.update(b"\0")
+
+    def _compiler_version(self) -> str:
+        command = self._build_command[0]
+        if os.sep in command:  # ./build.sh のような、タスクディレクトリからの相対パス
+            command = os.path.join(self._task_dir, command)
+        compiler = shutil.which(command) or command
+        if not self._known_compilers.fullmatch(os.path.basename(command)):
+            return _executable_signature(compiler)
+        try:
+            completed_process = subprocess.run(
+                [compiler, "--version"], capture_output=True, text=True, timeout=10
             )
+        except (OSError, subprocess.TimeoutExpired):
+            return compiler
+        return compiler + completed_process.stdout
+
+    def _walk(self, outputs: Set[str]) -> Iterator[Tuple[str, os.stat_result]]:
+        """キーの計算対象になるファイルを、タスクディレクトリからの相対パスで列挙する."""
+        for dirpath, dirnames, filenames in os.walk(self._task_dir):
+            reldir = os.path.relpath(dirpath, self._task_dir)
+
+            def relpath(name: str) -> str:
+                return name if reldir == "." else os.path.join(reldir, name)
+
+            dirnames[:] = [
+                name
+                for name in dirnames
+                if not name.startswith(".") and relpath(name) not in outputs
+            ]
+            for name in filenames:
+                path = relpath(name)
+                if name.startswith(".") or path in outputs:
+                    continue
+                if path in self._ignored:
+                    continue
+                try:
+                    yield path, os.stat(os.path.join(dirpath, name))
+                except OSError:
+                    continue
+
+
+def _executable_signature(path: str) -> str:
+    """実行ファイルの実体のパス・更新時刻・中身のハッシュをまとめた文字列を返す."""
+    realpath = os.path.realpath(path)
+    digest = hashlib.sha256()
+    try:
+        stat = os.stat(realpath)
+        with open(realpath, "rb") as file:
+            while chunk := file.read(1 << 20):
+                digest.update(chunk)
+    except OSError:
+        return path
+    return f"{realpath}:{stat.st_mtime_ns}:{digest.hexdigest()}"
@@ -0,0 +1,170 @@
+"""Python製の解答をプロファイラの下で実行し、折りたたんだスタックを書き出す.
+
+このファイルは atcoder_helper から import されるのではなく、解答を実行するインタプリタ
+(python, pypy3 等)によって単体のスクリプトとして実行される.
+そのため、標準ライブラリ以外に依存してはならない.
+
+使い方:
+    <interpreter> python_profiler.py <mode> <output path> <script>
+
+mode は次のいずれか.
+    cprofile: cProfile で関数ごとの時間を計り、呼び出し経路ごとの時間を推定する.
+        重みの単位はマイクロ秒.
+    sampling: CPU時間 1ms ごとの SIGPROF で、実行中のスタックを記録する.
+        重みの単位はサンプル数. 実際の間隔はカーネルのタイマーの粒度(数ms)まで粗くなる.
+
+解答の終了後、output path に "root;caller;callee 重み" の形の行を書き出す.
+"""
+
+import collections
+import cProfile
+import os
+import pstats
+import runpy
+import signal
+import sys
+import traceback
+from types import FrameType
+from typing import Any
+from typing import Counter
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+_SAMPLING_INTERVAL = 0.001  # [秒]
+# 深い再帰で行が巨大にならないよう、これより深いスタックは根元を省く
+_MAX_DEPTH = 256
+# cprofile で、これより重みの小さい呼び出し経路はたどらない[マイクロ秒]
+_MIN_WEIGHT = 1.0
+
+_Function = Tuple[str, int, str]  # pstats のキー (filename, line, name)
+
+
+def _run_script(script: str) -> int:
+    """解答スクリプトを __main__ として実行し、終了コードを返す."""
+    try:
+        runpy.run_path(script, run_name="__main__")
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        if isinstance(e.code, int):
+            return e.code
+        print(e.code, file=sys.stderr)
+        return 1
+    except BaseException:
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+def _label(filename: str, line: int, name: str) -> str:
+    """関数を、折りたたんだスタックの1段として表す. ";" は段の区切りなので使わない."""
+    if filename == "~":  # 組み込み関数
+        label = name
+    else:
+        label = f"{name} ({os.path.basename(filename)}:{line})"
+    return label.replace(";", ":")
+
+
+def _join(frames: List[str]) -> str:
+    if len(frames) > _MAX_DEPTH:
+        frames = ["[truncated]", *frames[-_MAX_DEPTH:]]
+    return ";".join(frames)
+
+
+def _is_main_module(frame: FrameType) -> bool:
+    return frame.f_code.co_name == "<module>" and (
+        frame.f_globals.get("__name__") == "__main__"
+    )
+
+
+def _sample(script: str) -> Tuple[int, Counter[str]]:
+    stacks: Counter[str] = collections.Counter()
+
+    def record(signum: int, frame: Optional[FrameType]) -> None:
+        frames = []
+        while frame is not None:
+            code = frame.f_code
+            frames.append(_label(code.co_filename, code.co_firstlineno, code.co_name))
+            # 解答の __main__ より外側は、このスクリプトと runpy なので記録しない
+            if _is_main_module(frame):
+                stacks[_join(frames[::-1])] += 1
+                return
+            frame = frame.f_back
+
+    signal.signal(signal.SIGPROF, record)
+    signal.setitimer(signal.ITIMER_PROF, _SAMPLING_INTERVAL, _SAMPLING_INTERVAL)
+    try:
+        code = _run_script(script)
+    finally:
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+    return code, stacks
+
+
+def _cprofile(script: str) -> Tuple[int, Counter[str]]:
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        code = _run_script(script)
+    finally:
+        profile.disable()
+    # Stats.stats は文書化されていないが、呼び出し元ごとの時間はここからしか取れない
+    stats: Dict[_Function, Any]
+    stats = pstats.Stats(profile).stats  # type: ignore[attr-defined]
+    return code, _collapse_stats(stats, os.path.abspath(script))
+
+
+def _collapse_stats(stats: Dict[_Function, Any], script: str) -> Counter[str]:
+    """呼び出しグラフから、呼び出し経路ごとの時間を推定する.
+
+    cProfile は関数ごとの時間と呼び出し元ごとの累積時間しか記録しないので、関数自身の
+    時間を呼び出し元ごとの累積時間の比で経路に按分する. 再帰呼び出しは、経路の中で
+    最初に現れた段にまとめる.
+    """
+    callees: Dict[_Function, Dict[_Function, float]] = collections.defaultdict(dict)
+    for function, (_, _, _, _, callers) in stats.items():
+        for caller, (_, _, _, cumulative) in callers.items():
+            callees[caller][function] = cumulative
+
+    stacks: Counter[str] = collections.Counter()
+
+    def walk(path: List[_Function], ratio: float) -> None:
+        weight = round(stats[path[-1]][2] * ratio * 1e6)
+        if weight > 0:
+            stacks[_join([_label(*frame) for frame in path])] += weight
+
+        for callee, edge_cumulative in callees[path[-1]].items():
+            callee_cumulative = stats.get(callee, (0, 0, 0, 0.0))[3]
+            if callee in path or callee_cumulative <= 0:
+                continue
+            # callee の時間のうち、この経路から呼ばれた分
+            callee_ratio = ratio * edge_cumulative / callee_cumulative
+            if edge_cumulative * ratio * 1e6 >= _MIN_WEIGHT:
+                walk([*path, callee], callee_ratio)
+
+    for function in stats:
+        filename, _, name = function
+        if name == "<module>" and os.path.abspath(filename) == script:
+            walk([function], 1.0)
+    return stacks
+
+
+def main() -> None:
+    """エントリポイント."""
+    mode, output_path, script = sys.argv[1:4]
+    sys.argv = [script]
+    # sys.path[0] はこのファイルのあるディレクトリになっているが、解答から見えるべきなのは
+    # 解答スクリプトのあるディレクトリ
+    sys.path[0] = os.path.dirname(os.path.abspath(script))
+
+    code, stacks = _cprofile(script) if mode == "cprofile" else _sample(script)
+
+    with open(output_path, "wt") as file:
+        for stack, weight in sorted(stacks.items()):
+            file.write(f"{stack} {weight}\n")
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
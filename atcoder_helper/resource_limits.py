@@ -0,0 +1,268 @@
+"""解答のプロセスに、カーネルが強制する資源の制限をかける.
+
+制限は2段構えになっている.
+    - setrlimit: 仮想メモリ・スタック・書き込めるファイルサイズを制限する.
+      どの環境でも使えるが、仮想メモリはピークメモリ使用量とは一致しない.
+    - cgroup v2: memory.max で実メモリ使用量そのものを、pids.max でプロセス数を制限する.
+      書き込み可能で memory コントローラが有効な cgroup が見つかる場合だけ使う. 環境変数
+      ATCODER_HELPER_CGROUP で、実行ごとの cgroup を作る親 cgroup を指定できる.
+
+どちらの制限も、暴走した解答がホストをスワップに追い込む前に止めるためのもの.
+"""
+
+import os
+import resource
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Final
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+# 仮想メモリの制限を memory_limit の何倍にするか. 確保しただけで触らない領域や
+# 共有ライブラリも仮想メモリには数えられるので、実メモリの制限より緩くする
+_ADDRESS_SPACE_FACTOR: Final[int] = 2
+# 実行ごとの cgroup の pids.max. fork 爆弾を止めるためのもの. RLIMIT_NPROC はユーザの
+# 全プロセスを数え、root には効かないので使わない
+_MAX_PROCESSES: Final[int] = 1024
+
+_CGROUP_ENV: Final[str] = "ATCODER_HELPER_CGROUP"
+
+# 処理系がメモリ確保に失敗して異常終了したときに、標準エラー出力に残すもの
+_ALLOCATION_FAILURE_MARKERS: Final[Tuple[bytes, ...]] = (
+    b"MemoryError",  # Python
+    b"std::bad_alloc",  # C++
+    b"OutOfMemoryError",  # Java, C#
+    b"memory allocation of",  # Rust
+    b"failed to allocate memory",  # Ruby
+    b"Cannot allocate memory",
+)
+
+
+@dataclass
+class ResourceLimits:
+    """解答のプロセスにかける setrlimit の制限. None の項目は制限しない."""
+
+    address_space: Optional[int] = None  # [bytes]
+    stack: Optional[int] = None  # [bytes]
+    file_size: Optional[int] = None  # [bytes]
+
+    @classmethod
+    def for_solution(
+        cls,
+        memory_limit: Optional[int],
+        output_limit: Optional[int],
+        limit_address_space: bool = True,
+        memory_cgroup: bool = False,
+    ) -> "ResourceLimits":
+        """解答の実行に使う制限を決める.
+
+        スタックは AtCoder のジャッジと同様に、メモリ制限と同じ大きさまで使えるようにする.
+        ただし、仮想メモリを制限するときはスタックの制限を引き継いだままにする. glibc は
+        RLIMIT_STACK をスレッドのスタックの大きさにも使うので、両方を大きくすると
+        スレッドを数本作っただけで仮想メモリの制限に当たってしまう.
+        cgroup で実メモリを制限できるときは、仮想メモリは制限しない.
+
+        Args:
+            memory_limit (Optional[int]): メモリ制限[MiB]
+            output_limit (Optional[int]): 出力サイズ制限[MiB]
+            limit_address_space (bool): 仮想メモリを制限するか. Defaults to True
+            memory_cgroup (bool): cgroup の memory.max で実メモリを制限するか.
+                Defaults to False
+
+        Returns:
+            ResourceLimits: 制限
+        """
+        memory = None if memory_limit is None else memory_limit << 20
+        address_space = (
+            memory * _ADDRESS_SPACE_FACTOR
+            if memory is not None and limit_address_space and not memory_cgroup
+            else None
+        )
+        return cls(
+            address_space=address_space,
+            stack=memory if address_space is None else None,
+            file_size=None if output_limit is None else output_limit << 20,
+        )
+
+    def rlimits(self) -> List[Tuple[str, int]]:
+        """制限を、setrlimit に渡す (リソース名, 値) の組にして返す.
+
+        今の hard limit より大きくはできないので、その範囲に収める.
+        """
+        limits = []
+        for name, value in [
+            ("RLIMIT_AS", self.address_space),
+            ("RLIMIT_STACK", self.stack),
+            ("RLIMIT_FSIZE", self.file_size),
+        ]:
+            if value is None:
+                continue
+            _, hard = resource.getrlimit(getattr(resource, name))
+            if hard != resource.RLIM_INFINITY:
+                value = min(value, hard)
+            limits.append((name, value))
+        return limits
+
+
+class MemoryCgroup:
+    """解答の1回の実行のために作る cgroup v2.
+
+    解答のプロセスは、exec する前にフォークサーバの中で cgroup.procs に書き込んで入る.
+    """
+
+    # 使える親 cgroup を探すのは最初の一度だけにする
+    _parent_lock: Final[threading.Lock] = threading.Lock()
+    _parent_searched: bool = False
+    _parent: Optional[str] = None
+
+    # プロセスがいなくなってから cgroup を消せるようになるまで待つ時間[秒]
+    _remove_timeout: Final[float] = 1.0
+
+    path: str
+
+    def __init__(self, path: str):
+        """__init__.
+
+        Args:
+            path (str): cgroup のディレクトリ
+        """
+        self.path = path
+
+    @classmethod
+    def create(cls, memory_limit: int) -> Optional["MemoryCgroup"]:
+        """memory.max と (使えれば) pids.max を設定した cgroup を作る.
+
+        Args:
+            memory_limit (int): メモリ制限[bytes]
+
+        Returns:
+            Optional[MemoryCgroup]: 作った cgroup. cgroup v2 が使えなければ None
+        """
+        parent = cls._find_parent()
+        if parent is None:
+            return None
+
+        try:
+            path = tempfile.mkdtemp(prefix="atcoder_helper_", dir=parent)
+        except OSError:
+            return None
+
+        cgroup = cls(path)
+        try:
+            cgroup._write("memory.max", str(memory_limit))
+        except OSError:
+            cgroup.remove()
+            return None
+        try:
+            # スワップに逃げて遅くなるくらいなら、その場で止める
+            cgroup._write("memory.swap.max", "0")
+        except OSError:
+            pass
+        try:
+            cgroup._write("pids.max", str(_MAX_PROCESSES))
+        except OSError:
+            pass  # pids コントローラが有効でない
+        return cgroup
+
+    def oom_killed(self) -> bool:
+        """memory.max を超えて kill されたプロセスがあったかを返す."""
+        try:
+            with open(os.path.join(self.path, "memory.events"), "rt") as file:
+                for line in file:
+                    key, _, value = line.partition(" ")
+                    if key == "oom_kill":
+                        return int(value) > 0
+        except (OSError, ValueError):
+            pass
+        return False
+
+    def remove(self) -> None:
+        """この cgroup を消す. プロセスが残っている間は消せないので、少しだけ待つ."""
+        deadline = time.monotonic() + self._remove_timeout
+        while True:
+            try:
+                os.rmdir(self.path)
+                return
+            except FileNotFoundError:
+                return
+            except OSError:
+                if time.monotonic() >= deadline:
+                    return
+                time.sleep(0.01)
+
+    def _write(self, name: str, value: str) -> None:
+        with open(os.path.join(self.path, name), "wt") as file:
+            file.write(value)
+
+    @classmethod
+    def _find_parent(cls) -> Optional[str]:
+        with cls._parent_lock:
+            if not cls._parent_searched:
+                cls._parent = _find_cgroup_parent()
+                cls._parent_searched = True
+            return cls._parent
+
+
+def _find_cgroup_parent() -> Optional[str]:
+    """実行ごとの cgroup を作れる親 cgroup を探す. 見つからなければ None を返す."""
+    candidate = os.environ.get(_CGROUP_ENV)
+    if not candidate:
+        mount = _cgroup2_mount()
+        own = _own_cgroup()
+        if mount is None or own is None:
+            return None
+        candidate = os.path.join(mount, own.lstrip("/"))
+
+    try:
+        with open(os.path.join(candidate, "cgroup.subtree_control"), "rt") as file:
+            controllers = file.read().split()
+    except OSError:
+        return None
+
+    if "memory" not in controllers or not os.access(candidate, os.W_OK):
+        return None
+    return candidate
+
+
+def _cgroup2_mount() -> Optional[str]:
+    """マウントされている cgroup v2 の場所を返す."""
+    try:
+        with open("/proc/self/mountinfo", "rt") as file:
+            for line in file:
+                fields, _, rest = line.partition(" - ")
+                if rest.split(" ", 1)[0] == "cgroup2":
+                    return fields.split()[4]
+    except OSError:
+        pass
+    return None
+
+
+def _own_cgroup() -> Optional[str]:
+    """このプロセスが属する cgroup v2 のパスを返す."""
+    try:
+        with open("/proc/self/cgroup", "rt") as file:
+            for line in file:
+                hierarchy, _, path = line.rstrip("\n").split(":", 2)
+                if hierarchy == "0":
+                    return path
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def is_allocation_failure(stderr: bytes) -> bool:
+    """標準エラー出力が、メモリ確保の失敗で異常終了したことを示しているかを返す.
+
+    仮想メモリの制限に当たると、多くの処理系はシグナルで kill されるのではなく
+    メモリ確保の失敗として異常終了するので、その痕跡を探す.
+
+    Args:
+        stderr (bytes): 解答の標準エラー出力
+
+    Returns:
+        bool: メモリ確保に失敗していそうか
+    """
+    return any(marker in stderr for marker in _ALLOCATION_FAILURE_MARKERS)
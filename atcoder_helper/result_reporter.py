@@ -0,0 +1,257 @@
+"""テスト結果を、CI などが読み込める機械可読な形式で書き出す.
+
+形式は次のいずれか.
+    json: JSON Lines. ケースが終わるたびに1行ずつ書き出し、最後に集計を1行書く.
+    junit: JUnit XML. ケースが終わるたびに <testcase> を書き出す.
+
+どちらも、ケースは実行が終わった順に書き出す. 期待する出力と解答の出力の差分や
+標準エラー出力は、大量の実行結果を安く取り込めるよう先頭だけに切り詰める.
+"""
+
+import difflib
+import json
+import re
+import sys
+import threading
+from typing import IO
+from typing import Any
+from typing import Dict
+from typing import Final
+from typing import List
+from typing import Optional
+from typing import Protocol
+from xml.sax.saxutils import escape
+from xml.sax.saxutils import quoteattr
+
+from atcoder_helper.entities.atcoder_test_case import AtCoderTestResult
+from atcoder_helper.entities.atcoder_test_case import AtCoderTestStatus
+
+REPORT_FORMATS: Final[List[str]] = ["json", "junit"]
+
+_MAX_DIFF_LINES: Final[int] = 50
+_MAX_TEXT_LENGTH: Final[int] = 4096  # 差分や標準エラー出力の長さの上限[文字]
+
+# XML 1.0 に書けない制御文字
+_INVALID_XML_CHARS: Final[re.Pattern[str]] = re.compile(
+    "[\\x00-\\x08\\x0b\\x0c\\x0e-\\x1f\\ufffe\\uffff]"
+)
+
+
+class ResultReporter(Protocol):
+    """テスト結果を書き出す."""
+
+    def report(self, result: AtCoderTestResult) -> None:
+        """1つのケースの結果を書き出す.
+
+        複数のスレッドから同時に呼ばれても安全でなければならない.
+
+        Args:
+            result (AtCoderTestResult): テスト結果
+        """
+
+    def close(self) -> None:
+        """集計などを書き出して終える. 書き出し先のファイルを開いていれば閉じる."""
+
+
+def _is_passed(result: AtCoderTestResult) -> bool:
+    return result.status in (AtCoderTestStatus.AC, AtCoderTestStatus.JUSTSHOW)
+
+
+def _truncate(text: str) -> str:
+    if len(text) <= _MAX_TEXT_LENGTH:
+        return text
+    return text[:_MAX_TEXT_LENGTH] + "\n... (truncated)"
+
+
+def result_diff(result: AtCoderTestResult) -> Optional[str]:
+    """期待する出力と解答の出力の unified diff を、先頭だけに切り詰めて返す.
+
+    Args:
+        result (AtCoderTestResult): テスト結果
+
+    Returns:
+        Optional[str]: 差分. 期待する出力がないか、通ったケースなら None
+    """
+    if result.expected is None or _is_passed(result):
+        return None
+    lines = list(
+        difflib.unified_diff(
+            result.expected.splitlines(),
+            result.actual.splitlines(),
+            fromfile="expected",
+            tofile="actual",
+            lineterm="",
+        )
+    )
+    if len(lines) > _MAX_DIFF_LINES:
+        lines = [*lines[:_MAX_DIFF_LINES], "... (truncated)"]
+    return _truncate("\n".join(lines))
+
+
+class JsonLinesReporter:
+    """テスト結果を JSON Lines で書き出す."""
+
+    _file: IO[str]
+    _owns_file: bool
+    _lock: threading.Lock
+    _results: List[AtCoderTestResult]
+
+    def __init__(self, file: IO[str], owns_file: bool = False):
+        """__init__.
+
+        Args:
+            file (IO[str]): 書き出し先
+            owns_file (bool): close で file も閉じるか. Defaults to False
+        """
+        self._file = file
+        self._owns_file = owns_file
+        self._lock = threading.Lock()
+        self._results = []
+
+    def report(self, result: AtCoderTestResult) -> None:
+        """1つのケースの結果を1行書き出す."""
+        line = json.dumps(
+            {
+                "type": "case",
+                "name": result.name,
+                "status": result.status.name,
+                "passed": _is_passed(result),
+                "cached": result.cached,
+                "wall_time": result.wall_time,
+                "cpu_time": result.cpu_time,
+                "max_rss": result.max_rss,
+                "diff": result_diff(result),
+                "error": _truncate(result.error) or None,
+            },
+            ensure_ascii=False,
+        )
+        with self._lock:
+            self._results.append(result)
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        """集計を1行書き出す."""
+        with self._lock:
+            statuses: Dict[str, int] = {}
+            for result in self._results:
+                statuses[result.status.name] = statuses.get(result.status.name, 0) + 1
+            summary: Dict[str, Any] = {
+                "type": "summary",
+                "total": len(self._results),
+                "passed": sum(1 for result in self._results if _is_passed(result)),
+                "statuses": statuses,
+            }
+            self._file.write(json.dumps(summary) + "\n")
+            self._file.flush()
+            if self._owns_file:
+                self._file.close()
+
+
+class JUnitReporter:
+    """テスト結果を JUnit XML で書き出す.
+
+    件数を数え終わる前に書き出し始めるので、<testsuite> に tests などの属性は付けない.
+    """
+
+    _file: IO[str]
+    _owns_file: bool
+    _suite: str
+    _lock: threading.Lock
+
+    def __init__(self, file: IO[str], suite: str, owns_file: bool = False):
+        """__init__.
+
+        Args:
+            file (IO[str]): 書き出し先
+            suite (str): テストスイートの名前
+            owns_file (bool): close で file も閉じるか. Defaults to False
+        """
+        self._file = file
+        self._owns_file = owns_file
+        self._suite = suite
+        self._lock = threading.Lock()
+
+        self._file.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        self._file.write("<testsuites>\n")
+        self._file.write(f"  <testsuite name={_attribute(suite)}>\n")
+        self._file.flush()
+
+    def report(self, result: AtCoderTestResult) -> None:
+        """1つのケースの結果を <testcase> として書き出す."""
+        time = result.wall_time if result.wall_time is not None else 0.0
+        lines = [
+            f"    <testcase classname={_attribute(self._suite)}"
+            f" name={_attribute(result.name)} time={_attribute(f'{time:.3f}')}>"
+        ]
+        properties = {"status": result.status.name, "cached": str(result.cached)}
+        if result.cpu_time is not None:
+            properties["cpu_time"] = f"{result.cpu_time:.3f}"
+        if result.max_rss is not None:
+            properties["max_rss"] = str(result.max_rss)
+        lines.append("      <properties>")
+        for name, value in properties.items():
+            lines.append(
+                f"        <property name={_attribute(name)} value={_attribute(value)}/>"
+            )
+        lines.append("      </properties>")
+
+        if not _is_passed(result):
+            tag = "error" if result.status == AtCoderTestStatus.ERROR else "failure"
+            body = result_diff(result) or ""
+            lines.append(
+                f"      <{tag} type={_attribute(result.status.name)}"
+                f" message={_attribute(result.status.name)}>{_text(body)}</{tag}>"
+            )
+        if result.error:
+            lines.append(
+                f"      <system-err>{_text(_truncate(result.error))}</system-err>"
+            )
+        lines.append("    </testcase>")
+
+        with self._lock:
+            self._file.write("\n".join(lines) + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        """閉じタグを書き出す."""
+        with self._lock:
+            self._file.write("  </testsuite>\n</testsuites>\n")
+            self._file.flush()
+            if self._owns_file:
+                self._file.close()
+
+
+def _text(text: str) -> str:
+    return escape(_INVALID_XML_CHARS.sub("", text))
+
+
+def _attribute(value: str) -> str:
+    return quoteattr(_INVALID_XML_CHARS.sub("", value))
+
+
+def create_result_reporter(
+    output_format: str, output_file: Optional[str], suite: str
+) -> ResultReporter:
+    """形式と書き出し先から ResultReporter を作る.
+
+    Args:
+        output_format (str): "json" か "junit"
+        output_file (Optional[str]): 書き出し先のファイル. None なら標準出力
+        suite (str): テストスイートの名前. JUnit XML で使う
+
+    Raises:
+        OSError: 書き出し先のファイルを開けなかった
+        ValueError: 知らない形式
+
+    Returns:
+        ResultReporter: 結果を書き出すもの
+    """
+    if output_format not in REPORT_FORMATS:
+        raise ValueError(f"unknown report format: {output_format}")
+
+    file = sys.stdout if output_file is None else open(output_file, "wt")
+    owns_file = output_file is not None
+    if output_format == "json":
+        return JsonLinesReporter(file, owns_file=owns_file)
+    return JUnitReporter(file, suite, owns_file=owns_file)
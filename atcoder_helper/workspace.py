@@ -0,0 +1,91 @@
+"""タスクディレクトリのソースを写した、言語ごとの作業ディレクトリを用意する.
+
+同じタスクを複数の言語設定でビルドすると、成果物 (main など) やビルドキャッシュが
+ぶつかる. そこで言語ごとにタスクディレクトリの写しを作り、その中でビルド・実行する.
+写しはタスクディレクトリの隠しディレクトリに置いて使い回すので、ソースが変わって
+いなければビルドキャッシュが効く.
+"""
+
+import json
+import os
+import shutil
+from typing import Dict
+from typing import Final
+from typing import List
+from typing import Optional
+
+_WORKSPACES_DIR: Final[str] = ".atcoder_helper_languages"
+# 作業ディレクトリに写したファイルの、写した時点の (mtime_ns, size)
+_MANIFEST_FILENAME: Final[str] = ".atcoder_helper_workspace.json"
+
+
+def prepare_language_workspace(task_dir: str, language: str) -> str:
+    """言語 language 用の作業ディレクトリに、タスクディレクトリのファイルを写す.
+
+    隠しファイルと隠しディレクトリは写さない. 写した後に作業ディレクトリの中で
+    書き換えられたファイル (その言語のビルド成果物) は、ほかの言語で作った同名の
+    ファイルで上書きしないよう、写し直さない. タスクディレクトリから消えたファイルは、
+    作業ディレクトリからは消さない.
+
+    Args:
+        task_dir (str): タスクディレクトリ
+        language (str): 言語設定の名前
+
+    Raises:
+        OSError: 作業ディレクトリを用意できなかった
+
+    Returns:
+        str: 作業ディレクトリのパス
+    """
+    task_dir = os.path.abspath(task_dir)
+    workspace = os.path.join(task_dir, _WORKSPACES_DIR, language)
+    os.makedirs(workspace, exist_ok=True)
+    manifest = _read_manifest(workspace)
+
+    for dirpath, dirnames, filenames in os.walk(task_dir):
+        dirnames[:] = [name for name in dirnames if not name.startswith(".")]
+        relative_dir = os.path.relpath(dirpath, task_dir)
+        os.makedirs(os.path.join(workspace, relative_dir), exist_ok=True)
+        for name in filenames:
+            if name.startswith("."):
+                continue
+            relative_path = os.path.normpath(os.path.join(relative_dir, name))
+            source = os.path.join(task_dir, relative_path)
+            target = os.path.join(workspace, relative_path)
+
+            source_signature = _signature(source)
+            target_signature = _signature(target)
+            if source_signature is None or target_signature == source_signature:
+                continue
+            if target_signature is not None and target_signature != manifest.get(
+                relative_path
+            ):
+                continue  # 作業ディレクトリの中で作られた・書き換えられたファイル
+
+            shutil.copy2(source, target)
+            manifest[relative_path] = _signature(target)
+
+    _write_manifest(workspace, manifest)
+    return workspace
+
+
+def _signature(path: str) -> Optional[List[int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _read_manifest(workspace: str) -> Dict[str, Optional[List[int]]]:
+    try:
+        with open(os.path.join(workspace, _MANIFEST_FILENAME), "rt") as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def _write_manifest(workspace: str, manifest: Dict[str, Optional[List[int]]]) -> None:
+    with open(os.path.join(workspace, _MANIFEST_FILENAME), "wt") as file:
+        json.dump(manifest, file)
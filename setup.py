@@ -35,6 +35,12 @@ setuptools.setup(
         "pydantic",
         "injector",
     ],
+    extras_require={
+        # 数値出力の誤差判定を高速化する
+        "numeric": ["numpy"],
+        # exec scaling で計算量を推定する
+        "scaling": ["numpy"],
+    },
     entry_points={
         "console_scripts": "atcoder_helper=atcoder_helper.entrypoint.main:main"
     },
@@ -9,18 +9,28 @@ import mock
 import pytest
 
 from atcoder_helper.adapter.controller.controller import Controller
+from atcoder_helper.application.usecases.archive import ArchiveUsecase
 from atcoder_helper.application.usecases.atcoder_helper_config import (
     AtCoderHelperConfigUsecase,
 )
 from atcoder_helper.application.usecases.auth import AuthUsecase
 from atcoder_helper.application.usecases.errors import AlreadyLoggedIn
 from atcoder_helper.application.usecases.errors import AtcoderAccessError
+from atcoder_helper.application.usecases.errors import BuildFailure
 from atcoder_helper.application.usecases.errors import ConfigAccessError
 from atcoder_helper.application.usecases.errors import DirectoryNotEmpty
+from atcoder_helper.application.usecases.errors import HelperProgramFailure
+from atcoder_helper.application.usecases.errors import MissingDependency
+from atcoder_helper.application.usecases.errors import ProfilerUnavailable
+from atcoder_helper.application.usecases.errors import ResultWriteError
 from atcoder_helper.application.usecases.errors import UndefinedLanguage
+from atcoder_helper.application.usecases.errors import UndefinedTestCase
 from atcoder_helper.application.usecases.execute_test import ExecuteTestUsecase
 from atcoder_helper.application.usecases.fetch_task import FetchTaskUsecase
 from atcoder_helper.application.usecases.init_task import InitTaskDirUsecase
+from atcoder_helper.application.usecases.pipeline import PipelineUsecase
+from atcoder_helper.application.usecases.scaling_test import ScalingTestUsecase
+from atcoder_helper.application.usecases.stress_test import StressTestUsecase
 from atcoder_helper.entities.atcoder_helper_config import LanguageConfig
 
 
@@ -30,6 +40,10 @@ def _get_sut(
     execute_test_usecase_mock: ExecuteTestUsecase = mock.MagicMock(),
     fetch_task_usecase_mock: FetchTaskUsecase = mock.MagicMock(),
     init_task_dir_usecase_mock: InitTaskDirUsecase = mock.MagicMock(),
+    stress_test_usecase_mock: StressTestUsecase = mock.MagicMock(),
+    scaling_test_usecase_mock: ScalingTestUsecase = mock.MagicMock(),
+    pipeline_usecase_mock: PipelineUsecase = mock.MagicMock(),
+    archive_usecase_mock: ArchiveUsecase = mock.MagicMock(),
 ) -> Controller:
     return Controller(
         auth_usecase=auth_usecase_mock,
@@ -37,10 +51,14 @@ def _get_sut(
         execute_test_usecase=execute_test_usecase_mock,
         fetch_task_usecase=fetch_task_usecase_mock,
         init_task_dir_usecase=init_task_dir_usecase_mock,
+        stress_test_usecase=stress_test_usecase_mock,
+        scaling_test_usecase=scaling_test_usecase_mock,
+        pipeline_usecase=pipeline_usecase_mock,
+        archive_usecase=archive_usecase_mock,
     )
 
 
-def _get_default_namespace(**additional_kwargs: str) -> argparse.Namespace:
+def _get_default_namespace(**additional_kwargs: Any) -> argparse.Namespace:
     return argparse.Namespace(verbose=False, **additional_kwargs)
 
 
@@ -189,7 +207,7 @@ def test_task_create_handler(
 
 @pytest.mark.parametrize(
     argnames=("execute_test_side_effect", "should_succeed"),
-    argvalues=[[None, True], [ConfigAccessError(), False]],
+    argvalues=[[None, True], [ConfigAccessError(), False], [BuildFailure(), False]],
 )
 def test_execute_test_handler(
     execute_test_side_effect: Exception, should_succeed: bool
@@ -201,11 +219,277 @@ def test_execute_test_handler(
         )
     )
 
+    args = _get_default_namespace(
+        bench=False,
+        watch=False,
+        languages=None,
+        profile=None,
+        jobs=None,
+        time_limit=None,
+        memory_limit=None,
+        output_limit=None,
+        changed_only=False,
+        failed_only=False,
+        format="text",
+        output=None,
+    )
+
+    if should_succeed:
+        sut.execute_test_handler(args)
+    else:
+        with pytest.raises(SystemExit) as e:
+            sut.execute_test_handler(args)
+        assert e.value.code == 1
+
+
+@pytest.mark.parametrize(
+    argnames=("watch_test_side_effect", "should_succeed"),
+    argvalues=[
+        [KeyboardInterrupt(), True],
+        [ConfigAccessError(), False],
+        [BuildFailure(), False],
+    ],
+)
+def test_execute_test_handler_watch(
+    watch_test_side_effect: Exception, should_succeed: bool
+) -> None:
+    """--watch のときはwatch_testを呼び、Ctrl+C では正常に終わる."""
+    watch_test_mock = mock.MagicMock(side_effect=watch_test_side_effect)
+    sut = _get_sut(
+        execute_test_usecase_mock=mock.MagicMock(watch_test=watch_test_mock)
+    )
+
+    args = _get_default_namespace(
+        bench=False,
+        watch=True,
+        debounce=0.2,
+        jobs=None,
+        time_limit=None,
+        memory_limit=None,
+        output_limit=None,
+    )
+
+    if should_succeed:
+        sut.execute_test_handler(args)
+    else:
+        with pytest.raises(SystemExit) as e:
+            sut.execute_test_handler(args)
+        assert e.value.code == 1
+    watch_test_mock.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    argnames=("race_languages_side_effect", "should_succeed"),
+    argvalues=[
+        [None, True],
+        [UndefinedLanguage(), False],
+        [ConfigAccessError(), False],
+    ],
+)
+def test_execute_test_handler_languages(
+    race_languages_side_effect: Exception, should_succeed: bool
+) -> None:
+    """--languages のときはrace_languagesを呼ぶ."""
+    race_languages_mock = mock.MagicMock(side_effect=race_languages_side_effect)
+    sut = _get_sut(
+        execute_test_usecase_mock=mock.MagicMock(race_languages=race_languages_mock)
+    )
+
+    args = _get_default_namespace(
+        bench=False,
+        watch=False,
+        languages=["python", "python-pypy3"],
+        jobs=None,
+        time_limit=None,
+        memory_limit=None,
+        output_limit=None,
+    )
+
+    if should_succeed:
+        sut.execute_test_handler(args)
+    else:
+        with pytest.raises(SystemExit) as e:
+            sut.execute_test_handler(args)
+        assert e.value.code == 1
+    race_languages_mock.assert_called_once()
+    assert race_languages_mock.call_args.args == (["python", "python-pypy3"],)
+
+
+@pytest.mark.parametrize(
+    argnames=("profile_test_side_effect", "should_succeed"),
+    argvalues=[
+        [None, True],
+        [UndefinedTestCase(), False],
+        [ProfilerUnavailable(), False],
+        [HelperProgramFailure(), False],
+        [BuildFailure(), False],
+    ],
+)
+def test_execute_test_handler_profile(
+    profile_test_side_effect: Exception, should_succeed: bool
+) -> None:
+    """--profile のときはprofile_testを呼ぶ."""
+    profile_test_mock = mock.MagicMock(side_effect=profile_test_side_effect)
+    sut = _get_sut(
+        execute_test_usecase_mock=mock.MagicMock(profile_test=profile_test_mock)
+    )
+
+    args = _get_default_namespace(
+        bench=False,
+        watch=False,
+        languages=None,
+        profile="sample-1",
+        profiler=None,
+        profile_top=20,
+        profile_output=None,
+        time_limit=None,
+        memory_limit=None,
+        output_limit=None,
+    )
+
+    if should_succeed:
+        sut.execute_test_handler(args)
+    else:
+        with pytest.raises(SystemExit) as e:
+            sut.execute_test_handler(args)
+        assert e.value.code == 1
+    assert profile_test_mock.call_args.args == ("sample-1",)
+
+
+@pytest.mark.parametrize(
+    argnames=("benchmark_test_side_effect", "should_succeed"),
+    argvalues=[
+        [None, True],
+        [ConfigAccessError(), False],
+        [BuildFailure(), False],
+        [ResultWriteError(), False],
+    ],
+)
+def test_execute_test_handler_bench(
+    benchmark_test_side_effect: Exception, should_succeed: bool
+) -> None:
+    """--bench のときはbenchmark_testを呼ぶ."""
+    benchmark_test_mock = mock.MagicMock(side_effect=benchmark_test_side_effect)
+    sut = _get_sut(
+        execute_test_usecase_mock=mock.MagicMock(benchmark_test=benchmark_test_mock)
+    )
+
+    args = _get_default_namespace(
+        bench=True,
+        warmup=1,
+        repeat=10,
+        precision=None,
+        cpu=None,
+        bench_json=None,
+        time_limit=None,
+        memory_limit=None,
+        output_limit=None,
+    )
+
+    if should_succeed:
+        sut.execute_test_handler(args)
+    else:
+        with pytest.raises(SystemExit) as e:
+            sut.execute_test_handler(args)
+        assert e.value.code == 1
+    benchmark_test_mock.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    argnames=("stress_test_return_value", "stress_test_side_effect", "should_succeed"),
+    argvalues=[
+        [True, None, True],
+        [False, None, False],
+        [True, ConfigAccessError(), False],
+        [True, BuildFailure(), False],
+        [True, HelperProgramFailure(), False],
+    ],
+    ids=["一致", "食い違いあり", "設定エラー", "ビルド失敗", "生成器の失敗"],
+)
+def test_stress_test_handler(
+    stress_test_return_value: bool,
+    stress_test_side_effect: Exception,
+    should_succeed: bool,
+) -> None:
+    """stress_test_handlerのテスト."""
+    sut = _get_sut(
+        stress_test_usecase_mock=mock.MagicMock(
+            stress_test=mock.MagicMock(
+                return_value=stress_test_return_value,
+                side_effect=stress_test_side_effect,
+            )
+        )
+    )
+
+    args = _get_default_namespace(
+        generator=["gen"],
+        reference=["brute"],
+        seeds=10,
+        start_seed=0,
+        jobs=None,
+        time_limit=None,
+        memory_limit=None,
+        output_limit=None,
+        minimize_time=10.0,
+        format_hint=None,
+    )
+
+    if should_succeed:
+        sut.stress_test_handler(args)
+    else:
+        with pytest.raises(SystemExit) as e:
+            sut.stress_test_handler(args)
+        assert e.value.code == 1
+
+
+@pytest.mark.parametrize(
+    argnames=(
+        "scaling_test_return_value",
+        "scaling_test_side_effect",
+        "should_succeed",
+    ),
+    argvalues=[
+        [True, None, True],
+        [False, None, False],
+        [True, ConfigAccessError(), False],
+        [True, BuildFailure(), False],
+        [True, HelperProgramFailure(), False],
+        [True, MissingDependency(), False],
+    ],
+    ids=["制限内", "制限超過", "設定エラー", "ビルド失敗", "生成器の失敗", "numpyなし"],
+)
+def test_scaling_test_handler(
+    scaling_test_return_value: bool,
+    scaling_test_side_effect: Exception,
+    should_succeed: bool,
+) -> None:
+    """scaling_test_handlerのテスト."""
+    sut = _get_sut(
+        scaling_test_usecase_mock=mock.MagicMock(
+            scaling_test=mock.MagicMock(
+                return_value=scaling_test_return_value,
+                side_effect=scaling_test_side_effect,
+            )
+        )
+    )
+
+    args = _get_default_namespace(
+        generator=["gen"],
+        max_n=200000,
+        min_n=None,
+        up_to=None,
+        steps=8,
+        repeat=3,
+        time_limit=None,
+        memory_limit=None,
+        output_limit=None,
+    )
+
     if should_succeed:
-        sut.execute_test_handler(_get_default_namespace())
+        sut.scaling_test_handler(args)
     else:
         with pytest.raises(SystemExit) as e:
-            sut.execute_test_handler(_get_default_namespace())
+            sut.scaling_test_handler(args)
         assert e.value.code == 1
 
 
@@ -224,7 +508,7 @@ def test_fetch_task_handler(
     )
     contest = "foo"
     task = "bar"
-    args = _get_default_namespace(contest=contest, task=task)
+    args = _get_default_namespace(contest=contest, task=task, all=False)
 
     if should_succeed:
         sut.fetch_task_handler(args)
@@ -234,6 +518,93 @@ def test_fetch_task_handler(
         assert e.value.code == 1
 
 
+@pytest.mark.parametrize(
+    argnames=("fetch_contest_side_effect", "should_succeed"),
+    argvalues=[
+        [None, True],
+        [AtcoderAccessError, False],
+        [ConfigAccessError, False],
+    ],
+)
+def test_fetch_task_handler_all(
+    fetch_contest_side_effect: Exception, should_succeed: bool
+) -> None:
+    """--all のときはfetch_contestを呼ぶ."""
+    fetch_contest_mock = mock.MagicMock(side_effect=fetch_contest_side_effect)
+    sut = _get_sut(
+        fetch_task_usecase_mock=mock.MagicMock(fetch_contest=fetch_contest_mock)
+    )
+    args = _get_default_namespace(contest="abc300", task=None, all=True, jobs=4)
+
+    if should_succeed:
+        sut.fetch_task_handler(args)
+    else:
+        with pytest.raises(SystemExit) as e:
+            sut.fetch_task_handler(args)
+        assert e.value.code == 1
+    fetch_contest_mock.assert_called_once_with("abc300", jobs=4)
+
+
+@pytest.mark.parametrize(
+    argnames=("prepare_contest_side_effect", "should_succeed"),
+    argvalues=[
+        [None, True],
+        [KeyboardInterrupt, True],
+        [AtcoderAccessError, False],
+        [ConfigAccessError, False],
+    ],
+)
+def test_contest_prepare_handler(
+    prepare_contest_side_effect: Exception, should_succeed: bool
+) -> None:
+    """contest_prepare_handlerのテスト."""
+    prepare_contest_mock = mock.MagicMock(side_effect=prepare_contest_side_effect)
+    sut = _get_sut(
+        fetch_task_usecase_mock=mock.MagicMock(prepare_contest=prepare_contest_mock)
+    )
+    args = _get_default_namespace(
+        contest="abc300", tasks=["a", "b"], jobs=None, warm_up=10.0
+    )
+
+    if should_succeed:
+        sut.contest_prepare_handler(args)
+    else:
+        with pytest.raises(SystemExit) as e:
+            sut.contest_prepare_handler(args)
+        assert e.value.code == 1
+    prepare_contest_mock.assert_called_once_with(
+        "abc300", tasks=["a", "b"], jobs=None, warm_up=10.0
+    )
+
+
+@pytest.mark.parametrize(
+    argnames=("sync_side_effect", "should_succeed"),
+    argvalues=[
+        [None, True],
+        [KeyboardInterrupt, False],
+        [AtcoderAccessError, False],
+        [ConfigAccessError, False],
+    ],
+)
+def test_archive_sync_handler(
+    sync_side_effect: Exception, should_succeed: bool
+) -> None:
+    """archive_sync_handlerのテスト."""
+    sync_mock = mock.MagicMock(side_effect=sync_side_effect)
+    sut = _get_sut(archive_usecase_mock=mock.MagicMock(sync=sync_mock))
+    args = _get_default_namespace(
+        contests=[["abc001", "abc002"], ["arc100"]], jobs=None
+    )
+
+    if should_succeed:
+        sut.archive_sync_handler(args)
+    else:
+        with pytest.raises(SystemExit) as e:
+            sut.archive_sync_handler(args)
+        assert e.value.code == 1
+    sync_mock.assert_called_once_with(["abc001", "abc002", "arc100"], jobs=None)
+
+
 @pytest.mark.parametrize(
     argnames=("init_config_side_effect", "should_succeed"),
     argvalues=[[None, True], [ConfigAccessError, False]],
@@ -342,3 +713,39 @@ def test_config_use_handler(
         with pytest.raises(SystemExit) as e:
             sut.config_use_handler(args)
         assert e.value.code == 1
+
+
+@pytest.mark.parametrize(
+    argnames=("run_tasks_return_value", "run_tasks_side_effect", "should_succeed"),
+    argvalues=[
+        [True, None, True],
+        [False, None, False],
+        [True, ConfigAccessError(), False],
+    ],
+    ids=["すべて通った", "失敗あり", "設定エラー"],
+)
+def test_run_tasks_handler(
+    run_tasks_return_value: bool,
+    run_tasks_side_effect: Exception,
+    should_succeed: bool,
+) -> None:
+    """run_tasks_handlerのテスト."""
+    sut = _get_sut(
+        pipeline_usecase_mock=mock.MagicMock(
+            run_tasks=mock.MagicMock(
+                return_value=run_tasks_return_value,
+                side_effect=run_tasks_side_effect,
+            )
+        )
+    )
+
+    args = _get_default_namespace(
+        task_dirs=["a", "b"], fetch=True, fetch_jobs=2, build_jobs=None, run_jobs=None
+    )
+
+    if should_succeed:
+        sut.run_tasks_handler(args)
+    else:
+        with pytest.raises(SystemExit) as e:
+            sut.run_tasks_handler(args)
+        assert e.value.code == 1
@@ -0,0 +1,66 @@
+"""parserのテスト."""
+
+from typing import List
+
+import mock
+import pytest
+
+from atcoder_helper.adapter.controller.parser import get_root_parser
+
+
+def _run_exec(argv: List[str]) -> mock.MagicMock:
+    controller = mock.MagicMock()
+    args = get_root_parser().parse_args(["exec"] + argv)
+    args.handler(self=controller, args=args)
+    return controller
+
+
+@pytest.mark.parametrize(
+    argnames="argv",
+    argvalues=[
+        ["--watch", "--bench"],
+        ["--languages", "python", "--profile", "sample-1"],
+        ["--watch", "--format", "junit"],
+        ["--bench", "--output", "results.xml"],
+        ["--profile", "sample-1", "--failed-only"],
+        ["--languages", "python", "--changed-only"],
+        ["--bench", "--jobs", "2"],
+        ["--warmup", "3"],
+        ["--debounce", "1"],
+    ],
+)
+def test_exec_rejects_options_unused_by_mode(
+    argv: List[str], capsys: pytest.CaptureFixture[str]
+) -> None:
+    """モードは1つだけ選べ、選んだモードが使わない引数は無視せずにエラーにする."""
+    with pytest.raises(SystemExit) as e:
+        _run_exec(argv)
+
+    assert e.value.code == 2
+    assert "error" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize(
+    argnames="argv",
+    argvalues=[
+        ["--format", "junit", "--output", "results.xml", "--failed-only", "-j", "2"],
+        ["--watch", "--debounce", "1", "-j", "2"],
+        ["--languages", "python,cpp", "-j", "1", "--time-limit", "3"],
+        ["--profile", "sample-1", "--profiler", "perf", "--profile-top", "5"],
+        ["--format", "text", "--watch"],
+    ],
+)
+def test_exec_accepts_options_used_by_mode(argv: List[str]) -> None:
+    """選んだモードが使う引数(と既定値のままの引数)だけなら、そのまま実行する."""
+    controller = _run_exec(argv)
+
+    controller._run_test_suite.assert_called_once()
+
+
+def test_exec_accepts_bench_options() -> None:
+    """--bench の引数は --bench と一緒に使える."""
+    controller = _run_exec(["--bench", "--warmup", "2", "--repeat", "5", "--cpu", "0"])
+
+    benchmark_test = controller._execute_test_usecase.benchmark_test
+    assert benchmark_test.call_args.kwargs["warmup"] == 2
+    assert benchmark_test.call_args.kwargs["cpu"] == 0
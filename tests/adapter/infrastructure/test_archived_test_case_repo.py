@@ -0,0 +1,91 @@
+"""archived_test_case_repoのテスト."""
+
+from typing import Optional
+
+import mock
+import requests
+
+from atcoder_helper.adapter.infrastructure.archived_test_case_repo import (
+    ArchivedAtCoderTestCaseRepositoryImpl,
+)
+from atcoder_helper.application.repositories.errors import ParseError
+from atcoder_helper.application.repositories.errors import ReadError
+from atcoder_helper.entities.atcoder_problem import AtCoderProblem
+from atcoder_helper.entities.atcoder_test_case import AtcoderTestCase
+
+
+def _test_cases(task: str) -> list[AtcoderTestCase]:
+    return [AtcoderTestCase(name="case-1", given=task, expected=None)]
+
+
+def _archive(*tasks: str) -> mock.MagicMock:
+    def read_problem(contest: str, task: str) -> Optional[AtCoderProblem]:
+        if task not in tasks:
+            return None
+        return AtCoderProblem(
+            contest=contest,
+            task=task,
+            title=task,
+            time_limit=None,
+            memory_limit=None,
+            statement="",
+            test_cases=_test_cases(task),
+        )
+
+    return mock.MagicMock(read_problem=mock.MagicMock(side_effect=read_problem))
+
+
+def test_fetch_test_cases() -> None:
+    """アーカイブにあれば通信せず、なければAtCoderから取得する."""
+    remote = mock.MagicMock(fetch_test_cases=mock.MagicMock(return_value=[]))
+    sut = ArchivedAtCoderTestCaseRepositoryImpl(_archive("a"), remote)
+    session = requests.Session()
+
+    assert sut.fetch_test_cases(session, "abc300", "a") == _test_cases("a")
+    remote.fetch_test_cases.assert_not_called()
+
+    assert sut.fetch_test_cases(session, "abc300", "b") == []
+    remote.fetch_test_cases.assert_called_once_with(session, "abc300", "b")
+
+
+def test_fetch_test_cases_broken_archive() -> None:
+    """アーカイブを読めなければ、AtCoderから取得する."""
+    archive = mock.MagicMock(read_problem=mock.MagicMock(side_effect=ReadError()))
+    remote = mock.MagicMock(fetch_test_cases=mock.MagicMock(return_value=[]))
+    sut = ArchivedAtCoderTestCaseRepositoryImpl(archive, remote)
+
+    assert sut.fetch_test_cases(requests.Session(), "abc300", "a") == []
+
+
+def test_fetch_contest_test_cases() -> None:
+    """アーカイブにないタスクだけをAtCoderから取得し、タスクの順に返す."""
+    remote = mock.MagicMock(
+        fetch_contest_test_cases=mock.MagicMock(
+            return_value={"b": _test_cases("b"), "d": ParseError()}
+        )
+    )
+    sut = ArchivedAtCoderTestCaseRepositoryImpl(_archive("a", "c"), remote)
+    session = requests.Session()
+
+    result = sut.fetch_contest_test_cases(session, "abc300", ["a", "b", "c", "d"], 4)
+
+    assert list(result) == ["a", "b", "c", "d"]
+    assert result["b"] == _test_cases("b")
+    assert isinstance(result["d"], ParseError)
+    remote.fetch_contest_test_cases.assert_called_once_with(
+        session, "abc300", ["b", "d"], 4
+    )
+
+
+def test_fetch_tasks() -> None:
+    """アーカイブにある問題一覧を使う. use_cache=False ならAtCoderに問い合わせる."""
+    archive = mock.MagicMock(read_tasks=mock.MagicMock(return_value=["a", "b"]))
+    remote = mock.MagicMock(fetch_tasks=mock.MagicMock(return_value=["a", "b", "c"]))
+    sut = ArchivedAtCoderTestCaseRepositoryImpl(archive, remote)
+    session = requests.Session()
+
+    assert sut.fetch_tasks(session, "abc300") == ["a", "b"]
+    remote.fetch_tasks.assert_not_called()
+
+    assert sut.fetch_tasks(session, "abc300", use_cache=False) == ["a", "b", "c"]
+    remote.fetch_tasks.assert_called_once_with(session, "abc300", use_cache=False)
@@ -0,0 +1,80 @@
+"""atcoder_contest_repoのテスト."""
+
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from typing import Any
+
+import mock
+import pytest
+import requests
+from pytest import MonkeyPatch
+
+from atcoder_helper.adapter.infrastructure.atcoder_contest_repo import (
+    AtCoderContestRepositoryImpl,
+)
+from atcoder_helper.adapter.infrastructure.atcoder_test_case_repo import (
+    AtCoderTestCaseRepositoryImpl,
+)
+from atcoder_helper.application.repositories.errors import ParseError
+
+_contest_page = """
+<html><body>
+<small class="contest-duration">
+  コンテスト時間:
+  <a href="http://www.timeanddate.com/"><time class="fixtime fixtime-full">2023-04-29 21:00:00+0900</time></a>
+  ~
+  <a href="http://www.timeanddate.com/"><time class="fixtime fixtime-full">2023-04-29 22:40:00+0900</time></a>
+  (100分)
+</small>
+</body></html>
+"""  # noqa: E501
+
+
+def test_fetch_start_time(monkeypatch: MonkeyPatch) -> None:
+    """コンテスト時間の最初の時刻を、タイムゾーン付きで返す."""
+    monkeypatch.setattr(
+        requests.Session,
+        "get",
+        mock.MagicMock(
+            return_value=mock.MagicMock(status_code=200, text=_contest_page)
+        ),
+    )
+
+    start = AtCoderContestRepositoryImpl().fetch_start_time(
+        requests.Session(), "abc300"
+    )
+
+    assert start == datetime(2023, 4, 29, 21, tzinfo=timezone(timedelta(hours=9)))
+
+
+def test_fetch_start_time_not_found(monkeypatch: MonkeyPatch) -> None:
+    """開始時刻が見つからなければParseError."""
+    monkeypatch.setattr(
+        requests.Session,
+        "get",
+        mock.MagicMock(
+            return_value=mock.MagicMock(status_code=404, text="<html></html>")
+        ),
+    )
+
+    with pytest.raises(ParseError):
+        AtCoderContestRepositoryImpl().fetch_start_time(requests.Session(), "foo")
+
+
+def test_warm_up_keeps_pool_for_contest_fetch(monkeypatch: MonkeyPatch) -> None:
+    """開いた接続のプールを、コンテスト全体の取得でも使い回す."""
+
+    def get(self: requests.Session, url: str, **kwargs: Any) -> mock.MagicMock:
+        return mock.MagicMock(status_code=200, ok=True, text="")
+
+    monkeypatch.setattr(requests.Session, "get", get)
+    session = requests.Session()
+
+    assert AtCoderContestRepositoryImpl().warm_up(session, "abc300", 4) == 4
+    adapter = session.get_adapter("https://atcoder.jp/contests/abc300/tasks")
+
+    AtCoderTestCaseRepositoryImpl().fetch_contest_test_cases(
+        session, "abc300", ["a"], jobs=2
+    )
+    assert session.get_adapter("https://atcoder.jp/contests/abc300/tasks") is adapter
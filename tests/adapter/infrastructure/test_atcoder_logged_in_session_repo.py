@@ -15,10 +15,21 @@ from atcoder_helper.application.repositories.errors import ConnectionError
 from atcoder_helper.application.repositories.errors import LoginFailure
 from atcoder_helper.application.repositories.errors import ParseError
 
+
+def _page(text: str) -> mock.MagicMock:
+    return mock.MagicMock(return_value=mock.MagicMock(status_code=200, text=text))
+
+
+def _redirect(location: str) -> mock.MagicMock:
+    return mock.MagicMock(
+        return_value=mock.MagicMock(status_code=302, headers={"Location": location})
+    )
+
+
 test_read_parameter = {
     "OK": [
-        mock.MagicMock(return_value=mock.MagicMock(text='<input value="foo"/>')),
-        mock.MagicMock(return_value=mock.MagicMock(headers={"Location": "/home"})),
+        _page('<input value="foo"/>'),
+        _redirect("/home"),
         None,
     ],
     "error(get失敗)": [
@@ -27,18 +38,18 @@ test_read_parameter = {
         ConnectionError,
     ],
     "error(parser失敗)": [
-        mock.MagicMock(return_value=mock.MagicMock(text="<input/>")),
-        mock.MagicMock(return_value=mock.MagicMock(headers={"Location": "/home"})),
+        _page("<input/>"),
+        _redirect("/home"),
         ParseError,
     ],
     "error(POST失敗)": [
-        mock.MagicMock(return_value=mock.MagicMock(text='<input value="foo"/>')),
+        _page('<input value="foo"/>'),
         mock.MagicMock(side_effect=Exception),
         ConnectionError,
     ],
     "error(ログイン失敗)": [
-        mock.MagicMock(return_value=mock.MagicMock(text='<input value="foo"/>')),
-        mock.MagicMock(return_value=mock.MagicMock(headers={"Location": "/foo"})),
+        _page('<input value="foo"/>'),
+        _redirect("/foo"),
         LoginFailure,
     ],
 }
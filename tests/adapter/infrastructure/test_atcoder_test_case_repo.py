@@ -1,5 +1,8 @@
 """atcoder_test_case_repoのテスト."""
 
+from pathlib import Path
+from typing import Any
+from typing import List
 from typing import Type
 
 import mock
@@ -10,13 +13,17 @@ from pytest import MonkeyPatch
 from atcoder_helper.adapter.infrastructure.atcoder_test_case_repo import (
     AtCoderTestCaseRepositoryImpl,
 )
+from atcoder_helper.adapter.infrastructure.http_cache import HttpCache
+from atcoder_helper.adapter.infrastructure.http_transport import HttpTransport
+from atcoder_helper.application.repositories.errors import ConnectionError
 from atcoder_helper.application.repositories.errors import ParseError
 
 fetch_test_cases_parameters = {
     "OK": [
         mock.MagicMock(
             return_value=mock.MagicMock(
-                text='<div id="task-statement"><span class="lang-ja"></span></div>'
+                status_code=200,
+                text='<div id="task-statement"><span class="lang-ja"></span></div>',
             )
         ),
         None,
@@ -26,7 +33,7 @@ fetch_test_cases_parameters = {
         ConnectionError,
     ],
     "Error(parse error)": [
-        mock.MagicMock(return_value=mock.MagicMock(text="<foo />")),
+        mock.MagicMock(return_value=mock.MagicMock(status_code=200, text="<foo />")),
         ParseError,
     ],
 }
@@ -54,3 +61,224 @@ def test_fetch_test_cases(
             sut.fetch_test_cases(session, contest, task)
     else:
         sut.fetch_test_cases(session, contest, task)
+
+
+def _task_page(*samples: str) -> str:
+    sections = "".join(
+        f"<section><h3>入力例 {i}</h3><pre>{sample}\n</pre></section>"
+        f"<section><h3>出力例 {i}</h3><pre>{sample}!\n</pre></section>"
+        for i, sample in enumerate(samples, 1)
+    )
+    return (
+        "<html><head><script>var x = 1;</script></head><body>"
+        '<div id="task-statement"><span class="lang-ja">'
+        f"{sections}</span></div></body></html>"
+    )
+
+
+def test_fetch_test_cases_from_cache(tmp_path: Path) -> None:
+    """問題ページに ETag も Last-Modified もなくても、2回目は通信しない."""
+    transport = mock.MagicMock(
+        get=mock.MagicMock(
+            return_value=mock.MagicMock(
+                status_code=200, ok=True, text=_task_page("1"), headers={}
+            )
+        )
+    )
+    sut = AtCoderTestCaseRepositoryImpl(
+        cache=HttpCache(str(tmp_path), transport=transport), transport=transport
+    )
+    session = requests.Session()
+
+    first = sut.fetch_test_cases(session, "abc042", "a")
+    second = sut.fetch_test_cases(session, "abc042", "a")
+
+    assert second == first
+    assert [(case.given, case.expected) for case in second] == [("1", "1!")]
+    transport.get.assert_called_once()
+
+
+_tasks_page = """
+<table>
+  <tr>
+    <td><a href="/contests/abc042/tasks/abc042_a">A</a></td>
+    <td><a href="/contests/abc042/tasks/abc042_a">Iroha and Haiku</a></td>
+  </tr>
+  <tr><td><a href="/contests/abc042/tasks/abc042_b">B</a></td></tr>
+  <tr><td><a href="/contests/abc042/tasks/arc058_a">C</a></td></tr>
+  <tr><td><a href="/contests/abc042/submit?taskScreenName=abc042_a">提出</a></td></tr>
+  <tr><td><a href="/contests/abc041/tasks/abc041_a">前回</a></td></tr>
+</table>
+"""
+
+
+def test_fetch_tasks(monkeypatch: MonkeyPatch) -> None:
+    """問題一覧の順に重複なくタスク名を返し、共有された問題はタスクIDのまま返す."""
+    get_mock = mock.MagicMock(
+        return_value=mock.MagicMock(status_code=200, text=_tasks_page)
+    )
+    monkeypatch.setattr(requests.Session, "get", get_mock)
+
+    sut = AtCoderTestCaseRepositoryImpl()
+
+    assert sut.fetch_tasks(requests.Session(), "abc042") == ["a", "b", "arc058_a"]
+    get_mock.assert_called_once_with(
+        "https://atcoder.jp/contests/abc042/tasks", timeout=mock.ANY
+    )
+
+
+def test_fetch_tasks_without_cache(monkeypatch: MonkeyPatch) -> None:
+    """use_cache=False なら、キャッシュを通さずに問い合わせる."""
+    get_mock = mock.MagicMock(
+        return_value=mock.MagicMock(status_code=200, text=_tasks_page)
+    )
+    monkeypatch.setattr(requests.Session, "get", get_mock)
+    cache = mock.MagicMock(get=mock.MagicMock(return_value=["stale"]))
+
+    sut = AtCoderTestCaseRepositoryImpl(cache=cache)
+
+    assert sut.fetch_tasks(requests.Session(), "abc042") == ["stale"]
+    assert sut.fetch_tasks(requests.Session(), "abc042", use_cache=False) == [
+        "a",
+        "b",
+        "arc058_a",
+    ]
+    cache.get.assert_called_once()
+    get_mock.assert_called_once()
+
+
+def test_fetch_tasks_not_found(monkeypatch: MonkeyPatch) -> None:
+    """問題が1つもなければParseError."""
+    monkeypatch.setattr(
+        requests.Session,
+        "get",
+        mock.MagicMock(
+            return_value=mock.MagicMock(status_code=200, text="<html></html>")
+        ),
+    )
+
+    with pytest.raises(ParseError):
+        AtCoderTestCaseRepositoryImpl().fetch_tasks(requests.Session(), "abc042")
+
+
+def test_fetch_contest_test_cases(monkeypatch: MonkeyPatch) -> None:
+    """取得に失敗したタスクは、テストケースの代わりにそのエラーを返す."""
+    pages = {
+        "https://atcoder.jp/contests/abc042/tasks/abc042_a": _task_page("1", "2"),
+        "https://atcoder.jp/contests/abc042/tasks/arc058_a": _task_page("3"),
+        "https://atcoder.jp/contests/abc042/tasks/abc042_b": "<foo />",
+    }
+
+    def get(self: requests.Session, url: str, **kwargs: Any) -> mock.MagicMock:
+        if url not in pages:
+            raise requests.ConnectionError()
+        return mock.MagicMock(status_code=200, text=pages[url])
+
+    monkeypatch.setattr(requests.Session, "get", get)
+
+    sut = AtCoderTestCaseRepositoryImpl(transport=HttpTransport(sleep=lambda _: None))
+    result = sut.fetch_contest_test_cases(
+        requests.Session(), "abc042", ["a", "b", "arc058_a", "d"], jobs=4
+    )
+
+    assert list(result) == ["a", "b", "arc058_a", "d"]
+    assert isinstance(result["a"], list)
+    assert [(case.name, case.given, case.expected) for case in result["a"]] == [
+        ("case-1", "1", "1!"),
+        ("case-2", "2", "2!"),
+    ]
+    assert isinstance(result["b"], ParseError)
+    assert isinstance(result["arc058_a"], list)
+    assert isinstance(result["d"], ConnectionError)
+    assert "abc042_d" in str(result["d"])
+
+
+def test_fetch_contest_test_cases_does_not_hide_bugs(monkeypatch: MonkeyPatch) -> None:
+    """通信とパース以外のエラーは、握りつぶさずに投げる."""
+    monkeypatch.setattr(
+        AtCoderTestCaseRepositoryImpl,
+        "fetch_test_cases",
+        mock.MagicMock(side_effect=TypeError()),
+    )
+
+    with pytest.raises(TypeError):
+        AtCoderTestCaseRepositoryImpl().fetch_contest_test_cases(
+            requests.Session(), "abc042", ["a", "b"], jobs=2
+        )
+
+
+_problem_page = """
+<html><body><div id="main-container">
+<span class="h2">A - Takahashi <a class="btn" href="/editorial">解説</a></span>
+<p>実行時間制限: 2 sec / メモリ制限: 1024 MB</p>
+<div id="task-statement"><span class="lang">
+<span class="lang-ja"><section><h3>問題文</h3><p>足してください</p></section>
+<section><h3>入力例 1</h3><pre>1 2
+</pre></section><section><h3>出力例 1</h3><pre>3
+</pre></section></span>
+<span class="lang-en"><section><h3>Sample Input 1</h3><pre>1 2</pre></section></span>
+</span></div>
+</div></body></html>
+"""
+
+_old_problem_page = """
+<html><body><div id="main-container">
+<span class="h2">A - 積雪深差</span>
+<p>Time Limit: 2 sec / Memory Limit: 65536 KB</p>
+<div id="task-statement"><div class="part">
+<section><h3>入力例 1</h3><pre>15
+10</pre></section><section><h3>出力例 1</h3><pre>5</pre></section>
+</div></div>
+</div></body></html>
+"""
+
+
+@pytest.mark.parametrize(
+    argnames=("page", "title", "time_limit", "memory_limit", "expected"),
+    argvalues=[
+        (_problem_page, "A - Takahashi", 2.0, 1024, ["1 2", "3"]),
+        (_old_problem_page, "A - 積雪深差", 2.0, 64, ["15\n10", "5"]),
+    ],
+    ids=["現在の問題ページ", "言語ごとに分かれていない古い問題ページ"],
+)
+def test_fetch_problem(
+    page: str,
+    title: str,
+    time_limit: float,
+    memory_limit: int,
+    expected: List[str],
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """問題名・制限・問題文・入力例と出力例を取り出す."""
+    monkeypatch.setattr(
+        requests.Session,
+        "get",
+        mock.MagicMock(return_value=mock.MagicMock(status_code=200, text=page)),
+    )
+
+    problem = AtCoderTestCaseRepositoryImpl().fetch_problem(
+        requests.Session(), "abc001", "a"
+    )
+
+    assert (problem.contest, problem.task) == ("abc001", "a")
+    assert problem.title == title
+    assert problem.time_limit == time_limit
+    assert problem.memory_limit == memory_limit
+    assert "Sample Input" not in problem.statement
+    assert [
+        [case.given, case.expected] for case in problem.test_cases
+    ] == [expected]
+
+
+def test_fetch_problem_not_found(monkeypatch: MonkeyPatch) -> None:
+    """問題文がなければParseError."""
+    monkeypatch.setattr(
+        requests.Session,
+        "get",
+        mock.MagicMock(
+            return_value=mock.MagicMock(status_code=404, text="<html></html>")
+        ),
+    )
+
+    with pytest.raises(ParseError):
+        AtCoderTestCaseRepositoryImpl().fetch_problem(requests.Session(), "foo", "a")
@@ -0,0 +1,127 @@
+"""http_cacheのテスト."""
+
+from pathlib import Path
+from typing import List
+
+import mock
+import pytest
+
+from atcoder_helper.adapter.infrastructure.http_cache import HttpCache
+from atcoder_helper.application.repositories.errors import ConnectionError
+from atcoder_helper.application.repositories.errors import ParseError
+
+_url = "https://atcoder.jp/contests/abc300/tasks/abc300_a"
+
+
+def _response(status_code: int, text: str = "", **headers: str) -> mock.MagicMock:
+    return mock.MagicMock(
+        status_code=status_code,
+        ok=status_code < 400,
+        text=text,
+        headers=headers,
+    )
+
+
+def _extract(text: str) -> List[str]:
+    if not text:
+        raise ParseError()
+    return text.split()
+
+
+def test_get_serves_fresh_entry_without_network(tmp_path: Path) -> None:
+    """新しいうちは、問い合わせずにキャッシュを返す."""
+    now = [1_000_000.0]
+    session = mock.MagicMock(
+        get=mock.MagicMock(return_value=_response(200, "a b", ETag='"v1"'))
+    )
+    sut = HttpCache(str(tmp_path), clock=lambda: now[0])
+
+    assert sut.get(session, _url, _extract) == ["a", "b"]
+    now[0] += 60
+    assert sut.get(session, _url, _extract) == ["a", "b"]
+
+    assert session.get.call_count == 1
+
+
+def test_get_entry_without_validators(tmp_path: Path) -> None:
+    """検証子(ETag / Last-Modified)のないページも1時間は新しく、過ぎたら取得し直す."""
+    now = [1_000_000.0]
+    session = mock.MagicMock(get=mock.MagicMock(return_value=_response(200, "a")))
+    sut = HttpCache(str(tmp_path), clock=lambda: now[0])
+    sut.get(session, _url, _extract)
+
+    now[0] += 60 * 60 - 1
+    assert sut.get(session, _url, _extract) == ["a"]
+    assert session.get.call_count == 1
+
+    now[0] += 1
+    session.get.return_value = _response(200, "b")
+
+    assert sut.get(session, _url, _extract) == ["b"]
+    assert session.get.call_args.kwargs["headers"] == {}
+
+
+def test_get_revalidates_stale_entry(tmp_path: Path) -> None:
+    """古くなったら条件付きリクエストで確かめ、304 ならパースし直さない."""
+    now = [1_700_000_000.0]
+    last_modified = "Tue, 14 Nov 2023 21:56:40 GMT"  # now の 1000 秒前
+    session = mock.MagicMock(
+        get=mock.MagicMock(
+            return_value=_response(
+                200, "a b", ETag='"v1"', **{"Last-Modified": last_modified}
+            )
+        )
+    )
+    sut = HttpCache(str(tmp_path), clock=lambda: now[0])
+    sut.get(session, _url, _extract)
+
+    # 最終更新から 1000 秒なので、100 秒で古くなる
+    now[0] += 101
+    session.get.return_value = _response(304)
+    extract = mock.MagicMock()
+
+    assert sut.get(session, _url, extract) == ["a", "b"]
+    assert session.get.call_args.kwargs["headers"] == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": last_modified,
+    }
+    extract.assert_not_called()
+
+
+def test_get_falls_back_to_stale_entry_when_offline(tmp_path: Path) -> None:
+    """通信できなければ、古くてもキャッシュを返す."""
+    now = [1_000_000.0]
+    session = mock.MagicMock(get=mock.MagicMock(return_value=_response(200, "a")))
+    sut = HttpCache(str(tmp_path), clock=lambda: now[0])
+    sut.get(session, _url, _extract)
+
+    now[0] += 365 * 24 * 60 * 60
+    session.get.side_effect = OSError()
+
+    assert sut.get(session, _url, _extract) == ["a"]
+    with pytest.raises(ConnectionError):
+        sut.get(session, f"{_url}_other", _extract)
+
+
+def test_get_does_not_cache_parse_error(tmp_path: Path) -> None:
+    """取り出せなかったページはキャッシュしない."""
+    session = mock.MagicMock(get=mock.MagicMock(return_value=_response(200, "")))
+    sut = HttpCache(str(tmp_path))
+
+    with pytest.raises(ParseError):
+        sut.get(session, _url, _extract)
+
+    assert sut.peek(_url) is None
+
+
+def test_peek(tmp_path: Path) -> None:
+    """壊れたキャッシュは、ないものとして扱う."""
+    session = mock.MagicMock(get=mock.MagicMock(return_value=_response(200, "a")))
+    sut = HttpCache(str(tmp_path))
+    sut.get(session, _url, _extract)
+
+    assert sut.peek(_url) == ["a"]
+
+    [cache_file] = tmp_path.iterdir()
+    cache_file.write_text("{")
+    assert sut.peek(_url) is None
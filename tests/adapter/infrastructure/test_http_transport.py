@@ -0,0 +1,128 @@
+"""http_transportのテスト."""
+
+from typing import Any
+from typing import List
+
+import mock
+import pytest
+import requests
+
+from atcoder_helper.adapter.infrastructure.http_transport import HttpTransport
+from atcoder_helper.adapter.infrastructure.http_transport import TokenBucket
+
+_url = "https://atcoder.jp/contests/abc300/tasks"
+
+
+class _FakeClock:
+    """sleep すると進む時計."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: List[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _response(status_code: int, **headers: str) -> mock.MagicMock:
+    return mock.MagicMock(status_code=status_code, headers=headers)
+
+
+def _transport(clock: _FakeClock, **kwargs: Any) -> HttpTransport:
+    return HttpTransport(clock=clock, sleep=clock.sleep, jitter=lambda: 1.0, **kwargs)
+
+
+def test_token_bucket() -> None:
+    """溜まっている burst 個までは待たず、それ以降は rate に合わせて待つ."""
+    clock = _FakeClock()
+    sut = TokenBucket(rate=2.0, burst=3, clock=clock, sleep=clock.sleep)
+
+    assert [sut.acquire() for _ in range(5)] == [0.0, 0.0, 0.0, 0.5, 0.5]
+    clock.now += 10
+    assert sut.acquire() == 0.0
+
+
+def test_get_retries_5xx_with_backoff() -> None:
+    """5xx なら指数バックオフで送り直し、成功した応答を返す."""
+    clock = _FakeClock()
+    session = mock.MagicMock(
+        get=mock.MagicMock(side_effect=[_response(502), _response(500), _response(200)])
+    )
+    sut = _transport(clock)
+
+    assert sut.get(session, _url).status_code == 200
+    assert clock.sleeps == [0.5, 1.0]
+    assert session.get.call_args.kwargs["timeout"] == (5.0, 15.0)
+
+    stats = sut.stats()
+    assert (stats.requests, stats.attempts, stats.retries, stats.failures) == (
+        1,
+        3,
+        2,
+        0,
+    )
+
+
+def test_get_gives_up_after_max_attempts() -> None:
+    """送り直しても失敗すれば、最後の例外を投げる."""
+    clock = _FakeClock()
+    session = mock.MagicMock(get=mock.MagicMock(side_effect=requests.Timeout()))
+    sut = _transport(clock, max_attempts=3)
+
+    with pytest.raises(requests.Timeout):
+        sut.get(session, _url)
+    assert session.get.call_count == 3
+    assert sut.stats().failures == 1
+
+
+def test_get_honors_retry_after() -> None:
+    """Retry-After より早くは送り直さない."""
+    clock = _FakeClock()
+    session = mock.MagicMock(
+        get=mock.MagicMock(
+            side_effect=[_response(429, **{"Retry-After": "3"}), _response(200)]
+        )
+    )
+
+    assert _transport(clock).get(session, _url).status_code == 200
+    assert clock.sleeps == [3.0]
+
+
+def test_post_is_not_retried_after_it_may_have_been_processed() -> None:
+    """POST は、サーバーが処理したかもしれない 500 や読み込みタイムアウトでは送り直さない."""
+    clock = _FakeClock()
+    sut = _transport(clock)
+
+    session = mock.MagicMock(post=mock.MagicMock(return_value=_response(500)))
+    assert sut.post(session, _url).status_code == 500
+    assert session.post.call_count == 1
+
+    session = mock.MagicMock(post=mock.MagicMock(side_effect=requests.ReadTimeout()))
+    with pytest.raises(requests.ReadTimeout):
+        sut.post(session, _url)
+    assert session.post.call_count == 1
+
+    session = mock.MagicMock(
+        post=mock.MagicMock(side_effect=[requests.ConnectTimeout(), _response(302)])
+    )
+    assert sut.post(session, _url).status_code == 302
+
+
+def test_retry_budget() -> None:
+    """再試行予算が尽きたら、それ以上は送り直さない."""
+    clock = _FakeClock()
+    session = mock.MagicMock(get=mock.MagicMock(return_value=_response(503)))
+    sut = _transport(clock, min_retry_budget=2, retry_ratio=0.0)
+
+    for _ in range(3):
+        sut.get(session, _url)
+
+    stats = sut.stats()
+    assert stats.retries == 2
+    assert stats.attempts == 5
+    assert stats.budget_exhausted == 3
+    assert stats.failures == 3
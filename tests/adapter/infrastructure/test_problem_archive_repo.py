@@ -0,0 +1,67 @@
+"""problem_archive_repoのテスト."""
+
+from pathlib import Path
+
+from atcoder_helper.adapter.infrastructure.problem_archive_repo import (
+    SqliteProblemArchiveRepositoryImpl,
+)
+from atcoder_helper.entities.atcoder_problem import AtCoderProblem
+from atcoder_helper.entities.atcoder_test_case import AtcoderTestCase
+
+
+def _problem(task: str, *samples: str) -> AtCoderProblem:
+    return AtCoderProblem(
+        contest="abc300",
+        task=task,
+        title=f"{task.upper()} - Foo",
+        time_limit=2.0,
+        memory_limit=1024,
+        statement="問題文",
+        test_cases=[
+            AtcoderTestCase(name=f"case-{i}", given=sample, expected=f"{sample}!")
+            for i, sample in enumerate(samples, 1)
+        ],
+    )
+
+
+def test_read_without_database(tmp_path: Path) -> None:
+    """データベースがなければ、作らずに何も保存していないものとして扱う."""
+    filename = tmp_path / "archive" / "archive.sqlite3"
+    sut = SqliteProblemArchiveRepositoryImpl(str(filename))
+
+    assert sut.read_problem("abc300", "a") is None
+    assert sut.read_tasks("abc300") is None
+    assert sut.archived_tasks("abc300") == set()
+    assert not sut.is_synced("abc300")
+    assert not filename.exists()
+
+
+def test_write_problem(tmp_path: Path) -> None:
+    """問題はサンプルの順を保って保存し、書き直すとサンプルも置き換える."""
+    sut = SqliteProblemArchiveRepositoryImpl(str(tmp_path / "archive.sqlite3"))
+
+    sut.write_problem(_problem("a", "1", "2", "3"))
+    sut.write_problem(_problem("b"))
+    assert sut.read_problem("abc300", "a") == _problem("a", "1", "2", "3")
+
+    sut.write_problem(_problem("a", "4"))
+    assert sut.read_problem("abc300", "a") == _problem("a", "4")
+    assert sut.archived_tasks("abc300") == {"a", "b"}
+    assert sut.read_problem("abc300", "c") is None
+
+
+def test_sync_mark(tmp_path: Path) -> None:
+    """問題一覧が変わったら、保存し終えた印を消す."""
+    sut = SqliteProblemArchiveRepositoryImpl(str(tmp_path / "archive.sqlite3"))
+
+    sut.write_tasks("abc300", ["a", "b"])
+    assert sut.read_tasks("abc300") == ["a", "b"]
+    assert not sut.is_synced("abc300")
+
+    sut.mark_synced("abc300")
+    sut.write_tasks("abc300", ["a", "b"])
+    assert sut.is_synced("abc300")
+
+    sut.write_tasks("abc300", ["a", "b", "c"])
+    assert not sut.is_synced("abc300")
+    assert sut.read_tasks("abc300") == ["a", "b", "c"]
@@ -0,0 +1,71 @@
+"""result_cache_repoのテスト."""
+
+from pathlib import Path
+
+import pytest
+
+from atcoder_helper.adapter.infrastructure.result_cache_repo import (
+    ResultCacheRepositoryImpl,
+)
+from atcoder_helper.application.repositories.errors import ParseError
+from atcoder_helper.application.repositories.errors import ReadError
+from atcoder_helper.application.repositories.errors import WriteError
+from atcoder_helper.entities.atcoder_test_case import AtCoderTestResult
+from atcoder_helper.entities.atcoder_test_case import AtCoderTestStatus
+from atcoder_helper.entities.atcoder_test_case import CachedTestResult
+
+results = [
+    CachedTestResult(
+        "key",
+        AtCoderTestResult(
+            "foo_case",
+            AtCoderTestStatus.WA,
+            "actual",
+            "",
+            expected="expected",
+            wall_time=0.5,
+            cpu_time=0.25,
+            max_rss=1024,
+        ),
+    ),
+    CachedTestResult(
+        None, AtCoderTestResult("bar_case", AtCoderTestStatus.TLE, "", "")
+    ),
+]
+
+
+def test_write_and_read(tmp_path: Path) -> None:
+    """書き込んだ結果をそのまま読み込める."""
+    sut = ResultCacheRepositoryImpl(str(tmp_path / "cache.json"))
+
+    sut.write(results)
+
+    assert sut.read() == results
+
+
+def test_write_error(tmp_path: Path) -> None:
+    """書き込めなければWriteError."""
+    sut = ResultCacheRepositoryImpl(str(tmp_path / "missing" / "cache.json"))
+
+    with pytest.raises(WriteError):
+        sut.write(results)
+
+
+@pytest.mark.parametrize(
+    argnames=("content", "exception"),
+    argvalues=[
+        [None, ReadError],
+        ["{", ParseError],
+        ['[{"key": "key", "result": {"name": "foo"}}]', ParseError],
+    ],
+    ids=["ファイルがない", "JSONでない", "項目が足りない"],
+)
+def test_read_error(tmp_path: Path, content: str, exception: type) -> None:
+    """読み込めなければReadError、パースできなければParseError."""
+    filename = tmp_path / "cache.json"
+    if content is not None:
+        filename.write_text(content)
+    sut = ResultCacheRepositoryImpl(str(filename))
+
+    with pytest.raises(exception):
+        sut.read()
@@ -0,0 +1,34 @@
+"""task_repository_factoryのテスト."""
+
+from pathlib import Path
+
+from atcoder_helper.adapter.infrastructure.task_repository_factory import (
+    TaskRepositoryFactoryImpl,
+)
+from atcoder_helper.entities.atcoder_test_case import AtcoderTestCase
+
+
+def test_find_task_dirs(tmp_path: Path) -> None:
+    """タスク設定ファイルがあるディレクトリだけを、名前順に返す."""
+    for name in ["b", "a", "not_task"]:
+        (tmp_path / name).mkdir()
+    (tmp_path / "a" / "task.yaml").write_text("")
+    (tmp_path / "b" / "task.yaml").write_text("")
+    sut = TaskRepositoryFactoryImpl("task.yaml", "testcases.yaml")
+
+    assert sut.find_task_dirs(str(tmp_path)) == [
+        str(tmp_path / "a"),
+        str(tmp_path / "b"),
+    ]
+    assert sut.find_task_dirs(str(tmp_path / "missing")) == []
+
+
+def test_test_case_repo(tmp_path: Path) -> None:
+    """タスクディレクトリの中のファイルを読み書きする."""
+    sut = TaskRepositoryFactoryImpl("task.yaml", "testcases.yaml")
+    test_cases = [AtcoderTestCase(name="case-1", given="1", expected="1")]
+
+    sut.test_case_repo(str(tmp_path)).write(test_cases)
+
+    assert (tmp_path / "testcases.yaml").exists()
+    assert sut.test_case_repo(str(tmp_path)).read() == test_cases
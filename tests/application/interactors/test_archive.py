@@ -0,0 +1,101 @@
+"""Tests for archive."""
+
+from pathlib import Path
+from typing import List
+from typing import Set
+from typing import Tuple
+
+import mock
+import pytest
+import requests
+
+from atcoder_helper.adapter.infrastructure.problem_archive_repo import (
+    SqliteProblemArchiveRepositoryImpl,
+)
+from atcoder_helper.application.interactors.archive import ArchiveInteractor
+from atcoder_helper.application.repositories.errors import ConnectionError
+from atcoder_helper.application.repositories.errors import ParseError
+from atcoder_helper.application.repositories.errors import ReadError
+from atcoder_helper.application.usecases.errors import AtcoderAccessError
+from atcoder_helper.application.usecases.errors import ConfigAccessError
+from atcoder_helper.entities.atcoder_problem import AtCoderProblem
+
+
+def _problem(contest: str, task: str) -> AtCoderProblem:
+    return AtCoderProblem(
+        contest=contest,
+        task=task,
+        title=task,
+        time_limit=2.0,
+        memory_limit=1024,
+        statement="",
+        test_cases=[],
+    )
+
+
+def _remote(failing: Set[Tuple[str, str]]) -> mock.MagicMock:
+    def fetch_tasks(session: requests.Session, contest: str) -> List[str]:
+        if contest == "abc999":
+            raise ParseError()
+        return ["a", "b", "c"]
+
+    def fetch_problem(
+        session: requests.Session, contest: str, task: str
+    ) -> AtCoderProblem:
+        if (contest, task) in failing:
+            raise ConnectionError()
+        return _problem(contest, task)
+
+    return mock.MagicMock(
+        fetch_tasks=mock.MagicMock(side_effect=fetch_tasks),
+        fetch_problem=mock.MagicMock(side_effect=fetch_problem),
+    )
+
+
+def test_sync_resumes(tmp_path: Path) -> None:
+    """取得できた問題は保存し、次回は残りの問題だけを取得する."""
+    archive = SqliteProblemArchiveRepositoryImpl(str(tmp_path / "archive.sqlite3"))
+    session_repo = mock.MagicMock(read=mock.MagicMock(return_value=requests.Session()))
+
+    remote = _remote(failing={("abc001", "b")})
+    sut = ArchiveInteractor(session_repo, remote, archive)
+    with pytest.raises(AtcoderAccessError):
+        sut.sync(["abc001", "abc002"], jobs=2)
+
+    assert archive.archived_tasks("abc001") == {"a", "c"}
+    assert not archive.is_synced("abc001")
+    assert archive.is_synced("abc002")
+
+    remote = _remote(failing=set())
+    sut = ArchiveInteractor(session_repo, remote, archive)
+    sut.sync(["abc001", "abc002"], jobs=2)
+
+    assert archive.is_synced("abc001")
+    assert archive.read_problem("abc001", "b") == _problem("abc001", "b")
+    remote.fetch_problem.assert_called_once_with(mock.ANY, "abc001", "b")
+    remote.fetch_tasks.assert_called_once_with(mock.ANY, "abc001")
+
+
+def test_sync_missing_contest(tmp_path: Path) -> None:
+    """問題一覧を取得できないコンテストがあっても、ほかのコンテストは保存する."""
+    archive = SqliteProblemArchiveRepositoryImpl(str(tmp_path / "archive.sqlite3"))
+    session_repo = mock.MagicMock(read=mock.MagicMock(return_value=requests.Session()))
+    sut = ArchiveInteractor(session_repo, _remote(failing=set()), archive)
+
+    with pytest.raises(AtcoderAccessError):
+        sut.sync(["abc999", "abc001"])
+
+    assert archive.is_synced("abc001")
+    assert archive.read_tasks("abc999") is None
+
+
+def test_sync_session_error() -> None:
+    """セッションを読み込めなければConfigAccessError."""
+    sut = ArchiveInteractor(
+        mock.MagicMock(read=mock.MagicMock(side_effect=ReadError())),
+        mock.MagicMock(),
+        mock.MagicMock(),
+    )
+
+    with pytest.raises(ConfigAccessError):
+        sut.sync(["abc001"])
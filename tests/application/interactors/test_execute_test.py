@@ -1,6 +1,11 @@
 """Tests for execute_test."""
 
+import json
+import time
+from pathlib import Path
+from typing import Any
 from typing import List
+from typing import Optional
 from typing import Type
 
 import mock
@@ -8,29 +13,60 @@ import pytest
 
 from atcoder_helper.application.interactors.execute_test import ControllerBuilder
 from atcoder_helper.application.interactors.execute_test import ExecuteTestInteractor
+from atcoder_helper.application.interactors.execute_test import FileWatcherBuilder
+from atcoder_helper.application.interactors.execute_test import ProfilerBuilder
+from atcoder_helper.application.interactors.execute_test import (
+    ResultReporterBuilder,
+)
+from atcoder_helper.application.interactors.execute_test import (
+    ResultReporterBuilderImpl,
+)
+from atcoder_helper.application.repositories.atcoder_helper_config_repo import (
+    ConfigRepository,
+)
 from atcoder_helper.application.repositories.errors import ReadError
 from atcoder_helper.application.repositories.local_test_case_repo import (
     LocalTestCaseRepository,
 )
+from atcoder_helper.application.repositories.result_cache_repo import (
+    ResultCacheRepository,
+)
 from atcoder_helper.application.repositories.task_config_repo import (
     TaskConfigRepository,
 )
+from atcoder_helper.application.usecases.errors import BuildFailure
 from atcoder_helper.application.usecases.errors import ConfigAccessError
+from atcoder_helper.application.usecases.errors import UndefinedLanguage
+from atcoder_helper.application.usecases.errors import UndefinedTestCase
+from atcoder_helper.entities.atcoder_helper_config import AtCoderHelperConfig
+from atcoder_helper.entities.atcoder_helper_config import LanguageConfig
+from atcoder_helper.entities.atcoder_profile import ProfileResult
 from atcoder_helper.entities.atcoder_task_config import TaskConfig
 from atcoder_helper.entities.atcoder_test_case import AtcoderTestCase
 from atcoder_helper.entities.atcoder_test_case import AtCoderTestResult
 from atcoder_helper.entities.atcoder_test_case import AtCoderTestStatus
+from atcoder_helper.entities.atcoder_test_case import CachedTestResult
 
 
 def _get_sut(
     task_config_repo_mock: TaskConfigRepository = mock.MagicMock(),
     test_case_repo_mock: LocalTestCaseRepository = mock.MagicMock(),
     controller_builder: ControllerBuilder = mock.MagicMock(),
+    file_watcher_builder: FileWatcherBuilder = mock.MagicMock(),
+    result_cache_repo_mock: ResultCacheRepository = mock.MagicMock(),
+    config_repo_mock: ConfigRepository = mock.MagicMock(),
+    profiler_builder: ProfilerBuilder = mock.MagicMock(),
+    result_reporter_builder: ResultReporterBuilder = mock.MagicMock(),
 ) -> ExecuteTestInteractor:
     return ExecuteTestInteractor(
         task_config_repo=task_config_repo_mock,
         test_case_repo=test_case_repo_mock,
+        result_cache_repo=result_cache_repo_mock,
+        config_repo=config_repo_mock,
         controller_builder=controller_builder,
+        file_watcher_builder=file_watcher_builder,
+        profiler_builder=profiler_builder,
+        result_reporter_builder=result_reporter_builder,
     )
 
 
@@ -103,6 +139,565 @@ def test_execute_test(
     else:
         sut.execute_test()
         build_mock.assert_called_once()
+        # 並列実行されるので呼び出し順は保証されない
         execute_mock.assert_has_calls(
-            [mock.call(testcase) for testcase in execute_called_with]
+            [mock.call(testcase) for testcase in execute_called_with], any_order=True
+        )
+
+
+def test_execute_test_keeps_case_order(capfd: Any) -> None:
+    """並列実行しても、結果は元のケース順で表示される."""
+
+    def execute(test_case: AtcoderTestCase) -> AtCoderTestResult:
+        # 先頭のケースほど遅く終わるようにする
+        time.sleep(0.05 * (len(_test_cases) - _test_cases.index(test_case)))
+        return AtCoderTestResult(test_case.name, AtCoderTestStatus.AC, "", "")
+
+    sut = _get_sut(
+        task_config_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(return_value=_task_config)
+        ),
+        test_case_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(return_value=_test_cases)
+        ),
+        controller_builder=mock.MagicMock(
+            build=mock.MagicMock(
+                return_value=mock.MagicMock(execute=mock.MagicMock(side_effect=execute))
+            )
+        ),
+    )
+
+    sut.execute_test(jobs=len(_test_cases))
+
+    summary = capfd.readouterr().out.split("SUMMARY:")[1]
+    positions = [summary.index(test_case.name) for test_case in _test_cases]
+    assert positions == sorted(positions)
+
+
+@pytest.mark.parametrize(
+    argnames=("time_limit", "expected_time_limit"),
+    argvalues=[[None, _task_config.time_limit], [10.0, 10.0]],
+    ids=["タスク設定の値を使う", "引数で上書きする"],
+)
+def test_execute_test_time_limit(
+    time_limit: Optional[float], expected_time_limit: float
+) -> None:
+    """実行時間制限がexecutorに渡される."""
+    controller_builder = mock.MagicMock(
+        build=mock.MagicMock(
+            return_value=mock.MagicMock(execute=mock.MagicMock(return_value=_result))
+        )
+    )
+    sut = _get_sut(
+        task_config_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(return_value=_task_config)
+        ),
+        test_case_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(return_value=_test_cases)
+        ),
+        controller_builder=controller_builder,
+    )
+
+    sut.execute_test(time_limit=time_limit)
+
+    controller_builder.build.assert_called_once_with(
+        _task_config.build,
+        _task_config.run,
+        time_limit=expected_time_limit,
+        memory_limit=_task_config.memory_limit,
+        output_limit=_task_config.output_limit,
+        fork_server=_task_config.fork_server,
+        preload_modules=_task_config.preload_modules,
+        checker=_task_config.checker,
+        limit_address_space=_task_config.limit_address_space,
+    )
+
+
+def test_execute_test_stops_on_build_failure() -> None:
+    """ビルドに失敗したらテストを実行せずにエラーにする."""
+    execute_mock = mock.MagicMock(return_value=_result)
+    sut = _get_sut(
+        task_config_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(return_value=_task_config)
+        ),
+        test_case_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(return_value=_test_cases)
+        ),
+        controller_builder=mock.MagicMock(
+            build=mock.MagicMock(
+                return_value=mock.MagicMock(
+                    build=mock.MagicMock(return_value=False), execute=execute_mock
+                )
+            )
+        ),
+    )
+
+    with pytest.raises(BuildFailure):
+        sut.execute_test()
+    execute_mock.assert_not_called()
+
+
+def _get_benchmark_sut(execute_mock: mock.MagicMock) -> ExecuteTestInteractor:
+    return _get_sut(
+        task_config_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(return_value=_task_config)
+        ),
+        test_case_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(return_value=_test_cases[:1])
+        ),
+        controller_builder=mock.MagicMock(
+            build=mock.MagicMock(return_value=mock.MagicMock(execute=execute_mock))
+        ),
+    )
+
+
+def _get_cached_sut(
+    execute_mock: mock.MagicMock, result_cache_repo_mock: mock.MagicMock
+) -> ExecuteTestInteractor:
+    controller = mock.MagicMock(
+        execute=execute_mock,
+        cache_key=mock.MagicMock(side_effect=lambda case: f"key_{case.given}"),
+    )
+    return _get_sut(
+        task_config_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(return_value=_task_config)
+        ),
+        test_case_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(return_value=_test_cases)
+        ),
+        controller_builder=mock.MagicMock(
+            build=mock.MagicMock(return_value=controller)
+        ),
+        result_cache_repo_mock=result_cache_repo_mock,
+    )
+
+
+def _cached(name: str, key: str, status: AtCoderTestStatus) -> CachedTestResult:
+    expected = "expected" if status == AtCoderTestStatus.WA else None
+    return CachedTestResult(key, AtCoderTestResult(name, status, "", "", expected))
+
+
+_previous_results = [
+    _cached("test_a", "key_foo_a", AtCoderTestStatus.AC),
+    _cached("test_b", "key_old", AtCoderTestStatus.AC),  # 入力が変わった
+    _cached("test_c", "key_foo_c", AtCoderTestStatus.WA),
+]
+
+
+@pytest.mark.parametrize(
+    argnames=("changed_only", "failed_only", "shown", "executed"),
+    argvalues=[
+        [False, False, ["test_a", "test_b", "test_c"], ["test_b"]],
+        [True, False, ["test_b"], ["test_b"]],
+        [False, True, ["test_c"], []],
+        [True, True, ["test_b", "test_c"], ["test_b"]],
+    ],
+    ids=["すべて", "--changed-only", "--failed-only", "両方"],
+)
+def test_execute_test_reuses_cached_results(
+    changed_only: bool,
+    failed_only: bool,
+    shown: List[str],
+    executed: List[str],
+    capfd: Any,
+) -> None:
+    """前回から変わっていないケースは実行せず、前回の結果を再利用する."""
+    execute_mock = mock.MagicMock(
+        side_effect=lambda case: AtCoderTestResult(
+            case.name, AtCoderTestStatus.AC, "", ""
+        )
+    )
+    result_cache_repo_mock = mock.MagicMock(
+        read=mock.MagicMock(return_value=_previous_results)
+    )
+    sut = _get_cached_sut(execute_mock, result_cache_repo_mock)
+
+    sut.execute_test(changed_only=changed_only, failed_only=failed_only)
+
+    assert [call.args[0].name for call in execute_mock.call_args_list] == executed
+    summary = capfd.readouterr().out.split("SUMMARY:")[1]
+    assert [name for name in ["test_a", "test_b", "test_c"] if name in summary] == (
+        shown
+    )
+    if "test_a" in shown:
+        assert "cached" in summary
+
+    # 実行しなかったケースは前回の記録が残る
+    [written] = result_cache_repo_mock.write.call_args.args
+    assert {cached.result.name: cached.key for cached in written} == {
+        "test_a": "key_foo_a",
+        "test_b": "key_foo_b" if "test_b" in executed else "key_old",
+        "test_c": "key_foo_c",
+    }
+
+
+def test_execute_test_does_not_reuse_tle() -> None:
+    """TLE は実行ごとにぶれうるので、再利用できるようには記録しない."""
+    execute_mock = mock.MagicMock(
+        side_effect=lambda case: AtCoderTestResult(
+            case.name, AtCoderTestStatus.TLE, "", ""
         )
+    )
+    result_cache_repo_mock = mock.MagicMock(
+        read=mock.MagicMock(side_effect=ReadError())
+    )
+    sut = _get_cached_sut(execute_mock, result_cache_repo_mock)
+
+    sut.execute_test()
+
+    assert execute_mock.call_count == len(_test_cases)
+    [written] = result_cache_repo_mock.write.call_args.args
+    assert [cached.key for cached in written] == [None] * len(_test_cases)
+
+
+def test_execute_test_reports_to_stdout(capfd: Any) -> None:
+    """標準出力に書き出すときは、ケースごとに渡して色付きの表示はしない."""
+    reporter = mock.MagicMock()
+    result_reporter_builder = mock.MagicMock(
+        build=mock.MagicMock(return_value=reporter)
+    )
+    sut = _get_sut(
+        task_config_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(
+                return_value=TaskConfig(
+                    contest="abc300", task="a", build=["foo"], run=["bar"]
+                )
+            )
+        ),
+        test_case_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(return_value=_test_cases)
+        ),
+        controller_builder=mock.MagicMock(
+            build=mock.MagicMock(
+                return_value=mock.MagicMock(
+                    execute=mock.MagicMock(
+                        side_effect=lambda case: AtCoderTestResult(
+                            case.name, AtCoderTestStatus.AC, "", ""
+                        )
+                    ),
+                    cache_key=mock.MagicMock(return_value=None),
+                )
+            )
+        ),
+        result_cache_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(side_effect=ReadError())
+        ),
+        result_reporter_builder=result_reporter_builder,
+    )
+
+    sut.execute_test(output_format="json")
+
+    result_reporter_builder.build.assert_called_once_with("json", None, "abc300_a")
+    reported = [call.args[0].name for call in reporter.report.call_args_list]
+    assert sorted(reported) == ["test_a", "test_b", "test_c"]
+    reporter.close.assert_called_once()
+    assert capfd.readouterr().out == ""
+
+
+def test_execute_test_builds_to_stderr_when_reporting_to_stdout(capfd: Any) -> None:
+    """標準出力に書き出すときは、ビルドのメッセージを標準エラー出力に回す."""
+    sut = _get_sut(
+        task_config_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(return_value=_task_config)
+        ),
+        test_case_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(return_value=_test_cases)
+        ),
+        controller_builder=mock.MagicMock(
+            build=mock.MagicMock(
+                return_value=mock.MagicMock(
+                    build=mock.MagicMock(side_effect=lambda: print("compiled") or True),
+                    execute=mock.MagicMock(return_value=_result),
+                    cache_key=mock.MagicMock(return_value=None),
+                )
+            )
+        ),
+        result_cache_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(side_effect=ReadError())
+        ),
+    )
+
+    sut.execute_test(output_format="junit")
+
+    out, err = capfd.readouterr()
+    assert out == ""
+    assert "compiled" in err
+
+
+def test_execute_test_report_file(tmp_path: Path, capfd: Any) -> None:
+    """ファイルに書き出すときは、いつもの表示もする."""
+    output_file = tmp_path / "results.jsonl"
+    sut = _get_sut(
+        task_config_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(return_value=_task_config)
+        ),
+        test_case_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(return_value=_test_cases[:1])
+        ),
+        controller_builder=mock.MagicMock(
+            build=mock.MagicMock(
+                return_value=mock.MagicMock(
+                    execute=mock.MagicMock(
+                        return_value=AtCoderTestResult(
+                            "test_a", AtCoderTestStatus.WA, "bar", "", "bar_a"
+                        )
+                    ),
+                    cache_key=mock.MagicMock(return_value=None),
+                )
+            )
+        ),
+        result_cache_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(side_effect=ReadError())
+        ),
+        result_reporter_builder=ResultReporterBuilderImpl(),
+    )
+
+    sut.execute_test(output_format="json", output_file=str(output_file))
+
+    case, summary = [json.loads(line) for line in output_file.read_text().splitlines()]
+    assert case["name"] == "test_a"
+    assert case["status"] == "WA"
+    assert summary["statuses"] == {"WA": 1}
+    assert "SUMMARY:" in capfd.readouterr().out
+
+
+def test_watch_test_runs_failing_cases_first() -> None:
+    """変更のたびに再実行し、前回失敗したケースから実行する."""
+    executed: List[str] = []
+
+    def execute(test_case: AtcoderTestCase) -> AtCoderTestResult:
+        executed.append(test_case.name)
+        status = (
+            AtCoderTestStatus.WA if test_case.name == "test_b" else AtCoderTestStatus.AC
+        )
+        return AtCoderTestResult(test_case.name, status, "", "", test_case.expected)
+
+    controller = mock.MagicMock(
+        build=mock.MagicMock(return_value=True),
+        execute=mock.MagicMock(side_effect=execute),
+    )
+    controller_builder = mock.MagicMock(build=mock.MagicMock(return_value=controller))
+    watcher = mock.MagicMock(
+        wait=mock.MagicMock(side_effect=[{"main.py"}, KeyboardInterrupt()])
+    )
+    sut = _get_sut(
+        task_config_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(return_value=_task_config)
+        ),
+        test_case_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(return_value=_test_cases)
+        ),
+        controller_builder=controller_builder,
+        file_watcher_builder=mock.MagicMock(
+            build=mock.MagicMock(return_value=watcher)
+        ),
+    )
+
+    with pytest.raises(KeyboardInterrupt):
+        sut.watch_test(jobs=1)
+
+    assert executed == ["test_a", "test_b", "test_c", "test_b", "test_a", "test_c"]
+    # 設定が変わらなければ、エグゼキューターは作り直さない
+    controller_builder.build.assert_called_once()
+    assert controller.build.call_count == 2
+    watcher.close.assert_called_once()
+
+
+def test_watch_test_keeps_watching_on_build_failure() -> None:
+    """ビルドに失敗してもテストは実行せず、次の変更を待つ."""
+    controller = mock.MagicMock(build=mock.MagicMock(side_effect=[False, True]))
+    controller.execute.return_value = _result
+    watcher = mock.MagicMock(
+        wait=mock.MagicMock(side_effect=[{"main.py"}, KeyboardInterrupt()])
+    )
+    sut = _get_sut(
+        task_config_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(return_value=_task_config)
+        ),
+        test_case_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(return_value=_test_cases)
+        ),
+        controller_builder=mock.MagicMock(
+            build=mock.MagicMock(return_value=controller)
+        ),
+        file_watcher_builder=mock.MagicMock(
+            build=mock.MagicMock(return_value=watcher)
+        ),
+    )
+
+    with pytest.raises(KeyboardInterrupt):
+        sut.watch_test(jobs=1)
+
+    assert controller.execute.call_count == len(_test_cases)
+    assert watcher.discard.call_count == 2
+
+
+def _timed_result(status: AtCoderTestStatus, wall_time: float) -> AtCoderTestResult:
+    return AtCoderTestResult(
+        "test_a", status, "", "", wall_time=wall_time, cpu_time=wall_time / 2
+    )
+
+
+def _helper_config() -> AtCoderHelperConfig:
+    languages = {
+        name: LanguageConfig(
+            name=name,
+            template_dir=None,
+            use_default_template=None,
+            build=[f"build-{name}"],
+            run=[f"run-{name}"],
+        )
+        for name in ["fast", "slow"]
+    }
+    return AtCoderHelperConfig(languages=languages, default_language="fast")
+
+
+def test_race_languages(tmp_path: Path, monkeypatch: Any, capfd: Any) -> None:
+    """言語ごとの作業ディレクトリでビルドし、ビルドに失敗した言語は CE と表示する."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "main.py").write_text("print(1)")
+
+    fast = mock.MagicMock(
+        build=mock.MagicMock(return_value=True),
+        execute=mock.MagicMock(
+            side_effect=lambda case: AtCoderTestResult(
+                case.name, AtCoderTestStatus.AC, "", "", cpu_time=0.5
+            )
+        ),
+    )
+    slow = mock.MagicMock(build=mock.MagicMock(return_value=False))
+    controllers = {"build-fast": fast, "build-slow": slow}
+    builder = mock.MagicMock(
+        build=mock.MagicMock(side_effect=lambda build, *_, **__: controllers[build[0]])
+    )
+    sut = _get_sut(
+        task_config_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(return_value=_task_config)
+        ),
+        test_case_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(return_value=_test_cases)
+        ),
+        controller_builder=builder,
+        config_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(return_value=_helper_config())
+        ),
+    )
+
+    sut.race_languages(["fast", "slow", "fast"], jobs=2)
+
+    assert builder.build.call_count == 2
+    for call in builder.build.call_args_list:
+        workspace = Path(call.kwargs["task_dir"])
+        assert (workspace / "main.py").read_text() == "print(1)"
+    assert fast.execute.call_count == len(_test_cases)
+    slow.execute.assert_not_called()
+
+    out, _ = capfd.readouterr()
+    race = out.partition("RACE")[2]
+    assert "CE" in race
+    assert "3/3" in race
+    assert "1.500" in race
+
+
+def test_race_languages_undefined_language() -> None:
+    """設定にない言語を指定したらエラー."""
+    sut = _get_sut(
+        config_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(return_value=_helper_config())
+        ),
+    )
+
+    with pytest.raises(UndefinedLanguage):
+        sut.race_languages(["fast", "unknown"])
+
+
+def test_profile_test(tmp_path: Path, capfd: Any) -> None:
+    """指定したケースだけを計り、折りたたんだスタックを書き出して上位の関数を表示する."""
+    profile = ProfileResult(
+        "cprofile", "us", {"<module>;solve": 30, "<module>;solve;dfs": 70}
+    )
+    executor = mock.MagicMock(
+        build=mock.MagicMock(return_value=True),
+        profile=mock.MagicMock(return_value=(_result, profile)),
+    )
+    profiler_builder = mock.MagicMock(build=mock.MagicMock(return_value=executor))
+    sut = _get_sut(
+        task_config_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(return_value=_task_config)
+        ),
+        test_case_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(return_value=_test_cases)
+        ),
+        profiler_builder=profiler_builder,
+    )
+    output_file = tmp_path / "profile.folded"
+
+    sut.profile_test("test_b", profiler="sampling", output_file=str(output_file))
+
+    executor.profile.assert_called_once_with(_test_cases[1])
+    assert profiler_builder.build.call_args.kwargs["profiler"] == "sampling"
+    # 時間制限を指定しなければ、プロファイラで遅くなる分だけ緩める
+    assert profiler_builder.build.call_args.kwargs["time_limit"] == 20.0
+    assert output_file.read_text() == "<module>;solve 30\n<module>;solve;dfs 70\n"
+    out, _ = capfd.readouterr()
+    assert "  70.0  dfs" in out
+
+
+def test_profile_test_undefined_case() -> None:
+    """testcases.yaml にないケースを指定したらエラー."""
+    sut = _get_sut(
+        task_config_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(return_value=_task_config)
+        ),
+        test_case_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(return_value=_test_cases)
+        ),
+    )
+
+    with pytest.raises(UndefinedTestCase):
+        sut.profile_test("test_z")
+
+
+def test_benchmark_test(tmp_path: Path) -> None:
+    """ウォームアップを除いた repeat 回の統計をJSONに書き出す."""
+    wall_times = [9.0, 1.0, 2.0, 3.0, 4.0, 5.0]  # 先頭はウォームアップ
+    execute_mock = mock.MagicMock(
+        side_effect=[_timed_result(AtCoderTestStatus.AC, t) for t in wall_times]
+    )
+    sut = _get_benchmark_sut(execute_mock)
+    json_file = tmp_path / "bench.json"
+
+    sut.benchmark_test(warmup=1, repeat=5, json_file=str(json_file))
+
+    assert execute_mock.call_count == 6
+    [result] = json.loads(json_file.read_text())
+    assert result["name"] == "test_a"
+    assert result["status"] == "AC"
+    assert result["runs"] == 5
+    assert result["wall"] == {"min": 1.0, "median": 3.0, "p95": 4.8}
+    assert result["cpu"]["median"] == 1.5
+
+
+def test_benchmark_test_stops_when_precise_enough() -> None:
+    """信頼区間が十分狭くなったら、repeat 回に達する前に打ち切る."""
+    execute_mock = mock.MagicMock(
+        return_value=_timed_result(AtCoderTestStatus.AC, 1.0)
+    )
+    sut = _get_benchmark_sut(execute_mock)
+
+    sut.benchmark_test(warmup=0, repeat=100, precision=0.01)
+
+    assert execute_mock.call_count == 5
+
+
+def test_benchmark_test_stops_on_failure(capfd: Any) -> None:
+    """正しく動かない解答はそれ以上計測しない."""
+    execute_mock = mock.MagicMock(
+        return_value=_timed_result(AtCoderTestStatus.WA, 1.0)
+    )
+    sut = _get_benchmark_sut(execute_mock)
+
+    sut.benchmark_test(warmup=1, repeat=10)
+
+    assert execute_mock.call_count == 1
+    assert "WA" in capfd.readouterr().out
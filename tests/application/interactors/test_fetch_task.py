@@ -1,5 +1,7 @@
 """Tests for fetch_task."""
 
+from datetime import datetime
+from datetime import timezone
 from typing import List
 from typing import Optional
 from typing import Type
@@ -8,7 +10,9 @@ from unittest.mock import ANY
 import mock
 import pytest
 import requests
+from pytest import MonkeyPatch
 
+from atcoder_helper.application.interactors import fetch_task
 from atcoder_helper.application.interactors.fetch_task import FetchTaskInteractor
 from atcoder_helper.application.repositories.errors import ConnectionError
 from atcoder_helper.application.repositories.errors import ParseError
@@ -16,6 +20,8 @@ from atcoder_helper.application.repositories.errors import ReadError
 from atcoder_helper.application.repositories.errors import WriteError
 from atcoder_helper.application.usecases.errors import AtcoderAccessError
 from atcoder_helper.application.usecases.errors import ConfigAccessError
+from atcoder_helper.entities.atcoder_helper_config import AtCoderHelperConfig
+from atcoder_helper.entities.atcoder_helper_config import LanguageConfig
 from atcoder_helper.entities.atcoder_task_config import TaskConfig
 from atcoder_helper.entities.atcoder_test_case import AtcoderTestCase
 
@@ -40,12 +46,20 @@ def _get_sut(
     test_case_repo_mock: mock.MagicMock,
     session_repo_mock: mock.MagicMock,
     atcoder_testcase_repo_mock: mock.MagicMock,
+    repo_factory_mock: mock.MagicMock = mock.MagicMock(),
+    config_repo_mock: mock.MagicMock = mock.MagicMock(),
+    contest_repo_mock: mock.MagicMock = mock.MagicMock(),
+    controller_builder_mock: mock.MagicMock = mock.MagicMock(),
 ) -> FetchTaskInteractor:
     return FetchTaskInteractor(
         task_config_repo=task_config_repo_mock,
         test_case_repo=test_case_repo_mock,
         session_repo=session_repo_mock,
         atcoder_testcase_repo=atcoder_testcase_repo_mock,
+        repo_factory=repo_factory_mock,
+        config_repo=config_repo_mock,
+        contest_repo=contest_repo_mock,
+        controller_builder=controller_builder_mock,
     )
 
 
@@ -257,3 +271,182 @@ def test_fetch_task(
         atcoder_testcase_repo_mock.fetch_test_cases.assert_called_with(
             session=ANY, contest=fetched_contest, task=fetched_task
         )
+
+
+def _get_contest_sut(
+    fetch_contest_test_cases: mock.MagicMock,
+    repo_factory_mock: mock.MagicMock,
+    fetch_tasks: mock.MagicMock = mock.MagicMock(return_value=["a", "b"]),
+    contest_repo_mock: mock.MagicMock = mock.MagicMock(),
+    controller_builder_mock: mock.MagicMock = mock.MagicMock(),
+) -> FetchTaskInteractor:
+    return _get_sut(
+        mock.MagicMock(read=mock.MagicMock(return_value=_default_task_config())),
+        mock.MagicMock(),
+        mock.MagicMock(read=mock.MagicMock(return_value=requests.Session())),
+        mock.MagicMock(
+            fetch_tasks=fetch_tasks,
+            fetch_contest_test_cases=fetch_contest_test_cases,
+        ),
+        repo_factory_mock=repo_factory_mock,
+        contest_repo_mock=contest_repo_mock,
+        controller_builder_mock=controller_builder_mock,
+        config_repo_mock=mock.MagicMock(
+            read=mock.MagicMock(
+                return_value=AtCoderHelperConfig(
+                    languages={
+                        "fooLang": LanguageConfig(
+                            name="fooLang",
+                            template_dir=None,
+                            use_default_template=None,
+                            build=["make"],
+                            run=["./main"],
+                        )
+                    },
+                    default_language="fooLang",
+                )
+            )
+        ),
+    )
+
+
+def test_fetch_contest() -> None:
+    """すべてのタスクをまとめて取得し、ないタスクディレクトリは初期化する."""
+    fetch_contest_test_cases = mock.MagicMock(
+        return_value={
+            "a": _default_atcoder_testcases(),
+            "b": _default_atcoder_testcases(),
+        }
+    )
+    repo_factory_mock = mock.MagicMock(
+        find_task_dirs=mock.MagicMock(return_value=["abc300/a"])
+    )
+    sut = _get_contest_sut(fetch_contest_test_cases, repo_factory_mock)
+
+    sut.fetch_contest("abc300")
+
+    fetch_contest_test_cases.assert_called_once_with(ANY, "abc300", ["a", "b"], 2)
+    repo_factory_mock.task_config_repo.assert_called_once_with("abc300/b")
+    written = repo_factory_mock.task_config_repo.return_value.write.call_args
+    assert written.args[0].contest == "abc300"
+    assert written.args[0].task == "b"
+    assert written.args[0].build == ["make"]
+    assert [call.args for call in repo_factory_mock.test_case_repo.call_args_list] == [
+        ("abc300/a",),
+        ("abc300/b",),
+    ]
+
+
+def test_fetch_contest_partial_failure(capsys: pytest.CaptureFixture[str]) -> None:
+    """取得に失敗したタスクがあっても、取得できたタスクは書き込む."""
+    repo_factory_mock = mock.MagicMock(
+        find_task_dirs=mock.MagicMock(return_value=["abc300/a", "abc300/b"])
+    )
+    error = ConnectionError("cannot GET https://atcoder.jp/contests/abc300/tasks/a")
+    error.__cause__ = requests.ReadTimeout("read timed out")
+    sut = _get_contest_sut(
+        mock.MagicMock(return_value={"a": error, "b": _default_atcoder_testcases()}),
+        repo_factory_mock,
+    )
+
+    with pytest.raises(AtcoderAccessError):
+        sut.fetch_contest("abc300", jobs=1)
+
+    # どのタスクがなぜ失敗したかを表示する
+    assert (
+        "a: テストケースの取得に失敗しました: cannot GET "
+        "https://atcoder.jp/contests/abc300/tasks/a (ReadTimeout: read timed out)"
+    ) in capsys.readouterr().out
+
+    repo_factory_mock.test_case_repo.assert_called_once_with("abc300/b")
+    repo_factory_mock.test_case_repo.return_value.write.assert_called_once_with(
+        _default_atcoder_testcases()
+    )
+
+
+class _FakeTime:
+    """sleep すると進む時計."""
+
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def test_prepare_contest(monkeypatch: MonkeyPatch) -> None:
+    """開始前にタスクディレクトリを作ってビルドし、接続を開いてから開始時に取得する."""
+    start = datetime(2023, 4, 29, 12, 0, tzinfo=timezone.utc)
+    clock = _FakeTime(start.timestamp() - 600)
+    monkeypatch.setattr(fetch_task, "time", clock)
+
+    events: List[str] = []
+
+    def record(event: str, result: object) -> mock.MagicMock:
+        def side_effect(*args: object, **kwargs: object) -> object:
+            events.append(f"{event}@{clock.now - start.timestamp():.0f}")
+            return result
+
+        return mock.MagicMock(side_effect=side_effect)
+
+    contest_repo_mock = mock.MagicMock(
+        fetch_start_time=mock.MagicMock(return_value=start),
+        warm_up=record("warm_up", 3),
+    )
+    controller_builder_mock = mock.MagicMock()
+    controller_builder_mock.build.return_value.build = record("build", True)
+    # 開始直後は、まだ問題一覧が見えない
+    fetch_tasks = mock.MagicMock(side_effect=[ParseError(), ["a", "b"]])
+    fetch_contest_test_cases = mock.MagicMock(
+        return_value={
+            "a": _default_atcoder_testcases(),
+            "b": _default_atcoder_testcases(),
+        }
+    )
+    repo_factory_mock = mock.MagicMock(
+        find_task_dirs=mock.MagicMock(return_value=["abc300/a"])
+    )
+    sut = _get_contest_sut(
+        fetch_contest_test_cases,
+        repo_factory_mock,
+        fetch_tasks=fetch_tasks,
+        contest_repo_mock=contest_repo_mock,
+        controller_builder_mock=controller_builder_mock,
+    )
+
+    sut.prepare_contest("abc300", tasks=["a", "b", "c"], warm_up=5.0)
+
+    assert events == ["build@-600", "build@-600", "warm_up@-5"]
+    assert [
+        call.kwargs["task_dir"] for call in controller_builder_mock.build.call_args_list
+    ] == ["abc300/b", "abc300/c"]
+    contest_repo_mock.warm_up.assert_called_once_with(ANY, "abc300", 3)
+    # 開始前の問題一覧がキャッシュに残っていても使わない
+    assert fetch_tasks.call_args_list == [
+        mock.call(ANY, "abc300", use_cache=False)
+    ] * 2
+    fetch_contest_test_cases.assert_called_once_with(ANY, "abc300", ["a", "b"], 3)
+    assert clock.now >= start.timestamp()
+
+
+def test_prepare_contest_already_started(monkeypatch: MonkeyPatch) -> None:
+    """既に始まっていれば、用意せずにすぐ取得する."""
+    start = datetime(2023, 4, 29, 12, 0, tzinfo=timezone.utc)
+    monkeypatch.setattr(fetch_task, "time", _FakeTime(start.timestamp() + 1))
+    contest_repo_mock = mock.MagicMock(
+        fetch_start_time=mock.MagicMock(return_value=start)
+    )
+    fetch_contest_test_cases = mock.MagicMock(return_value={})
+    repo_factory_mock = mock.MagicMock()
+    sut = _get_contest_sut(
+        fetch_contest_test_cases, repo_factory_mock, contest_repo_mock=contest_repo_mock
+    )
+
+    with pytest.raises(AtcoderAccessError):
+        sut.prepare_contest("abc300")
+
+    contest_repo_mock.warm_up.assert_not_called()
+    fetch_contest_test_cases.assert_called_once_with(ANY, "abc300", ["a", "b"], 2)
@@ -1,6 +1,7 @@
 """Tests for init_task."""
 
 
+from typing import Optional
 from typing import Type
 
 import mock
@@ -15,6 +16,7 @@ from atcoder_helper.application.repositories.errors import WriteError
 from atcoder_helper.application.usecases.errors import ConfigAccessError
 from atcoder_helper.entities.atcoder_helper_config import AtCoderHelperConfig
 from atcoder_helper.entities.atcoder_helper_config import LanguageConfig
+from atcoder_helper.entities.atcoder_test_case import AtcoderTestCase
 
 
 def _get_config() -> AtCoderHelperConfig:
@@ -25,11 +27,23 @@ def _get_config() -> AtCoderHelperConfig:
 
 
 def _get_sut(
-    atcoder_helper_repo_mock: mock.MagicMock, task_config_repo_mock: mock.MagicMock
+    atcoder_helper_repo_mock: mock.MagicMock,
+    task_config_repo_mock: mock.MagicMock,
+    atcoder_testcase_repo_mock: Optional[mock.MagicMock] = None,
+    repo_factory_mock: Optional[mock.MagicMock] = None,
 ) -> InitTaskDirInteractor:
+    # 既定のモックはテストごとに作り、呼び出し履歴を持ち越さない
+    if atcoder_testcase_repo_mock is None:
+        atcoder_testcase_repo_mock = mock.MagicMock(
+            cached_test_cases=mock.MagicMock(return_value=None)
+        )
+    if repo_factory_mock is None:
+        repo_factory_mock = mock.MagicMock()
     return InitTaskDirInteractor(
         atcoder_helper_config_repo=atcoder_helper_repo_mock,
         task_config_repo=task_config_repo_mock,
+        atcoder_testcase_repo=atcoder_testcase_repo_mock,
+        repo_factory=repo_factory_mock,
     )
 
 
@@ -82,10 +96,33 @@ def test_init_task(
     contest = "fooContest"
     task = "fooTask"
 
-    sut = InitTaskDirInteractor(atcoder_helper_config_repo_mock, task_config_repo_mock)
+    sut = _get_sut(atcoder_helper_config_repo_mock, task_config_repo_mock)
 
     if exception:
         with pytest.raises(exception):
             sut.init_task(dir, contest, task)
     else:
         sut.init_task(dir, contest, task)
+
+
+def test_init_task_writes_cached_test_cases() -> None:
+    """以前に取得した問題なら、キャッシュからテストケースも書き込む."""
+    test_cases = [AtcoderTestCase(name="case-1", given="1", expected="2")]
+    atcoder_testcase_repo_mock = mock.MagicMock(
+        cached_test_cases=mock.MagicMock(return_value=test_cases)
+    )
+    repo_factory_mock = mock.MagicMock()
+    sut = _get_sut(
+        mock.MagicMock(read=mock.MagicMock(return_value=_get_config())),
+        mock.MagicMock(),
+        atcoder_testcase_repo_mock,
+        repo_factory_mock,
+    )
+
+    sut.init_task("abc300/a", "abc300", "a")
+
+    atcoder_testcase_repo_mock.cached_test_cases.assert_called_once_with("abc300", "a")
+    repo_factory_mock.test_case_repo.assert_called_once_with("abc300/a")
+    repo_factory_mock.test_case_repo.return_value.write.assert_called_once_with(
+        test_cases
+    )
@@ -0,0 +1,51 @@
+"""Tests for minimizer."""
+
+from typing import Optional
+
+import pytest
+
+from atcoder_helper.application.interactors.minimizer import minimize
+
+
+def _has_large_value(given: str) -> bool:
+    """100以上の値が含まれていると誤る解答."""
+    return any(int(token) >= 100 for token in given.split())
+
+
+@pytest.mark.parametrize(argnames="jobs", argvalues=[1, 4])
+def test_minimize_lines_and_values(jobs: int) -> None:
+    """形式を知らなくても、行を削り、値を半分ずつ小さくする."""
+    given = "".join(f"{value}\n" for value in [3, 150, 7, 999, 42, 5])
+
+    assert minimize(given, _has_large_value, jobs=jobs, time_budget=10) == "124\n"
+
+
+@pytest.mark.parametrize(
+    argnames=("format_hint", "expected"),
+    argvalues=[[None, "3\n0 100 0\n"], ["n-list", "1\n100\n"]],
+    ids=["ヒントなし", "ヒントあり"],
+)
+def test_minimize_counted_list(format_hint: Optional[str], expected: str) -> None:
+    """N に続いて N 個の数が並ぶ形式なら、N を保ったまま要素を削れる."""
+
+    def is_failing(given: str) -> bool:
+        tokens = given.split()
+        # 形式が壊れた入力では誤りは再現しない
+        if int(tokens[0]) != len(tokens) - 1:
+            return False
+        return _has_large_value(" ".join(tokens[1:]))
+
+    given = "3\n5 200 17\n"
+
+    minimized = minimize(
+        given, is_failing, jobs=2, time_budget=10, format_hint=format_hint
+    )
+
+    assert minimized == expected
+
+
+def test_minimize_respects_time_budget() -> None:
+    """時間切れなら、その時点の入力を返す."""
+    given = "1\n2\n3\n"
+
+    assert minimize(given, lambda _: True, jobs=1, time_budget=0) == given
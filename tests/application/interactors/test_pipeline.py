@@ -0,0 +1,170 @@
+"""Tests for pipeline."""
+
+import threading
+import time
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+import mock
+import pytest
+
+from atcoder_helper.application.interactors.pipeline import PipelineInteractor
+from atcoder_helper.application.repositories.errors import ConnectionError
+from atcoder_helper.application.usecases.errors import ConfigAccessError
+from atcoder_helper.entities.atcoder_task_config import TaskConfig
+from atcoder_helper.entities.atcoder_test_case import AtcoderTestCase
+from atcoder_helper.entities.atcoder_test_case import AtCoderTestResult
+from atcoder_helper.entities.atcoder_test_case import AtCoderTestStatus
+
+_test_cases = [
+    AtcoderTestCase(name="case-1", given="1", expected="1"),
+    AtcoderTestCase(name="case-2", given="2", expected="2"),
+]
+
+
+def _accept(test_case: AtcoderTestCase) -> AtCoderTestResult:
+    return AtCoderTestResult(test_case.name, AtCoderTestStatus.AC, "", "")
+
+
+def _controller_builder(
+    execute: Any = _accept, build: Any = lambda task_dir: True
+) -> mock.MagicMock:
+    """タスクディレクトリごとにエグゼキューターを作る. build には task_dir が渡される."""
+
+    def create(*_: Any, task_dir: str, **__: Any) -> mock.MagicMock:
+        return mock.MagicMock(
+            build=mock.MagicMock(side_effect=lambda: build(task_dir)),
+            execute=mock.MagicMock(side_effect=execute),
+        )
+
+    return mock.MagicMock(build=mock.MagicMock(side_effect=create))
+
+
+def _get_sut(
+    controller_builder: mock.MagicMock,
+    atcoder_testcase_repo: Optional[mock.MagicMock] = None,
+    test_case_repos: Optional[Dict[str, mock.MagicMock]] = None,
+    task_dirs: Optional[List[str]] = None,
+) -> PipelineInteractor:
+    test_case_repos = {} if test_case_repos is None else test_case_repos
+
+    def task_config_repo(task_dir: str) -> mock.MagicMock:
+        config = TaskConfig(contest="abc300", task=task_dir, build=["b"], run=["r"])
+        return mock.MagicMock(read=mock.MagicMock(return_value=config))
+
+    def test_case_repo(task_dir: str) -> mock.MagicMock:
+        return test_case_repos.setdefault(
+            task_dir, mock.MagicMock(read=mock.MagicMock(return_value=_test_cases))
+        )
+
+    return PipelineInteractor(
+        repo_factory=mock.MagicMock(
+            find_task_dirs=mock.MagicMock(
+                return_value=["a", "b"] if task_dirs is None else task_dirs
+            ),
+            task_config_repo=mock.MagicMock(side_effect=task_config_repo),
+            test_case_repo=mock.MagicMock(side_effect=test_case_repo),
+        ),
+        session_repo=mock.MagicMock(),
+        atcoder_testcase_repo=atcoder_testcase_repo or mock.MagicMock(),
+        controller_builder=controller_builder,
+    )
+
+
+def test_run_tasks_fetches_while_building() -> None:
+    """テストケースの取得とビルドを同時に進め、取得したケースで実行する."""
+    fetch_started = threading.Event()
+    build_started = threading.Event()
+    overlapped: List[bool] = []
+
+    def fetch_test_cases(**_: Any) -> List[AtcoderTestCase]:
+        fetch_started.set()
+        overlapped.append(build_started.wait(timeout=5))
+        return _test_cases
+
+    def build(task_dir: str) -> bool:
+        build_started.set()
+        overlapped.append(fetch_started.wait(timeout=5))
+        return True
+
+    test_case_repos: Dict[str, mock.MagicMock] = {}
+    sut = _get_sut(
+        _controller_builder(build=build),
+        atcoder_testcase_repo=mock.MagicMock(
+            fetch_test_cases=mock.MagicMock(side_effect=fetch_test_cases)
+        ),
+        test_case_repos=test_case_repos,
+        task_dirs=["a"],
+    )
+
+    assert sut.run_tasks(fetch=True)
+
+    assert overlapped == [True, True]
+    test_case_repos["a"].write.assert_called_once_with(_test_cases)
+
+
+def test_run_tasks_limits_concurrent_runs() -> None:
+    """すべてのタスクを通して、同時に実行するケース数は run_jobs までになる."""
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    def execute(test_case: AtcoderTestCase) -> AtCoderTestResult:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+        return _accept(test_case)
+
+    controller_builder = _controller_builder(execute=execute)
+    sut = _get_sut(controller_builder)
+
+    assert sut.run_tasks(run_jobs=2)
+
+    assert peak == 2
+    built = controller_builder.build.mock_calls
+    assert sorted(call.kwargs["task_dir"] for call in built) == ["a", "b"]
+
+
+@pytest.mark.parametrize(
+    argnames=("build", "fetch_side_effect"),
+    argvalues=[
+        [lambda task_dir: task_dir != "b", None],
+        [lambda task_dir: True, ConnectionError()],
+    ],
+    ids=["ビルド失敗", "取得失敗"],
+)
+def test_run_tasks_reports_failure(build: Any, fetch_side_effect: Any) -> None:
+    """失敗したタスクがあっても、ほかのタスクは最後まで進める."""
+    executed: List[str] = []
+
+    def execute(test_case: AtcoderTestCase) -> AtCoderTestResult:
+        executed.append(test_case.name)
+        return _accept(test_case)
+
+    sut = _get_sut(
+        _controller_builder(execute=execute, build=build),
+        atcoder_testcase_repo=mock.MagicMock(
+            fetch_test_cases=mock.MagicMock(
+                return_value=_test_cases, side_effect=fetch_side_effect
+            )
+        ),
+    )
+
+    assert not sut.run_tasks(fetch=True)
+    # ビルドに失敗したタスク以外は実行する. 取得に失敗したら手元のケースで実行する
+    expected_runs = 2 if fetch_side_effect is None else 4
+    assert len(executed) == expected_runs
+
+
+def test_run_tasks_without_task_dirs() -> None:
+    """タスクディレクトリが見つからなければエラー."""
+    sut = _get_sut(_controller_builder(), task_dirs=[])
+
+    with pytest.raises(ConfigAccessError):
+        sut.run_tasks()
@@ -0,0 +1,139 @@
+"""Tests for scaling_test."""
+
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import List
+from typing import Optional
+
+import mock
+import pytest
+
+from atcoder_helper.application.interactors.scaling_test import ScalingTestInteractor
+from atcoder_helper.application.usecases.errors import HelperProgramFailure
+from atcoder_helper.application.usecases.errors import MissingDependency
+from atcoder_helper.entities.atcoder_task_config import TaskConfig
+from atcoder_helper.entities.atcoder_test_case import AtcoderTestCase
+from atcoder_helper.entities.atcoder_test_case import AtCoderTestResult
+from atcoder_helper.entities.atcoder_test_case import AtCoderTestStatus
+
+_task_config = TaskConfig(
+    contest=None, task=None, build=["build"], run=["solution"], time_limit=2.0
+)
+
+
+def _build(cpu_time: Callable[[int], float], broken_generator: bool = False) -> Any:
+    """入力生成器は N と N 個の数を出力し、解答は N に応じた CPU 時間を返す.
+
+    解答の CPU 時間が time_limit を超えたら TLE にする. 入力が N 個の数を含んでいな
+    ければ WA にする.
+    """
+    executed: List[int] = []
+
+    def build(
+        build_command: List[str], run_command: List[str], **kwargs: Any
+    ) -> Any:
+        def execute(
+            test_case: AtcoderTestCase, output_path: Optional[str] = None
+        ) -> AtCoderTestResult:
+            if run_command[0] == "gen":
+                status = (
+                    AtCoderTestStatus.ERROR
+                    if broken_generator
+                    else AtCoderTestStatus.JUSTSHOW
+                )
+                n = int(run_command[-1])
+                output = f"{n}\n" + "1 " * n
+                if output_path is not None:
+                    Path(output_path).write_text(output)
+                # actual は表示用に切り詰められている
+                return AtCoderTestResult(test_case.name, status, output[:16], "")
+
+            assert test_case.given_file is not None
+            first, *values = Path(test_case.given_file).read_text().split()
+            n = int(first)
+            if len(values) != n:
+                return AtCoderTestResult(test_case.name, AtCoderTestStatus.WA, "", "")
+            executed.append(n)
+            if cpu_time(n) > kwargs["time_limit"]:
+                return AtCoderTestResult(test_case.name, AtCoderTestStatus.TLE, "", "")
+            return AtCoderTestResult(
+                test_case.name,
+                AtCoderTestStatus.JUSTSHOW,
+                "",
+                "",
+                cpu_time=cpu_time(n),
+            )
+
+        return mock.MagicMock(
+            build=mock.MagicMock(return_value=True),
+            execute=mock.MagicMock(side_effect=execute),
+        )
+
+    return mock.MagicMock(build=mock.MagicMock(side_effect=build), executed=executed)
+
+
+def _get_sut(controller_builder: Any) -> ScalingTestInteractor:
+    return ScalingTestInteractor(
+        task_config_repo=mock.MagicMock(
+            read=mock.MagicMock(return_value=_task_config)
+        ),
+        controller_builder=controller_builder,
+    )
+
+
+def test_scaling_test_within_limit(capsys: pytest.CaptureFixture[str]) -> None:
+    """線形の解答は、最大制約でも実行時間制限に収まる."""
+    builder = _build(lambda n: 0.02 + 1e-6 * n)
+    sut = _get_sut(builder)
+
+    assert sut.scaling_test(["gen"], max_n=200000, up_to=20000, steps=5)
+
+    # up_to の 1/1000 から up_to までの等比数列を、repeat 回ずつ試す
+    sizes = [20, 112, 632, 3557, 20000]
+    assert builder.executed == [n for n in sizes for _ in range(3)]
+    assert "best fit: O(N)" in capsys.readouterr().out
+
+
+def test_scaling_test_projection_exceeds_limit(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """二乗の解答は、試した範囲で収まっても、最大制約での見積もりが制限を超える."""
+    sut = _get_sut(_build(lambda n: 0.02 + 1e-9 * n**2))
+
+    assert not sut.scaling_test(["gen"], max_n=200000, up_to=20000, repeat=1)
+
+    output = capsys.readouterr().out
+    assert "best fit: O(N^2)" in output
+    assert "WARNING" in output
+
+
+def test_scaling_test_stops_at_time_limit() -> None:
+    """制限を超えた入力サイズより大きいサイズは試さない."""
+    builder = _build(lambda n: 0.02 + 1e-9 * n**2)
+    sut = _get_sut(builder)
+
+    assert not sut.scaling_test(["gen"], max_n=200000, repeat=1)
+    assert max(builder.executed) < 200000
+
+
+def test_scaling_test_broken_generator() -> None:
+    """入力生成器が失敗したらエラーにする."""
+    sut = _get_sut(_build(lambda n: 0.1, broken_generator=True))
+
+    with pytest.raises(HelperProgramFailure):
+        sut.scaling_test(["gen"], max_n=1000)
+
+
+def test_scaling_test_without_numpy() -> None:
+    """計算量の推定に必要な numpy がなければ、実行する前にエラーにする."""
+    builder = _build(lambda n: 0.1)
+    sut = _get_sut(builder)
+
+    with mock.patch(
+        "atcoder_helper.application.interactors.scaling_test.can_fit_complexity",
+        return_value=False,
+    ):
+        with pytest.raises(MissingDependency):
+            sut.scaling_test(["gen"], max_n=1000)
+    builder.build.assert_not_called()
@@ -0,0 +1,134 @@
+"""Tests for stress_test."""
+
+from pathlib import Path
+from typing import Any
+from typing import List
+from typing import Optional
+
+import mock
+import pytest
+
+from atcoder_helper.application.interactors.stress_test import StressTestInteractor
+from atcoder_helper.application.repositories.errors import ReadError
+from atcoder_helper.application.usecases.errors import HelperProgramFailure
+from atcoder_helper.entities.atcoder_task_config import TaskConfig
+from atcoder_helper.entities.atcoder_test_case import AtcoderTestCase
+from atcoder_helper.entities.atcoder_test_case import AtCoderTestResult
+from atcoder_helper.entities.atcoder_test_case import AtCoderTestStatus
+
+_task_config = TaskConfig(contest=None, task=None, build=["build"], run=["solution"])
+
+
+def _shown(output: str) -> str:
+    """テスト結果の actual と同じく、表示用に先頭だけにする."""
+    return output if len(output) <= 8 else output[:8] + "\n... (truncated)"
+
+
+def _build(
+    failing_seed: Optional[int] = None,
+    broken_generator: bool = False,
+    padding: str = "",
+) -> Any:
+    """入力生成器はシードに padding を付けて出力し、愚直解と解答は入力をそのまま出力する.
+
+    ただし解答は failing_seed に対してだけ WA になる.
+    """
+
+    def build(build_command: List[str], run_command: List[str], **_: Any) -> Any:
+        def execute(
+            test_case: AtcoderTestCase, output_path: Optional[str] = None
+        ) -> AtCoderTestResult:
+            if run_command[0] == "gen":
+                status = (
+                    AtCoderTestStatus.ERROR
+                    if broken_generator
+                    else AtCoderTestStatus.JUSTSHOW
+                )
+                output = run_command[-1] + padding
+            elif run_command[0] == "brute":
+                status = AtCoderTestStatus.JUSTSHOW
+                output = test_case.given
+            else:
+                status = (
+                    AtCoderTestStatus.WA
+                    if test_case.given == str(failing_seed) + padding
+                    else AtCoderTestStatus.AC
+                )
+                output = "wrong"
+
+            if output_path is not None:
+                Path(output_path).write_text(output)
+            return AtCoderTestResult(test_case.name, status, _shown(output), "")
+
+        return mock.MagicMock(
+            build=mock.MagicMock(return_value=True),
+            execute=mock.MagicMock(side_effect=execute),
+        )
+
+    return mock.MagicMock(build=mock.MagicMock(side_effect=build))
+
+
+def _get_sut(
+    controller_builder: Any, test_case_repo_mock: mock.MagicMock
+) -> StressTestInteractor:
+    return StressTestInteractor(
+        task_config_repo=mock.MagicMock(
+            read=mock.MagicMock(return_value=_task_config)
+        ),
+        test_case_repo=test_case_repo_mock,
+        controller_builder=controller_builder,
+    )
+
+
+def test_stress_test_passes() -> None:
+    """すべてのシードで一致すれば何も保存しない."""
+    test_case_repo_mock = mock.MagicMock()
+    sut = _get_sut(_build(), test_case_repo_mock)
+
+    assert sut.stress_test(["gen"], ["brute"], seeds=20, jobs=4)
+    test_case_repo_mock.write.assert_not_called()
+
+
+def test_stress_test_saves_first_disagreement() -> None:
+    """最初に食い違ったシードのケースを testcases.yaml に追加する."""
+    existing = AtcoderTestCase(name="sample_1", given="1", expected="1")
+    test_case_repo_mock = mock.MagicMock(
+        read=mock.MagicMock(return_value=[existing])
+    )
+    sut = _get_sut(_build(failing_seed=7), test_case_repo_mock)
+
+    assert not sut.stress_test(["gen"], ["brute"], seeds=20, start_seed=3, jobs=4)
+    test_case_repo_mock.write.assert_called_once_with(
+        [existing, AtcoderTestCase(name="stress_7", given="7", expected="7")]
+    )
+
+
+def test_stress_test_creates_testcases_file() -> None:
+    """testcases.yaml がなければ新しく作る."""
+    test_case_repo_mock = mock.MagicMock(read=mock.MagicMock(side_effect=ReadError()))
+    sut = _get_sut(_build(failing_seed=0), test_case_repo_mock)
+
+    assert not sut.stress_test(["gen"], ["brute"], seeds=1)
+    test_case_repo_mock.write.assert_called_once_with(
+        [AtcoderTestCase(name="stress_0", given="0", expected="0")]
+    )
+
+
+def test_stress_test_saves_whole_input() -> None:
+    """表示用に切り詰められた出力ではなく、入力と愚直解の出力の全体を保存する."""
+    padding = "\n" + "0" * 100
+    test_case_repo_mock = mock.MagicMock(read=mock.MagicMock(side_effect=ReadError()))
+    sut = _get_sut(_build(failing_seed=0, padding=padding), test_case_repo_mock)
+
+    assert not sut.stress_test(["gen"], ["brute"], seeds=1, minimize_time=0)
+    test_case_repo_mock.write.assert_called_once_with(
+        [AtcoderTestCase(name="stress_0", given="0" + padding, expected="0" + padding)]
+    )
+
+
+def test_stress_test_broken_generator() -> None:
+    """入力生成器が失敗したらエラーにする."""
+    sut = _get_sut(_build(broken_generator=True), mock.MagicMock())
+
+    with pytest.raises(HelperProgramFailure):
+        sut.stress_test(["gen"], ["brute"], seeds=5)
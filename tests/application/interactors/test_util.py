@@ -0,0 +1,28 @@
+"""Tests for interactors.util."""
+
+from atcoder_helper.application.interactors.util import Limits
+from atcoder_helper.application.interactors.util import resolve_limits
+from atcoder_helper.entities.atcoder_task_config import TaskConfig
+
+_task_config = TaskConfig(
+    contest=None,
+    task=None,
+    build=["build"],
+    run=["solution"],
+    time_limit=2.0,
+    memory_limit=1024,
+    output_limit=64,
+)
+
+
+def test_resolve_limits_from_task_config() -> None:
+    """指定がなければタスク設定の制限を使い、実行時間制限だけ倍率をかける."""
+    assert resolve_limits(_task_config) == Limits(2.0, 1024, 64)
+    assert resolve_limits(_task_config, time_factor=3.0) == Limits(6.0, 1024, 64)
+
+
+def test_resolve_limits_override() -> None:
+    """指定された制限はそのまま使い、倍率はかけない."""
+    assert resolve_limits(_task_config, 0.5, 256, 8, time_factor=3.0) == Limits(
+        0.5, 256, 8
+    )
@@ -0,0 +1,54 @@
+"""Tests for entities.atcoder_benchmark."""
+
+import math
+from typing import List
+
+import pytest
+
+from atcoder_helper.entities.atcoder_benchmark import TimingStats
+from atcoder_helper.entities.atcoder_benchmark import count_outliers
+from atcoder_helper.entities.atcoder_benchmark import percentile
+from atcoder_helper.entities.atcoder_benchmark import relative_confidence_interval
+
+
+@pytest.mark.parametrize(
+    argnames=("q", "expected"),
+    argvalues=[[0.0, 1.0], [0.5, 2.5], [0.95, 3.85], [1.0, 4.0]],
+)
+def test_percentile(q: float, expected: float) -> None:
+    """percentileは線形補間する."""
+    assert percentile([1.0, 2.0, 3.0, 4.0], q) == pytest.approx(expected)
+
+
+def test_timing_stats() -> None:
+    """TimingStats.ofは並び順によらない."""
+    stats = TimingStats.of([3.0, 1.0, 2.0])
+
+    assert (stats.min, stats.median) == (1.0, 2.0)
+    assert stats.p95 == pytest.approx(2.9)
+
+
+test_count_outliers_parameters = {
+    "外れ値なし": [[1.0, 1.1, 0.9, 1.0, 1.05, 0.95], 0],
+    "大きい外れ値": [[1.0, 1.1, 0.9, 1.0, 1.05, 0.95, 5.0], 1],
+    "少なすぎる": [[1.0, 5.0, 9.0], 0],
+}
+
+
+@pytest.mark.parametrize(
+    argnames=("samples", "expected"),
+    argvalues=test_count_outliers_parameters.values(),
+    ids=test_count_outliers_parameters.keys(),
+)
+def test_count_outliers(samples: List[float], expected: int) -> None:
+    """count_outliersのテスト."""
+    assert count_outliers(samples) == expected
+
+
+def test_relative_confidence_interval() -> None:
+    """ばらつきが小さいほど信頼区間は狭い."""
+    assert relative_confidence_interval([1.0]) == math.inf
+    assert relative_confidence_interval([1.0, 1.0, 1.0]) == 0.0
+    assert relative_confidence_interval([1.0, 1.01, 0.99]) < (
+        relative_confidence_interval([1.0, 1.5, 0.5])
+    )
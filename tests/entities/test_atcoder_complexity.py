@@ -0,0 +1,43 @@
+"""Tests for entities.atcoder_complexity."""
+
+import math
+import random
+from typing import Callable
+
+import pytest
+
+from atcoder_helper.entities.atcoder_complexity import choose_best_fit
+from atcoder_helper.entities.atcoder_complexity import fit_complexity
+
+_sizes = [100 * 2**step for step in range(10)]
+
+
+@pytest.mark.parametrize(
+    argnames=("expected", "running_time"),
+    argvalues=[
+        ["O(1)", lambda n: 0.1],
+        ["O(N)", lambda n: 0.01 + 1e-6 * n],
+        ["O(N log N)", lambda n: 0.01 + 1e-7 * n * math.log(n)],
+        ["O(N^2)", lambda n: 0.03 + 1e-9 * n**2],
+    ],
+    ids=["定数", "線形", "NlogN", "二乗"],
+)
+def test_fit_complexity(expected: str, running_time: Callable[[int], float]) -> None:
+    """計測のぶれがあっても、計算量のクラスを見分けられる."""
+    noise = random.Random(0)
+    times = [running_time(n) * noise.uniform(0.98, 1.02) for n in _sizes]
+
+    best = choose_best_fit(fit_complexity(_sizes, times))
+
+    assert best.complexity.name == expected
+    assert best.predict(200000) == pytest.approx(running_time(200000), rel=0.1)
+
+
+def test_fit_complexity_drops_decreasing_curves() -> None:
+    """係数が負になるクラスは結果に含めない."""
+    times = [1.0 / n for n in _sizes]
+
+    fits = fit_complexity(_sizes, times)
+
+    assert all(fit.coefficient >= 0 for fit in fits)
+    assert [fit.error for fit in fits] == sorted(fit.error for fit in fits)
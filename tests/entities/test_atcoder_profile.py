@@ -0,0 +1,31 @@
+"""Tests for entities.atcoder_profile."""
+
+from atcoder_helper.entities.atcoder_profile import Hotspot
+from atcoder_helper.entities.atcoder_profile import find_hotspots
+from atcoder_helper.entities.atcoder_profile import format_collapsed
+from atcoder_helper.entities.atcoder_profile import parse_collapsed
+
+
+def test_find_hotspots() -> None:
+    """自身の重みが大きい順に並び、再帰は total に一度だけ数える."""
+    stacks = {
+        "main;solve": 10,
+        "main;solve;dfs;dfs": 60,
+        "main;read": 30,
+    }
+
+    assert find_hotspots(stacks, 3) == [
+        Hotspot("dfs", 60, 60),
+        Hotspot("read", 30, 30),
+        Hotspot("solve", 10, 70),
+    ]
+
+
+def test_collapsed_round_trip() -> None:
+    """書き出したスタックを読み直せる. 読めない行は無視する."""
+    stacks = {"main;solve (task.py:3)": 5, "main": 1}
+
+    text = format_collapsed(stacks)
+
+    assert text == "main 1\nmain;solve (task.py:3) 5\n"
+    assert parse_collapsed(text + "garbage\n") == stacks
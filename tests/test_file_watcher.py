@@ -0,0 +1,68 @@
+"""file_watcherのテスト."""
+
+import threading
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from atcoder_helper.file_watcher import FileWatcher
+from atcoder_helper.file_watcher import InotifyFileWatcher
+from atcoder_helper.file_watcher import PollingFileWatcher
+
+
+def _inotify_watcher(directory: str) -> FileWatcher:
+    try:
+        return InotifyFileWatcher(directory)
+    except (OSError, AttributeError):
+        pytest.skip("inotify is not available")
+
+
+_watcher_factories = pytest.mark.parametrize(
+    argnames="create",
+    argvalues=[_inotify_watcher, PollingFileWatcher],
+    ids=["inotify", "polling"],
+)
+
+
+def _write_later(path: Path, content: str) -> threading.Timer:
+    timer = threading.Timer(0.3, path.write_text, args=(content,))
+    timer.start()
+    return timer
+
+
+@_watcher_factories
+def test_wait_returns_changed_files(
+    tmp_path: Path, create: Callable[[str], FileWatcher]
+) -> None:
+    """サブディレクトリも含めて、変わったファイルを返す. 隠しファイルは無視する."""
+    (tmp_path / "src").mkdir()
+    (tmp_path / "main.py").write_text("print(1)\n")
+    watcher = create(str(tmp_path))
+    try:
+        (tmp_path / ".main.py.swp").write_text("swap")
+        timer = _write_later(tmp_path / "src" / "lib.py", "x = 1\n")
+        changed = watcher.wait(debounce=0.2)
+        timer.join()
+    finally:
+        watcher.close()
+
+    assert changed == {str(Path("src") / "lib.py")}
+
+
+@_watcher_factories
+def test_discard_drops_earlier_changes(
+    tmp_path: Path, create: Callable[[str], FileWatcher]
+) -> None:
+    """捨てた変更は、そのあとの wait で返さない."""
+    watcher = create(str(tmp_path))
+    try:
+        (tmp_path / "a.out").write_text("built")
+        watcher.discard()
+        timer = _write_later(tmp_path / "main.py", "print(2)\n")
+        changed = watcher.wait(debounce=0.2)
+        timer.join()
+    finally:
+        watcher.close()
+
+    assert changed == {"main.py"}
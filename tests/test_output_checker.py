@@ -0,0 +1,219 @@
+"""output_checkerのテスト."""
+
+import sys
+import tempfile
+from pathlib import Path
+from typing import List
+
+import mock
+import pytest
+
+from atcoder_helper import output_checker
+from atcoder_helper.entities.atcoder_task_config import CheckerConfig
+
+test_outputs_match_parameters = {
+    "一致": [b"1 2\n3\n", b"1 2\n3\n", True],
+    "末尾の空白は無視": [b"1 2\n3", b"1 2\n3 \n\n", True],
+    "改行コードは無視": [b"1 2\n3\n", b"1 2\r\n3\r\n", True],
+    "途中の空白は無視しない": [b"1 2\n3\n", b"1  2\n3\n", False],
+    "長さが違う": [b"1 2\n3\n", b"1 2\n", False],
+    "空": [b"", b"\n", True],
+}
+
+
+@pytest.mark.parametrize(
+    argnames=("expected", "actual", "match"),
+    argvalues=test_outputs_match_parameters.values(),
+    ids=test_outputs_match_parameters.keys(),
+)
+def test_outputs_match(expected: bytes, actual: bytes, match: bool) -> None:
+    """outputs_matchのテスト."""
+    assert output_checker.outputs_match(expected, actual) == match
+
+
+@pytest.mark.parametrize(
+    argnames=("expected", "actual", "match"),
+    argvalues=test_outputs_match_parameters.values(),
+    ids=test_outputs_match_parameters.keys(),
+)
+def test_outputs_match_across_chunks(
+    expected: bytes, actual: bytes, match: bool
+) -> None:
+    """chunkの境目がどこにあっても同じ結果になる."""
+    with mock.patch.object(output_checker, "_CHUNK_SIZE", 1):
+        assert output_checker.outputs_match(expected, actual) == match
+
+
+@pytest.mark.parametrize(
+    argnames="content", argvalues=[b"", b"foo\n"], ids=["空", "空でない"]
+)
+def test_mapped(content: bytes) -> None:
+    """mappedのテスト."""
+    with tempfile.TemporaryFile() as file:
+        file.write(content)
+        file.flush()
+        with output_checker.mapped(file) as buffer:
+            assert buffer[:] == content
+
+
+def _write_files(tmp_path: Path, actual: bytes, expected: bytes) -> List[str]:
+    paths = [tmp_path / "input", tmp_path / "output", tmp_path / "answer"]
+    for path, content in zip(paths, [b"", actual, expected]):
+        path.write_bytes(content)
+    return [str(path) for path in paths]
+
+
+test_token_checker_parameters = {
+    "一致": [b"1 2\n3\n", b"1 2\n3\n", True],
+    "空白の数と種類は無視": [b"1 2\n3\n", b"1\t 2 3", True],
+    "トークンが違う": [b"1 2\n3\n", b"1 2 4\n", False],
+    "トークンが足りない": [b"1 2\n3\n", b"1 2\n", False],
+    "トークンが多い": [b"1 2\n", b"1 2 3\n", False],
+    "空": [b"", b"\n", True],
+}
+
+
+@pytest.mark.parametrize(
+    argnames=("expected", "actual", "accepted"),
+    argvalues=test_token_checker_parameters.values(),
+    ids=test_token_checker_parameters.keys(),
+)
+def test_token_checker(
+    expected: bytes, actual: bytes, accepted: bool, tmp_path: Path
+) -> None:
+    """TokenCheckerのテスト."""
+    result = output_checker.TokenChecker().check(
+        *_write_files(tmp_path, actual, expected)
+    )
+
+    assert result.accepted == accepted
+
+
+test_numeric_checker_parameters = {
+    "一致": [b"1 2.5\n", b"1 2.5\n", True],
+    "絶対誤差が許容範囲内": [b"0.5\n", b"0.5000009\n", True],
+    "相対誤差が許容範囲内": [b"1e9\n", b"1000000999\n", True],
+    "誤差が大きい": [b"0.5\n", b"0.50001\n", False],
+    "inf": [b"inf\n", b"inf\n", True],
+    "nan": [b"1\n", b"nan\n", False],
+    "数値以外のトークンが混ざる": [b"Yes\n1 2\n", b"Yes\n1.0000001 2\n", True],
+    "数値以外のトークンが違う": [b"Yes\n1 2\n", b"No\n1 2\n", False],
+    "トークンが足りない": [b"1 2\n", b"1\n", False],
+    "空白だけ": [b"", b" \n", True],
+}
+
+
+@pytest.mark.parametrize(argnames="use_numpy", argvalues=[True, False])
+@pytest.mark.parametrize(
+    argnames=("expected", "actual", "accepted"),
+    argvalues=test_numeric_checker_parameters.values(),
+    ids=test_numeric_checker_parameters.keys(),
+)
+def test_numeric_checker(
+    expected: bytes, actual: bytes, accepted: bool, use_numpy: bool, tmp_path: Path
+) -> None:
+    """NumericCheckerは、numpyの有無によらず同じ判定をする."""
+    if use_numpy and not output_checker._has_numpy:
+        pytest.skip("numpy is not installed")
+    sut = output_checker.create_checker(CheckerConfig(type="numeric"), str(tmp_path))
+
+    with mock.patch.object(output_checker, "_has_numpy", use_numpy):
+        result = sut.check(*_write_files(tmp_path, actual, expected))
+
+    assert result.accepted == accepted
+
+
+@pytest.mark.parametrize(
+    argnames=("actual", "accepted"),
+    argvalues=[
+        [b"1.0000001 22 333.0\n4444 5 66\n", True],
+        [b"1 22 333 4444 5 67", False],
+        [b"1 22 333 4444 5", False],
+    ],
+    ids=["一致", "違う", "足りない"],
+)
+def test_numeric_checker_in_chunks(
+    actual: bytes, accepted: bool, tmp_path: Path
+) -> None:
+    """出力をまとめてコピーせず、トークンの途中で切らずに少しずつ数値に変換して比較する."""
+    if not output_checker._has_numpy:
+        pytest.skip("numpy is not installed")
+    sut = output_checker.create_checker(CheckerConfig(type="numeric"), str(tmp_path))
+
+    with mock.patch.object(output_checker, "_CHUNK_SIZE", 4):
+        result = sut.check(*_write_files(tmp_path, actual, b"1 22 333 4444 5 66\n"))
+
+    assert result.accepted == accepted
+
+
+@pytest.mark.parametrize(
+    argnames=("actual", "message"),
+    argvalues=[
+        [b"Yes\n1 2 3 4\n", "expected 3 tokens but got 5"],
+        [b"Yes\n1\n", "expected 3 tokens but got 2"],
+        [b"No\n1 2 3 4\n", "token 1: expected 'Yes' but got 'No'"],
+        [b"Yes\n1 2.5\n", "token 3: expected '2' but got '2.5'"],
+    ],
+    ids=["多い", "足りない", "最初のトークンが違う", "数値が違う"],
+)
+def test_numeric_checker_message(actual: bytes, message: str, tmp_path: Path) -> None:
+    """トークンの列は作らずに両方をたどり、最初に食い違ったところを示す."""
+    sut = output_checker.create_checker(CheckerConfig(type="numeric"), str(tmp_path))
+    token = mock.MagicMock(
+        finditer=output_checker._TOKEN.finditer,
+        findall=mock.MagicMock(side_effect=AssertionError("findall")),
+    )
+
+    with mock.patch.object(output_checker, "_TOKEN", token):
+        result = sut.check(*_write_files(tmp_path, actual, b"Yes\n1 2\n"))
+
+    assert not result.accepted
+    assert result.message == message
+
+
+# 出力と正解を数値として比較し、違えば WA (終了コード1)、入力が "fail" なら _fail (3)
+_external_checker_source = (
+    "import sys\n"
+    "given, output, answer = (open(path).read() for path in sys.argv[1:])\n"
+    "if given == 'fail': sys.exit(3)\n"
+    "if float(output) != float(answer):\n"
+    "    sys.stderr.write('differ')\n"
+    "    sys.exit(1)\n"
+)
+
+test_external_checker_parameters = {
+    "AC": [b"", b"1.0", b"1", True],
+    "WA": [b"", b"2", b"1", False],
+}
+
+
+@pytest.mark.parametrize(
+    argnames=("given", "actual", "expected", "accepted"),
+    argvalues=test_external_checker_parameters.values(),
+    ids=test_external_checker_parameters.keys(),
+)
+def test_external_checker(
+    given: bytes, actual: bytes, expected: bytes, accepted: bool, tmp_path: Path
+) -> None:
+    """ExternalCheckerは終了コードで判定し、標準エラー出力をメッセージにする."""
+    (tmp_path / "checker.py").write_text(_external_checker_source)
+    sut = output_checker.create_checker(
+        CheckerConfig(type="external", run=[sys.executable, "checker.py"]),
+        str(tmp_path),
+    )
+
+    result = sut.check(*_write_files(tmp_path, actual, expected))
+
+    assert result.accepted == accepted
+    assert result.message == ("" if accepted else "differ")
+
+
+def test_external_checker_failure(tmp_path: Path) -> None:
+    """チェッカが _fail で終了したらCheckerFailureを送出する."""
+    (tmp_path / "checker.py").write_text(_external_checker_source)
+    sut = output_checker.ExternalChecker([sys.executable, "checker.py"], str(tmp_path))
+    input_path, output_path, answer_path = _write_files(tmp_path, b"1", b"1")
+    Path(input_path).write_text("fail")
+
+    with pytest.raises(output_checker.CheckerFailure):
+        sut.check(input_path, output_path, answer_path)
@@ -0,0 +1,90 @@
+"""profilerのテスト."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from atcoder_helper.entities.atcoder_test_case import AtcoderTestCase
+from atcoder_helper.entities.atcoder_test_case import AtCoderTestStatus
+from atcoder_helper.profiler import ProfilerFailure
+from atcoder_helper.profiler import ProfilerUnavailable
+from atcoder_helper.profiler import collapse_perf_script
+from atcoder_helper.profiler import create_profiler
+from atcoder_helper.program_executor import ProfilingProgramExecutorRepoImpl
+
+_SOLUTION = """\
+def heavy():
+    return sum(i * i for i in range(300000))
+
+
+def solve():
+    return heavy()
+
+
+print(solve())
+"""
+
+
+@pytest.mark.parametrize(argnames="name", argvalues=["cprofile", "sampling"])
+def test_python_profiler(tmp_path: Path, name: str) -> None:
+    """解答の結果はそのままに、解答の関数だけのスタックを集める."""
+    (tmp_path / "task.py").write_text(_SOLUTION)
+    run_command = [sys.executable, "task.py"]
+    sut = ProfilingProgramExecutorRepoImpl(
+        [], run_command, create_profiler(name, run_command), task_dir=str(tmp_path)
+    )
+
+    expected = str(sum(i * i for i in range(300000)))
+    test_case = AtcoderTestCase(name="a", given="", expected=expected)
+
+    result, profile = sut.profile(test_case)
+
+    assert result.status == AtCoderTestStatus.AC
+    assert profile.profiler == name
+    assert profile.stacks
+    assert all(stack.startswith("<module> (task.py:1)") for stack in profile.stacks)
+    assert any("solve (task.py:5)" in stack for stack in profile.stacks)
+
+
+def test_python_profiler_without_result(tmp_path: Path) -> None:
+    """解答が kill されて計測結果が残らなければ ProfilerFailure."""
+    (tmp_path / "task.py").write_text("while True: pass\n")
+    run_command = [sys.executable, "task.py"]
+    sut = ProfilingProgramExecutorRepoImpl(
+        [],
+        run_command,
+        create_profiler("sampling", run_command),
+        task_dir=str(tmp_path),
+        time_limit=0.5,
+    )
+
+    with pytest.raises(ProfilerFailure, match="TLE"):
+        sut.profile(AtcoderTestCase(name="a", given="", expected=None))
+
+
+def test_create_profiler() -> None:
+    """Python のスクリプトかどうかで選び、使えない組み合わせはエラー."""
+    assert create_profiler(None, ["python3", "task.py"]).name == "cprofile"
+    with pytest.raises(ProfilerUnavailable):
+        create_profiler("sampling", ["./main"])
+    with pytest.raises(ProfilerUnavailable):
+        create_profiler("gprof", ["./main"])
+
+
+def test_collapse_perf_script() -> None:
+    """プロセス名を根にして、呼び出し元から順に並べる."""
+    text = """\
+main 1234 [000] 10.000001:    1001001 cpu-clock:u:
+\t    55d0c8a1b2c3 solve(int)+0x23 (/tmp/work/main)
+\t    55d0c8a1b000 main+0x10 (/tmp/work/main)
+\t    7f0000000000 [unknown] (/usr/lib/libc.so.6)
+
+main 1234 [000] 10.001002:    1001001 cpu-clock:u:
+\t    55d0c8a1b2c3 solve(int)+0x40 (/tmp/work/main)
+\t    55d0c8a1b000 main+0x10 (/tmp/work/main)
+\t    7f0000000000 [unknown] (/usr/lib/libc.so.6)
+
+"""
+
+    assert collapse_perf_script(text) == {"main;[libc.so.6];main;solve(int)": 2}
@@ -0,0 +1,451 @@
+"""program_executorのテスト."""
+
+import os
+import sys
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Any
+from typing import List
+from typing import Optional
+
+import mock
+import pytest
+
+from atcoder_helper.application.interactors.util import pinned_to_cpu
+from atcoder_helper.entities.atcoder_task_config import CheckerConfig
+from atcoder_helper.entities.atcoder_test_case import AtcoderTestCase
+from atcoder_helper.entities.atcoder_test_case import AtCoderTestStatus
+from atcoder_helper.program_executor import ForkServerProgramExecutorRepoImpl
+from atcoder_helper.program_executor import ProgramExecutorRepoImpl
+from atcoder_helper.resource_limits import MemoryCgroup
+
+
+def _get_sut(
+    source: str,
+    tmp_path: Path,
+    time_limit: Optional[float] = None,
+    memory_limit: Optional[int] = None,
+    output_limit: Optional[int] = None,
+) -> ProgramExecutorRepoImpl:
+    run_command: List[str] = [sys.executable, "-c", source]
+    return ProgramExecutorRepoImpl(
+        [],
+        run_command,
+        task_dir=str(tmp_path),
+        time_limit=time_limit,
+        memory_limit=memory_limit,
+        output_limit=output_limit,
+    )
+
+
+test_execute_parameters = {
+    "AC": ["print(input())", "foo", "foo", AtCoderTestStatus.AC],
+    "WA": ["print('bar')", "foo", "foo", AtCoderTestStatus.WA],
+    "JUSTSHOW": ["print(input())", "foo", None, AtCoderTestStatus.JUSTSHOW],
+    "ERROR": ["raise SystemExit(1)", "foo", "foo", AtCoderTestStatus.ERROR],
+    "TLE": ["while True: pass", "foo", "foo", AtCoderTestStatus.TLE],
+    "MLE": ["x = bytearray(256 << 20)", "foo", "foo", AtCoderTestStatus.MLE],
+    "MLE(仮想メモリの制限)": ["x = bytearray(4 << 30)", "", "", AtCoderTestStatus.MLE],
+    "OLE": ["while True: print('x' * 4096)", "foo", "foo", AtCoderTestStatus.OLE],
+    "OLE(ファイルサイズの制限)": [
+        "print('x' * (4 << 20))",
+        "",
+        "",
+        AtCoderTestStatus.OLE,
+    ],
+    "AC(末尾の空白は無視)": [
+        "print(input() + '  ')",
+        "foo",
+        "foo\n",
+        AtCoderTestStatus.AC,
+    ],
+    "AC(改行コードは無視)": [
+        "import sys; sys.stdout.buffer.write(b'a\\r\\nb\\r\\n')",
+        "",
+        "a\nb",
+        AtCoderTestStatus.AC,
+    ],
+}
+
+
+@pytest.mark.parametrize(
+    argnames=("source", "given", "expected", "status"),
+    argvalues=test_execute_parameters.values(),
+    ids=test_execute_parameters.keys(),
+)
+def test_execute(
+    source: str,
+    given: str,
+    expected: Optional[str],
+    status: AtCoderTestStatus,
+    tmp_path: Path,
+) -> None:
+    """executeのテスト."""
+    sut = _get_sut(source, tmp_path, time_limit=1.0, memory_limit=128, output_limit=1)
+
+    result = sut.execute(AtcoderTestCase(name="foo", given=given, expected=expected))
+
+    assert result.status == status
+    assert result.wall_time is not None
+    assert result.cpu_time is not None
+    assert result.max_rss is not None and result.max_rss > 0
+
+
+def test_execute_max_rss_excludes_parent(tmp_path: Path) -> None:
+    """ピークメモリ使用量に、atcoder_helper 自身のメモリ使用量を含めない."""
+    ballast = b"x" * (256 << 20)
+    sut = _get_sut("pass", tmp_path)
+
+    result = sut.execute(AtcoderTestCase(name="foo", given="", expected=None))
+
+    assert len(ballast) == 256 << 20
+    assert result.max_rss is not None and 0 < result.max_rss < 128 << 10
+
+
+@pytest.mark.skipif(
+    not hasattr(os, "sched_getaffinity") or len(os.sched_getaffinity(0)) < 2,
+    reason="needs at least 2 usable cpus",
+)
+def test_execute_inherits_thread_affinity(tmp_path: Path) -> None:
+    """先に起動していたフォークサーバから起動しても、呼び出したスレッドの CPU に固定される."""
+    sut = _get_sut("import os\nprint(sorted(os.sched_getaffinity(0)))", tmp_path)
+    case = AtcoderTestCase(name="foo", given="", expected=None)
+    usable = sorted(os.sched_getaffinity(0))
+    # 固定する前にフォークサーバを起動させておく
+    assert sut.execute(case).actual.strip() == str(usable)
+
+    with pinned_to_cpu(usable[0]) as pinned:
+        assert sut.execute(case).actual.strip() == str([pinned])
+
+    assert sut.execute(case).actual.strip() == str(usable)
+
+
+def test_execute_kills_process_group(tmp_path: Path) -> None:
+    """TLEしたときは子プロセスごとkillされる."""
+    source = (
+        "import subprocess, sys\n"
+        "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+        "while True: pass\n"
+    )
+    sut = _get_sut(source, tmp_path, time_limit=0.5)
+
+    result = sut.execute(AtcoderTestCase(name="foo", given="", expected=""))
+
+    assert result.status == AtCoderTestStatus.TLE
+    assert result.wall_time is not None and result.wall_time < 10
+
+
+def test_execute_reports_signal(tmp_path: Path) -> None:
+    """シグナルで落ちたときは、そのシグナルを表示する."""
+    sut = _get_sut("import os, signal; os.kill(os.getpid(), signal.SIGSEGV)", tmp_path)
+
+    result = sut.execute(AtcoderTestCase(name="foo", given="", expected=""))
+
+    assert result.status == AtCoderTestStatus.ERROR
+    assert "terminated by SIGSEGV." in result.error
+
+
+def test_execute_without_address_space_limit(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """仮想メモリを制限しなければ、確保しただけで触らない領域は数えない."""
+    # cgroup が使えると仮想メモリは制限しないので、使えない環境として試す
+    monkeypatch.setattr(MemoryCgroup, "create", mock.MagicMock(return_value=None))
+    source = "import mmap; m = mmap.mmap(-1, 1 << 30); print('ok')"
+
+    limited = _get_sut(source, tmp_path, memory_limit=128)
+    unlimited = ProgramExecutorRepoImpl(
+        [],
+        [sys.executable, "-c", source],
+        task_dir=str(tmp_path),
+        memory_limit=128,
+        limit_address_space=False,
+    )
+
+    case = AtcoderTestCase(name="foo", given="", expected="ok")
+    assert limited.execute(case).status == AtCoderTestStatus.MLE
+    assert unlimited.execute(case).status == AtCoderTestStatus.AC
+
+
+def test_execute_threads_with_default_memory_limit(tmp_path: Path) -> None:
+    """メモリ制限が AtCoder と同じでも、スレッドを作れる."""
+    source = (
+        "import threading\n"
+        "threads = [threading.Thread(target=sum, args=([],)) for _ in range(16)]\n"
+        "for thread in threads: thread.start()\n"
+        "for thread in threads: thread.join()\n"
+        "print('ok')\n"
+    )
+    sut = _get_sut(source, tmp_path, memory_limit=1024)
+
+    result = sut.execute(AtcoderTestCase(name="foo", given="", expected="ok"))
+
+    assert result.status == AtCoderTestStatus.AC, result.error
+
+
+def _get_build_sut(tmp_path: Path, source: str) -> ProgramExecutorRepoImpl:
+    return ProgramExecutorRepoImpl(
+        [sys.executable, "-c", source], [], task_dir=str(tmp_path)
+    )
+
+
+# main.txt を「コンパイル」して a.out を作り、ビルド回数を数える
+_build_source = (
+    "import shutil\n"
+    "shutil.copy('main.txt', 'a.out')\n"
+    "open('build_count', 'a').write('x')\n"
+)
+
+
+def _build_count(tmp_path: Path) -> int:
+    return len((tmp_path / "build_count").read_text())
+
+
+def test_build_skips_when_sources_are_unchanged(tmp_path: Path) -> None:
+    """ソースが変わっていなければビルドを省略する."""
+    (tmp_path / "main.txt").write_text("foo")
+    sut = _get_build_sut(tmp_path, _build_source)
+
+    assert sut.build()
+    assert sut.build()
+    assert _build_count(tmp_path) == 1
+
+    (tmp_path / "testcases.yaml").write_text("[]")
+    assert sut.build()
+    assert _build_count(tmp_path) == 1
+
+    (tmp_path / "main.txt").write_text("bar")
+    assert sut.build()
+    assert _build_count(tmp_path) == 2
+
+    (tmp_path / "a.out").unlink()
+    assert sut.build()
+    assert _build_count(tmp_path) == 3
+
+
+def test_build_failure_is_not_cached(tmp_path: Path) -> None:
+    """ビルドに失敗したときはキャッシュされず、毎回ビルドし直す."""
+    (tmp_path / "main.txt").write_text("foo")
+    sut = _get_build_sut(
+        tmp_path, "open('build_count', 'a').write('x')\nraise SystemExit(1)\n"
+    )
+
+    assert not sut.build()
+    assert not sut.build()
+    assert _build_count(tmp_path) == 2
+
+
+def test_build_output_follows_redirected_stdout(tmp_path: Path, capfd: Any) -> None:
+    """sys.stdout を差し替えると、ビルドのメッセージも差し替え先に出る."""
+    (tmp_path / "main.txt").write_text("foo")
+    sut = _get_build_sut(tmp_path, _build_source + "print('compiled')\n")
+
+    with redirect_stdout(sys.stderr):
+        assert sut.build()
+        assert sut.build()
+
+    out, err = capfd.readouterr()
+    assert out == ""
+    assert "compiled" in err
+    assert "skipping build" in err
+
+
+def test_build_does_not_run_unknown_command_for_cache_key(tmp_path: Path) -> None:
+    """コンパイラでないビルドコマンドは、キャッシュのキーを計算するためには実行しない."""
+    (tmp_path / "main.txt").write_text("foo")
+    (tmp_path / "build.sh").write_text(
+        "#!/bin/sh\n"
+        'echo "build $@" >> "$(dirname "$0")/log"\n'
+        "cp main.txt a.out\n"
+        "printf x >> build_count\n"
+    )
+    (tmp_path / "build.sh").chmod(0o755)
+    sut = ProgramExecutorRepoImpl(
+        [str(tmp_path / "build.sh")], [], task_dir=str(tmp_path)
+    )
+
+    assert sut.build()
+    assert sut.build()
+    assert _build_count(tmp_path) == 1
+    assert "--version" not in (tmp_path / "log").read_text()
+
+
+def test_build_with_empty_command(tmp_path: Path) -> None:
+    """ビルドコマンドが空ならビルドは不要."""
+    assert ProgramExecutorRepoImpl([], [], task_dir=str(tmp_path)).build()
+
+
+def test_cache_key(tmp_path: Path) -> None:
+    """ソース・入力・期待する出力・制限のどれかが変わればキーも変わる."""
+    (tmp_path / "main.py").write_text("print(input())")
+    case = AtcoderTestCase(name="a", given="foo", expected="foo")
+    sut = ProgramExecutorRepoImpl(
+        [], [sys.executable, "main.py"], task_dir=str(tmp_path), time_limit=2.0
+    )
+    assert sut.build()
+    key = sut.cache_key(case)
+
+    assert key is not None
+    assert sut.cache_key(case.copy()) == key
+    assert sut.cache_key(case.copy(update={"given": "bar"})) != key
+    assert sut.cache_key(case.copy(update={"expected": "bar"})) != key
+    assert sut.cache_key(case.copy(update={"name": "b"})) == key
+
+    other_limit = ProgramExecutorRepoImpl(
+        [], [sys.executable, "main.py"], task_dir=str(tmp_path), time_limit=3.0
+    )
+    assert other_limit.build()
+    assert other_limit.cache_key(case) != key
+
+    (tmp_path / "main.py").write_text("print(input() * 2)")
+    assert sut.build()
+    assert sut.cache_key(case) != key
+
+
+def test_cache_key_of_built_program(tmp_path: Path) -> None:
+    """ビルドする場合は、ビルドのキーから決まる. 入力ファイルは中身から決まる."""
+    (tmp_path / "main.txt").write_text("foo")
+    (tmp_path / "input.txt").write_text("foo")
+    case = AtcoderTestCase(name="a", given_file="input.txt", expected="foo")
+    sut = _get_build_sut(tmp_path, _build_source)
+    assert sut.build()
+    key = sut.cache_key(case)
+
+    assert key is not None
+    assert sut.cache_key(case.copy(update={"given_file": "missing.txt"})) is None
+
+    (tmp_path / "main.txt").write_text("bar")
+    assert sut.build()
+    assert sut.cache_key(case) != key
+
+
+fork_server_parameters = {
+    "AC": ["print(input())", "foo", "foo", AtCoderTestStatus.AC],
+    "WA": ["print('bar')", "foo", "foo", AtCoderTestStatus.WA],
+    "ERROR(例外)": ["raise ValueError()", "foo", "foo", AtCoderTestStatus.ERROR],
+    "ERROR(exit)": ["raise SystemExit(3)", "foo", "foo", AtCoderTestStatus.ERROR],
+    "TLE": ["while True: pass", "foo", "foo", AtCoderTestStatus.TLE],
+    "MLE": ["x = bytearray(4 << 30)", "foo", "foo", AtCoderTestStatus.MLE],
+    "OLE": ["print('x' * (4 << 20))", "foo", "foo", AtCoderTestStatus.OLE],
+}
+
+
+@pytest.mark.parametrize(
+    argnames=("source", "given", "expected", "status"),
+    argvalues=fork_server_parameters.values(),
+    ids=fork_server_parameters.keys(),
+)
+def test_fork_server_execute(
+    source: str,
+    given: str,
+    expected: Optional[str],
+    status: AtCoderTestStatus,
+    tmp_path: Path,
+) -> None:
+    """フォークサーバ経由でも通常と同じ判定になる."""
+    (tmp_path / "task.py").write_text(source)
+    sut = ForkServerProgramExecutorRepoImpl(
+        [],
+        [sys.executable, "task.py"],
+        task_dir=str(tmp_path),
+        time_limit=1.0,
+        memory_limit=128,
+        output_limit=1,
+        preload_modules=["json"],
+    )
+
+    for _ in range(2):  # 2回目以降は起動済みのサーバを使う
+        result = sut.execute(
+            AtcoderTestCase(name="foo", given=given, expected=expected)
+        )
+        assert result.status == status
+
+
+def test_execute_with_given_file(tmp_path: Path) -> None:
+    """入力がファイルで与えられたときは、そのファイルを標準入力にする."""
+    (tmp_path / "input.txt").write_text("1 2 3\n")
+    sut = _get_sut("print(sum(map(int, input().split())))", tmp_path)
+
+    result = sut.execute(
+        AtcoderTestCase(name="foo", given_file="input.txt", expected="6")
+    )
+
+    assert result.status == AtCoderTestStatus.AC
+
+
+def test_execute_with_missing_given_file(tmp_path: Path) -> None:
+    """入力ファイルが開けなければERRORになる."""
+    sut = _get_sut("print(input())", tmp_path)
+
+    result = sut.execute(
+        AtcoderTestCase(name="foo", given_file="missing.txt", expected="6")
+    )
+
+    assert result.status == AtCoderTestStatus.ERROR
+
+
+def test_execute_with_token_checker(tmp_path: Path) -> None:
+    """トークン単位で比較するチェッカを使える."""
+    sut = ProgramExecutorRepoImpl(
+        [],
+        [sys.executable, "-c", "print('1\\t2   3')"],
+        task_dir=str(tmp_path),
+        checker=CheckerConfig(type="token"),
+    )
+
+    result = sut.execute(AtcoderTestCase(name="foo", given="", expected="1 2\n3"))
+
+    assert result.status == AtCoderTestStatus.AC
+
+
+# checker.txt を「コンパイル」して checker.py を作り、ビルド回数を数える.
+# checker.py は入力の2倍が出力されていれば AC にする
+_checker_build_source = (
+    "import shutil\n"
+    "shutil.copy('checker.txt', 'checker.py')\n"
+    "open('checker_build_count', 'a').write('x')\n"
+)
+_checker_source = (
+    "import sys\n"
+    "given, output, _ = (open(path).read() for path in sys.argv[1:])\n"
+    "if int(output) != 2 * int(given.split()[0]):\n"
+    "    sys.stderr.write('not doubled')\n"
+    "    sys.exit(1)\n"
+)
+
+
+def test_execute_with_external_checker(tmp_path: Path) -> None:
+    """外部チェッカは一度だけビルドされ、入力・出力・正解のパスで呼び出される."""
+    (tmp_path / "checker.txt").write_text(_checker_source)
+    (tmp_path / "main.txt").write_text("foo")
+    checker = CheckerConfig(
+        type="external",
+        build=[sys.executable, "-c", _checker_build_source, "checker.txt"],
+        run=[sys.executable, "checker.py"],
+    )
+    sut = ProgramExecutorRepoImpl(
+        [sys.executable, "-c", _build_source],
+        [sys.executable, "-c", "print(int(input()) * 2 + (input() == 'wrong'))"],
+        task_dir=str(tmp_path),
+        checker=checker,
+    )
+
+    assert sut.build()
+    assert sut.build()
+    assert len((tmp_path / "checker_build_count").read_text()) == 1
+    assert _build_count(tmp_path) == 1
+
+    # 解答のソースを変えてもチェッカはビルドし直さない
+    (tmp_path / "main.txt").write_text("bar")
+    assert sut.build()
+    assert len((tmp_path / "checker_build_count").read_text()) == 1
+    assert _build_count(tmp_path) == 2
+
+    accepted = sut.execute(AtcoderTestCase(name="foo", given="3\nok", expected=""))
+    rejected = sut.execute(
+        AtcoderTestCase(name="foo", given="3\nwrong", expected="")
+    )
+
+    assert accepted.status == AtCoderTestStatus.AC
+    assert rejected.status == AtCoderTestStatus.WA
+    assert rejected.error == "not doubled"
@@ -0,0 +1,98 @@
+"""resource_limitsのテスト."""
+
+import resource
+from pathlib import Path
+
+import pytest
+
+from atcoder_helper import resource_limits
+from atcoder_helper.resource_limits import MemoryCgroup
+from atcoder_helper.resource_limits import ResourceLimits
+from atcoder_helper.resource_limits import is_allocation_failure
+
+
+def test_for_solution() -> None:
+    """メモリ制限と出力サイズ制限から、setrlimit の値を決める."""
+    limits = ResourceLimits.for_solution(memory_limit=256, output_limit=16)
+
+    assert limits.address_space == 512 << 20
+    assert limits.stack is None
+    assert limits.file_size == 16 << 20
+
+
+@pytest.mark.parametrize(
+    argnames=("limit_address_space", "memory_cgroup"),
+    argvalues=[[False, False], [True, True]],
+    ids=["仮想メモリを制限しない", "cgroup で制限する"],
+)
+def test_for_solution_with_large_stack(
+    limit_address_space: bool, memory_cgroup: bool
+) -> None:
+    """仮想メモリを制限しないときだけ、スタックをメモリ制限と同じ大きさまで使えるようにする."""
+    limits = ResourceLimits.for_solution(
+        memory_limit=256,
+        output_limit=16,
+        limit_address_space=limit_address_space,
+        memory_cgroup=memory_cgroup,
+    )
+
+    assert limits.address_space is None
+    assert limits.stack == 256 << 20
+
+
+def test_for_solution_without_limits() -> None:
+    """制限がなければ、何も制限しない."""
+    limits = ResourceLimits.for_solution(
+        memory_limit=None, output_limit=None, limit_address_space=True
+    )
+
+    assert limits.rlimits() == []
+
+
+def test_rlimits_are_clamped_to_hard_limit() -> None:
+    """今の hard limit より大きな値は指定しない."""
+    _, hard = resource.getrlimit(resource.RLIMIT_FSIZE)
+    huge = (1 << 62) if hard == resource.RLIM_INFINITY else hard + 1
+
+    (limit,) = ResourceLimits(file_size=huge).rlimits()
+
+    assert limit == ("RLIMIT_FSIZE", huge if hard == resource.RLIM_INFINITY else hard)
+
+
+@pytest.mark.parametrize(
+    argnames=("stderr", "expected"),
+    argvalues=[
+        [b"Traceback (most recent call last):\nMemoryError\n", True],
+        [b"terminate called after throwing an instance of 'std::bad_alloc'", True],
+        [b"ValueError: invalid literal for int()", False],
+    ],
+    ids=["Python", "C++", "メモリ以外"],
+)
+def test_is_allocation_failure(stderr: bytes, expected: bool) -> None:
+    """メモリ確保の失敗を標準エラー出力から見分ける."""
+    assert is_allocation_failure(stderr) == expected
+
+
+def test_find_cgroup_parent(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """環境変数で指定された cgroup でも、memory コントローラが有効でなければ使わない."""
+    monkeypatch.setenv("ATCODER_HELPER_CGROUP", str(tmp_path))
+
+    (tmp_path / "cgroup.subtree_control").write_text("cpu pids\n")
+    assert resource_limits._find_cgroup_parent() is None
+
+    (tmp_path / "cgroup.subtree_control").write_text("cpu memory pids\n")
+    assert resource_limits._find_cgroup_parent() == str(tmp_path)
+
+
+def test_memory_cgroup_oom_killed(tmp_path: Path) -> None:
+    """memory.events の oom_kill を見て、メモリ制限で kill されたかを判定する."""
+    cgroup = MemoryCgroup(str(tmp_path))
+    events = tmp_path / "memory.events"
+
+    assert not cgroup.oom_killed()
+
+    events.write_text("low 0\nhigh 0\nmax 3\noom 1\noom_kill 0\n")
+    assert not cgroup.oom_killed()
+
+    events.write_text("low 0\nhigh 0\nmax 5\noom 2\noom_kill 1\n")
+    assert cgroup.oom_killed()
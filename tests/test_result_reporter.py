@@ -0,0 +1,145 @@
+"""result_reporterのテスト."""
+
+import io
+import json
+import threading
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import pytest
+
+from atcoder_helper.entities.atcoder_test_case import AtCoderTestResult
+from atcoder_helper.entities.atcoder_test_case import AtCoderTestStatus
+from atcoder_helper.result_reporter import JsonLinesReporter
+from atcoder_helper.result_reporter import JUnitReporter
+from atcoder_helper.result_reporter import create_result_reporter
+from atcoder_helper.result_reporter import result_diff
+
+_results = [
+    AtCoderTestResult(
+        "sample_1", AtCoderTestStatus.AC, "1\n", "", "1\n", wall_time=0.012
+    ),
+    AtCoderTestResult(
+        "sample_2",
+        AtCoderTestStatus.WA,
+        "2\n",
+        "debug \x01<&>\n",
+        "3\n",
+        wall_time=0.5,
+        cpu_time=0.25,
+        max_rss=4096,
+    ),
+    AtCoderTestResult("sample_3", AtCoderTestStatus.TLE, "", "", "4\n"),
+    AtCoderTestResult("sample_4", AtCoderTestStatus.ERROR, "", "Traceback", "5\n"),
+]
+
+
+def test_result_diff() -> None:
+    """通らなかったケースだけ、期待する出力との差分を返す."""
+    assert result_diff(_results[0]) is None
+    assert result_diff(_results[1]) == "\n".join(
+        ["--- expected", "+++ actual", "@@ -1 +1 @@", "-3", "+2"]
+    )
+
+
+def test_result_diff_truncated() -> None:
+    """大きな差分は先頭だけにする."""
+    result = AtCoderTestResult(
+        "large",
+        AtCoderTestStatus.WA,
+        "".join(f"{i}\n" for i in range(10000)),
+        "",
+        "".join(f"{-i}\n" for i in range(10000)),
+    )
+
+    diff = result_diff(result)
+
+    assert diff is not None
+    assert diff.endswith("... (truncated)")
+    assert len(diff.splitlines()) <= 51
+
+
+def test_json_lines_reporter() -> None:
+    """ケースごとに1行、最後に集計を1行書き出す."""
+    file = io.StringIO()
+    sut = JsonLinesReporter(file)
+
+    for result in _results:
+        sut.report(result)
+    sut.close()
+
+    records = [json.loads(line) for line in file.getvalue().splitlines()]
+    assert [record["name"] for record in records[:-1]] == [
+        "sample_1",
+        "sample_2",
+        "sample_3",
+        "sample_4",
+    ]
+    assert records[1] == {
+        "type": "case",
+        "name": "sample_2",
+        "status": "WA",
+        "passed": False,
+        "cached": False,
+        "wall_time": 0.5,
+        "cpu_time": 0.25,
+        "max_rss": 4096,
+        "diff": "--- expected\n+++ actual\n@@ -1 +1 @@\n-3\n+2",
+        "error": "debug \x01<&>\n",
+    }
+    assert records[-1] == {
+        "type": "summary",
+        "total": 4,
+        "passed": 1,
+        "statuses": {"AC": 1, "WA": 1, "TLE": 1, "ERROR": 1},
+    }
+    assert not file.closed
+
+
+def test_junit_reporter() -> None:
+    """複数のスレッドから書いても、JUnit XML として読める."""
+    file = io.StringIO()
+    sut = JUnitReporter(file, "abc300_a")
+
+    threads = [threading.Thread(target=sut.report, args=(r,)) for r in _results]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    sut.close()
+
+    [suite] = ET.fromstring(file.getvalue())
+    assert suite.get("name") == "abc300_a"
+    cases = {case.get("name", ""): case for case in suite}
+    assert sorted(cases) == ["sample_1", "sample_2", "sample_3", "sample_4"]
+
+    assert cases["sample_1"].get("time") == "0.012"
+    assert cases["sample_1"].find("failure") is None
+
+    failure = cases["sample_2"].find("failure")
+    assert failure is not None
+    assert failure.get("type") == "WA"
+    assert "+2" in (failure.text or "")
+    # XML に書けない制御文字は落とす
+    assert cases["sample_2"].findtext("system-err") == "debug <&>\n"
+
+    assert cases["sample_3"].find("failure") is not None
+    assert cases["sample_4"].find("error") is not None
+
+
+@pytest.mark.parametrize(argnames="output_format", argvalues=["json", "junit"])
+def test_create_result_reporter(tmp_path: Path, output_format: str) -> None:
+    """ファイルに書き出すときは、close で閉じる."""
+    output_file = tmp_path / "results"
+
+    sut = create_result_reporter(output_format, str(output_file), "suite")
+    sut.report(_results[0])
+    sut.close()
+
+    assert "sample_1" in output_file.read_text()
+
+
+def test_create_result_reporter_unknown_format() -> None:
+    """知らない形式は ValueError."""
+    with pytest.raises(ValueError):
+        create_result_reporter("yaml", None, "suite")
@@ -0,0 +1,39 @@
+"""Tests for workspace."""
+
+import os
+from pathlib import Path
+
+from atcoder_helper.workspace import prepare_language_workspace
+
+
+def test_prepare_language_workspace_mirrors_sources(tmp_path: Path) -> None:
+    """隠しファイル以外を写し、ソースの変更は写し直す."""
+    (tmp_path / "main.py").write_text("print(1)")
+    (tmp_path / "lib").mkdir()
+    (tmp_path / "lib" / "util.py").write_text("x = 1")
+    (tmp_path / ".atcoder_helper_task_config.yaml").write_text("task: a")
+
+    workspace = Path(prepare_language_workspace(str(tmp_path), "python"))
+
+    assert workspace == tmp_path / ".atcoder_helper_languages" / "python"
+    assert (workspace / "main.py").read_text() == "print(1)"
+    assert (workspace / "lib" / "util.py").read_text() == "x = 1"
+    assert not (workspace / ".atcoder_helper_task_config.yaml").exists()
+
+    (tmp_path / "main.py").write_text("print(22)")
+    prepare_language_workspace(str(tmp_path), "python")
+
+    assert (workspace / "main.py").read_text() == "print(22)"
+
+
+def test_prepare_language_workspace_keeps_build_outputs(tmp_path: Path) -> None:
+    """作業ディレクトリの中で書き換えられたファイルは上書きしない."""
+    (tmp_path / "main.cpp").write_text("int main() {}")
+    (tmp_path / "main").write_text("binary from another language")
+    workspace = Path(prepare_language_workspace(str(tmp_path), "cpp"))
+
+    (workspace / "main").write_text("binary built in the workspace")
+    os.utime(tmp_path / "main", ns=(1, 1))
+    prepare_language_workspace(str(tmp_path), "cpp")
+
+    assert (workspace / "main").read_text() == "binary built in the workspace"